@@ -1,21 +1,80 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import pyarrow as pa # Chunked ingestion errors (pa.ArrowInvalid)
 import plotly.express as px
 from fpdf import FPDF
 import io
+import os
 from faker import Faker
-import random
 import openpyxl
 import re
-from scipy import stats
-import string # Import the string module
 from datetime import datetime
 from datetime import timedelta
 import zipfile # For downloading multiple tables as ZIP
-import time # For simulating delays
+from time import perf_counter # Generation profiling
  
 from datetime import timezone # Import timezone explicitly
+# Static lookup tables (domain lists, field maps, templates) are built once per process
+from nullbyte.bias import calculate_bias_score
+from nullbyte.columns import ColumnCache, plan_key
+from nullbyte.catalog import (
+    DIAGNOSES_LIST, INSURANCE_PROVIDERS_LIST, BLOOD_TYPES_LIST, MEDICATIONS_LIST,
+    TRANSACTION_TYPES_LIST, PRODUCT_NAMES_LIST, PAYMENT_METHODS_LIST, PRODUCT_CATEGORIES_LIST,
+    SHIPPING_STATUSES_LIST, GRADES_LIST, SUBJECTS_LIST, DEPARTMENTS_LIST, POSITIONS_LIST,
+    DEGREES_LIST, SKILLS_LIST, PROPERTY_TYPES_LIST, REALESTATE_STATUSES_LIST, AMENITIES_LIST,
+    FILE_EXTENSIONS_LIST, GENERAL_CATEGORIES_LIST, GENERAL_STATUSES_LIST,
+    CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP, DOMAIN_PROMPT_TO_SCHEMA_MAP,
+    FIELD_SYNONYM_TO_CANONICAL_MAP, SCHEMA_INFERENCE_RULES, SCHEMA_TEMPLATES,
+)
+from nullbyte.deep import (
+    FINISHED_STATES as FINISHED_TRAINING_STATES,
+    MODEL_TYPES as DEEP_MODEL_TYPES,
+    deep_models_available,
+    list_saved_models,
+    sample_saved_model,
+    start_training,
+)
+from nullbyte.dp import (
+    COLUMN_MECHANISMS as DP_COLUMN_MECHANISMS,
+    DEFAULT_NUMERIC_BINS as DP_DEFAULT_NUMERIC_BINS,
+    EXPONENTIAL as DP_EXPONENTIAL,
+    GAUSSIAN as DP_GAUSSIAN,
+    LAPLACE as DP_LAPLACE,
+    MECHANISM_LABELS as DP_MECHANISM_LABELS,
+    OTHER_CATEGORY as DP_OTHER_CATEGORY,
+    PrivacyLedger,
+    dataset_key as dp_ledger_key,
+    fit_dp_histograms,
+    privatize_columns,
+)
+from nullbyte.drift import compare_frames
+from nullbyte.dtypes import categorical_like_columns, compact_dataframe
+from nullbyte.fakers import get_faker, get_value_pools
+from nullbyte.federated import (
+    DEFAULT_HISTOGRAM_BINS as FEDERATED_DEFAULT_BINS,
+    FederationError,
+    run_federation,
+    standin_participants,
+)
+from nullbyte.ingest import DEFAULT_LOCAL_DATA_DIR, LOCAL_DATA_DIR_ENV, IngestError, ingest_table, resolve_local_path
+from nullbyte.generators import (
+    DEFAULT_PII_STRATEGY_KEY, VALUE_GENERATOR_FUNCTIONS, fake, use_faker, pooled_fake_values,
+    generate_ifsc, generate_upi, _generate_string_value, _apply_pii_strategy_to_value, get_field_pii_strategy, _generate_value_from_schema,
+)
+from nullbyte.matcher import SYNONYM_MATCHER, DOMAIN_KEYWORD_MATCHER
+from nullbyte.inference import infer_field_schema_from_name, infer_value_schema
+from nullbyte.metrics import record_generation_run
+from nullbyte.pii_scan import DETECTION_MIN_HIT_RATE as PII_SCAN_MIN_HIT_RATE, PII_TYPE_LABELS as PII_SCAN_TYPE_LABELS, scan_frame
+from nullbyte.privacy import LOW_NNDR_THRESHOLD, NEAR_COPY_QUANTILE, distance_to_closest_record
+from nullbyte.profiling import GenerationProfiler, profiling
+from nullbyte.quality import DEFAULT_TIME_BUDGET_SECONDS as DEFAULT_BENCHMARK_SECONDS, benchmark_quality, comparable_column_kinds
+from nullbyte.scramble import scramble_tables
+from nullbyte.streams import EDGE_CASES_STREAM, FAN_OUT_STREAM, PROMPT_TABLE, RandomStreams, chunk_bounds, resolve_seed, stream_random as random # `random`: drop-in that draws from the selected stream
+from nullbyte.store import DatasetStore
+from nullbyte.synthesis import fit_gaussian_copula, fit_numeric_column
+from nullbyte.utility import tstr_benchmark
+from nullbyte.virtual import DEFAULT_PAGE_SIZE as DEFAULT_VIRTUAL_PAGE_SIZE, MAX_VIRTUAL_ROWS, VirtualTable
 # Application Details
 APP_NAME = "NullByte AI"
 APP_TAGLINE = "Synthetic Data Generator"
@@ -39,7 +98,7 @@ PII_HANDLING_STRATEGIES = {
     "redacted": "Redacted (e.g., [REDACTED])",
     "scramble_column": "Scramble Column (Shuffle existing fakes)" # To be implemented later for schema generation
 }
-DEFAULT_PII_STRATEGY_KEY = "default_pii_strategy"
+# DEFAULT_PII_STRATEGY_KEY ("default_pii_strategy") is defined in nullbyte/generators.py, which reads it too
 
 # --- NEW: Indian Language Support ---
 INDIAN_LOCALES = {
@@ -56,26 +115,35 @@ INDIAN_LOCALES = {
 DEFAULT_LOCALE_KEY = "selected_locale"
 
 # --- Session State Initialization ---
+# --- NEW: Tiered dataset store (hot / zstd Arrow IPC / disk spill) for generated and uploaded DataFrames ---
+if '_dataset_store' not in st.session_state:
+    st.session_state._dataset_store = DatasetStore()
+datasets = st.session_state._dataset_store # Use datasets.<key> instead of st.session_state.<key> for DataFrame results
 if 'table_schemas' not in st.session_state: # Changed from 'schema'
     st.session_state.table_schemas = {} # Dict: {table_name: [field_defs]}
 if 'active_table_name' not in st.session_state:
     st.session_state.active_table_name = None
 if 'relationships' not in st.session_state:
     st.session_state.relationships = [] # List of relationship dicts
-if 'generated_data_frames' not in st.session_state: # New: To store {table_name: DataFrame}
-    st.session_state.generated_data_frames = {}
+if 'generated_data_frames' not in datasets: # New: To store {table_name: DataFrame}
+    datasets.generated_data_frames = {}
 if 'active_display_table_name' not in st.session_state: # New: For displaying selected table
     st.session_state.active_display_table_name = None
 if 'edge_cases' not in st.session_state:
     st.session_state.edge_cases = []
+if 'column_cache' not in st.session_state: # --- NEW: Columns of the last Smart Schema Editor run, reused when their plan is unchanged ---
+    st.session_state.column_cache = ColumnCache()
+    datasets.attach("column_cache", st.session_state.column_cache) # Counts against the session memory budget
+if 'schema_editor_random_seed' not in st.session_state: # Stream seed of unseeded runs, kept across edits until a new draw is asked for
+    st.session_state.schema_editor_random_seed = resolve_seed(None)
 if DEFAULT_PII_STRATEGY_KEY not in st.session_state:
     st.session_state[DEFAULT_PII_STRATEGY_KEY] = "realistic_fake"
 if 'initial_schema_populated' not in st.session_state: # For template loading logic
     st.session_state.initial_schema_populated = False
-if 'prompt_generated_df' not in st.session_state:
-    st.session_state.prompt_generated_df = None
-if 'uploaded_df_for_schema' not in st.session_state:
-    st.session_state.uploaded_df_for_schema = None
+if 'prompt_generated_df' not in datasets:
+    datasets.prompt_generated_df = None
+if 'uploaded_df_for_schema' not in datasets:
+    datasets.uploaded_df_for_schema = None
 if 'num_rows_for_file_upload_tab3' not in st.session_state:
     st.session_state.num_rows_for_file_upload_tab3 = 10 # Default if no file uploaded yet
 if 'uploaded_file_name_tab3' not in st.session_state:
@@ -90,8 +158,8 @@ if 'playground_edge_cases' not in st.session_state:
     st.session_state.playground_edge_cases = []
 if 'playground_num_rows' not in st.session_state:
     st.session_state.playground_num_rows = 20 # Default for quick scenario testing
-if 'playground_generated_df' not in st.session_state:
-    st.session_state.playground_generated_df = None
+if 'playground_generated_df' not in datasets:
+    datasets.playground_generated_df = None
 if 'playground_table_name_for_conditions' not in st.session_state: # Fixed name for conditions
     st.session_state.playground_table_name_for_conditions = "PlaygroundScenarioTable"
 if DEFAULT_LOCALE_KEY not in st.session_state:
@@ -110,6 +178,8 @@ if 'deep_model_data_uploaded' not in st.session_state:
     st.session_state.deep_model_data_uploaded = False # Flag for GAN/VAE
 if 'deep_model_prompt' not in st.session_state:
     st.session_state.deep_model_prompt = ""
+if 'deep_training_job' not in st.session_state:
+    st.session_state.deep_training_job = None # nullbyte.deep.TrainingJob of the latest CTGAN/TVAE run
 if 'dp_epsilon' not in st.session_state:
     st.session_state.dp_epsilon = 1.0 # Default Epsilon for DP
 if 'nlp_model_prompt' not in st.session_state:
@@ -122,26 +192,30 @@ if 'dp_mechanism_numeric' not in st.session_state:
     st.session_state.dp_mechanism_numeric = "Laplace Mechanism"
 if 'dp_mechanism_categorical' not in st.session_state:
     st.session_state.dp_mechanism_categorical = "Randomized Response"
-if 'benchmark_fidelity_score' not in st.session_state:
-    st.session_state.benchmark_fidelity_score = None
+if 'dp_column_release_summary' not in st.session_state:
+    st.session_state.dp_column_release_summary = None # Per-column effective epsilon of the last column-level DP transform
+if 'benchmark_report' not in st.session_state: # nullbyte.quality.QualityReport
+    st.session_state.benchmark_report = None
 if 'benchmark_utility_score' not in st.session_state:
     st.session_state.benchmark_utility_score = None
 if 'benchmark_privacy_score' not in st.session_state: # Lower is better for risk, or higher for protection
     st.session_state.benchmark_privacy_score = None
+if 'benchmark_privacy_report' not in st.session_state: # nullbyte.privacy.PrivacyReport
+    st.session_state.benchmark_privacy_report = None
+if 'benchmark_utility_report' not in st.session_state: # nullbyte.utility.UtilityReport
+    st.session_state.benchmark_utility_report = None
 if 'advanced_lab_selection' not in st.session_state:
     st.session_state.advanced_lab_selection = "🤖 AI-Powered Generation" # Default selection, ensure it's one of the options
 if 'federated_participants_list' not in st.session_state:
-    st.session_state.federated_participants_list = [] # List of dicts: {"name": "P1", "trained": False}
+    st.session_state.federated_participants_list = [] # List of dicts: {"name": "Hospital A", "path": local file}
 if 'federated_new_participant_name' not in st.session_state:
     st.session_state.federated_new_participant_name = ""
-if 'federated_aggregation_done' not in st.session_state:
-    st.session_state.federated_aggregation_done = False
-if 'federated_global_schema_template_output' not in st.session_state:
-    st.session_state.federated_global_schema_template_output = "None (Custom Schema)"
+if 'federated_result' not in st.session_state:
+    st.session_state.federated_result = None # FederatedResult (global model) of the last federated training run
 if 'federated_num_rows_output' not in st.session_state:
     st.session_state.federated_num_rows_output = 100
-if 'federated_generated_df_output' not in st.session_state:
-    st.session_state.federated_generated_df_output = None
+if 'federated_generated_df_output' not in datasets:
+    datasets.federated_generated_df_output = None
 if 'marketplace_templates' not in st.session_state:
     st.session_state.marketplace_templates = [ # Pre-populate with some examples
         {"name": "Realistic E-commerce Transactions", "description": "Detailed e-commerce data with customer behavior.", "author": "CommunityUser1", "rating": 4.5, "downloads": 120, "discussions": 15, "trust_badge": "Verified"},
@@ -321,6 +395,8 @@ if selected_locale_from_ui != st.session_state[DEFAULT_LOCALE_KEY]:
 use_fixed_seed = st.checkbox("Use fixed random seed for reproducible dataset")
 
 # --- Seed Management & Faker Initialization ---
+FIXED_RANDOM_SEED = 42
+active_seed = FIXED_RANDOM_SEED if use_fixed_seed else None # Part of the Faker/value-pool cache key
 if use_fixed_seed:
     random.seed(42)
     Faker.seed(42)
@@ -330,22 +406,18 @@ else:
     Faker.seed(None)
     np.random.seed(None) # Add this for NumPy
 
-# Initialize Faker based on the selected focus and locale
+# Initialize Faker based on the selected focus and locale (cached per locale/focus/seed, not rebuilt every rerun)
+current_locale_for_faker = st.session_state[DEFAULT_LOCALE_KEY] if st.session_state.data_generation_focus == "indian" else 'en_US'
 try:
-    if st.session_state.data_generation_focus == "indian":
-        current_locale_for_faker = st.session_state[DEFAULT_LOCALE_KEY]
-        fake = Faker(current_locale_for_faker)
-        # st.caption(f"Faker initialized with: {current_locale_for_faker} (Indian Focus)") # For debugging
-    else: # global focus
-        current_locale_for_faker = 'en_US' # Default global locale
-        fake = Faker(current_locale_for_faker)
-        # st.caption(f"Faker initialized with: {current_locale_for_faker} (Global Focus)") # For debugging
+    # `fake` (from nullbyte.generators) forwards to the Faker registered for this script run's thread
+    use_faker(get_faker(st.session_state[DEFAULT_LOCALE_KEY], st.session_state.data_generation_focus, active_seed),
+              get_value_pools(st.session_state[DEFAULT_LOCALE_KEY], st.session_state.data_generation_focus, active_seed))
 except AttributeError as e:
     st.error(f"Error initializing Faker with locale '{current_locale_for_faker}': {e}. "
              f"This might indicate that the locale is not fully supported by your Faker installation. "
              f"Falling back to 'en_IN'. Please check Faker documentation or update the library if you need this locale.")
     st.session_state[DEFAULT_LOCALE_KEY] = "en_IN" # Fallback Indian locale
-    fake = Faker("en_IN") # Re-initialize with fallback
+    use_faker(get_faker("en_IN", "indian", active_seed), get_value_pools("en_IN", "indian", active_seed)) # Re-initialize with fallback
 
 # Field type definitions (FIELD_TYPES remains the same as it's for UI display of types)
 FIELD_TYPES = {
@@ -367,1152 +439,25 @@ FIELD_TYPES = {
     "animal_name": "Animal Name (Pet Name)" # New type for animal names
 }
 
-def is_dpdp_pii(field_name):
-    """Check if a field name matches DPDP-sensitive PII."""
-    field_lower = field_name.lower()
-    return (
-        'phone' in field_lower or
-        'aadhaar' in field_lower or
-        'pan' in field_lower or
-        'passport' in field_lower or
-        'voter' in field_lower or
-        'ifsc' in field_lower or
-        'upi' in field_lower
-    )
+DPDP_NAME_KEYWORDS = ('phone', 'aadhaar', 'passport', 'voter') # Substrings anywhere in the name ("telephone", "smartphone_model")
+DPDP_NAME_TOKENS = frozenset( # Short identifiers: a whole name token, bare or with an ID suffix, so "company" is not PAN
+    keyword + suffix for keyword in ('pan', 'ifsc', 'upi') for suffix in ('', 'card', 'code', 'id', 'no', 'num', 'number')
+)
 
-def mask_pii(value, field_type):
-    """Mask PII data according to field type."""
-    if pd.isna(value) or not str(value).strip(): # Check for empty or NaN
-        return value
-
-    if field_type == "phone":
-        if len(str(value)) >= 4:
-            return f"XXXXXX{str(value)[-4:]}"
-        return "XXXXXX"
-    elif field_type in ["aadhaar", "pan", "passport", "voterid", "ifsc", "upi"]:
-        if len(str(value)) >= 4:
-            return f"XXXXXX{str(value)[-4:]}"
-        return "XXXXXX"
-    elif field_type == "email":
-        parts = str(value).split('@')
-        if len(parts) == 2:
-            return f"{parts[0][0]}***@{parts[1]}"
-        return "***@***"
-    return value
-
-def validate_constraint(field_type, constraint):
-    """Validate if the constraint is valid for the given field type."""
-    if field_type in ["int", "float"]:
-        # Check if constraint is in format "min-max"
-        pattern = r"^\s*(-?\d+(?:\.\d+)?)\s*-\s*(-?\d+(?:\.\d+)?)\s*$"
-        match = re.match(pattern, constraint)
-        if match:
-            min_val, max_val = match.groups()
-            try:
-                min_val = float(min_val)
-                max_val = float(max_val)
-                return True # Allow min == max for single value constraint
-            except ValueError:
-                return False
-        return False
-    elif field_type == "date":
-        # Check if constraint is in format "YYYY-MM-DD - YYYY-MM-DD"
-        pattern = r"^\s*(\d{4}-\d{2}-\d{2})\s*-\s*(\d{4}-\d{2}-\d{2})\s*$"
-        match = re.match(pattern, constraint)
-        if match:
-            start_date, end_date = match.groups()
-            try:
-                start = datetime.strptime(start_date, "%Y-%m-%d")
-                end = datetime.strptime(end_date, "%Y-%m-%d")
-                return True
-            except ValueError:
-                return False
-        return False
-    elif field_type == "category":
-        # Check if constraint is a comma-separated list of values
-        values = [v.strip() for v in constraint.split(",") if v.strip()]
-        return len(values) > 0
-    elif field_type == "string":
-        # For string type, constraint is optional
-        return True
-    elif field_type in ["email", "phone", "address", "name", "aadhaar", "pan", "passport", "voterid", "ifsc", "upi"]:
-        # These types don't need constraints for generation, but validate if provided
-        if constraint: # If a constraint is provided, check if it's a simple value for == edge case
-             return True # We'll handle constraint validation for these types in the generator if needed
+def is_dpdp_pii(field_name):
+    """Check if a field name matches DPDP-sensitive PII (short identifiers token-wise: snake_case, spaces and camelCase)."""
+    field_name = str(field_name)
+    if any(keyword in field_name.lower() for keyword in DPDP_NAME_KEYWORDS):
         return True
-    return False
-
-def generate_aadhaar():
-    """Generate a fake but realistic Aadhaar number (12 digits, optionally with spaces)"""
-    aadhaar = ''.join([str(random.randint(0, 9)) for _ in range(12)])
-    # Randomly add spaces for formatting (40% chance)
-    if random.random() < 0.4:
-        aadhaar = f"{aadhaar[:4]} {aadhaar[4:8]} {aadhaar[8:12]}"
-    return aadhaar
-
-def generate_pan():
-    """Generate a fake but realistic PAN number (AAAAA0000A format)"""
-    first_five = ''.join([random.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ') for _ in range(5)])
-    four_digits = ''.join([str(random.randint(0, 9)) for _ in range(4)])
-    last_char = random.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ')
-    return f"{first_five}{four_digits}{last_char}"
-
-def generate_passport():
-    """Generate a fake but realistic Indian passport number"""
-    first_char = random.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ')
-    seven_digits = ''.join([str(random.randint(0, 9)) for _ in range(7)])
-    return f"{first_char}{seven_digits}"
-
-def generate_voter_id():
-    """Generate a fake but realistic Voter ID (2 letters followed by 7 digits)"""
-    first_two = ''.join([random.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ') for _ in range(2)])
-    seven_digits = ''.join([str(random.randint(0, 9)) for _ in range(7)])
-    return f"{first_two}{seven_digits}"
-
-def generate_ifsc():
-    """Generate a fake but realistic IFSC code (4 letters + 0 + 6 digits)"""
-    bank_code = ''.join([random.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ') for _ in range(4)])
-    branch_code = ''.join([str(random.randint(0, 9)) for _ in range(6)])
-    return f"{bank_code}0{branch_code}"
-
-def generate_upi():
-    """Generate a fake but realistic UPI ID"""
-    username = fake.user_name()
-    domain = random.choice(['@oksbi', '@paytm', '@ybl', '@axl', '@ibl'])
-    return f"{username}{domain}".lower()
-
-# --- Value Generation Helper Functions ---
-def _generate_string_value(constraint, field_name, pii_strategy, edge_condition=None, full_field_schema=None):
-    """
-    Generates a string value based on the field name and any hints in the schema.
-    Handles business-specific patterns like API paths, version numbers, etc.
-    """
-    field_lower = field_name.lower()
-    
-    # Handle edge conditions first
-    if edge_condition and edge_condition.get('operator') == '==':
-        return str(edge_condition['value'])
-    
-    # Handle business-specific patterns
-    if full_field_schema and full_field_schema.get('_hint_api_path'):
-        # Generate realistic API endpoint paths
-        api_versions = ['v1', 'v2', 'v3']
-        api_resources = ['users', 'products', 'orders', 'customers', 'payments', 'inventory', 'analytics']
-        api_actions = ['get', 'create', 'update', 'delete', 'list', 'search', 'filter']
-        version = random.choice(api_versions)
-        resource = random.choice(api_resources)
-        action = random.choice(api_actions)
-        return f"/{version}/{resource}/{action}"
-    
-    elif full_field_schema and full_field_schema.get('_hint_version'):
-        # Generate semantic version numbers
-        major = random.randint(1, 5)
-        minor = random.randint(0, 9)
-        patch = random.randint(0, 9)
-        return f"{major}.{minor}.{patch}"
-    
-    elif "connection_string" in field_lower:
-        # Generate database connection strings
-        db_types = ['postgresql', 'mysql', 'mongodb', 'redis']
-        db_type = random.choice(db_types)
-        user = fake.user_name()
-        password = fake.password()
-        host = fake.hostname()
-        port = random.randint(1024, 65535)
-        db_name = fake.word()
-        return f"{db_type}://{user}:{password}@{host}:{port}/{db_name}"
-    
-    elif "sku" in field_lower:
-        # Generate product SKUs
-        prefix = "".join(random.choices(string.ascii_uppercase, k=3))
-        middle = "".join(random.choices(string.ascii_uppercase + string.digits, k=3))
-        suffix = "".join(random.choices(string.ascii_uppercase, k=2))
-        return f"{prefix}-{middle}-{suffix}"
-    
-    elif "campaign_id" in field_lower:
-        # Generate marketing campaign IDs
-        year = datetime.now().year
-        quarter = f"Q{(datetime.now().month-1)//3 + 1}"
-        campaign_type = random.choice(['EMAIL', 'SOCIAL', 'PPC', 'SEO'])
-        number = random.randint(1000, 9999)
-        return f"{campaign_type}-{year}-{quarter}-{number}"
-    
-    elif "job_title" in field_lower:
-        # Generate realistic job titles
-        levels = ['Junior', 'Senior', 'Lead', 'Principal', 'Staff', 'Chief']
-        roles = ['Software Engineer', 'Data Scientist', 'Product Manager', 'DevOps Engineer', 
-                'UX Designer', 'Business Analyst', 'Project Manager', 'Solutions Architect']
-        specialties = ['', 'Backend', 'Frontend', 'Full Stack', 'Cloud', 'Security', 'Mobile']
-        
-        level = random.choice(levels)
-        role = random.choice(roles)
-        specialty = random.choice(specialties)
-        
-        if specialty:
-            return f"{level} {specialty} {role}"
-        return f"{level} {role}"
-    
-    # Handle Faker-specific patterns
-    elif full_field_schema and full_field_schema.get('is_faker_url'):
-        return fake.url()
-    elif full_field_schema and full_field_schema.get('is_faker_ipv4'):
-        return fake.ipv4()
-    elif full_field_schema and full_field_schema.get('is_faker_color_name'):
-        return fake.color_name()
-    elif full_field_schema and full_field_schema.get('is_faker_job'):
-        return fake.job()
-    elif full_field_schema and full_field_schema.get('is_faker_company'):
-        return fake.company()
-    
-    # Handle inferred alphanumeric IDs
-    elif full_field_schema and full_field_schema.get('_is_inferred_alphanum_id'):
-        prefix = full_field_schema.get('_inferred_prefix', 'ID-')
-        length = full_field_schema.get('length', 8)
-        chars = string.ascii_uppercase + string.digits
-        return prefix + ''.join(random.choices(chars, k=length))
-    
-    # Default string generation
-    if constraint:
-        # If there's a constraint, try to use it
-        try:
-            return str(constraint)
-        except:
-            pass
-    
-    # Generate a random string based on the field name
-    if any(kw in field_lower for kw in ['name', 'title', 'description']):
-        return fake.sentence(nb_words=3)
-    elif any(kw in field_lower for kw in ['code', 'id', 'key']):
-        return fake.uuid4()
-    else:
-        return fake.word()
-
-def _generate_int_value(constraint, field_name, pii_strategy, edge_condition=None):
-    min_default, max_default = 1, 1000
-    min_default_initial, max_default_initial = min_default, max_default # Store initial defaults
-
-    if constraint:
-        pattern = r"^\s*(-?\d+(?:\.\d+)?)\s*-\s*(-?\d+(?:\.\d+)?)\s*$"
-        match = re.match(pattern, constraint)
-        if match:
-            min_val_str, max_val_str = match.groups()
-            try:
-                parsed_min = int(float(min_val_str)) # Use float conversion for flexibility then int
-                parsed_max = int(float(max_val_str))
-                if parsed_min <= parsed_max:
-                    min_default = parsed_min
-                    max_default = parsed_max
-                else:
-                    st.warning(f"Invalid constraint range for INT field '{field_name}': min ({parsed_min}) > max ({parsed_max}). Using default range {min_default_initial}-{max_default_initial}.")
-            except ValueError:
-                st.warning(f"Error converting constraint parts '{min_val_str}', '{max_val_str}' to int for '{field_name}'. Using default range.")
-        else:
-            st.warning(f"Malformed INT constraint '{constraint}' for field '{field_name}'. Using default range {min_default_initial}-{max_default_initial}.")
-    
-    # min_default, max_default now hold either parsed values or initial defaults for the constraint
-    
-    min_target, max_target = min_default, max_default
-
-    if edge_condition:
-        op = edge_condition['operator']
-        try:
-            val = int(edge_condition['value'])
-            if op == '>': min_target = val + 1
-            elif op == '<': max_target = val - 1
-            elif op == '==': min_target, max_target = val, val
-            elif op == '>=': min_target = val
-            elif op == '<=': max_target = val
-            # Note: != is complex for direct generation, would require generate-then-check-retry.
-        except ValueError:
-             st.warning(f"Edge case value '{edge_condition['value']}' for '{field_name}' is not a valid integer. Ignoring edge case for this field.")
-
-
-    if "age" in field_name.lower() or "salary" in field_name.lower(): # Ensure non-negative for these
-        min_target = max(0, min_target)
-
-    if min_target > max_target: # If edge case created invalid range, try to make a small valid one
-        if edge_condition and edge_condition.get('operator') == '==': return int(edge_condition['value']) # Exact value if possible
-        st.warning(f"Edge case for '{field_name}' created an invalid range ({min_target}-{max_target}). Attempting to adjust or use original constraint.")
-        # Attempt to create a small valid range around the edge value if possible, else revert
-        if edge_condition and edge_condition.get('operator') in ['>', '>=']: max_target = min_target + abs(min_target // 20 or 10) + 10
-        elif edge_condition and edge_condition.get('operator') in ['<', '<=']: min_target = max_target - abs(max_target // 20 or 10) - 10
-        if min_target > max_target: # Still invalid, revert to original default or constraint
-            min_target, max_target = min_default, max_default
-            if "age" in field_name.lower() or "salary" in field_name.lower(): min_target = max(0, min_target)
-            if min_target > max_target: return random.randint(0,100) # Absolute fallback
-
-    generated_value = random.randint(min_target, max_target)
-
-    # --- Conceptual Differential Privacy (Laplace Mechanism) ---
-    if (st.session_state.get('advanced_lab_selection') == "🛡️ Differential Privacy" and
-        st.session_state.get('dp_mechanism_numeric') == "Laplace Mechanism" and
-        st.session_state.get('dp_epsilon', 0) > 0):
-
-        epsilon = st.session_state.dp_epsilon
-        # Sensitivity: For direct perturbation of a value within a range [min, max],
-        # sensitivity can be considered max - min.
-        # If min_target == max_target, sensitivity is 0, no noise added.
-        sensitivity = float(max_target - min_target)
-
-        if sensitivity > 0: # Only add noise if there's a range
-            noise = np.random.laplace(0, sensitivity / epsilon)
-            noisy_value = generated_value + noise
-            noisy_value_int = int(round(noisy_value))
-            # Clip to original target range (Note: simple clipping can affect formal DP guarantees)
-            generated_value = max(min_target, min(noisy_value_int, max_target))
-            # st.sidebar.caption(f"DP Applied to {field_name}: val={generated_value}, noise={noise:.2f}, sens={sensitivity}, eps={epsilon}") # For debugging
-
-    return generated_value
-
-
-def _generate_float_value(constraint, field_name, pii_strategy, edge_condition=None):
-    min_default, max_default = 1.0, 1000.0
-    min_default_initial, max_default_initial = min_default, max_default # Store initial defaults
-
-    if constraint:
-        pattern = r"^\s*(-?\d+(?:\.\d+)?)\s*-\s*(-?\d+(?:\.\d+)?)\s*$"
-        match = re.match(pattern, constraint)
-        if match:
-            min_val_str, max_val_str = match.groups()
-            try:
-                parsed_min = float(min_val_str)
-                parsed_max = float(max_val_str)
-                if parsed_min <= parsed_max:
-                    min_default = parsed_min
-                    max_default = parsed_max
-                else:
-                    st.warning(f"Invalid constraint range for FLOAT field '{field_name}': min ({parsed_min}) > max ({parsed_max}). Using default range {min_default_initial}-{max_default_initial}.")
-            except ValueError:
-                st.warning(f"Error converting constraint parts '{min_val_str}', '{max_val_str}' to float for '{field_name}'. Using default range.")
-        else:
-            st.warning(f"Malformed FLOAT constraint '{constraint}' for field '{field_name}'. Using default range {min_default_initial}-{max_default_initial}.")
-
-    # min_default, max_default now hold either parsed values or initial defaults for the constraint
-    
-    min_target, max_target = min_default, max_default
-
-    if edge_condition:
-        op = edge_condition['operator']
-        try:
-            val = float(edge_condition['value'])
-            if op == '>': min_target = val + 0.01 # Small epsilon for float
-            elif op == '<': max_target = val - 0.01
-            elif op == '==': min_target, max_target = val, val
-            elif op == '>=': min_target = val
-            elif op == '<=': max_target = val
-        except ValueError:
-             st.warning(f"Edge case value '{edge_condition['value']}' for '{field_name}' is not a valid float. Ignoring edge case for this field.")
-
-
-    if "age" in field_name.lower() or "salary" in field_name.lower() or "price" in field_name.lower():
-        min_target = max(0.0, min_target)
-
-    if min_target > max_target:
-        if edge_condition and edge_condition.get('operator') == '==': return float(edge_condition['value']) # Exact value if possible
-        st.warning(f"Edge case for '{field_name}' created an invalid float range ({min_target}-{max_target}). Attempting to adjust or use original constraint.")
-        if edge_condition and edge_condition.get('operator') in ['>', '>=']: max_target = min_target + abs(min_target / 20.0 or 10.0) + 10.0
-        elif edge_condition and edge_condition.get('operator') in ['<', '<=']: min_target = max_target - abs(max_target / 20.0 or 10.0) - 10.0
-        if min_target > max_target:
-            min_target, max_target = min_default, max_default
-            if "age" in field_name.lower() or "salary" in field_name.lower() or "price" in field_name.lower(): min_target = max(0.0, min_target)
-            if min_target > max_target: return round(random.uniform(0.0,100.0), 2)
-
-    generated_value = round(random.uniform(min_target, max_target), 2)
-
-    # --- Conceptual Differential Privacy (Laplace Mechanism) ---
-    if (st.session_state.get('advanced_lab_selection') == "🛡️ Differential Privacy" and
-        st.session_state.get('dp_mechanism_numeric') == "Laplace Mechanism" and
-        st.session_state.get('dp_epsilon', 0) > 0):
-
-        epsilon = st.session_state.dp_epsilon
-        # Sensitivity: For direct perturbation of a value within a range [min, max],
-        # sensitivity can be considered max - min.
-        sensitivity = float(max_target - min_target)
-
-        if sensitivity > 0: # Only add noise if there's a range
-            noise = np.random.laplace(0, sensitivity / epsilon)
-            noisy_value = generated_value + noise
-            # Clip to original target range (Note: simple clipping can affect formal DP guarantees)
-            # Ensure the clipped value still respects the float nature (e.g. precision)
-            generated_value = round(max(min_target, min(noisy_value, max_target)), 2)
-            # st.sidebar.caption(f"DP Applied to {field_name}: val={generated_value}, noise={noise:.2f}, sens={sensitivity}, eps={epsilon}") # For debugging
-
-    return generated_value
-
-
-def _generate_date_value(constraint, field_name, pii_strategy, edge_condition=None):
-    start_default = datetime.now() - timedelta(days=365)
-    end_default = datetime.now()
-
-    if constraint and validate_constraint("date", constraint):
-        start_date_str, end_date_str = map(str.strip, constraint.split('-'))
-        try:
-            start_default = datetime.strptime(start_date_str, "%Y-%m-%d")
-            end_default = datetime.strptime(end_date_str, "%Y-%m-%d")
-        except ValueError:
-            st.warning(f"Invalid date constraint format for '{field_name}'. Using default date range.")
-
-
-    start_target, end_target = start_default, end_default
-
-    if edge_condition:
-        op = edge_condition['operator']
-        try:
-            val_date = datetime.strptime(str(edge_condition['value']), "%Y-%m-%d")
-            if op == '>': start_target = val_date + timedelta(days=1)
-            elif op == '<': end_target = val_date - timedelta(days=1)
-            elif op == '==': start_target, end_target = val_date, val_date
-            elif op == '>=': start_target = val_date
-            elif op == '<=': end_target = val_date
-        except ValueError:
-             st.warning(f"Edge case value '{edge_condition['value']}' for '{field_name}' is not a valid date (YYYY-MM-DD). Ignoring edge case for this field.")
-
-
-    if start_target > end_target:
-        if edge_condition and edge_condition.get('operator') == '==': return val_date.strftime("%Y-%m-%d") # Exact value if possible
-        st.warning(f"Edge case for '{field_name}' created an invalid date range. Using original constraint.")
-        start_target, end_target = start_default, end_default
-        if start_target > end_target: return fake.date_this_year().strftime("%Y-%m-%d") # Absolute fallback
-
-    days_between = (end_target - start_target).days
-    if days_between < 0: days_between = 0 # Should not happen if logic above is correct
-    random_days = random.randint(0, days_between)
-    return (start_target + timedelta(days=random_days)).strftime("%Y-%m-%d")
-
-def _generate_category_value(constraint, field_name, pii_strategy, edge_condition=None):
-    if edge_condition and edge_condition.get('operator') == '==':
-        # Ensure the edge case value is one of the possible categories if constraint exists
-        if constraint:
-            values = [v.strip() for v in constraint.split(",") if v.strip()]
-            if str(edge_condition['value']) in values:
-                return str(edge_condition['value'])
-            else: # Edge case value not in allowed categories, warn and pick from original
-                st.warning(f"Edge case value '{edge_condition['value']}' for '{field_name}' not in allowed categories. Picking from original constraint.")
-        else: # No original constraint, so edge case value is fine
-            return str(edge_condition['value'])
-
-    if constraint:
-        values = [v.strip() for v in constraint.split(",") if v.strip()]
-        if values: return random.choice(values)
-    return random.choice(["Option A", "Option B", "Option C"])
-
-def _apply_pii_strategy_to_value(value, field_type, pii_strategy):
-    """Applies masking or redaction to a generated value based on the chosen strategy."""
-    if pii_strategy == "masked":
-        return mask_pii(value, field_type)
-    elif pii_strategy == "redacted":
-        return "[REDACTED]"
-    # "realistic_fake" is the default if no other strategy applies or if value is already faked
-    # "scramble_column" is handled *after* generation
-    return value
-
-def _generate_email_value(constraint, field_name, pii_strategy, edge_condition=None):
-    # Edge cases for email (like '==') are less common for generation, but could be supported
-    if edge_condition and edge_condition.get('operator') == '==':
-         val = str(edge_condition['value'])
-    else:
-        val = fake.email()
-    return _apply_pii_strategy_to_value(val, "email", pii_strategy)
-
-def _generate_phone_value(constraint, field_name, pii_strategy, edge_condition=None):
-    if edge_condition and edge_condition.get('operator') == '==':
-         val = str(edge_condition['value'])
-    else:
-        if st.session_state.data_generation_focus == "indian":
-            val = f"+91 {random.randint(7000, 9999)}{random.randint(100000, 999999)}"
-        else: # global focus
-            val = fake.phone_number() # Uses the globally configured 'fake' object (e.g., en_US)
-    return _apply_pii_strategy_to_value(val, "phone", pii_strategy)
-
-def _generate_address_value(constraint, field_name, pii_strategy, edge_condition=None):
-    if edge_condition and edge_condition.get('operator') == '==':
-         val = str(edge_condition['value'])
-    else:
-        val = fake.address().replace('\n', ', ')
-    # Address is typically faked, masking/redaction can be applied if needed via strategy
-    return _apply_pii_strategy_to_value(val, "address", pii_strategy)
-
-def _generate_name_value(constraint, field_name, pii_strategy, edge_condition=None):
-    # This function now needs the full field_schema to access prefix/suffix
-    # For simplicity in this diff, we'll assume field_schema is passed if called from generate_value
-    # The call signature in VALUE_GENERATOR_FUNCTIONS might need adjustment if we pass full schema there.
-    # For now, we'll assume field_name can be used to look up its schema if needed, or this logic moves.
-    if edge_condition and edge_condition.get('operator') == '==':
-         val = str(edge_condition['value'])
-    else:
-        val = fake.name()
-    return _apply_pii_strategy_to_value(val, "name", pii_strategy)
-
-def _generate_aadhaar_value(constraint, field_name, pii_strategy, edge_condition=None):
-    if edge_condition and edge_condition.get('operator') == '==':
-         val = str(edge_condition['value'])
-    else:
-        val = generate_aadhaar()
-    return _apply_pii_strategy_to_value(val, "aadhaar", pii_strategy)
-
-def _generate_pan_value(constraint, field_name, pii_strategy, edge_condition=None):
-    if edge_condition and edge_condition.get('operator') == '==':
-         val = str(edge_condition['value'])
-    else:
-        val = generate_pan()
-    return _apply_pii_strategy_to_value(val, "pan", pii_strategy)
-
-def _generate_passport_value(constraint, field_name, pii_strategy, edge_condition=None):
-    if edge_condition and edge_condition.get('operator') == '==':
-         val = str(edge_condition['value'])
-    else:
-        val = generate_passport()
-    return _apply_pii_strategy_to_value(val, "passport", pii_strategy)
-
-def _generate_voterid_value(constraint, field_name, pii_strategy, edge_condition=None):
-    if edge_condition and edge_condition.get('operator') == '==':
-         val = str(edge_condition['value'])
-    else:
-        val = generate_voter_id()
-    return _apply_pii_strategy_to_value(val, "voterid", pii_strategy)
-
-def _generate_ifsc_value(constraint, field_name, pii_strategy, edge_condition=None):
-    if edge_condition and edge_condition.get('operator') == '==':
-         val = str(edge_condition['value'])
-    else:
-        val = generate_ifsc()
-    return _apply_pii_strategy_to_value(val, "ifsc", pii_strategy)
-
-def _generate_upi_value(constraint, field_name, pii_strategy, edge_condition=None):
-    if edge_condition and edge_condition.get('operator') == '==':
-         val = str(edge_condition['value'])
-    else:
-        val = generate_upi()
-    return _apply_pii_strategy_to_value(val, "upi", pii_strategy)
-
-def _generate_animal_name_value(constraint, field_name, pii_strategy, edge_condition=None):
-    """Generates a pet-like name."""
-    if edge_condition and edge_condition.get('operator') == '==':
-        return str(edge_condition['value'])
-    # Using fake.first_name() as a proxy for pet names.
-    # Could be expanded with a dedicated list of actual animal names.
-    return fake.first_name()
-    # Pet names are generally not PII, so no _apply_pii_strategy_to_value needed here.
-
-# --- Constants for Domain-Specific Data Generation ---
-DIAGNOSES_LIST = ["Hypertension", "Diabetes", "Asthma", "Arthritis", "Migraine",
-                  "Bronchitis", "Anemia", "Pneumonia", "Sinusitis", "Depression", "Anxiety",
-                  "Allergy", "Osteoporosis", "Glaucoma", "Eczema", "GERD", "COVID-19", "Influenza",
-                  "Chronic Kidney Disease", "Hyperlipidemia", "Hypothyroidism", "Sleep Apnea", "Obesity"]
-INSURANCE_PROVIDERS_LIST = ["United Health", "Aetna", "Blue Cross", "Cigna", "Humana",
-                            "Kaiser Permanente", "Anthem", "Centene", "Molina Healthcare", "WellCare"]
-BLOOD_TYPES_LIST = ["A+", "A-", "B+", "B-", "AB+", "AB-", "O+", "O-"]
-MEDICATIONS_LIST = ["Paracetamol", "Ibuprofen", "Amoxicillin", "Lisinopril", "Metformin",
-                    "Atorvastatin", "Omeprazole", "Losartan", "Albuterol", "Gabapentin",
-                    "Sertraline", "Amlodipine", "Simvastatin", "Hydrochlorothiazide", "Levothyroxine",
-                    "Azithromycin", "Ciprofloxacin", "Prednisone", "Insulin Glargine", "Warfarin", "Clopidogrel"]
-TRANSACTION_TYPES_LIST = ["Deposit", "Withdrawal", "Transfer", "Payment", "Refund", "Fee", "Interest"]
-PRODUCT_NAMES_LIST = ["Laptop", "Smartphone", "Headphones", "Smartwatch", "Tablet",
-                      "Camera", "Speaker", "Monitor", "Keyboard", "Mouse",
-                      "Desk Chair", "Coffee Maker", "Blender", "Backpack", "Water Bottle",
-                      "Running Shoes", "Yoga Mat", "Bluetooth Speaker", "External Hard Drive", "Webcam"]
-PRODUCT_NAMES_LIST.extend(["Drone", "VR Headset", "Air Fryer", "Electric Scooter", "Fitness Tracker",
-                           "Projector", "Robot Vacuum", "Security Camera System", "Portable SSD", "Gaming Console",
-                           "Wireless Charger", "E-reader", "Digital Photo Frame", "Smart Thermostat", "Air Purifier",
-                           "Electric Toothbrush", "Hair Dryer", "Instant Pot", "Microwave Oven", "Toaster", "Action Camera"])
-PAYMENT_METHODS_LIST = ["Credit Card", "Debit Card", "UPI", "Net Banking", "Cash on Delivery", "Wallet", "EMI"]
-PRODUCT_CATEGORIES_LIST = ["Electronics", "Clothing", "Home & Kitchen", "Books", "Beauty"]
-SHIPPING_STATUSES_LIST = ["Pending", "Shipped", "Delivered", "Cancelled", "Returned"]
-GRADES_LIST = ["A", "B", "C", "D", "F"]
-SUBJECTS_LIST = ["Math", "Science", "English", "History", "Geography"]
-DEPARTMENTS_LIST = ["IT", "HR", "Finance", "Marketing", "Operations"]
-DEPARTMENTS_LIST.extend(["Legal", "Customer Support", "Research & Development", "Product Management", "Quality Assurance",
-                         "Sales", "Supply Chain", "Administration", "Public Relations", "Design"])
-POSITIONS_LIST = ["Manager", "Developer", "Analyst", "Designer", "Accountant",
-                  "Consultant", "Specialist", "Coordinator", "Engineer", "Administrator",
-                  "Director", "Vice President", "Executive", "Intern", "Team Lead", "Architect", "Scientist"]
-DEGREES_LIST = ["B.Tech", "MBA", "B.Com", "B.A", "M.Sc"]
-SKILLS_LIST = ["Python", "Java", "SQL", "Excel", "Communication"]
-SKILLS_LIST.extend(["Project Management", "Data Analysis", "Machine Learning", "Cloud Computing", "Cybersecurity", "Agile Methodologies", "UI/UX Design",
-                    "JavaScript", "React", "Node.js", "Angular", "Vue.js", "DevOps", "Kubernetes", "Docker", "Terraform",
-                    "C++", "C#", ".NET", "PHP", "Ruby on Rails", "Go", "Swift", "Kotlin", "Mobile Development (iOS/Android)",
-                    "Technical Writing", "Problem Solving", "Critical Thinking", "Leadership", "Teamwork", "Creativity",
-                    "Digital Marketing", "SEO/SEM", "Content Creation", "Salesforce", "SAP", "Oracle", "Tableau", "Power BI"])
-PROPERTY_TYPES_LIST = ["Apartment", "Villa", "Plot", "Office", "Shop"]
-REALESTATE_STATUSES_LIST = ["Available", "Sold", "Rented", "Under Construction"]
-AMENITIES_LIST = ["Swimming Pool", "Gym", "Park", "Security", "Play Area"]
-FOOD_ITEMS_LIST = ["Pizza", "Burger", "Pasta", "Salad", "Fries", "Soda", "Sushi", "Tacos", "Biryani", "Noodles", "Sandwich", "Ice Cream",
-                   "Salad Bowl", "Smoothie", "Coffee", "Tea", "Milkshake", "Wrap", "Steak", "Seafood Platter", "Dim Sum", "Ramen", "Curry",
-                   "Dosa", "Idli", "Vada", "Samosa", "Spring Roll", "Momo", "Fried Chicken", "Hot Dog", "Pancakes", "Waffles",
-                   "Omelette", "Cereal", "Yogurt", "Fruit Salad", "Juice", "Cake", "Pastry", "Cookie", "Donut", "Muffin"]
-RESTAURANT_TYPES_LIST = ["Cafe", "Fine Dining", "Fast Food", "Pizzeria", "Bakery", "Cloud Kitchen"] # For restaurant name generation
-DELIVERY_STATUSES_LIST = ["Order Placed", "Preparing", "Out for Delivery", "Delivered", "Cancelled by User", "Cancelled by Restaurant", "Delayed"]
-ACADEMIC_JOURNALS_LIST = ["Nature", "Science", "Cell", "The Lancet", "JAMA", "IEEE Transactions", "Physical Review Letters",
-                          "New England Journal of Medicine (NEJM)", "PNAS", "BMJ", "Nature Communications", "Journal of the American Chemical Society (JACS)",
-                          "Angewandte Chemie", "Advanced Materials", "Nature Medicine", "Science Advances", "Cell Host & Microbe", "Immunity"]
-COMMON_HASHTAGS_LIST = ["#instagood", "#photooftheday", "#love", "#travel", "#tech", "#science", "#innovation", "#news", "#health",
-                        "#business", "#startup", "#motivation", "#art", "#foodie", "#fitness"]
-SENSOR_TYPES_LIST = ["Temperature", "Humidity", "Pressure", "Light", "Motion", "GPS",
-                     "Accelerometer", "Gyroscope", "Proximity", "Sound Level", "Air Quality", "CO2 Sensor",
-                     "Water Flow", "Soil Moisture", "Radiation", "Magnetic Field", "Vibration", "Ultrasonic"]
-SPECIES_LIST = ["Dog", "Cat", "Bird", "Fish", "Lion", "Tiger", "Elephant", "Bear", "Rabbit", "Horse", "Cow", "Sheep",
-                "Deer", "Fox", "Wolf", "Monkey", "Snake", "Lizard", "Frog", "Turtle", "Shark", "Whale", "Dolphin",
-                "Eagle", "Owl", "Penguin", "Crocodile", "Alligator", "Spider", "Ant", "Bee", "Butterfly"]
-COMMON_DOG_BREEDS_LIST = ["Labrador Retriever", "German Shepherd", "Golden Retriever", "Bulldog", "Poodle", "Beagle"]
-COMMON_CAT_BREEDS_LIST = ["Siamese", "Persian", "Maine Coon", "Ragdoll", "Bengal", "Sphynx"]
-LOGISTICS_CARRIER_SUFFIXES_LIST = ["Logistics", "Shipping Lines", "Freight", "Express", "Carriers", "Transport", "Movers"]
-LOGISTICS_SHIPMENT_STATUSES_LIST = ["Processing", "In Transit", "Out for Delivery", "Delivered",
-                                    "Delayed", "Held at Customs", "Returned to Sender", "Exception",
-                                    "Pending Pickup", "At Origin Facility", "At Destination Facility"]
-HABITAT_LIST = ["Forest", "Desert", "Ocean", "Grassland", "Mountain", "Domestic", "Urban", "Arctic",
-                "Jungle", "Savanna", "Wetland", "River", "Lake", "Cave", "Coral Reef", "Tundra", "Taiga", "Swamp"]
-PUBLICATION_TYPES_LIST = ["Journal Article", "Conference Paper", "Book Chapter", "Preprint", "Thesis",
-                          "Review Article", "Case Study", "Technical Report", "Poster Presentation", "Editorial",
-                          "Letter to Editor", "Book Review", "Dataset Paper", "Software Paper", "Patent"]
-
-# --- NEW LISTS FOR EXPANDED DOMAINS ---
-LEAD_SOURCES_LIST = ["Website", "Referral", "Cold Call", "Advertisement", "Trade Show", "Social Media", "Email Campaign"]
-DEAL_STAGES_LIST = ["Prospecting", "Qualification", "Needs Analysis", "Proposal", "Negotiation", "Closed Won", "Closed Lost"]
-CAMPAIGN_TYPES_LIST = ["Email Marketing", "Social Media Ads", "Search Engine Marketing (SEM)", "Content Marketing", "Influencer Marketing", "Affiliate Marketing"]
-WAREHOUSE_LOCATIONS_LIST = ["North Wing", "South Wing", "East Dock", "West Dock", "Central Hub", "Overflow Section"]
-EMPLOYEE_STATUS_LIST = ["Active", "On Leave", "Terminated", "Resigned", "Retired", "Contractor"]
-PROJECT_STATUS_LIST = ["Not Started", "In Progress", "Completed", "On Hold", "Cancelled"]
-TASK_PRIORITY_LIST = ["High", "Medium", "Low", "Critical"]
-VEHICLE_TYPES_LIST = ["Sedan", "SUV", "Truck", "Hatchback", "Coupe", "Minivan", "Motorcycle"]
-RETURN_REASONS_LIST = ["Wrong Item", "Damaged Item", "Changed Mind", "Doesn't Fit", "Not as Described"]
-POLICY_TYPES_LIST = ["Life Insurance", "Health Insurance", "Auto Insurance", "Home Insurance", "Travel Insurance"]
-CLAIM_STATUSES_LIST = ["Submitted", "Processing", "Approved", "Rejected", "Paid", "Pending Information"]
-TRANSPORT_MODES_LIST = ["Road", "Rail", "Air", "Sea", "Pipeline"]
-COURSE_LEVELS_LIST = ["Beginner", "Intermediate", "Advanced", "Expert"]
-PROPERTY_LISTING_STATUSES_LIST = ["For Sale", "For Rent", "Sold", "Rented", "Pending", "Off Market"]
-ISSUE_TYPES_LIST = ["Bug", "Feature Request", "Task", "Improvement", "Question"]
-ISSUE_STATUSES_LIST = ["Open", "In Progress", "Resolved", "Closed", "Reopened", "Pending QA"]
-LEGAL_CASE_TYPES_LIST = ["Civil", "Criminal", "Family Law", "Corporate Law", "Real Estate Law"]
-MEDIA_GENRES_LIST = ["Action", "Comedy", "Drama", "Sci-Fi", "Horror", "Romance", "Thriller", "Documentary", "Animation"]
-ENERGY_TARIFF_TYPES_LIST = ["Fixed Rate", "Variable Rate", "Time-of-Use", "Prepaid"]
-AGRICULTURE_CROP_TYPES_LIST = ["Wheat", "Rice", "Corn", "Soybean", "Cotton", "Sugarcane", "Fruits", "Vegetables"]
-URL_SCHEMES_LIST = ["http", "https"] # For URL generation
-FILE_EXTENSIONS_LIST = ["txt", "pdf", "jpg", "png", "docx", "xlsx", "csv", "py", "js", "html"]
-BOOLEAN_REPRESENTATIONS_LIST = ["True,False", "Yes,No", "1,0", "Active,Inactive"] # For boolean-like categories
-
-
-# Travel & Tourism Domain Lists
-TRAVEL_DESTINATIONS_LIST = ["Paris", "Rome", "London", "New York", "Tokyo", "Dubai", "Bali", "Barcelona", "Amsterdam", "Sydney", "Bangkok", "Singapore", "Venice", "Prague", "Vienna", "Berlin", "San Francisco", "Los Angeles", "Miami", "Chicago", "Toronto", "Vancouver", "Mexico City", "Rio de Janeiro", "Buenos Aires", "Cairo", "Cape Town", "Mumbai", "Delhi", "Beijing", "Shanghai", "Seoul", "Moscow", "Istanbul"]
-AIRLINE_NAMES_LIST = ["Emirates", "Qatar Airways", "Singapore Airlines", "ANA All Nippon Airways", "Qantas Airways", "Lufthansa", "British Airways", "Delta Air Lines", "American Airlines", "United Airlines", "Air France", "KLM", "Turkish Airlines", "Cathay Pacific", "IndiGo", "Southwest Airlines"]
-HOTEL_AMENITIES_LIST = ["WiFi", "Swimming Pool", "Gym", "Spa", "Restaurant", "Bar", "Room Service", "Parking", "Air Conditioning", "Breakfast Included", "Airport Shuttle", "Pet Friendly", "Business Center", "Concierge"]
-ROOM_TYPES_LIST = ["Standard Room", "Deluxe Room", "Suite", "Family Room", "Single Room", "Double Room", "King Room", "Queen Room", "Studio", "Apartment", "Villa", "Bungalow"]
-TRAVEL_BOOKING_STATUSES_LIST = ["Confirmed", "Pending", "Cancelled", "Modified", "Completed", "No-Show", "Waitlisted"]
-TRAVEL_ACTIVITY_TYPES_LIST = ["Sightseeing Tour", "Museum Visit", "Adventure Sport", "Cooking Class", "Wine Tasting", "Cultural Show", "Shopping Trip", "Beach Relaxation", "Hiking", "Cruise"]
-
-
-
-GENERAL_CATEGORIES_LIST = ["Category A", "Category B", "Category C", "Category D"]
-GENERAL_STATUSES_LIST = ["Active", "Inactive", "Pending", "Completed"]
+    tokens = re.split(r"[^a-z0-9]+", re.sub(r"(?<=[a-z0-9])(?=[A-Z])", "_", field_name).lower()) # "PanCard" -> pan, card; "IFSCcode" -> ifsccode
+    return any(t in DPDP_NAME_TOKENS for t in tokens)
 
 # --- Field Generator Dispatch Dictionary ---
 # This will be replaced by CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP and generate_value
 # FIELD_GENERATORS = { ... } # Removed for brevity, will be deprecated
 
-# --- NEW: Map of Canonical Field Names to their Schema Details (Type, Constraint) ---
-# This map will be used by the refactored generate_synthetic_data function
-CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP = {
-    # General & Common
-    "id": {"type": "string", "constraint": "", "is_generic_numeric_id": True, "display_name": "ID"},
-    "name": {"type": "name", "constraint": "", "display_name": "Name"},
-    "age": {"type": "int", "constraint": "18-80", "display_name": "Age"},
-    "gender": {"type": "category", "constraint": "Male,Female,Other", "display_name": "Gender"},
-    "email": {"type": "email", "constraint": "", "display_name": "Email"},
-    "phone": {"type": "phone", "constraint": "", "display_name": "Phone"},
-    "address": {"type": "address", "constraint": "", "display_name": "Address"},
-    "date": {"type": "date", "constraint": "", "display_name": "Date"}, # Generic date
-    "value": {"type": "float", "constraint": "10-1000", "display_name": "Value"},
-    "category": {"type": "category", "constraint": ",".join(GENERAL_CATEGORIES_LIST), "display_name": "Category"},
-    "description": {"type": "string", "constraint": "", "display_name": "Description"}, # Uses fake.sentence()
-    "status": {"type": "category", "constraint": ",".join(GENERAL_STATUSES_LIST), "display_name": "Status"},
-    "score": {"type": "float", "constraint": "0-100", "display_name": "Score"},
-    "city": {"type": "string", "constraint": "", "is_faker_city": True, "display_name": "City"},
-    "state": {"type": "string", "constraint": "", "is_faker_state": True, "display_name": "State"},
-    "country": {"type": "string", "constraint": "", "is_faker_country": True, "display_name": "Country"},
-    "pincode": {"type": "string", "constraint": "", "is_faker_postcode": True, "display_name": "Pincode"}, # also zipcode
-    "zipcode": {"type": "string", "constraint": "", "is_faker_postcode": True, "display_name": "Zipcode"},
-    "currency": {"type": "string", "constraint": "", "is_faker_currency_code": True, "display_name": "Currency"},
-    "job": {"type": "string", "constraint": "", "is_faker_job": True, "display_name": "Job Title"},
-    "company": {"type": "string", "constraint": "", "is_faker_company": True, "display_name": "Company"},
-    "aadhaar": {"type": "aadhaar", "constraint": "", "display_name": "Aadhaar"},
-    "pan": {"type": "pan", "constraint": "", "display_name": "PAN"},
-    "passport": {"type": "passport", "constraint": "", "display_name": "Passport"},
-    "url": {"type": "string", "constraint": "", "is_faker_url": True, "display_name": "URL"},
-    "ip_address": {"type": "string", "constraint": "", "is_faker_ipv4": True, "display_name": "IP Address"},
-    "mac_address": {"type": "string", "constraint": "", "is_faker_mac_address": True, "display_name": "MAC Address"},
-    "version_number": {"type": "string", "constraint": "", "is_version_number_pattern": True, "display_name": "Version"},
-    "blood_pressure_reading": {"type": "string", "constraint": "", "is_blood_pressure_pattern": True, "display_name": "Blood Pressure"},
-    "boolean_flag": {"type": "category", "constraint": random.choice(BOOLEAN_REPRESENTATIONS_LIST), "display_name": "Flag"},
-    "timestamp_detailed": {"type": "date", "constraint": "datetime_utc", "display_name": "Timestamp (UTC)"}, # Special constraint for datetime with UTC
-    "file_name": {"type": "string", "constraint": "", "is_faker_file_name": True, "display_name": "File Name"},
-    "mime_type": {"type": "string", "constraint": "", "is_faker_mime_type": True, "display_name": "MIME Type"},
-    "voterid": {"type": "voterid", "constraint": "", "display_name": "Voter ID"},
-    "ifsc": {"type": "ifsc", "constraint": "", "display_name": "IFSC Code"}, # also ifsc_code
-    "upi": {"type": "upi", "constraint": "", "display_name": "UPI ID"}, # also upi_id
-
-    # Hospital Domain
-    "patient_id": {"type": "string", "constraint": "", "is_generic_numeric_id": True, "display_name": "Patient ID"},
-    "doctor_name": {"type": "name", "constraint": "", "prefix": "Dr.", "display_name": "Doctor Name"}, # Note: space after Dr. handled in generation
-    "hospital_name": {"type": "string", "constraint": "", "suffix": " Hospital", "is_faker_company": True, "display_name": "Hospital Name"},
-    "diagnosis": {"type": "category", "constraint": ",".join(DIAGNOSES_LIST), "display_name": "Diagnosis"},
-    "admission_date": {"type": "date", "constraint": "", "display_name": "Admission Date"}, # Needs relative date logic if "discharge_date" is also present
-    "discharge_date": {"type": "date", "constraint": "", "display_name": "Discharge Date"},
-    "room_number": {"type": "string", "constraint": "", "is_room_number_pattern": True, "display_name": "Room Number"}, # e.g., "101A"
-    "insurance_provider": {"type": "category", "constraint": ",".join(INSURANCE_PROVIDERS_LIST), "display_name": "Insurance Provider"},
-    "blood_type": {"type": "category", "constraint": ",".join(BLOOD_TYPES_LIST), "display_name": "Blood Type"},
-    "medication": {"type": "category", "constraint": ",".join(MEDICATIONS_LIST), "display_name": "Medication"},
-
-    # Finance Domain (Example, expand as needed)
-    "transaction_id": {"type": "string", "constraint": "", "is_generic_numeric_id": True, "display_name": "Transaction ID"},
-    "account_number": {"type": "string", "constraint": "digits:10-12", "is_digit_sequence": True, "display_name": "Account Number"}, # Custom constraint type
-    "bank_name": {"type": "string", "constraint": "", "is_faker_company": True, "suffix": " Bank", "display_name": "Bank Name"},
-    "balance": {"type": "float", "constraint": "-5000-50000", "display_name": "Balance"},
-    "reference_number": {"type": "string", "constraint": "", "is_reference_number_pattern": True, "display_name": "Reference Number"},
-    "amount": {"type": "float", "constraint": "100-10000", "display_name": "Amount"},
-    "salary": {"type": "int", "constraint": "20000-200000", "display_name": "Salary"},
-    "transaction_type": {"type": "category", "constraint": ",".join(TRANSACTION_TYPES_LIST), "display_name": "Transaction Type"},
-    "credit_card_number": {"type": "string", "constraint": "", "is_faker_credit_card_number": True, "display_name": "Credit Card Number"},
-
-    # Food Delivery Domain
-    "restaurant_name": {"type": "string", "constraint": "", "is_faker_company": True, "suffix_from_list": RESTAURANT_TYPES_LIST, "display_name": "Restaurant Name"},
-    "food_items": {"type": "category", "constraint": ",".join(FOOD_ITEMS_LIST), "display_name": "Food Items"}, # Could also be a multi-select or string for comma-separated items
-    "order_total": {"type": "int", "constraint": "100-2000", "display_name": "Order Total (INR)"},
-    "delivery_agent_name": {"type": "name", "constraint": "", "display_name": "Delivery Agent Name"},
-    "delivery_time_minutes": {"type": "int", "constraint": "15-75", "display_name": "Delivery Time (Minutes)"},
-    "delivery_rating": {"type": "int", "constraint": "1-5", "display_name": "Delivery Rating"},
-    "delivery_address": {"type": "address", "constraint": "", "display_name": "Delivery Address"}, # Already covered by general address
-    "payment_mode": {"type": "category", "constraint": ",".join(PAYMENT_METHODS_LIST), "display_name": "Payment Mode"}, # Re-use from e-commerce
-    "delivery_status": {"type": "category", "constraint": ",".join(DELIVERY_STATUSES_LIST), "display_name": "Delivery Status"},
-
-    # Education Domain
-    "student_id": {"type": "string", "constraint": "", "is_generic_numeric_id": True, "display_name": "Student ID"},
-    "school_name": {"type": "string", "constraint": "", "is_faker_company": True, "suffix": " School", "display_name": "School Name"},
-    "teacher_name": {"type": "name", "constraint": "", "prefix_options": ["Mr.", "Ms.", "Dr."], "display_name": "Teacher Name"},
-    "grade": {"type": "category", "constraint": ",".join(GRADES_LIST), "display_name": "Grade"},
-    "subject": {"type": "category", "constraint": ",".join(SUBJECTS_LIST), "display_name": "Subject"},
-    "attendance": {"type": "string", "constraint": "70-100", "is_percentage_pattern": True, "display_name": "Attendance"},
-    "course_name": {"type": "string", "constraint": "", "is_faker_bs": True, "display_name": "Course Name"},
-
-    # Employee Domain
-    "employee_id": {"type": "string", "constraint": "", "is_generic_numeric_id": True, "display_name": "Employee ID"},
-    "department": {"type": "category", "constraint": ",".join(DEPARTMENTS_LIST), "display_name": "Department"},
-    "position": {"type": "category", "constraint": ",".join(POSITIONS_LIST), "display_name": "Position"},
-    "employee_status": {"type": "category", "constraint": ",".join(EMPLOYEE_STATUS_LIST), "display_name": "Employee Status"},
-    "performance_rating": {"type": "float", "constraint": "1.0-5.0", "display_name": "Performance Rating"},
-
-    # Real Estate Domain
-    "property_id": {"type": "string", "constraint": "", "is_generic_numeric_id": True, "display_name": "Property ID"},
-    "area": {"type": "string", "constraint": "500-3000", "unit": "sq.ft.", "is_measurement_pattern": True, "display_name": "Area"},
-    "property_type": {"type": "category", "constraint": ",".join(PROPERTY_TYPES_LIST), "display_name": "Property Type"},
-    "listing_status": {"type": "category", "constraint": ",".join(PROPERTY_LISTING_STATUSES_LIST), "display_name": "Listing Status"},
-    "year_built": {"type": "int", "constraint": "1990-2023", "display_name": "Year Built"},
-
-    # E-commerce (some fields might be general or already covered)
-    "order_id": {"type": "string", "constraint": "", "is_generic_numeric_id": True, "display_name": "Order ID"},
-    "customer_name": {"type": "name", "constraint": "", "display_name": "Customer Name"},
-    "product_name": {"type": "category", "constraint": ",".join(PRODUCT_NAMES_LIST), "display_name": "Product Name"},
-    "price": {"type": "float", "constraint": "100-5000", "display_name": "Price"},
-    "quantity": {"type": "int", "constraint": "1-10", "display_name": "Quantity"},
-    "product_category": {"type": "category", "constraint": ",".join(PRODUCT_CATEGORIES_LIST), "display_name": "Product Category"},
-    "discount": {"type": "float", "constraint": "0-0.5", "display_name": "Discount"}, # as a percentage
-    "shipping_status": {"type": "category", "constraint": ",".join(SHIPPING_STATUSES_LIST), "display_name": "Shipping Status"},
-    # ... Add ALL other canonical fields from FIELD_GENERATORS here, mapping them to a type and constraint
-
-    # Academic/Research Domain
-    "publication_title": {"type": "string", "constraint": "", "display_name": "Publication Title"}, # Will use _generate_string_value
-    "author_names": {"type": "name", "constraint": "", "is_multi_name": True, "display_name": "Author Names"}, # Special handling for multiple authors
-    "journal_name": {"type": "category", "constraint": ",".join(ACADEMIC_JOURNALS_LIST), "display_name": "Journal Name"},
-    "publication_year": {"type": "int", "constraint": "2000-2024", "display_name": "Publication Year"},
-    "citation_count": {"type": "int", "constraint": "0-1000", "display_name": "Citation Count"},
-    "doi": {"type": "string", "constraint": "", "is_doi_pattern": True, "display_name": "DOI"},
-    "keywords": {"type": "string", "constraint": "", "is_keywords_list": True, "display_name": "Keywords"}, # Comma-separated list of words
-    "publication_type": {"type": "category", "constraint": ",".join(PUBLICATION_TYPES_LIST), "display_name": "Publication Type"},
-
-    # Social Media Domain
-    "username": {"type": "string", "constraint": "", "is_faker_user_name": True, "display_name": "Username"},
-    "post_text": {"type": "string", "constraint": "", "display_name": "Post Text"}, # Will use _generate_string_value
-    "like_count": {"type": "int", "constraint": "0-10000", "display_name": "Like Count"},
-    "share_count": {"type": "int", "constraint": "0-5000", "display_name": "Share Count"},
-    "comment_text": {"type": "string", "constraint": "", "display_name": "Comment Text"}, # Will use _generate_string_value
-    "hashtags": {"type": "category", "constraint": ",".join(COMMON_HASHTAGS_LIST), "is_multi_category": True, "display_name": "Hashtags"},
-
-    # IoT/Sensor Domain
-    "sensor_id": {"type": "string", "constraint": "", "is_generic_alphanum_id": True, "prefix": "SENSOR-", "display_name": "Sensor ID"},
-    "timestamp": {"type": "date", "constraint": "datetime", "display_name": "Timestamp"}, # Special constraint for datetime
-    "temperature": {"type": "float", "constraint": "-20.0-50.0", "unit": "°C", "is_measurement_pattern": True, "display_name": "Temperature"},
-    "humidity": {"type": "float", "constraint": "0.0-100.0", "unit": "%", "is_measurement_pattern": True, "display_name": "Humidity"},
-    "latitude": {"type": "float", "constraint": "-90.0-90.0", "is_faker_latitude": True, "display_name": "Latitude"},
-    "longitude": {"type": "float", "constraint": "-180.0-180.0", "is_faker_longitude": True, "display_name": "Longitude"},
-    "sensor_type": {"type": "category", "constraint": ",".join(SENSOR_TYPES_LIST), "display_name": "Sensor Type"},
-
-    # Animal Data Domain
-    "animal_name": {"type": "animal_name", "constraint": "", "display_name": "Animal Name"}, # Changed type to "animal_name"
-    "species": {"type": "category", "constraint": ",".join(SPECIES_LIST), "display_name": "Species"},
-    "breed": {"type": "category", "constraint": ",".join(COMMON_DOG_BREEDS_LIST + COMMON_CAT_BREEDS_LIST), "display_name": "Breed"}, # Combine or make dynamic
-    "animal_age": {"type": "int", "constraint": "0-25", "display_name": "Animal Age (Years)"},
-    "habitat": {"type": "category", "constraint": ",".join(HABITAT_LIST), "display_name": "Habitat"},
-    "animal_weight_kg": {"type": "float", "constraint": "0.1-1000", "display_name": "Weight (kg)"},
-    "animal_color": {"type": "string", "constraint": "", "is_faker_color_name": True, "display_name": "Color"},
-
-    # Logistics/Supply Chain Domain
-    "shipment_id": {"type": "string", "constraint": "", "is_generic_alphanum_id": True, "prefix": "SHP-", "display_name": "Shipment ID"},
-    "tracking_number": {"type": "string", "constraint": "", "is_tracking_number_pattern": True, "display_name": "Tracking Number"},
-    "carrier_name": {"type": "string", "constraint": "", "is_faker_company": True, "suffix_from_list": LOGISTICS_CARRIER_SUFFIXES_LIST, "display_name": "Carrier Name"},
-    "origin_location": {"type": "address", "constraint": "", "display_name": "Origin Location"}, # Reuses address type
-    "destination_location": {"type": "address", "constraint": "", "display_name": "Destination Location"}, # Reuses address type
-    "shipment_status_logistics": {"type": "category", "constraint": ",".join(LOGISTICS_SHIPMENT_STATUSES_LIST), "display_name": "Shipment Status"},
-    "freight_cost": {"type": "float", "constraint": "50-5000", "display_name": "Freight Cost"},
-    "estimated_delivery_date": {"type": "date", "constraint": "", "display_name": "Estimated Delivery Date"},
-    "actual_delivery_date": {"type": "date", "constraint": "", "display_name": "Actual Delivery Date"},
-    "package_weight_kg": {"type": "float", "constraint": "0.1-1000", "unit": "kg", "is_measurement_pattern": True, "display_name": "Package Weight (kg)"}, # Reused from animal, good generic
-    "package_dimensions_cm": {"type": "string", "constraint": "", "is_dimension_pattern": True, "display_name": "Package Dimensions (cm)"},
-
-    # Travel & Tourism Domain
-    "booking_id": {"type": "string", "constraint": "", "is_generic_alphanum_id": True, "prefix": "BKG-", "display_name": "Booking ID"},
-    "traveler_name": {"type": "name", "constraint": "", "display_name": "Traveler Name"},
-    "destination_city_travel": {"type": "category", "constraint": ",".join(TRAVEL_DESTINATIONS_LIST), "is_faker_city_if_empty_constraint": True, "display_name": "Destination City"},
-    "origin_city_travel": {"type": "category", "constraint": ",".join(TRAVEL_DESTINATIONS_LIST), "is_faker_city_if_empty_constraint": True, "display_name": "Origin City"},
-    "travel_date": {"type": "date", "constraint": "", "display_name": "Travel Date"}, # Departure date
-    "return_date": {"type": "date", "constraint": "", "display_name": "Return Date"}, # Needs to be after travel_date
-    "flight_number": {"type": "string", "constraint": "", "is_flight_number_pattern": True, "display_name": "Flight Number"},
-    "airline_name": {"type": "category", "constraint": ",".join(AIRLINE_NAMES_LIST), "is_faker_company_if_empty_constraint": True, "suffix": " Airlines", "display_name": "Airline Name"},
-    "hotel_name": {"type": "string", "constraint": "", "is_faker_company": True, "suffix_options": [" Hotel", " Resort", " Inn", " Lodge", " Suites"], "display_name": "Hotel Name"},
-    "room_type": {"type": "category", "constraint": ",".join(ROOM_TYPES_LIST), "display_name": "Room Type"},
-    "booking_status_travel": {"type": "category", "constraint": ",".join(TRAVEL_BOOKING_STATUSES_LIST), "display_name": "Booking Status"},
-    "total_travel_cost": {"type": "float", "constraint": "200-10000", "display_name": "Total Cost (USD)"}, # Assuming USD for now
-    "travel_package_name": {"type": "string", "constraint": "", "is_faker_bs": True, "prefix": "Package: ", "display_name": "Travel Package Name"}, # Using bs for catchy names
-    "hotel_amenities_included": {"type": "category", "constraint": ",".join(HOTEL_AMENITIES_LIST), "is_multi_category": True, "display_name": "Hotel Amenities"},
-    "travel_activity": {"type": "category", "constraint": ",".join(TRAVEL_ACTIVITY_TYPES_LIST), "display_name": "Activity Booked"},
-
-    # --- NEW DOMAINS ---
-    # Sales/CRM
-    "lead_id": {"type": "string", "constraint": "", "is_generic_alphanum_id": True, "prefix": "LEAD-", "display_name": "Lead ID"},
-    "lead_source": {"type": "category", "constraint": ",".join(LEAD_SOURCES_LIST), "display_name": "Lead Source"},
-    "deal_stage": {"type": "category", "constraint": ",".join(DEAL_STAGES_LIST), "display_name": "Deal Stage"},
-    "opportunity_amount": {"type": "float", "constraint": "1000-1000000", "display_name": "Opportunity Amount"},
-    "close_date": {"type": "date", "constraint": "", "display_name": "Close Date"},
-    "account_type": {"type": "category", "constraint": "Prospect,Customer,Partner,Vendor", "display_name": "Account Type"},
-    "industry": {"type": "string", "constraint": "", "is_faker_bs": True, "display_name": "Industry"}, # Using bs for variety
-
-    # Marketing
-    "campaign_id": {"type": "string", "constraint": "", "is_generic_alphanum_id": True, "prefix": "CAMP-", "display_name": "Campaign ID"},
-    "campaign_name": {"type": "string", "constraint": "", "is_faker_catch_phrase": True, "display_name": "Campaign Name"},
-    "campaign_type": {"type": "category", "constraint": ",".join(CAMPAIGN_TYPES_LIST), "display_name": "Campaign Type"},
-    "ad_spend": {"type": "float", "constraint": "100-10000", "display_name": "Ad Spend"},
-    "impressions": {"type": "int", "constraint": "1000-1000000", "display_name": "Impressions"},
-    "clicks": {"type": "int", "constraint": "10-10000", "display_name": "Clicks"},
-    "ctr": {"type": "float", "constraint": "0.001-0.1", "display_name": "Click-Through Rate (CTR)"}, # As a decimal
-    "conversion_rate": {"type": "float", "constraint": "0.01-0.2", "display_name": "Conversion Rate"}, # As a decimal
-
-    # Manufacturing/Inventory
-    "sku": {"type": "string", "constraint": "", "is_generic_alphanum_id": True, "prefix": "SKU-", "display_name": "SKU"},
-    "serial_number": {"type": "string", "constraint": "", "is_generic_alphanum_id": True, "length": 12, "display_name": "Serial Number"},
-    "batch_number": {"type": "string", "constraint": "", "is_generic_alphanum_id": True, "prefix": "BATCH-", "length": 8, "display_name": "Batch Number"},
-    "warehouse_location": {"type": "category", "constraint": ",".join(WAREHOUSE_LOCATIONS_LIST), "display_name": "Warehouse Location"},
-    "stock_level": {"type": "int", "constraint": "0-10000", "display_name": "Stock Level"},
-    "supplier_name": {"type": "string", "constraint": "", "is_faker_company": True, "display_name": "Supplier Name"},
-
-    # Project Management
-    "project_id": {"type": "string", "constraint": "", "is_generic_alphanum_id": True, "prefix": "PROJ-", "display_name": "Project ID"},
-    "project_name": {"type": "string", "constraint": "", "is_faker_bs": True, "display_name": "Project Name"},
-    "task_id": {"type": "string", "constraint": "", "is_generic_alphanum_id": True, "prefix": "TASK-", "display_name": "Task ID"},
-    "task_name": {"type": "string", "constraint": "", "is_faker_catch_phrase": True, "display_name": "Task Name"},
-    "assignee_name": {"type": "name", "constraint": "", "display_name": "Assignee"},
-    "due_date": {"type": "date", "constraint": "", "display_name": "Due Date"},
-    "project_status": {"type": "category", "constraint": ",".join(PROJECT_STATUS_LIST), "display_name": "Project Status"},
-    "task_priority": {"type": "category", "constraint": ",".join(TASK_PRIORITY_LIST), "display_name": "Task Priority"},
-
-    # Software Development
-    "bug_id": {"type": "string", "constraint": "", "is_generic_numeric_id": True, "prefix": "BUG-", "display_name": "Bug ID"},
-    "feature_id": {"type": "string", "constraint": "", "is_generic_numeric_id": True, "prefix": "FEAT-", "display_name": "Feature ID"},
-    "commit_hash": {"type": "string", "constraint": "", "is_faker_sha256": True, "display_name": "Commit Hash"}, # sha256 is a good proxy
-    "repository_url": {"type": "string", "constraint": "", "is_faker_url": True, "display_name": "Repository URL"},
-    "issue_type": {"type": "category", "constraint": ",".join(ISSUE_TYPES_LIST), "display_name": "Issue Type"},
-    "issue_status": {"type": "category", "constraint": ",".join(ISSUE_STATUSES_LIST), "display_name": "Issue Status"},
-
-
-    # This is a crucial step for the refactor to work comprehensively.
-}
-
 # --- NEW: Field Schema Inference from Name ---
-def infer_field_schema_from_name(field_name_str, default_pii_strategy="realistic_fake"):
-    """
-    Infers a basic field schema (type, constraint, etc.) from a field name string.
-    """
-    # Default display name from the input string
-    display_name = field_name_str.replace("_", " ").title()
-    field_schema = {
-        "name": display_name,
-        "type": "string",  # Default type
-        "constraint": "",
-        "pii_handling": default_pii_strategy,
-        # Store a normalized version for internal use or as a fallback canonical key
-        "_original_canonical": field_name_str.lower().replace(" ", "_")
-    }
-    field_lower = field_name_str.lower()
-
-    # 1. Try to match to canonical schema first
-    normalized_field_name = field_lower.replace(" ", "_")
-    canonical_match = None
-
-    if normalized_field_name in CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP:
-        canonical_match = normalized_field_name
-    else:
-        # Sort synonyms by length (descending) to match longer, more specific synonyms first
-        sorted_synonyms = sorted(FIELD_SYNONYM_TO_CANONICAL_MAP.keys(), key=len, reverse=True)
-        for user_synonym in sorted_synonyms:
-            # Check for exact match of the synonym
-            if user_synonym == normalized_field_name: # More precise than 'in'
-                potential_canonical = FIELD_SYNONYM_TO_CANONICAL_MAP[user_synonym]
-                if potential_canonical in CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP:
-                    canonical_match = potential_canonical
-                    break
-            # Fallback to 'in' if no exact match, but be cautious as it can be too broad
-            # elif user_synonym in normalized_field_name:
-            #     # This part might need more refinement to avoid overly greedy matches
-            #     # For now, prioritize exact matches above
-            #     pass
-
-
-    if canonical_match:
-        details = CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP[canonical_match].copy()
-        field_schema.update(details)
-        field_schema["name"] = display_name # Ensure original name (title cased) is used for display
-        field_schema["_original_canonical"] = canonical_match # Store the matched canonical key
-        return field_schema
-
-    # 2. If no canonical match, apply general inference rules
-    if any(kw in field_lower for kw in ["date", "time", "timestamp", "dob", "joining", "day", "month", "year_of_birth", "birth_date"]): # "year" is too generic alone
-        field_schema["type"] = "date"
-        # More specific date constraints
-        if "dob" in field_lower or "birth_date" in field_lower or "year_of_birth" in field_lower :
-            start_def = datetime.now() - timedelta(days=365*70) # Up to 70 years ago
-            end_def = datetime.now() - timedelta(days=365*18)   # At least 18 years ago
-        elif "joining" in field_lower or "hire_date" in field_lower:
-            start_def = datetime.now() - timedelta(days=365*10) # Up to 10 years ago
-            end_def = datetime.now()
-        else: # Generic date
-            start_def = datetime.now() - timedelta(days=365)
-            end_def = datetime.now()
-        field_schema["constraint"] = f"{start_def.strftime('%Y-%m-%d')} - {end_def.strftime('%Y-%m-%d')}"
-    elif any(kw in field_lower for kw in ["id", "count", "age", "quantity", "salary", "year", "number", "level", "amount", "total", "seq", "num", "digit", "numeric", "integer", "score_value", "points"]):
-        field_schema["type"] = "int"
-        if "age" in field_lower: field_schema["constraint"] = "18-80"
-        elif "year" in field_lower and not "year_of_birth" in field_lower : field_schema["constraint"] = f"{datetime.now().year - 10}-{datetime.now().year}" # For general year fields
-        elif any(kw in field_lower for kw in ["salary", "amount", "total", "revenue", "income"]): field_schema["constraint"] = "1000-100000"
-        elif any(kw in field_lower for kw in ["quantity", "count", "stock", "inventory"]): field_schema["constraint"] = "1-100"
-        elif any(kw in field_lower for kw in ["level", "rank", "grade_numeric"]): field_schema["constraint"] = "1-10"
-        elif any(kw in field_lower for kw in ["score_value", "points"]): field_schema["constraint"] = "0-100"
-        else: field_schema["constraint"] = "0-1000"
-    elif any(kw in field_lower for kw in ["rate", "percent", "ratio", "score_decimal", "efficiency", "integrity", "price", "value", "balance", "temp", "humidity", "factor", "decimal", "float", "measurement", "latitude", "longitude", "coordinate"]):
-        field_schema["type"] = "float"
-        if any(kw in field_lower for kw in ["price", "value", "balance", "cost"]): field_schema["constraint"] = "0.0-1000.0"
-        elif any(kw in field_lower for kw in ["rate", "percent", "ratio", "factor", "coefficient"]): field_schema["constraint"] = "0.0-1.0" # Often proportions
-        elif "temp" in field_lower: field_schema["constraint"] = "-10.0-40.0"
-        elif "humidity" in field_lower: field_schema["constraint"] = "0.0-100.0"
-        elif any(kw in field_lower for kw in ["latitude"]): field_schema["constraint"] = "-90.0-90.0"
-        elif any(kw in field_lower for kw in ["longitude"]): field_schema["constraint"] = "-180.0-180.0"
-        else: field_schema["constraint"] = "0.0-100.0"
-    elif "email" in field_lower: field_schema["type"] = "email"
-    elif any(kw in field_lower for kw in ["phone", "mobile", "contact number"]): field_schema["type"] = "phone"
-    elif any(kw in field_lower for kw in ["address", "location", "city", "state", "country", "pincode", "zipcode", "street", "area", "place"]):
-        field_schema["type"] = "address" # Generic address type
-        if "city" in field_lower: field_schema["is_faker_city"] = True
-        elif "state" in field_lower: field_schema["is_faker_state"] = True
-        elif "country" in field_lower: field_schema["is_faker_country"] = True
-        elif any(kw in field_lower for kw in ["pincode", "zipcode"]): field_schema["is_faker_postcode"] = True
-    # More specific name checks to avoid overly broad matching
-    elif ("name" in field_lower and not any(kw in field_lower for kw in ["user_name", "company_name", "product_name", "brand_name", "model_name", "sensor_name", "item_name", "file_name", "column_name", "field_name", "campaign_name", "project_name", "program_name", "course_name", "animal_name", "login_name", "screen_name", "domain_name", "event_name", "team_name", "group_name", "font_name", "color_name", "style_name"])) \
-        or field_lower in ["person_name", "full_name", "customer_name", "employee_name", "student_name", "doctor_name", "author_name", "contact_name"]:
-        field_schema["type"] = "name"
-    elif "gender" in field_lower:
-        field_schema["type"] = "category"; field_schema["constraint"] = "Male,Female,Other,Prefer not to say"
-    elif "status" in field_lower:
-        field_schema["type"] = "category"; field_schema["constraint"] = "Active,Inactive,Pending,Completed,Cancelled,Open,Closed,Resolved,Shipped,Delivered"
-    elif any(kw in field_lower for kw in ["type", "category", "kind", "class", "group", "segment", "tier"]):
-        field_schema["type"] = "category"; field_schema["constraint"] = "Type A,Type B,Type C,Type D" # Generic categories
-    elif "flag" in field_lower or field_lower.startswith("is_") or field_lower.startswith("has_") or field_lower.endswith("_enabled") or field_lower.endswith("_available"):
-        field_schema["type"] = "category"; field_schema["constraint"] = random.choice(BOOLEAN_REPRESENTATIONS_LIST)
-    elif any(kw in field_lower for kw in ["url", "website", "link", "webpage", "site"]):
-        field_schema["type"] = "string"; field_schema["is_faker_url"] = True
-    elif "ip_address" in field_lower or field_lower == "ip":
-        field_schema["type"] = "string"; field_schema["is_faker_ipv4"] = True
-    elif any(kw in field_lower for kw in ["color", "colour"]):
-        field_schema["type"] = "string"; field_schema["is_faker_color_name"] = True
-    elif any(kw in field_lower for kw in ["job", "position", "role", "occupation", "designation"]):
-        field_schema["type"] = "string"; field_schema["is_faker_job"] = True
-    elif any(kw in field_lower for kw in ["company", "organization", "employer", "firm", "business", "vendor", "supplier", "client_company"]):
-        field_schema["type"] = "string"; field_schema["is_faker_company"] = True
-    elif "animal" in field_lower and "name" in field_lower: field_schema["type"] = "animal_name" # More specific
-    elif "car" in field_lower and any(kw in field_lower for kw in ["dream", "favorite", "model", "type"]): field_schema["type"] = "string"; field_schema["_hint_vehicle"] = True
-    elif "festival" in field_lower and any(kw in field_lower for kw in ["favorite", "preferred"]): field_schema["type"] = "string"; field_schema["_hint_event_name"] = True
-    elif "birthstone" in field_lower:
-        field_schema["type"] = "category"; field_schema["constraint"] = "Garnet,Amethyst,Aquamarine,Diamond,Emerald,Pearl,Ruby,Peridot,Sapphire,Opal,Topaz,Turquoise"
-    elif "zodiac_sign" == field_lower or ("zodiac" in field_lower and "sign" in field_lower):
-        field_schema["type"] = "category"; field_schema["constraint"] = "Aries,Taurus,Gemini,Cancer,Leo,Virgo,Libra,Scorpio,Sagittarius,Capricorn,Aquarius,Pisces"
-    elif "blood_group" == field_lower or ("blood" in field_lower and ("group" in field_lower or "type" in field_lower)):
-        field_schema["type"] = "category"; field_schema["constraint"] = ",".join(BLOOD_TYPES_LIST)
-    elif any(kw in field_lower for kw in ["favorite", "dream", "preference", "choice", "opinion", "hobby", "interest", "skill"]): # For general preference-like text
-        field_schema["type"] = "string"; field_schema["_hint_short_phrase"] = True
-    # Infer alphanumeric ID for novel fields that look like codes/keys but weren't caught by canonicals
-    elif field_schema["type"] == "string" and any(kw in field_lower for kw in ["code", "key", "token", "serial_no", "reference_id", "identifier_code", "tracking_id", "item_code", "product_code", "user_token", "api_key_value"]) and not any(kw in field_lower for kw in ["currency", "country_code", "zip_code", "area_code", "ifsc_code", "promo_code", "discount_code"]): # Avoid things that are already specific types
-        field_schema["_is_inferred_alphanum_id"] = True
-        # Try to make a somewhat meaningful prefix from the display name
-        prefix_candidate = "".join(filter(str.isalnum, display_name.replace(" ", "")))
-        field_schema["_inferred_prefix"] = prefix_candidate.upper()[:min(len(prefix_candidate), 4)] + "-" if prefix_candidate else "ID-"
-        field_schema["length"] = random.randint(6,12) # Default length for inferred IDs
-
-    return field_schema
-
-# --- NEW: Domain Prompt to Predefined Schema Mapping ---
-# Maps common domain phrases to a list of canonical field keys
-DOMAIN_PROMPT_TO_SCHEMA_MAP = {
-    "medical data": [
-        "patient_id", "patient_name", "age", "gender", "admission_date",
-        "discharge_date", "diagnosis", "doctor_name", "hospital_name", "blood_pressure_reading",
-        "blood_type", "medication", "phone", "email"
-    ],
-    "patient data": [ # New entry for "patient data"
-        "patient_id", "name", "age", "gender", "admission_date", "diagnosis", "phone", "email"
-    ],
-    "hospital data": [
-        "patient_id", "patient_name", "age", "gender", "admission_date",
-        "discharge_date", "diagnosis", "doctor_name", "hospital_name", "blood_pressure_reading",
-        "room_number", "insurance_provider", "blood_type", "medication", "phone", "email"
-    ],
-    "healthcare data": [
-        "patient_id", "patient_name", "age", "gender", "admission_date",
-        "discharge_date", "diagnosis", "doctor_name", "hospital_name",
-        "insurance_provider", "blood_type", "medication", "phone", "email"
-    ],
-    "e-commerce data": [
-        "order_id", "customer_name", "email", "product_name", "quantity", "price",
-        "order_date", "shipping_address", "shipping_status", "payment_method", "product_category"
-    ],
-    "retail data": [
-        "order_id", "customer_name", "email", "product_name", "quantity", "price",
-        "order_date", "shipping_address", "shipping_status", "payment_method", "product_category"
-    ],
-    "customer data": [ # New entry for "customer data"
-        "id", "customer_name", "email", "phone", "address",
-        "date", "category", "status" # Adding some generic fields
-    ],
-    "employee data": [
-        "employee_id", "name", "email", "phone", "job", 
-        "department", "salary", "date", 
-        "age", "gender", "address"
-    ],
-    "hr data": [
-        "employee_id", "name", "email", "phone", "job",
-        "department", "salary", "date", "age", "gender", "address"
-    ],
-    "financial data": [
-        "transaction_id", "account_number", "date", "amount", "transaction_type",
-        "description", "bank_name", "currency", "balance", "ifsc", "upi"
-    ],
-    "finance data": [ # Added for more direct matching
-        "transaction_id", "account_number", "date", "amount", "transaction_type",
-        "description", "bank_name", "currency", "balance", "ifsc", "upi"
-    ],
-    "banking data": [
-        "transaction_id", "account_number", "date", "amount", "transaction_type",
-        "description", "bank_name", "currency", "balance", "ifsc", "upi", "customer_name"
-    ],
-    "social media data": [
-        "id", "username", "post_text", "timestamp", "like_count",
-        "share_count", "comment_text", "hashtags"
-    ],
-    "logistics data": [
-        "shipment_id", "tracking_number", "carrier_name", "origin_location",
-        "destination_location", "shipment_status_logistics", "estimated_delivery_date",
-        "actual_delivery_date", "freight_cost", "package_weight_kg", "package_dimensions_cm"
-    ],
-    "supply chain data": [
-        "shipment_id", "tracking_number", "carrier_name", "origin_location",
-        "destination_location", "shipment_status_logistics", "estimated_delivery_date",
-        "actual_delivery_date", "freight_cost", "package_weight_kg", "package_dimensions_cm", "product_name"
-    ],
-    "travel data": [
-        "booking_id", "traveler_name", "destination_city_travel", "origin_city_travel",
-        "travel_date", "return_date", "flight_number", "airline_name", "hotel_name",
-        "room_type", "booking_status_travel", "total_travel_cost", "email", "phone"
-    ],
-    "tourism data": [
-        "booking_id", "traveler_name", "destination_city_travel", "origin_city_travel",
-        "travel_date", "return_date", "flight_number", "airline_name", "hotel_name",
-        "room_type", "booking_status_travel", "total_travel_cost", "email", "phone", "travel_activity"
-    ],
-    "iot data": [
-        "sensor_id", "timestamp", "temperature", "humidity", "latitude", "longitude", "sensor_type", "value"
-    ],
-    "sensor data": [
-        "sensor_id", "timestamp", "temperature", "humidity", "latitude", "longitude", "sensor_type", "value"
-    ],
-    "academic data": [
-        "id", "publication_title", "author_names", "journal_name", "publication_year", "doi", "keywords", "citation_count", "publication_type"
-    ],
-    "research data": [
-        "id", "publication_title", "author_names", "journal_name", "publication_year", "doi", "keywords", "citation_count", "publication_type"
-    ],
-     "student data": [
-        "student_id", "name", "age", "gender", "email", "phone", "address",
-        "school_name", "grade", "subject", "marks", "attendance"
-    ],
-    "education data": [
-        "student_id", "name", "age", "gender", "email", "school_name", "grade", "subject", "marks",
-        "teacher_name", "course_name" 
-    ],
-    "real estate data": [
-        "property_id", "property_type", "address", "city", "state", "pincode", "area",
-        "price", "bedrooms", "bathrooms", "year_built", "status"
-    ],
-    "property data": [
-        "property_id", "property_type", "address", "city", "state", "pincode", "area",
-        "price", "bedrooms", "bathrooms", "year_built", "status"
-    ],
-    "food delivery data": [
-        "order_id", "customer_name", "restaurant_name", "food_items", "order_total",
-        "delivery_agent_name", "delivery_time_minutes", "delivery_rating", "delivery_address",
-        "payment_mode", "delivery_status"
-    ],
-    "restaurant data": [
-        "restaurant_name", "address", "city", "phone", "category", 
-        "order_id", "food_items", "order_total", "delivery_status"
-    ],
-
-    # --- NEW DOMAINS MAPPINGS ---
-    "sales data": [
-        "lead_id", "customer_name", "email", "phone", "company", "lead_source",
-        "deal_stage", "opportunity_amount", "close_date", "account_type", "industry"
-    ],
-    "crm data": [
-        "lead_id", "customer_name", "email", "phone", "company", "lead_source",
-        "deal_stage", "opportunity_amount", "close_date", "account_type", "industry", "last_contact_date"
-    ],
-    "marketing campaign data": [
-        "campaign_id", "campaign_name", "campaign_type", "start_date", "end_date",
-        "ad_spend", "impressions", "clicks", "ctr", "conversion_rate", "target_audience"
-    ],
-    "inventory data": [
-        "sku", "product_name", "serial_number", "batch_number", "warehouse_location",
-        "stock_level", "supplier_name", "last_stocked_date", "unit_cost"
-    ],
-    "manufacturing data": [
-        "product_id", "product_name", "sku", "batch_number", "production_date", "quantity_produced",
-        "machine_id", "operator_name", "quality_check_status"
-    ],
-    "project management data": [
-        "project_id", "project_name", "task_id", "task_name", "assignee_name", "start_date",
-        "due_date", "project_status", "task_priority", "estimated_hours", "actual_hours"
-    ],
-    "software development data": [
-        "issue_id", "bug_id", "feature_id", "summary", "description", "reporter_name", "assignee_name",
-        "issue_type", "issue_status", "priority", "created_date", "updated_date", "commit_hash", "repository_url"
-    ],
-    "website traffic data": [
-        "session_id", "user_id", "timestamp_detailed", "ip_address", "url", "referrer_url",
-        "user_agent", "country", "city", "page_views", "bounce_rate"
-    ],
-}
+# infer_field_schema_from_name lives in nullbyte/inference.py (memoized, keyword-indexed, fuzzy fallback)
 
 FIELD_GENERATORS = {
     "patient_id": lambda nr: [f"{random.randint(1000, 9999)}{random.randint(1000, 9999)}" for _ in range(nr)],
@@ -1600,234 +545,20 @@ FIELD_GENERATORS.update({ # Adding some more direct Faker calls for new types
     "mime_type": lambda nr: [fake.mime_type() for _ in range(nr)],
 })
 
-# --- Synonym and Phrase Mapping for Fields ---
-# Maps user-friendly terms/phrases to canonical field keys used in FIELD_GENERATORS
-FIELD_SYNONYM_TO_CANONICAL_MAP = {
-    # General
-    "identifier": "id", "record id": "id",
-    "full name": "name", "person name": "name",
-    "years old": "age",
-    "sex": "gender",
-    "email address": "email",
-    "phone number": "phone", "contact number": "phone", "mobile number": "phone",
-    "location address": "address", "street address": "address",
-    "specific date": "date", "transaction date": "date", "order date": "date", "join date": "date", "listing date": "date", "date of birth": "date", "dob": "date",
-    "monetary value": "value",
-    "type": "category", "classification": "category", # 'category' itself is a key
-    "details": "description",
-    "current status": "status", # 'status' itself is a key
-    "rating": "score", # 'score' itself is a key
-    "website address": "url", "web link": "url", "site url": "url",
-    "internet protocol address": "ip_address", "ipv4 address": "ip_address",
-    "media access control address": "mac_address",
-    "software version": "version_number", "build number": "version_number",
-    "yes/no flag": "boolean_flag", "true/false indicator": "boolean_flag", "is active": "boolean_flag",
-    "event timestamp": "timestamp_detailed", "log time": "timestamp_detailed",
-    "attachment name": "file_name", "document name": "file_name",
-
-    # Hospital
-    "patient id": "patient_id", "patient number": "patient_id", "medical record number": "patient_id", "mrn": "patient_id",
-    "patient name": "patient_name",
-    "doctor name": "doctor_name", "physician name": "doctor_name", "blood pressure": "blood_pressure_reading",
-    "hospital name": "hospital_name", "clinic name": "hospital_name",
-    "medical condition": "diagnosis", # 'diagnosis' itself is a key
-    "admission date": "admission_date", "date of admission": "admission_date",
-    "discharge date": "discharge_date", "date of discharge": "discharge_date",
-    "room number": "room_number", "hospital room": "room_number",
-    "insurance provider": "insurance_provider", "health insurance": "insurance_provider",
-    "blood type": "blood_type", "blood group": "blood_type",
-    "prescription": "medication", "drug name": "medication", # 'medication' itself is a key
-
-    # Finance
-    "transaction id": "transaction_id", "transaction number": "transaction_id", "txn id": "transaction_id",
-    "account number": "account_number", "acct no": "account_number", "bank account number": "account_number",
-    "transaction amount": "amount", # 'amount' itself is a key
-    "bank name": "bank_name",
-    "account holder": "account_holder", "account name": "account_holder",
-    "transaction type": "transaction_type", "type of transaction": "transaction_type",
-    "account balance": "balance", # 'balance' itself is a key
-    "ifsc code": "ifsc_code", "ifsc": "ifsc_code",
-    "bank branch": "branch", # 'branch' itself is a key
-    "upi id": "upi_id", "upi address": "upi_id",
-    "reference number": "reference_number", "ref no": "reference_number",
-
-    # Ecommerce
-    "order id": "order_id", "order number": "order_id",
-    "customer name": "customer_name",
-    "product name": "product_name", "item name": "product_name",
-    "cost": "price", "product price": "price", # 'price' itself is a key
-    "order total": "order_total", # Ensure "order total" maps to the canonical field
-    "number of items": "quantity", # 'quantity' itself is a key
-    "payment method": "payment_method", "mode of payment": "payment_method",
-    "delivery address": "delivery_address", "shipping address": "delivery_address",
-    "customer email": "customer_email",
-    "customer phone": "customer_phone",
-    "product category": "product_category", "item category": "product_category",
-    "price reduction": "discount", # 'discount' itself is a key
-    "shipping status": "shipping_status", "order status": "shipping_status",
-
-    # Education (many are already direct matches or covered by general)
-    "student id": "student_id", "student number": "student_id", "roll number": "student_id",
-    "student name": "student_name",
-    "class": "grade", "student grade": "grade", # 'grade' itself is a key
-    "college name": "school_name", "university name": "school_name", # 'school_name' itself is a key
-    "teacher name": "teacher_name", "instructor name": "teacher_name", "professor name": "teacher_name",
-    "course name": "subject", # 'subject' itself is a key
-    "student attendance": "attendance", # 'attendance' itself is a key
-    "score obtained": "marks", "exam score": "marks", # 'marks' itself is a key
-    "parent name": "parent_name", "guardian name": "parent_name",
-
-    # Employee (many are already direct matches or covered by general)
-    "employee id": "employee_id", "employee number": "employee_id", "staff id": "employee_id",
-    "employee name": "employee_name", "staff name": "employee_name",
-    "dept": "department", # 'department' itself is a key
-    "compensation": "salary", "pay": "salary", "income": "salary", # 'salary' itself is a key
-    "joining date": "date", "date of joining": "date", # Covered by general date
-    "job title": "position", "designation": "position", "role": "position", # 'position' itself is a key
-    "reporting manager": "manager", "supervisor": "manager", # 'manager' itself is a key
-    "qualification": "education", "degree": "education", # 'education' itself is a key
-    "abilities": "skills", "expertise": "skills", # 'skills' itself is a key
-    "performance rating": "performance_rating", "appraisal score": "performance_rating",
-
-    # Real Estate
-    "property id": "property_id", "property number": "property_id", "listing id": "property_id",
-    "type of property": "property_type", # 'property_type' itself is a key
-    "size": "area", "square feet": "area", "sq ft": "area", # 'area' itself is a key
-    "property location": "location", # 'location' itself is a key
-    "number of bedrooms": "bedrooms", "beds": "bedrooms", # 'bedrooms' itself is a key
-    "number of bathrooms": "bathrooms", "baths": "bathrooms", # 'bathrooms' itself is a key
-    "seller name": "owner_name", # 'owner_name' itself is a key
-    # "contact_phone" is direct
-    "facilities": "amenities", # 'amenities' itself is a key
-    "construction year": "year_built", # 'year_built' itself is a key
-
-    # Add direct keys from FIELD_GENERATORS if they are not complex phrases
-
-    # Food Delivery Synonyms
-    "restaurant": "restaurant_name", "eatery name": "restaurant_name", "food place": "restaurant_name",
-    "items ordered": "food_items", "dishes": "food_items", "menu items": "food_items",
-    "bill amount": "order_total", "total cost": "order_total",
-    "delivery boy name": "delivery_agent_name", "rider name": "delivery_agent_name", "delivery person": "delivery_agent_name",
-    "restaurant name": "restaurant_name", # Added for exact phrase match
-    "food items": "food_items",           # Added for exact phrase match
-    "delivery agent": "delivery_agent_name", # Added for common phrase match
-    "delivery agent name": "delivery_agent_name", # Added for exact phrase match
-    "time to deliver": "delivery_time_minutes", "estimated delivery time": "delivery_time_minutes",
-    "customer rating for delivery": "delivery_rating",
-    "drop address": "delivery_address",
-    "how paid": "payment_mode",
-    "order current status": "delivery_status", "status of delivery": "delivery_status",
-    **{key: key for key in CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP.keys()}, # Canonical names are their own primary synonym
-
-    # Academic/Research Synonyms
-    "paper title": "publication_title", "article name": "publication_title",
-    "authors": "author_names", "researchers": "author_names",
-    "published in": "journal_name",
-    "year of publication": "publication_year",
-    "citations": "citation_count", "cited by": "citation_count",
-    "digital object identifier": "doi",
-    "research keywords": "keywords", "tags": "keywords", # 'tags' also used in social media
-    "type of publication": "publication_type",
-
-    # Social Media Synonyms
-    "user name": "username", "handle": "username", "screen name": "username",
-    "post content": "post_text", "tweet text": "post_text",
-    "likes": "like_count", "number of likes": "like_count",
-    "shares": "share_count", "retweets": "share_count",
-    "comment": "comment_text", "reply": "comment_text",
-    # "hashtags" is direct
-
-    # IoT/Sensor Synonyms
-    "device id": "sensor_id",
-    "reading time": "timestamp", "event time": "timestamp",
-    "temp": "temperature",
-    # "humidity", "latitude", "longitude", "sensor_type" are fairly direct
-
-    # Animal Data Synonyms
-    "animal": "animal_name", # General term, might default to name
-    "animal species": "species", "type of animal": "species",
-    "animal breed": "breed",
-    "age of animal": "animal_age",
-    "natural environment": "habitat", "lives in": "habitat",
-    "animal weight": "animal_weight_kg",
-    "fur color": "animal_color", "coat color": "animal_color",
-}
-FIELD_SYNONYM_TO_CANONICAL_MAP.update({
-    # Logistics Synonyms
-    "shipment number": "shipment_id", "consignment id": "shipment_id",
-    "tracking id": "tracking_number", "awb number": "tracking_number", "air waybill": "tracking_number",
-    "shipping company": "carrier_name", "freight carrier": "carrier_name", "courier": "carrier_name",
-    "pickup location": "origin_location", "despatch point": "origin_location", "from address": "origin_location", "origin": "origin_location",
-    "delivery location": "destination_location", "drop-off point": "destination_location", "to address": "destination_location", "destination": "destination_location",
-    "logistics status": "shipment_status_logistics", "delivery progress": "shipment_status_logistics",
-    "shipping cost": "freight_cost", "transportation charges": "freight_cost",
-    "edd": "estimated_delivery_date", "expected delivery": "estimated_delivery_date",
-    "add": "actual_delivery_date", "delivered on": "actual_delivery_date",
-    "parcel weight": "package_weight_kg", "shipment weight": "package_weight_kg",
-    "box size": "package_dimensions_cm", "package size": "package_dimensions_cm", "dimensions": "package_dimensions_cm",
-})
-FIELD_SYNONYM_TO_CANONICAL_MAP.update({
-    # Travel & Tourism Synonyms
-    "booking reference": "booking_id", "reservation id": "booking_id", "confirmation number": "booking_id",
-    "passenger name": "traveler_name", "guest name": "traveler_name",
-    "travel destination": "destination_city_travel", "going to": "destination_city_travel", "arrival city": "destination_city_travel",
-    "departure city": "origin_city_travel", "flying from": "origin_city_travel", "source city": "origin_city_travel",
-    "departure date": "travel_date", "check-in date": "travel_date", "start date": "travel_date",
-    "arrival date": "return_date", "check-out date": "return_date", "end date": "return_date", # Can be ambiguous, but common
-    "flight code": "flight_number", "flight id": "flight_number",
-    "airline company": "airline_name", "carrier": "airline_name", # 'carrier' also in logistics
-    "accommodation name": "hotel_name", "place to stay": "hotel_name", "resort name": "hotel_name",
-    "room category": "room_type", "type of room": "room_type",
-    "reservation status": "booking_status_travel", "booking state": "booking_status_travel",
-    "trip cost": "total_travel_cost", "package price": "total_travel_cost", "total fare": "total_travel_cost",
-    "tour package": "travel_package_name", "vacation package": "travel_package_name",
-    "hotel features": "hotel_amenities_included", "included services": "hotel_amenities_included",
-    "booked activity": "travel_activity", "excursion": "travel_activity", "tour name": "travel_activity",
-})
+def stream_column(streams, table_name, column_name, num_rows, generate_rows):
+    """`num_rows` values of a column; each chunk is drawn by `generate_rows(n)` from the column's own stream."""
+    column_values = []
+    for chunk_start, chunk_rows in chunk_bounds(num_rows):
+        streams.select(table_name, column_name, chunk_start)
+        column_values.extend(generate_rows(chunk_rows))
+    return column_values
 
-FIELD_SYNONYM_TO_CANONICAL_MAP.update({
-    # Sales/CRM Synonyms
-    "lead identifier": "lead_id",
-    "origin of lead": "lead_source",
-    "sales stage": "deal_stage", "pipeline stage": "deal_stage",
-    "deal size": "opportunity_amount", "potential revenue": "opportunity_amount",
-    "expected close date": "close_date",
-    "customer type": "account_type", "client type": "account_type",
-    "business sector": "industry", "market segment": "industry",
-
-    # Marketing Synonyms
-    "marketing campaign id": "campaign_id",
-    "promotion name": "campaign_name",
-    "type of campaign": "campaign_type",
-    "money spent on ads": "ad_spend", "advertising cost": "ad_spend",
-    "number of views": "impressions",
-    "number of clicks": "clicks",
-    "click rate": "ctr",
-    "conversion percentage": "conversion_rate",
-
-    # Manufacturing/Inventory Synonyms
-    "stock keeping unit": "sku",
-    "product serial": "serial_number",
-    "production batch": "batch_number",
-    "storage location": "warehouse_location",
-    "inventory count": "stock_level", "quantity on hand": "stock_level",
-    "vendor name": "supplier_name",
-
-    # Project Management Synonyms
-    "project identifier": "project_id",
-    "task identifier": "task_id",
-    "assigned to": "assignee_name", "responsible person": "assignee_name",
-    "deadline": "due_date", "target date": "due_date",
-    "current project phase": "project_status",
-    "task importance": "task_priority",
-
-    # Software Development Synonyms
-    "bug report id": "bug_id", "defect id": "bug_id",
-    "git commit id": "commit_hash", "revision code": "commit_hash",
-})
 # Generate Synthetic Data Based on Input (Simplified prompt-based, distinct from domain-specific)
-def generate_synthetic_data(description):
-    # Seeding is now handled globally based on the 'use_fixed_seed' checkbox
+def generate_synthetic_data(description, profiler=None, seed=None):
+    # Seeding is now handled globally based on the 'use_fixed_seed' checkbox; generated values come from
+    # per-column streams keyed by `seed` (a fresh one per run when None)
+    profiler = profiler or GenerationProfiler("Prompt") # --- NEW: Per-column / per-stage timings ---
+    parse_start = perf_counter()
     description_lower_original = description.lower() # Keep original lowercased prompt for row parsing
 
     # Default values
@@ -1901,38 +632,33 @@ def generate_synthetic_data(description):
     processed_canonical_fields = set()
     domain_matched = False
 
-    # Sort domain keywords by length (descending) to match longer phrases first
-    sorted_domain_keywords = sorted(DOMAIN_PROMPT_TO_SCHEMA_MAP.keys(), key=len, reverse=True)
-
-    for domain_keyword in sorted_domain_keywords:
-        if domain_keyword in remaining_description_for_parsing: # Check against the potentially cleaned description
-            st.info(f"Recognized domain: '{domain_keyword}'. Generating predefined schema.")
-            canonical_fields_for_domain = DOMAIN_PROMPT_TO_SCHEMA_MAP[domain_keyword]
-            for canonical_field in canonical_fields_for_domain:
-                if canonical_field in CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP:
-                    schema_detail = CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP[canonical_field]
-                    parsed_schema_fields.append({
-                        "name": schema_detail.get("display_name", canonical_field.replace("_", " ").title()),
-                        "type": schema_detail["type"],
-                        "constraint": schema_detail["constraint"],
-                        "pii_handling": st.session_state.get(DEFAULT_PII_STRATEGY_KEY, "realistic_fake"),
-                        "_original_canonical": canonical_field
-                    })
-                    processed_canonical_fields.add(canonical_field) # Track processed fields
-                    # Add to detected PII/DPDP lists
-                    display_name = schema_detail.get("display_name", canonical_field.replace("_", " ").title())
-                    if display_name in PII_FIELDS or canonical_field in PII_FIELDS:
-                        if display_name not in detected_pii: detected_pii.append(display_name)
-                    if is_dpdp_pii(display_name) or is_dpdp_pii(canonical_field):
-                        if display_name not in detected_dpdp: detected_dpdp.append(display_name)
-            domain_matched = True
-            break # Stop after first domain match
+    # Longest domain keyword present in the prompt, found in one pass by the precompiled matcher
+    domain_keyword = DOMAIN_KEYWORD_MATCHER.best_match(remaining_description_for_parsing)
+
+    if domain_keyword:
+        st.info(f"Recognized domain: '{domain_keyword}'. Generating predefined schema.")
+        canonical_fields_for_domain = DOMAIN_PROMPT_TO_SCHEMA_MAP[domain_keyword]
+        for canonical_field in canonical_fields_for_domain:
+            if canonical_field in CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP:
+                schema_detail = CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP[canonical_field]
+                parsed_schema_fields.append({
+                    "name": schema_detail.get("display_name", canonical_field.replace("_", " ").title()),
+                    "type": schema_detail["type"],
+                    "constraint": schema_detail["constraint"],
+                    "pii_handling": st.session_state.get(DEFAULT_PII_STRATEGY_KEY, "realistic_fake"),
+                    "_original_canonical": canonical_field
+                })
+                processed_canonical_fields.add(canonical_field) # Track processed fields
+                # Add to detected PII/DPDP lists
+                display_name = schema_detail.get("display_name", canonical_field.replace("_", " ").title())
+                if display_name in PII_FIELDS or canonical_field in PII_FIELDS:
+                    if display_name not in detected_pii: detected_pii.append(display_name)
+                if is_dpdp_pii(display_name) or is_dpdp_pii(canonical_field):
+                    if display_name not in detected_dpdp: detected_dpdp.append(display_name)
+        domain_matched = True
 
     if not domain_matched:
         # Original logic for parsing individual fields if no domain was matched
-        # Sort synonyms by length (descending) to match longer phrases first
-        sorted_synonyms = sorted(FIELD_SYNONYM_TO_CANONICAL_MAP.keys(), key=len, reverse=True)
-
         # Split prompt by common delimiters like ",", "and", "with" to isolate potential field names
         potential_field_phrases = re.split(r'\s*(?:,|and|with)\s*', remaining_description_for_parsing)
 
@@ -1961,13 +687,13 @@ def generate_synthetic_data(description):
                 continue
             
             # 2. Try to match the (potentially shortened) field_name_part_for_synonym against synonyms
-            matched_canonical = None
-            for user_synonym in sorted_synonyms:
-                if user_synonym in field_name_part_for_synonym.lower(): 
-                    canonical_field = FIELD_SYNONYM_TO_CANONICAL_MAP[user_synonym]
-                    if canonical_field in CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP and canonical_field not in processed_canonical_fields:
-                        matched_canonical = canonical_field
-                        break # Found a match for this phrase part
+            #    Longest synonym in the phrase whose canonical field is still unused (single matcher pass)
+            matched_synonym = SYNONYM_MATCHER.best_match(
+                field_name_part_for_synonym.lower(),
+                accept=lambda syn: FIELD_SYNONYM_TO_CANONICAL_MAP[syn] in CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP
+                and FIELD_SYNONYM_TO_CANONICAL_MAP[syn] not in processed_canonical_fields
+            )
+            matched_canonical = FIELD_SYNONYM_TO_CANONICAL_MAP[matched_synonym] if matched_synonym else None
 
             if matched_canonical:
                 base_schema_detail = CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP[matched_canonical]
@@ -2005,8 +731,6 @@ def generate_synthetic_data(description):
                 for prefix_to_remove in instructional_prefixes_for_novel:
                     if novel_field_name_candidate.lower().startswith(prefix_to_remove):
                         novel_field_name_candidate = novel_field_name_candidate[len(prefix_to_remove):].strip()
-                        # Update field_lower if novel_field_name_candidate changed
-                        field_lower = novel_field_name_candidate.lower() # Re-assign field_lower
                         break # Remove only one prefix
 
                 # Basic cleaning: remove "field like", "fields like", "column like", "columns like"
@@ -2015,55 +739,17 @@ def generate_synthetic_data(description):
                 if not novel_field_name_candidate or novel_field_name_candidate in processed_canonical_fields or any(f['name'].lower() == novel_field_name_candidate.lower() for f in parsed_schema_fields):
                     continue
 
-                inferred_type = "string" # Default
-                inferred_constraint = parsed_custom_constraint if parsed_custom_constraint else ""
-                field_lower = novel_field_name_candidate.lower()
-
+                # Shared inference engine (same rules as the Smart Schema Editor and generate_value)
+                novel_field_schema = infer_field_schema_from_name(novel_field_name_candidate, st.session_state.get(DEFAULT_PII_STRATEGY_KEY, "realistic_fake"))
+                if parsed_custom_constraint:
+                    novel_field_schema["constraint"] = parsed_custom_constraint
                 if parsed_type_hint_from_constraint: # Type hinted by parsed constraint
-                    inferred_type = parsed_type_hint_from_constraint
+                    novel_field_schema["type"] = parsed_type_hint_from_constraint
                 elif novel_field_name_candidate.isdigit(): # Check if the novel field name is purely digits
-                    inferred_type = "int"
-                else: # No constraint parsed, or constraint didn't hint type, so infer from name
-                    if any(kw in field_lower for kw in ["date", "time", "timestamp", "dob", "joining"]):
-                        inferred_type = "date"
-                    elif any(kw in field_lower for kw in ["id", "count", "age", "quantity", "salary", "year", "number", "level", "hours", "duration"]):
-                        inferred_type = "int"
-                        if not inferred_constraint: # Only set default constraint if none was parsed
-                            if "age" in field_lower: inferred_constraint = "18-80"
-                            elif any(h_kw in field_lower for h_kw in ["hours", "duration"]): inferred_constraint = "0-100"
-                            else: inferred_constraint = "0-1000"
-                    elif any(kw in field_lower for kw in ["rate", "percent", "ratio", "score", "efficiency", "integrity", "price", "amount", "value", "balance", "temp", "humidity", "factor"]):
-                        inferred_type = "float"
-                        if not inferred_constraint: inferred_constraint = "0.0-100.0"
-                    elif "email" in field_lower: inferred_type = "email"
-                    elif "phone" in field_lower: inferred_type = "phone"
-                    elif any(kw in field_lower for kw in ["address", "location", "city", "state", "country", "pincode", "zipcode"]): inferred_type = "address"
-                    elif "name" in field_lower and not any(kw in field_lower for kw in ["user", "company", "product", "brand", "model", "sensor", "item", "file", "column", "field"]): inferred_type = "name"
-
-                display_name = novel_field_name_candidate.replace("_", " ").title()
-                parsed_schema_fields.append({
-                    "name": display_name,
-                    "type": inferred_type, # This will be used by generate_value
-                    "constraint": inferred_constraint, # This will be used by generate_value
-                    "pii_handling": st.session_state.get(DEFAULT_PII_STRATEGY_KEY, "realistic_fake"),
-                    "_original_canonical": display_name.lower().replace(" ", "_"), # Treat as its own canonical for now
-                    # Add a flag if this novel field seems like an alphanumeric ID
-                    "_is_inferred_alphanum_id": True if inferred_type == "string" and \
-                                                    any(kw in field_lower for kw in ["code", "identifier", "serial", "reference", "token", "key", "uid", "guid"]) and \
-                                                    not any(kw in field_lower for kw in ["id","number"]) and \
-                                                    not any(kw in field_lower for kw in ["email", "phone", "address", "name", "date", "url", "description", "text", "comment", "note", "message", "title", "subject", "label", "caption"]) \
-                                                    else False,
-                    "_inferred_prefix": (
-                        "ORD-" if "order" in field_lower and any(kw in field_lower for kw in ["code", "identifier", "ref"]) else
-                        "PROD-" if "product" in field_lower and any(kw in field_lower for kw in ["code", "identifier", "sku"]) else
-                        "USR-" if "user" in field_lower and any(kw in field_lower for kw in ["code", "identifier", "key"]) else
-                        "TK-" if "token" in field_lower else
-                        "KEY-" if "key" in field_lower and "api" not in field_lower else # Avoid "api key" becoming KEY-
-                        "SN-" if "serial" in field_lower else
-                        "REF-" if "reference" in field_lower else
-                        ""
-                    ) if inferred_type == "string" and any(kw in field_lower for kw in ["code", "identifier", "serial", "reference", "token", "key", "uid", "guid"]) else ""
-                })
+                    novel_field_schema["type"] = "int"
+
+                display_name = novel_field_schema["name"]
+                parsed_schema_fields.append(novel_field_schema)
                 processed_canonical_fields.add(display_name.lower().replace(" ", "_"))
                 if display_name in PII_FIELDS or any(pii_kw.lower() in display_name.lower() for pii_kw in PII_FIELDS): # Check PII for novel fields too
                     if display_name not in detected_pii: detected_pii.append(display_name)
@@ -2095,76 +781,85 @@ def generate_synthetic_data(description):
     
     # Generate data using the parsed schema
     data = {}
-    for field_schema_item in parsed_schema_fields:
-        col_display_name = field_schema_item["name"]
-        # Special handling for Faker direct calls if specified in CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP
-        # This is a bridge for simple Faker calls that don't fit neatly into generate_value types
-        # (e.g. city, state, country, job, company, currency)
-        canonical_key = field_schema_item.get("_original_canonical")
-        schema_details_for_canonical = CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP.get(canonical_key, {})
-
-        # --- NEW: Dispatch Logic for Canonical-Specific Generation ---
-        canonical_generator_map = {
-            "is_faker_city": lambda: [fake.city() for _ in range(num_rows)],
-            "is_faker_state": lambda: [fake.state() for _ in range(num_rows)],
-            "is_faker_country": lambda: [fake.country() for _ in range(num_rows)],
-            "is_faker_company_with_suffix_list": lambda: [f"{fake.company()} {random.choice(schema_details_for_canonical['suffix_from_list'])}" for _ in range(num_rows)], # Combined check
-            "is_faker_company": lambda: [f"{schema_details_for_canonical.get('prefix', '').rstrip()} {fake.company()} {schema_details_for_canonical.get('suffix', '').lstrip()}".strip() for _ in range(num_rows)], # For company w/ prefix/suffix
-            "is_faker_postcode": lambda: [fake.postcode() for _ in range(num_rows)],
-            "is_faker_currency_code": lambda: [fake.currency_code() for _ in range(num_rows)],
-            "is_faker_job": lambda: [fake.job() for _ in range(num_rows)],
-            "is_generic_numeric_id": lambda: [f"{random.randint(1000, 9999)}{random.randint(1000, 9999)}" for _ in range(num_rows)],
-            "is_room_number_pattern": lambda: [f"{random.randint(1, 20)}{random.choice(['A', 'B', 'C', 'D'])}" for _ in range(num_rows)],
-            "is_percentage_pattern": lambda: [f"{random.randint(*map(int, schema_details_for_canonical.get('constraint', '0-100').split('-')))}%" for _ in range(num_rows)],
-            "is_measurement_pattern": lambda: [f"{random.randint(*map(int, schema_details_for_canonical.get('constraint', '1-100').split('-')))} {schema_details_for_canonical.get('unit', '').strip()}" for _ in range(num_rows)],
-            "is_reference_number_pattern": lambda: [f"REF{random.randint(10000, 99999)}{random.randint(100, 999)}" for _ in range(num_rows)],
-            "is_faker_sentence": lambda: [fake.sentence() for _ in range(num_rows)],
-            "is_faker_paragraph": lambda: [fake.paragraph(nb_sentences=3) for _ in range(num_rows)],
-            "is_faker_user_name": lambda: [fake.user_name() for _ in range(num_rows)],
-            "is_faker_latitude": lambda: [fake.latitude() for _ in range(num_rows)],
-            "is_faker_longitude": lambda: [fake.longitude() for _ in range(num_rows)],
-            "is_faker_color_name": lambda: [fake.color_name() for _ in range(num_rows)],
-            "is_doi_pattern": lambda: [f"10.{random.randint(1000, 9999)}/{''.join(random.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=6))}" for _ in range(num_rows)],
-            "is_faker_url": lambda: [fake.url() for _ in range(num_rows)],
-            "is_faker_ipv4": lambda: [fake.ipv4() for _ in range(num_rows)],
-            "is_faker_mac_address": lambda: [fake.mac_address() for _ in range(num_rows)],
-            "is_faker_file_name": lambda: [fake.file_name(extension=random.choice(FILE_EXTENSIONS_LIST)) for _ in range(num_rows)],
-            "is_faker_mime_type": lambda: [fake.mime_type() for _ in range(num_rows)],
-            "is_generic_alphanum_id": lambda: [f"{schema_details_for_canonical.get('prefix', '')}{''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789', k=8))}" for _ in range(num_rows)],
-            "is_keywords_list": lambda: [", ".join(fake.words(nb=random.randint(2, 5))) for _ in range(num_rows)],
-            "is_tracking_number_pattern": lambda: [f"{''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=3))}{random.randint(100000000, 999999999)}{''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=2))}" for _ in range(num_rows)],
-            "is_dimension_pattern": lambda: [f"{random.randint(10, 100)}x{random.randint(10, 100)}x{random.randint(5, 50)} cm" for _ in range(num_rows)],
-            "is_flight_number_pattern": lambda: [f"{''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=2))}{random.randint(100, 9999)}" for _ in range(num_rows)],
-            "is_multi_name": lambda: ["; ".join([fake.name() for _ in range(random.randint(1, 4))]) for _ in range(num_rows)],
-            "is_multi_category": lambda: [", ".join(random.sample(schema_details_for_canonical['constraint'].split(','), k=random.randint(1, min(3, len(schema_details_for_canonical['constraint'].split(',')))))) for _ in range(num_rows)] if schema_details_for_canonical['constraint'] else [fake.word() for _ in range(num_rows)],
-            "is_faker_city_if_empty_constraint": lambda: [random.choice(schema_details_for_canonical['constraint'].split(',')) for _ in range(num_rows)] if schema_details_for_canonical['constraint'] and schema_details_for_canonical['constraint'].strip() else [fake.word() for _ in range(num_rows)],
-            "is_version_number_pattern": lambda: f"{random.randint(0,5)}.{random.randint(0,20)}.{random.randint(0,100)}",
-            "is_faker_credit_card_number": lambda: [fake.credit_card_number() for _ in range(num_rows)],
-            "is_digit_sequence": lambda: [''.join(random.choices('0123456789', k=random.randint(int(schema_details_for_canonical['constraint'].split(':')[1].split('-')[0]), int(schema_details_for_canonical['constraint'].split(':')[1].split('-')[1])))) for _ in range(num_rows)] if schema_details_for_canonical.get('constraint', '').startswith('digits:') else [''.join(random.choices('0123456789', k=10)) for _ in range(num_rows)], # Fallback to 10 digits if constraint malformed
-        }
+    profiler.add_stage("Prompt parsing", perf_counter() - parse_start)
+    with profiling(profiler), RandomStreams(seed) as streams:
+        for field_schema_item in parsed_schema_fields:
+            col_display_name = field_schema_item["name"]
+            # Special handling for Faker direct calls if specified in CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP
+            # This is a bridge for simple Faker calls that don't fit neatly into generate_value types
+            # (e.g. city, state, country, job, company, currency)
+            canonical_key = field_schema_item.get("_original_canonical")
+            schema_details_for_canonical = CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP.get(canonical_key, {})
+
+            # --- NEW: Dispatch Logic for Canonical-Specific Generation ---
+            canonical_generator_map = {
+                "is_faker_city": lambda n: [fake.city() for _ in range(n)],
+                "is_faker_state": lambda n: [fake.state() for _ in range(n)],
+                "is_faker_country": lambda n: pooled_fake_values("country", n),
+                "is_faker_company_with_suffix_list": lambda n: [f"{fake.company()} {random.choice(schema_details_for_canonical['suffix_from_list'])}" for _ in range(n)], # Combined check
+                "is_faker_company": lambda n: [f"{schema_details_for_canonical.get('prefix', '').rstrip()} {fake.company()} {schema_details_for_canonical.get('suffix', '').lstrip()}".strip() for _ in range(n)], # For company w/ prefix/suffix
+                "is_faker_postcode": lambda n: [fake.postcode() for _ in range(n)],
+                "is_faker_currency_code": lambda n: pooled_fake_values("currency_code", n),
+                "is_faker_job": lambda n: [fake.job() for _ in range(n)],
+                "is_generic_numeric_id": lambda n: [f"{random.randint(1000, 9999)}{random.randint(1000, 9999)}" for _ in range(n)],
+                "is_room_number_pattern": lambda n: [f"{random.randint(1, 20)}{random.choice(['A', 'B', 'C', 'D'])}" for _ in range(n)],
+                "is_percentage_pattern": lambda n: [f"{random.randint(*map(int, schema_details_for_canonical.get('constraint', '0-100').split('-')))}%" for _ in range(n)],
+                "is_measurement_pattern": lambda n: [f"{random.randint(*map(int, schema_details_for_canonical.get('constraint', '1-100').split('-')))} {schema_details_for_canonical.get('unit', '').strip()}" for _ in range(n)],
+                "is_reference_number_pattern": lambda n: [f"REF{random.randint(10000, 99999)}{random.randint(100, 999)}" for _ in range(n)],
+                "is_faker_sentence": lambda n: [fake.sentence() for _ in range(n)],
+                "is_faker_paragraph": lambda n: [fake.paragraph(nb_sentences=3) for _ in range(n)],
+                "is_faker_user_name": lambda n: [fake.user_name() for _ in range(n)],
+                "is_faker_latitude": lambda n: [fake.latitude() for _ in range(n)],
+                "is_faker_longitude": lambda n: [fake.longitude() for _ in range(n)],
+                "is_faker_color_name": lambda n: pooled_fake_values("color_name", n),
+                "is_doi_pattern": lambda n: [f"10.{random.randint(1000, 9999)}/{''.join(random.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=6))}" for _ in range(n)],
+                "is_faker_url": lambda n: [fake.url() for _ in range(n)],
+                "is_faker_ipv4": lambda n: [fake.ipv4() for _ in range(n)],
+                "is_faker_mac_address": lambda n: [fake.mac_address() for _ in range(n)],
+                "is_faker_file_name": lambda n: [fake.file_name(extension=random.choice(FILE_EXTENSIONS_LIST)) for _ in range(n)],
+                "is_faker_mime_type": lambda n: pooled_fake_values("mime_type", n),
+                "is_generic_alphanum_id": lambda n: [f"{schema_details_for_canonical.get('prefix', '')}{''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789', k=8))}" for _ in range(n)],
+                "is_keywords_list": lambda n: [", ".join(fake.words(nb=random.randint(2, 5))) for _ in range(n)],
+                "is_tracking_number_pattern": lambda n: [f"{''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=3))}{random.randint(100000000, 999999999)}{''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=2))}" for _ in range(n)],
+                "is_dimension_pattern": lambda n: [f"{random.randint(10, 100)}x{random.randint(10, 100)}x{random.randint(5, 50)} cm" for _ in range(n)],
+                "is_flight_number_pattern": lambda n: [f"{''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=2))}{random.randint(100, 9999)}" for _ in range(n)],
+                "is_multi_name": lambda n: ["; ".join([fake.name() for _ in range(random.randint(1, 4))]) for _ in range(n)],
+                "is_multi_category": lambda n: [", ".join(random.sample(schema_details_for_canonical['constraint'].split(','), k=random.randint(1, min(3, len(schema_details_for_canonical['constraint'].split(',')))))) for _ in range(n)] if schema_details_for_canonical['constraint'] else [fake.word() for _ in range(n)],
+                "is_faker_city_if_empty_constraint": lambda n: [random.choice(schema_details_for_canonical['constraint'].split(',')) for _ in range(n)] if schema_details_for_canonical['constraint'] and schema_details_for_canonical['constraint'].strip() else [fake.word() for _ in range(n)],
+                "is_version_number_pattern": lambda n: [f"{random.randint(0,5)}.{random.randint(0,20)}.{random.randint(0,100)}" for _ in range(n)],
+                "is_faker_credit_card_number": lambda n: [fake.credit_card_number() for _ in range(n)],
+                "is_digit_sequence": lambda n: [''.join(random.choices('0123456789', k=random.randint(int(schema_details_for_canonical['constraint'].split(':')[1].split('-')[0]), int(schema_details_for_canonical['constraint'].split(':')[1].split('-')[1])))) for _ in range(n)] if schema_details_for_canonical.get('constraint', '').startswith('digits:') else [''.join(random.choices('0123456789', k=10)) for _ in range(n)], # Fallback to 10 digits if constraint malformed
+            }
         
-        # Check combined condition for company + suffix list *before* general company name generation
-        if schema_details_for_canonical.get("suffix_from_list") and schema_details_for_canonical.get("is_faker_company"):
-            generator_key = "is_faker_company_with_suffix_list"
-        else:
-            # Otherwise find the first key that matches in schema_details_for_canonical
-            generator_key = next((key for key in canonical_generator_map if schema_details_for_canonical.get(key)), None)
+            # Check combined condition for company + suffix list *before* general company name generation
+            if schema_details_for_canonical.get("suffix_from_list") and schema_details_for_canonical.get("is_faker_company"):
+                generator_key = "is_faker_company_with_suffix_list"
+            else:
+                # Otherwise find the first key that matches in schema_details_for_canonical
+                generator_key = next((key for key in canonical_generator_map if schema_details_for_canonical.get(key)), None)
         
-        if generator_key:
-            data[col_display_name] = canonical_generator_map[generator_key]()
+            column_start = perf_counter()
+            if generator_key:
+                generate_rows = canonical_generator_map[generator_key]
 
-        else:
-            # For types like "name" that might have prefix/suffix, pass the schema_details
-            if field_schema_item["type"] == "name":
-                 # Temporarily override field_schema_item for generate_value to include details from CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP
-                 # This is a bit of a hack; ideally generate_value always gets the full effective schema for the field.
-                 effective_schema_for_name = {**field_schema_item, **schema_details_for_canonical}
-                 data[col_display_name] = [_generate_value_from_schema(effective_schema_for_name) for _ in range(num_rows)]
             else:
-                 data[col_display_name] = [_generate_value_from_schema(field_schema_item) for _ in range(num_rows)]
+                # For types like "name" that might have prefix/suffix, pass the schema_details
+                if field_schema_item["type"] == "name":
+                     # Temporarily override field_schema_item for generate_value to include details from CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP
+                     # This is a bit of a hack; ideally generate_value always gets the full effective schema for the field.
+                     effective_schema_for_name = {**field_schema_item, **schema_details_for_canonical}
+                     generate_rows = lambda n, schema=effective_schema_for_name: [_generate_value_from_schema(schema) for _ in range(n)]
+                else:
+                     generate_rows = lambda n, schema=field_schema_item: [_generate_value_from_schema(schema) for _ in range(n)]
+            data[col_display_name] = stream_column(streams, PROMPT_TABLE, col_display_name, num_rows, generate_rows)
+            profiler.add_field("Prompt", col_display_name, perf_counter() - column_start, calls=1 if generator_key else num_rows, rows=num_rows)
 
     # Create DataFrame
-    synthetic_df = pd.DataFrame(data)
+    with profiler.stage("DataFrame build", rows=num_rows):
+        synthetic_df = pd.DataFrame(data)
+    with profiler.stage("Dtype compaction", rows=num_rows):
+        synthetic_df = compact_dataframe(synthetic_df, parsed_schema_fields)
+    profiler.finish()
 
     # Display PII warning if detected
     if detected_pii:
@@ -2181,30 +876,14 @@ def generate_synthetic_data(description):
 
     return synthetic_df, num_rows, parsed_schema_fields # Modified return
 
-# --- Value Generation Dispatcher ---
-VALUE_GENERATOR_FUNCTIONS = {
-    # "string" is now handled directly in generate_value to pass full_field_schema
-    "int": _generate_int_value,
-    "float": _generate_float_value,
-    "date": _generate_date_value,
-    "category": _generate_category_value,
-    "email": _generate_email_value,
-    "phone": _generate_phone_value,
-    "address": _generate_address_value,
-    "name": _generate_name_value, # _generate_name_value will be enhanced
-    "aadhaar": _generate_aadhaar_value,
-    "pan": _generate_pan_value,
-    "passport": _generate_passport_value,
-    "voterid": _generate_voterid_value,
-    "ifsc": _generate_ifsc_value,
-    "upi": _generate_upi_value,
-    "animal_name": _generate_animal_name_value, # Registering the new generator
-}# ... (other imports)
+# ... (other imports)
 from datetime import datetime # Already imported, ensure it's available
 
 # ... (rest of your existing code)
 
 # --- NEW: Explainability Report Function ---
+PDF_PROFILE_MAX_ROWS = 15 # Slowest fields/stages listed in the explainability report
+
 def generate_explainability_pdf(generation_context_info, generated_dfs_info):
     pdf = FPDF()
     pdf.add_page()
@@ -2290,8 +969,8 @@ def generate_explainability_pdf(generation_context_info, generated_dfs_info):
                 if is_dpdp_pii(field['name']):
                     strategy = PII_HANDLING_STRATEGIES.get(field.get('pii_handling', st.session_state.get(DEFAULT_PII_STRATEGY_KEY, "realistic_fake")), "N/A")
                     dpdp_fields_handled_notes.append(f"- Field '{field['name']}' (in table '{table_name}') identified as DPDP PII and handled via '{strategy}' strategy.")
-    elif generation_context_info.get('method') == "File-based Generation" and st.session_state.get('uploaded_df_for_schema') is not None:
-        original_df_columns = st.session_state.uploaded_df_for_schema.columns
+    elif generation_context_info.get('method') == "File-based Generation" and datasets.get('uploaded_df_for_schema') is not None:
+        original_df_columns = datasets.uploaded_df_for_schema.columns
         for col_name in original_df_columns:
             if is_dpdp_pii(col_name):
                  dpdp_fields_handled_notes.append(f"- Field '{col_name}' (from uploaded file) identified as DPDP PII and handled by faking values during synthetic generation.")
@@ -2330,6 +1009,46 @@ def generate_explainability_pdf(generation_context_info, generated_dfs_info):
         pdf.multi_cell(0, 5, "No dataset information available or generation was not completed for all tables.")
     pdf.ln(3)
 
+    # --- NEW: Generation Profile (if the run was profiled) ---
+    profiler = generation_context_info.get('profile')
+    if profiler is not None:
+        pdf.set_font("Arial", "B", 12)
+        pdf.cell(0, 10, "4.5. Generation Profile", 0, 1)
+        pdf.set_font("Arial", size=9)
+        if profiler.total_seconds is not None:
+            pdf.multi_cell(0, 5, f"Total generation wall time: {profiler.total_seconds:.3f} s")
+        for row in profiler.rows()[:PDF_PROFILE_MAX_ROWS]:
+            location = f"{row['Table']}.{row['Name']}" if row['Table'] else row['Name']
+            rate = f", {row['Rows/sec']:,.0f} rows/s" if row['Rows/sec'] else ""
+            pdf.multi_cell(0, 5, f"- {row['Kind']} {location}: {row['Wall time (s)']:.4f} s ({row['Share of run (%)']}% of run{rate})")
+        pdf.ln(3)
+
+    # --- NEW: Quality Benchmark (if one was run for this data) ---
+    benchmark = generation_context_info.get('benchmark')
+    if benchmark:
+        pdf.set_font("Arial", "B", 12)
+        pdf.cell(0, 10, "4.6. Quality Benchmark", 0, 1)
+        pdf.set_font("Arial", size=9)
+        fidelity_report = benchmark.get('fidelity')
+        if fidelity_report is not None:
+            for score_name, (score, ci) in fidelity_report.scores.items():
+                if pd.notna(score):
+                    pdf.multi_cell(0, 5, f"- {score_name}: {score:.1f}/100" + (f" (95% CI +/- {ci:.1f})" if pd.notna(ci) else ""))
+        utility_report = benchmark.get('utility')
+        if utility_report is not None:
+            utility_score_text = f"{utility_report.score:.1f}/100" if pd.notna(utility_report.score) else "not scorable (real-trained models do not predict the target)"
+            pdf.multi_cell(0, 5, f"- ML Utility (train synthetic, test real; target '{utility_report.target}', {utility_report.task}): {utility_score_text}")
+            for _, row in utility_report.results.iterrows():
+                value = row[utility_report.headline_metric]
+                result = f"{utility_report.headline_metric} {value:.3f}" if pd.notna(value) else f"failed ({row['Error']})"
+                pdf.multi_cell(0, 5, f"    {row['Model']} trained on {row['Trained On']} data: {result}")
+        privacy_report = benchmark.get('privacy')
+        if privacy_report is not None and privacy_report.rows_checked:
+            pdf.multi_cell(0, 5, f"- Privacy Protection: {privacy_report.score:.1f}/100 ({privacy_report.rows_checked:,} synthetic rows checked; "
+                                 f"exact copies {privacy_report.exact_copy_share:.2%}, near copies {privacy_report.near_copy_share:.2%}, "
+                                 f"median distance to closest record {np.median(privacy_report.dcr):.4f})")
+        pdf.ln(3)
+
     # --- Notes on Trust & Transparency ---
     pdf.set_font("Arial", "B", 12)
     pdf.cell(0, 10, "5. Notes on Trust & Transparency", 0, 1)
@@ -2347,6 +1066,50 @@ def generate_explainability_pdf(generation_context_info, generated_dfs_info):
 
 # ... (rest of your existing code)
 
+# --- NEW: Generation Profile Display ---
+def render_generation_profile(profiler):
+    """Shows per-field and per-stage wall times of the last run, slowest first."""
+    if profiler is None:
+        return
+    total = f" — {profiler.total_seconds:.3f} s" if profiler.total_seconds is not None else ""
+    with st.expander(f"⏱️ Generation Profile ({profiler.label}){total}"):
+        st.dataframe(profiler.to_dataframe(), use_container_width=True)
+        st.caption("Wall time per field and per stage (FK fan-out, edge-case assignment, PII masking, scrambling, export). Export timings refresh on every rerun.")
+
+# --- NEW: Background Training Status (CTGAN / TVAE) ---
+TRAINING_STATUS_REFRESH_SECONDS = 2
+
+def render_training_status(job):
+    """Shows epoch progress, losses and a cancel button for a background training job; refreshes itself while it runs."""
+    if job is None:
+        return
+
+    @st.fragment(run_every=None if job.finished else TRAINING_STATUS_REFRESH_SECONDS)
+    def _status_fragment():
+        status = job.status()
+        state = status.get("state")
+        epoch, epochs = status.get("epoch", 0), status.get("epochs") or job.epochs
+        st.progress(min(epoch / epochs, 1.0) if epochs else 0.0, text=f"{job.model_name}: epoch {epoch}/{epochs} ({state})")
+        if status.get("losses"):
+            st.caption(" | ".join(f"{k}: {v:.4f}" for k, v in status["losses"].items()))
+        if state not in FINISHED_TRAINING_STATES:
+            if st.button("Cancel Training", key="deep_model_cancel_btn"):
+                job.cancel()
+                st.info("Cancelling after the current epoch...")
+            return
+        if state == "completed":
+            st.success(f"Training complete. Model '{job.model_name}' saved to {status.get('model_path')}.")
+        elif state == "cancelled":
+            st.warning(f"Training cancelled at epoch {epoch}." + (
+                f" The checkpoint from epoch {status.get('checkpoint_epoch')} was saved as '{job.model_name}'." if status.get("model_path") else ""))
+        else:
+            st.error(f"Training failed: {status.get('error', 'unknown error')}")
+        if not st.session_state.get("deep_training_job_reported"):
+            st.session_state.deep_training_job_reported = True
+            st.rerun(scope="app") # Refresh the saved-model list once the job ends
+
+    _status_fragment()
+
 # --- NEW: Reusable Edge Case UI Function ---
 def render_edge_case_ui(ui_key_prefix, edge_cases_list_key, table_schemas_for_fields, available_table_names_for_conditions):
     """
@@ -2439,127 +1202,6 @@ def render_edge_case_ui(ui_key_prefix, edge_cases_list_key, table_schemas_for_fi
         edge_cases_list.append({'percentage': 1.0, 'conditions': []})
         st.rerun()
 
-def get_field_pii_strategy(field_schema, global_default_strategy):
-    """Determines the PII handling strategy for a field."""
-    # Field-specific strategy overrides global default
-    return field_schema.get("pii_handling", global_default_strategy)
-
-def _generate_value_from_schema(field_schema, edge_condition=None):
-    """Generate a random value based on field type and constraint using a dispatch dictionary."""
-    field_type = field_schema["type"]
-    constraint = field_schema.get("constraint", "") # Ensure constraint exists
-    # field_name = field_schema["name"] # field_name is available in field_schema
-    
-    default_pii_strategy = st.session_state.get(DEFAULT_PII_STRATEGY_KEY, "realistic_fake")
-    current_pii_strategy = get_field_pii_strategy(field_schema, default_pii_strategy)
-
-    # --- NEW: Check for special Faker direct calls and patterns based on flags in field_schema ---
-    # These flags would have been populated if field_schema came from CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP
-    # or inferred during the renaming process.
-    # Note: This is a representative subset. For full functionality, all relevant 'is_faker_...'
-    
-    # NEW: Handle inferred alphanumeric ID for novel fields first
-    if field_schema.get("_is_inferred_alphanum_id"):
-        prefix = field_schema.get("_inferred_prefix", "")
-        length = field_schema.get("length", random.randint(6, 10)) # Default length for inferred IDs
-        return f"{prefix}{''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789', k=length))}"
-
-    # and 'is_..._pattern' flags from CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP should be handled here.
-
-    if field_schema.get("is_faker_city"): return fake.city()
-    if field_schema.get("is_blood_pressure_pattern"):
-        systolic = random.randint(90, 170) # Example typical ranges
-        diastolic = random.randint(60, 110)
-        return f"{systolic}/{diastolic} mmHg"
-    if field_schema.get("is_faker_state"): return fake.state()
-    if field_schema.get("is_faker_country"): return fake.country()
-    if field_schema.get("is_faker_postcode"): return fake.postcode()
-    if field_schema.get("is_faker_currency_code"): return fake.currency_code()
-    if field_schema.get("is_faker_job"): return fake.job()
-    if field_schema.get("is_faker_company_with_suffix_list") and field_schema.get("suffix_from_list"):
-        return f"{fake.company()} {random.choice(field_schema['suffix_from_list'])}"
-    if field_schema.get("is_faker_company"): # Must be after more specific company checks
-        prefix = field_schema.get('prefix', '').rstrip()
-        suffix = field_schema.get('suffix', '').lstrip()
-        company_name = fake.company()
-        # Construct name with prefix/suffix carefully
-        parts = []
-        if prefix: parts.append(prefix)
-        parts.append(company_name)
-        if suffix: parts.append(suffix)
-        return " ".join(parts)
-    if field_schema.get("is_faker_url"): return fake.url()
-    if field_schema.get("is_faker_ipv4"): return fake.ipv4()
-    if field_schema.get("is_faker_mac_address"): return fake.mac_address()
-    if field_schema.get("is_faker_user_name"): return fake.user_name()
-    if field_schema.get("is_faker_latitude"): return fake.latitude()
-    if field_schema.get("is_faker_longitude"): return fake.longitude()
-    if field_schema.get("is_faker_color_name"): return fake.color_name()
-    if field_schema.get("is_faker_credit_card_number"): return fake.credit_card_number()
-    if field_schema.get("is_faker_file_name"):
-        ext_list = field_schema.get("constraint") # Assuming constraint might hold extensions for file_name
-        extensions = ext_list.split(',') if ext_list else FILE_EXTENSIONS_LIST # Fallback to global
-        return fake.file_name(extension=random.choice(extensions))
-
-    # Pattern-based generators
-    if field_schema.get("is_generic_numeric_id"): return f"{field_schema.get('prefix', '')}{random.randint(1000, 9999)}{random.randint(1000, 9999)}"
-    if field_schema.get("is_generic_alphanum_id"):
-        length = field_schema.get("length", 8)
-        return f"{field_schema.get('prefix', '')}{''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789', k=length))}"
-    if field_schema.get("is_room_number_pattern"): return f"{random.randint(1, 20)}{random.choice(['A', 'B', 'C', 'D'])}"
-    if field_schema.get("is_version_number_pattern"): return f"{random.randint(0,5)}.{random.randint(0,20)}.{random.randint(0,100)}"
-    if field_schema.get("is_doi_pattern"): return f"10.{random.randint(1000, 9999)}/{''.join(random.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=random.randint(5,10)))}"
-    if field_schema.get("is_tracking_number_pattern"): return f"{''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=3))}{random.randint(100000000, 999999999)}{''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=2))}"
-    if field_schema.get("is_flight_number_pattern"): return f"{''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=2))}{random.randint(100, 9999)}"
-    if field_schema.get("is_digit_sequence"): # e.g., constraint "digits:10-12"
-        min_len, max_len = 10, 12 # defaults
-        if field_schema.get('constraint', '').startswith('digits:'):
-            parts = field_schema['constraint'].split(':')[1].split('-')
-            min_len, max_len = int(parts[0]), int(parts[1])
-        return ''.join(random.choices('0123456789', k=random.randint(min_len, max_len)))
-
-    # Special handling for name with prefix/suffix
-    if field_type == "name":
-        base_name = fake.name()
-        # Handle multi_name for author lists - this logic might be better placed in the main generation loop
-        # if field_schema.get("is_multi_name"): # This flag is now handled in the main loop
-        #     return "; ".join([fake.name() for _ in range(random.randint(1,4))])
-
-        prefix_options = field_schema.get("prefix_options")
-        prefix = field_schema.get("prefix", "")
-        if prefix_options and isinstance(prefix_options, list) and prefix_options:
-            prefix = random.choice(prefix_options) # Choose one from options
-
-        if prefix and not prefix.endswith(" "):
-            prefix += " "
-
-        suffix = field_schema.get("suffix", "")
-        if suffix and not suffix.startswith(" "):
-            suffix = " " + suffix
-
-        val = f"{prefix}{base_name}{suffix}".strip()
-        return _apply_pii_strategy_to_value(val, "name", current_pii_strategy)
-    elif field_type == "date" and constraint == "datetime": # Special handling for datetime
-        # Generate a datetime object and format it
-        dt_obj = fake.date_time_this_year()
-        return dt_obj.strftime("%Y-%m-%d %H:%M:%S")
-    elif field_type == "date" and constraint == "datetime_utc": # Special handling for datetime with UTC
-        dt_obj = fake.date_time_this_year(tzinfo=timezone.utc) # Use timezone.utc
-        return dt_obj.isoformat() # ISO format includes timezone
-
-    # If type is string and not handled by specific flags/patterns above,
-    # call _generate_string_value directly, passing the full_field_schema for hints.
-    if field_type == "string":
-        return _generate_string_value(constraint, field_schema["name"], current_pii_strategy, edge_condition=edge_condition, full_field_schema=field_schema)
-
-    generator_func = VALUE_GENERATOR_FUNCTIONS.get(field_type)
-    if generator_func:
-        # Pass field_name for context within generator functions
-        return generator_func(constraint, field_schema["name"], current_pii_strategy, edge_condition=edge_condition)
-
-    st.warning(f"Unknown field type '{field_type}' for field '{field_schema['name']}'. Defaulting to N/A.")
-    return "N/A" # Fallback for unknown types
-
 def generate_value(field_name_str: str):
     """
     Generates a single synthetic value for a given field name string,
@@ -2610,47 +1252,9 @@ def generate_value(field_name_str: str):
         generate_value("email_open_rate")  # Returns: 0.35 (float as percentage)
         generate_value("click_through_rate")  # Returns: 0.12 (float as percentage)
     """
-    # First, try to infer the schema from the field name
-    inferred_schema = infer_field_schema_from_name(field_name_str)
-    
-    # Add business-specific enhancements to the schema
-    field_lower = field_name_str.lower()
-    
-    # Business/Finance specific enhancements
-    if any(kw in field_lower for kw in ["revenue", "income", "price", "cost", "amount", "value"]):
-        if "rate" in field_lower or "percentage" in field_lower:
-            inferred_schema["type"] = "float"
-            inferred_schema["constraint"] = "0.0-1.0"  # Represent as decimal
-        else:
-            inferred_schema["type"] = "float"
-            inferred_schema["constraint"] = "10.0-10000.0"  # Business-appropriate range
-    
-    # Tech/SaaS specific enhancements
-    elif any(kw in field_lower for kw in ["api", "endpoint", "url", "path"]):
-        inferred_schema["type"] = "string"
-        inferred_schema["_hint_api_path"] = True
-    elif any(kw in field_lower for kw in ["version", "release"]):
-        inferred_schema["type"] = "string"
-        inferred_schema["_hint_version"] = True
-    elif any(kw in field_lower for kw in ["environment", "env"]):
-        inferred_schema["type"] = "category"
-        inferred_schema["constraint"] = "development,staging,production"
-    
-    # Analytics specific enhancements
-    elif any(kw in field_lower for kw in ["rate", "percentage", "ratio"]):
-        inferred_schema["type"] = "float"
-        inferred_schema["constraint"] = "0.0-1.0"
-    elif any(kw in field_lower for kw in ["duration", "time"]):
-        if "millisecond" in field_lower:
-            inferred_schema["type"] = "float"
-            inferred_schema["constraint"] = "0.0-1000.0"
-        elif "second" in field_lower:
-            inferred_schema["type"] = "float"
-            inferred_schema["constraint"] = "0.0-60.0"
-        else:
-            inferred_schema["type"] = "int"
-            inferred_schema["constraint"] = "0-3600"
-    
+    # Infer the schema from the field name, with business/tech/analytics refinements (memoized per name)
+    inferred_schema = infer_value_schema(field_name_str)
+
     # Generate the value based on the enhanced schema
     return _generate_value_from_schema(inferred_schema)
 
@@ -2811,74 +1415,179 @@ def get_generation_order(table_schemas, relationships):
 
     return generation_order
 
+def scrambled_fields(table_schemas):
+    """(table, field) pairs of sensitive fields whose PII handling is 'scramble_column'."""
+    return {
+        (table_name, field_s["name"])
+        for table_name, fields in table_schemas.items() for field_s in fields
+        if field_s["type"] in ["email", "phone", "aadhaar", "pan", "passport", "voterid", "ifsc", "upi", "name", "address"]
+        and field_s.get("pii_handling") == "scramble_column"
+    }
+
+def generate_table_row(streams, row_index, schema_fields, edge_cases_list, table_name, profiler, row_data=None):
+    """
+    Row `row_index` of `table_name`: picks the row's edge-case rule, then generates each field not already in
+    `row_data`. Draws come only from the row's streams, so a row range can be regenerated on its own (nullbyte.virtual).
+    """
+    row_data = row_data if row_data is not None else {} # For potential intra-row dependencies
+
+    # Determine if an edge case rule applies to this row
+    edge_start = perf_counter()
+    applied_edge_rule_for_row = draw_edge_rule(streams, edge_cases_list, table_name, row_index)
+    profiler.add_stage("Edge-case assignment", perf_counter() - edge_start, rows=1)
+
+    for field_schema in schema_fields:
+        field_name = field_schema["name"]
+        if field_name in row_data: continue # Skip FKs already set
+
+        # Use generate_value_with_dependencies, passing field_schema, current row_data, and edge_condition
+        field_start = perf_counter()
+        streams.select(table_name, field_name, row_index)
+        row_data[field_name] = generate_value_with_dependencies(field_schema, row_data, edge_condition=edge_condition_for(applied_edge_rule_for_row, table_name, field_name))
+        profiler.add_field(table_name, field_name, perf_counter() - field_start)
+    return row_data
+
+def draw_edge_rule(streams, edge_cases_list, table_name, row_index):
+    """Edge-case rule applied to row `row_index` of `table_name` (or None), drawn from the table's edge-case stream."""
+    streams.select(table_name, EDGE_CASES_STREAM, row_index)
+    potential_rules_for_row = [
+        rule for rule in edge_cases_list
+        if rule.get('percentage', 0.0) > 0 and random.random() < (rule.get('percentage', 0.0) / 100.0)
+    ]
+    return random.choice(potential_rules_for_row) if potential_rules_for_row else None
+
+def edge_condition_for(rule, table_name, field_name):
+    """The condition of `rule` on `table_name`.`field_name`, if any."""
+    for cond in (rule or {}).get('conditions', []):
+        # Table name in the condition must match this table (the fixed playground table name for the playground)
+        if cond.get('table') == table_name and cond.get('field') == field_name:
+            return cond
+    return None
+
+def generate_table_columns(streams, schema_fields, edge_cases_list, table_name, num_rows, profiler,
+                           preset_columns=None, preset_keys=None, column_cache=None, plan_base=()):
+    """
+    Column-by-column equivalent of generate_table_row() over rows [0, num_rows): same streams, same values.
+    Each column's plan key chains the keys of the columns it reads (FKs in `preset_columns`, dependency
+    handlers), and columns found in `column_cache` under their key are reused instead of regenerated.
+    Returns ({column: values}, {column: plan key}).
+    """
+    columns = dict(preset_columns or {}) # FKs copied from parent rows come first
+    keys = dict(preset_keys or {})
+    edge_rules_key = plan_key([rule for rule in edge_cases_list if rule.get('percentage', 0.0) > 0])
+    row_edge_rules = None # Drawn once, only if a regenerated column is targeted by a rule
+    reused = 0
+
+    for field_schema in schema_fields:
+        field_name = field_schema["name"]
+        if field_name in columns: continue # Skip FKs already set
+
+        dependency = next((dep for fn_to_gen, dep in DEPENDENCY_HANDLERS if fn_to_gen == field_name.lower()), None)
+        dependency_column = next((c for c in columns if c.lower() == dependency), None) if dependency else None
+        targeted = any(
+            edge_condition_for(rule, table_name, field_name) is not None
+            for rule in edge_cases_list if rule.get('percentage', 0.0) > 0
+        )
+        key = plan_key(plan_base, table_name, num_rows, field_schema, edge_rules_key if targeted else None,
+                       dependency_column, keys.get(dependency_column))
+        values = column_cache.get(key) if column_cache is not None else None
+        if values is not None:
+            reused += 1
+        else:
+            if targeted and row_edge_rules is None:
+                with profiler.stage("Edge-case assignment", rows=num_rows):
+                    row_edge_rules = [draw_edge_rule(streams, edge_cases_list, table_name, i) for i in range(num_rows)]
+            dependency_values = columns.get(dependency_column)
+            field_start = perf_counter()
+            values = []
+            for chunk_start, chunk_rows in chunk_bounds(num_rows):
+                streams.select(table_name, field_name, chunk_start)
+                for i in range(chunk_start, chunk_start + chunk_rows):
+                    row_data = {dependency_column: dependency_values[i]} if dependency_values is not None else {}
+                    edge_condition = edge_condition_for(row_edge_rules[i], table_name, field_name) if targeted else None
+                    values.append(generate_value_with_dependencies(field_schema, row_data, edge_condition=edge_condition))
+            profiler.add_field(table_name, field_name, perf_counter() - field_start, calls=num_rows, rows=num_rows)
+            if column_cache is not None:
+                column_cache.put(key, values)
+        columns[field_name] = values
+        keys[field_name] = key
+    if reused:
+        profiler.add_stage("Reused cached columns", 0.0, rows=reused * num_rows, calls=reused)
+    return columns, keys
+
 # --- NEW: Simplified Generation for Single Table Scenario Playground ---
-def generate_single_table_data_with_edge_cases(schema_fields, num_rows, edge_cases_list, pii_strategy_global, table_name_for_conditions):
-    """Generates data for a single table, applying edge cases."""
+def generate_single_table_data_with_edge_cases(schema_fields, num_rows, edge_cases_list, pii_strategy_global, table_name_for_conditions, profiler=None, seed=None):
+    """
+    Generates data for a single table, applying edge cases. Timings are recorded into `profiler` if given.
+    Values come from per-field streams keyed by `seed` (see nullbyte.streams).
+    """
     if not schema_fields:
         st.error("Schema is empty. Cannot generate data for the playground.")
         return None
 
-    table_rows_data = []
-    for i in range(num_rows):
-        row_data = {} # For potential intra-row dependencies
-        applied_edge_rule_for_row = None
-        
-        # Determine if an edge case rule applies to this row
-        potential_rules_for_row = [
-            rule for rule in edge_cases_list
-            if rule.get('percentage', 0.0) > 0 and random.random() < (rule.get('percentage', 0.0) / 100.0)
+    profiler = profiler or GenerationProfiler("Single Table")
+    with profiling(profiler), RandomStreams(seed) as streams:
+        table_rows_data = [
+            generate_table_row(streams, i, schema_fields, edge_cases_list, table_name_for_conditions, profiler)
+            for i in range(num_rows)
         ]
-        if potential_rules_for_row:
-            applied_edge_rule_for_row = random.choice(potential_rules_for_row)
-
-        for field_schema in schema_fields:
-            field_name = field_schema["name"]
-            field_specific_edge_condition = None
-            if applied_edge_rule_for_row:
-                for cond in applied_edge_rule_for_row.get('conditions', []):
-                    # For playground, table name in condition must match the fixed playground table name
-                    if cond.get('table') == table_name_for_conditions and cond.get('field') == field_name:
-                        field_specific_edge_condition = cond
-                        break
-            # Use generate_value_with_dependencies, passing field_schema, current row_data, and edge_condition
-            row_data[field_name] = generate_value_with_dependencies(field_schema, row_data, edge_condition=field_specific_edge_condition)
+
+        with profiler.stage("DataFrame build", rows=num_rows):
+            df = pd.DataFrame(table_rows_data)
         
-        table_rows_data.append(row_data)
+        # Apply PII Scrambling if needed
+        with profiler.stage("PII scrambling", rows=num_rows):
+            scramble_tables({table_name_for_conditions: df}, scrambled_fields({table_name_for_conditions: schema_fields}), streams=streams)
 
-    df = pd.DataFrame(table_rows_data)
-    
-    # Apply PII Scrambling if needed
-    for field_s in schema_fields:
-        is_sensitive = field_s["type"] in ["email", "phone", "aadhaar", "pan", "passport", "voterid", "ifsc", "upi", "name", "address"]
-        if is_sensitive and field_s.get("pii_handling") == "scramble_column" and field_s["name"] in df.columns:
-            col_to_scramble = df[field_s["name"]].copy()
-            if col_to_scramble.nunique() > 1: # Only scramble if there's more than one unique value
-                np.random.shuffle(col_to_scramble.values)
-                df[field_s["name"]] = col_to_scramble
+        with profiler.stage("Dtype compaction", rows=num_rows):
+            df = compact_dataframe(df, schema_fields)
+    profiler.finish()
     return df
 
-def generate_hierarchical_data(table_schemas, relationships, num_rows_root, edge_cases_all, pii_strategy_global):
-    """Generates data for multiple related tables."""
+def generate_hierarchical_data(table_schemas, relationships, num_rows_root, edge_cases_all, pii_strategy_global, profiler=None, seed=None,
+                               column_cache=None):
+    """
+    Generates data for multiple related tables. Timings are recorded into `profiler` if given.
+    Values and fan-out counts come from per-table, per-field streams keyed by `seed` (see nullbyte.streams);
+    with a `column_cache` (nullbyte.columns), columns whose plan did not change since the last run are reused.
+    """
     generation_order = get_generation_order(table_schemas, relationships)
     if not generation_order:
         return None # Error already shown by get_generation_order
 
+    profiler = profiler or GenerationProfiler("Hierarchical")
+    column_cache = column_cache if column_cache is not None else ColumnCache() # Throwaway cache: every column is generated
+    with profiling(profiler), RandomStreams(seed) as streams, column_cache.run():
+        plan_base = (streams.seed, st.session_state.get(DEFAULT_LOCALE_KEY), st.session_state.get("data_generation_focus"), pii_strategy_global)
+        generated_data_frames = _generate_hierarchical_tables(table_schemas, relationships, num_rows_root, edge_cases_all, generation_order, profiler, streams,
+                                                              column_cache, plan_base)
+        # Scrambled only once all tables exist, so a key and the foreign keys copied from it share one permutation
+        with profiler.stage("PII scrambling", rows=sum(len(df) for df in generated_data_frames.values())):
+            scramble_tables(generated_data_frames, scrambled_fields(table_schemas), relationships, streams=streams)
+        # Compact only once all tables exist, so FK values copied from parents stay plain Python values
+        for table_name, df in generated_data_frames.items():
+            with profiler.stage("Dtype compaction", rows=len(df)):
+                generated_data_frames[table_name] = compact_dataframe(df, table_schemas[table_name])
+    profiler.finish()
+    return generated_data_frames
+
+def _generate_hierarchical_tables(table_schemas, relationships, num_rows_root, edge_cases_all, generation_order, profiler, streams,
+                                  column_cache=None, plan_base=()):
+    """Table-by-table body of generate_hierarchical_data (FK fan-out, column generation)."""
+
     generated_data_frames = {}
+    column_keys = {} # {table: {column: plan key}}, chained into the keys of child FK columns
     min_children_per_parent = 1 # Configurable: min number of child records per parent
     max_children_per_parent = 3 # Configurable: max number of child records per parent
 
     for table_name in generation_order:
         current_schema_fields = table_schemas[table_name]
-        table_rows_data = []
         
         parent_relationships_for_this_table = [r for r in relationships if r['child_table'] == table_name]
-        num_rows_for_this_table = 0
-        parent_pk_map_for_rows = [] # Stores [{fk_field: parent_pk_value}, ...] for each row
+        fk_columns, fk_keys = {}, {}
 
         if not parent_relationships_for_this_table: # It's a root table
             num_rows_for_this_table = num_rows_root
-            for _ in range(num_rows_for_this_table):
-                parent_pk_map_for_rows.append({})
         else:
             # Simplified: Iterate through the first parent's rows and generate children
             primary_parent_rel = parent_relationships_for_this_table[0]
@@ -2887,60 +1596,28 @@ def generate_hierarchical_data(table_schemas, relationships, num_rows_root, edge
                 st.error(f"Parent table '{primary_parent_rel['parent_table']}' for '{table_name}' has no data. Cannot generate child rows.")
                 continue
 
-            for _, parent_row in parent_df.iterrows():
-                num_children = random.randint(min_children_per_parent, max_children_per_parent)
-                for _ in range(num_children):
-                    fk_map = {}
-                    for rel in parent_relationships_for_this_table:
-                        current_parent_df = generated_data_frames.get(rel['parent_table'])
-                        if current_parent_df is not None and rel['parent_pk'] in current_parent_df.columns:
-                            # If this rel is the primary_parent_rel, use parent_row directly
-                            # Otherwise, for secondary parents, pick a random PK (simplification for now)
-                            pk_val_to_use = parent_row[rel['parent_pk']] if rel == primary_parent_rel else random.choice(current_parent_df[rel['parent_pk']].tolist())
-                            fk_map[rel['child_fk']] = pk_val_to_use
-                        else:
-                            st.warning(f"Could not find PK '{rel['parent_pk']}' in generated parent table '{rel['parent_table']}' for FK '{rel['child_fk']}' in '{table_name}'. FK will be None.")
-                            fk_map[rel['child_fk']] = None 
-                    parent_pk_map_for_rows.append(fk_map)
-            num_rows_for_this_table = len(parent_pk_map_for_rows)
-
-        for i in range(num_rows_for_this_table):
-            row_data = {}
-            current_fk_map = parent_pk_map_for_rows[i]
-            for fk_field, pk_value in current_fk_map.items():
-                row_data[fk_field] = pk_value
-
-            applied_edge_rule_for_row = None
-            potential_rules_for_row = [
-                rule for rule in edge_cases_all 
-                if rule.get('percentage', 0.0) > 0 and random.random() < (rule.get('percentage', 0.0) / 100.0)
-            ]
-            if potential_rules_for_row:
-                applied_edge_rule_for_row = random.choice(potential_rules_for_row)
-
-            for field_schema in current_schema_fields:
-                field_name = field_schema["name"]
-                if field_name in row_data: continue # Skip FKs already set
-                
-                field_specific_edge_condition = None
-                if applied_edge_rule_for_row:
-                    for cond in applied_edge_rule_for_row.get('conditions', []):
-                        if cond.get('table') == table_name and cond.get('field') == field_name:
-                            field_specific_edge_condition = cond
-                            break
-                row_data[field_name] = generate_value_with_dependencies(field_schema, row_data, edge_condition=field_specific_edge_condition)
-            
-            table_rows_data.append(row_data)
+            fan_out_key = plan_key(plan_base, table_name, FAN_OUT_STREAM, min_children_per_parent, max_children_per_parent, len(parent_df),
+                                   [(rel, column_keys.get(rel['parent_table'], {}).get(rel['parent_pk'])) for rel in parent_relationships_for_this_table])
+            fk_keys = {rel['child_fk']: plan_key(fan_out_key, rel['child_fk']) for rel in parent_relationships_for_this_table}
+            if column_cache is not None:
+                fk_columns = {fk: column_cache.get(key) for fk, key in fk_keys.items()}
+            if not fk_columns or any(values is None for values in fk_columns.values()):
+                fan_out_start = perf_counter()
+                fk_columns = _fan_out_foreign_keys(streams, table_name, parent_relationships_for_this_table, generated_data_frames,
+                                                   min_children_per_parent, max_children_per_parent)
+                profiler.add_stage("FK fan-out", perf_counter() - fan_out_start, rows=len(next(iter(fk_columns.values()))))
+                if column_cache is not None:
+                    for fk, values in fk_columns.items():
+                        column_cache.put(fk_keys[fk], values)
+            num_rows_for_this_table = len(next(iter(fk_columns.values())))
+
+        table_columns, column_keys[table_name] = generate_table_columns(
+            streams, current_schema_fields, edge_cases_all, table_name, num_rows_for_this_table, profiler,
+            preset_columns=fk_columns, preset_keys=fk_keys, column_cache=column_cache, plan_base=plan_base
+        )
 
-        df = pd.DataFrame(table_rows_data)
-        
-        for field_s in current_schema_fields: # PII Scrambling
-            is_sensitive = field_s["type"] in ["email", "phone", "aadhaar", "pan", "passport", "voterid", "ifsc", "upi", "name", "address"]
-            if is_sensitive and field_s.get("pii_handling") == "scramble_column" and field_s["name"] in df.columns:
-                col_to_scramble = df[field_s["name"]].copy()
-                if col_to_scramble.nunique() > 1:
-                    np.random.shuffle(col_to_scramble.values)
-                    df[field_s["name"]] = col_to_scramble
+        with profiler.stage("DataFrame build", rows=num_rows_for_this_table):
+            df = pd.DataFrame(table_columns)
 
         generated_data_frames[table_name] = df
         if df.empty and num_rows_for_this_table > 0 :
@@ -2952,209 +1629,34 @@ def generate_hierarchical_data(table_schemas, relationships, num_rows_root, edge
 
     return generated_data_frames
 
-# The generate_domain_specific_data function is now effectively merged into generate_synthetic_data
+def _fan_out_foreign_keys(streams, table_name, parent_relationships, generated_data_frames, min_children, max_children):
+    """
+    FK columns of a child table: min..max children per row of the first parent (drawn from the table's
+    fan-out stream), each also given a random key of every other parent (simplification for now).
+    """
+    primary_parent_rel = parent_relationships[0]
+    parent_keys = []
+    for rel in parent_relationships:
+        current_parent_df = generated_data_frames.get(rel['parent_table'])
+        if current_parent_df is not None and rel['parent_pk'] in current_parent_df.columns:
+            parent_keys.append(current_parent_df[rel['parent_pk']].tolist())
+        else:
+            st.warning(f"Could not find PK '{rel['parent_pk']}' in generated parent table '{rel['parent_table']}' for FK '{rel['child_fk']}' in '{table_name}'. FK will be None.")
+            parent_keys.append(None)
+
+    fk_values = [[] for _ in parent_relationships]
+    for parent_index in range(len(generated_data_frames[primary_parent_rel['parent_table']])):
+        streams.select(table_name, FAN_OUT_STREAM, parent_index)
+        num_children = random.randint(min_children, max_children)
+        for _ in range(num_children):
+            for rel, keys, values in zip(parent_relationships, parent_keys, fk_values):
+                if keys is None:
+                    values.append(None)
+                else: # The primary parent's row itself, a random row of any other parent
+                    values.append(keys[parent_index] if rel == primary_parent_rel else random.choice(keys))
+    return {rel['child_fk']: values for rel, values in zip(parent_relationships, fk_values)}
 
-# --- Schema Inference Rules for pre-populating Smart Schema Editor ---
-SCHEMA_INFERENCE_RULES = [
-    (r"(?:email)", "email", ""),
-    (r"(?:name)", "name", ""),
-    (r"(?:phone|contact)", "phone", ""),
-    (r"(?:address|location)", "address", ""),
-    (r"(?:age)", "int", "18-60"),
-    (r"(?:salary|income|pay)", "int", "20000-500000"),
-    (r"(?:gender)", "category", "Male, Female, Other"),
-    (r"(?:aadhaar)", "aadhaar", ""),
-    (r"(?:pan)", "pan", ""),
-    (r"(?:passport)", "passport", ""),
-    (r"(?:voter)", "voterid", ""), # voter or voter id
-    (r"(?:ifsc)", "ifsc", ""),
-    (r"(?:upi)", "upi", ""),
-    (r"(?:date|dob|joining_date|order_date)", "date", f"{fake.date_this_year(before_today=True, after_today=False).strftime('%Y-%m-%d')} - {fake.date_this_year(before_today=False, after_today=True).strftime('%Y-%m-%d')}"),
-    (r"(?:price|amount|value|cost)", "float", "10.00-1000.00"),
-    (r"(?:id|number|code)$", "string", ""), # Ends with id, number, or code
-    (r"(?:status|type|category)$", "category", "Type A, Type B, Type C"), # Ends with status, type, or category
-]
-
-# --- Schema Templates ---
-SCHEMA_TEMPLATES = {
-    "None (Custom Schema)": { # Special value to indicate no template or custom editing
-        "description": "Start with a blank schema in the Smart Schema Editor.",
-        "fields": []
-    },
-    "E-commerce Customer Orders": {
-        "description": "A standard schema for tracking customer orders, including customer details, product information, and order status.",
-        "fields": [
-            {"name": "Order ID", "type": "string", "constraint": "", "_canonical_suggestion": "order_id"},
-            {"name": "Customer Name", "type": "name", "constraint": ""},
-            {"name": "Customer Email", "type": "email", "constraint": ""},
-            {"name": "Product Name", "type": "category", "constraint": "Laptop, Smartphone, Headphones, Charger, Case"},
-            {"name": "Quantity", "type": "int", "constraint": "1-5"},
-            {"name": "Price Per Unit", "type": "float", "constraint": "10.99-1299.99"},
-            {"name": "Order Date", "type": "date", "constraint": ""},
-            {"name": "Shipping Address", "type": "address", "constraint": ""},
-            {"name": "Order Status", "type": "category", "constraint": "Pending, Shipped, Delivered, Cancelled, Returned"},
-            {"name": "Payment Method", "type": "category", "constraint": "Credit Card, Debit Card, UPI, Net Banking"},
-        ]
-    },
-    "Basic Employee Records": {
-        "description": "Essential fields for managing employee information, such as ID, contact details, department, and salary.",
-        "fields": [
-            {"name": "Employee ID", "type": "string", "constraint": "", "_canonical_suggestion": "employee_id"},
-            {"name": "Full Name", "type": "name", "constraint": ""},
-            {"name": "Email", "type": "email", "constraint": ""},
-            {"name": "Phone Number", "type": "phone", "constraint": ""},
-            {"name": "Department", "type": "category", "constraint": "HR, Engineering, Marketing, Sales, Finance, Operations"},
-            {"name": "Position", "type": "string", "constraint": ""},
-            {"name": "Salary", "type": "int", "constraint": "30000-250000"},
-            {"name": "Joining Date", "type": "date", "constraint": ""},
-            {"name": "Age", "type": "int", "constraint": "22-60"},
-        ]
-    },
-    "Healthcare Patient Data (Demo)": {
-        "description": "A demonstration schema for patient records in a healthcare setting, including admission details and diagnosis.",
-        "fields": [
-            {"name": "Patient ID", "type": "string", "constraint": "", "_canonical_suggestion": "patient_id"},
-            {"name": "Patient Name", "type": "name", "constraint": ""},
-            {"name": "Age", "type": "int", "constraint": "0-90"},
-            {"name": "Gender", "type": "category", "constraint": "Male, Female, Other"},
-            {"name": "Admission Date", "type": "date", "constraint": ""},
-            {"name": "Discharge Date", "type": "date", "constraint": ""},
-            {"name": "Diagnosis", "type": "category", "constraint": "Flu, Common Cold, Hypertension, Diabetes, Injury"},
-            {"name": "Attending Doctor", "type": "name", "constraint": "", "_canonical_suggestion": "doctor_name"},
-            {"name": "Contact Phone", "type": "phone", "constraint": ""},
-        ]
-    },
-    "Financial Transactions (Simplified)": {
-        "description": "A simplified schema for financial transactions, covering transaction ID, account details, amount, and type.",
-        "fields": [
-            {"name": "Transaction ID", "type": "string", "constraint": "", "_canonical_suggestion": "transaction_id"},
-            {"name": "Account Number", "type": "string", "constraint": ""},
-            {"name": "Transaction Date", "type": "date", "constraint": ""},
-            {"name": "Amount", "type": "float", "constraint": "1.00-50000.00"},
-            {"name": "Transaction Type", "type": "category", "constraint": "Credit, Debit, Transfer, Payment"},
-            {"name": "Description", "type": "string", "constraint": ""},
-        ]
-    },
-    "Social Media Posts": {
-        "description": "Schema for social media post data, including user information, post content, engagement metrics, and timestamps.",
-        "fields": [
-            {"name": "Post ID", "type": "string", "constraint": "", "_canonical_suggestion": "id"},
-            {"name": "Username", "type": "string", "constraint": "", "_canonical_suggestion": "username"},
-            {"name": "Post Text", "type": "string", "constraint": "", "_canonical_suggestion": "post_text"},
-            {"name": "Timestamp", "type": "date", "constraint": "datetime", "_canonical_suggestion": "timestamp"},
-            {"name": "Likes", "type": "int", "constraint": "0-10000", "_canonical_suggestion": "like_count"},
-            {"name": "Shares", "type": "int", "constraint": "0-5000", "_canonical_suggestion": "share_count"},
-            {"name": "Hashtags", "type": "string", "constraint": "", "_canonical_suggestion": "hashtags"}
-        ]
-    },
-    "IoT Sensor Readings": {
-        "description": "Data structure for readings from IoT sensors, including sensor ID, timestamp, and various environmental measurements.",
-        "fields": [
-            {"name": "Sensor ID", "type": "string", "constraint": "", "_canonical_suggestion": "sensor_id"},
-            {"name": "Timestamp", "type": "date", "constraint": "datetime", "_canonical_suggestion": "timestamp"},
-            {"name": "Temperature (°C)", "type": "float", "constraint": "-10.0-40.0", "_canonical_suggestion": "temperature"},
-            {"name": "Humidity (%)", "type": "float", "constraint": "20.0-80.0", "_canonical_suggestion": "humidity"},
-            {"name": "Latitude", "type": "float", "constraint": "-90.0-90.0", "_canonical_suggestion": "latitude"},
-            {"name": "Longitude", "type": "float", "constraint": "-180.0-180.0", "_canonical_suggestion": "longitude"},
-            {"name": "Sensor Type", "type": "category", "constraint": "Temperature,Humidity,Pressure,Light", "_canonical_suggestion": "sensor_type"}
-        ]
-    },
-    "Academic Publications": {
-        "description": "Schema for academic publication metadata, including title, authors, journal, publication year, and citation information.",
-        "fields": [
-            {"name": "Publication ID", "type": "string", "constraint": "", "_canonical_suggestion": "id"},
-            {"name": "Title", "type": "string", "constraint": "", "_canonical_suggestion": "publication_title"},
-            {"name": "Authors", "type": "string", "constraint": "", "_canonical_suggestion": "author_names"},
-            {"name": "Journal", "type": "category", "constraint": "Nature, Science, Cell, The Lancet, PLOS One", "_canonical_suggestion": "journal_name"},
-            {"name": "Publication Year", "type": "int", "constraint": "2000-2024", "_canonical_suggestion": "publication_year"},
-            {"name": "DOI", "type": "string", "constraint": "", "_canonical_suggestion": "doi"},
-            {"name": "Keywords", "type": "string", "constraint": "", "_canonical_suggestion": "keywords"},
-            {"name": "Citation Count", "type": "int", "constraint": "0-500", "_canonical_suggestion": "citation_count"}
-        ]
-    },
-    "Logistics Shipment Tracking": {
-        "description": "Fields for tracking logistics shipments, including shipment ID, carrier, origin, destination, status, and costs.",
-        "fields": [
-            {"name": "Shipment ID", "type": "string", "constraint": "", "_canonical_suggestion": "shipment_id"},
-            {"name": "Tracking Number", "type": "string", "constraint": "", "_canonical_suggestion": "tracking_number"},
-            {"name": "Carrier Name", "type": "string", "constraint": "", "_canonical_suggestion": "carrier_name"},
-            {"name": "Origin", "type": "address", "constraint": "", "_canonical_suggestion": "origin_location"},
-            {"name": "Destination", "type": "address", "constraint": "", "_canonical_suggestion": "destination_location"},
-            {"name": "Status", "type": "category", "constraint": ",".join(LOGISTICS_SHIPMENT_STATUSES_LIST), "_canonical_suggestion": "shipment_status_logistics"},
-            {"name": "Estimated Delivery", "type": "date", "constraint": "", "_canonical_suggestion": "estimated_delivery_date"},
-            {"name": "Actual Delivery", "type": "date", "constraint": "", "_canonical_suggestion": "actual_delivery_date"},
-            {"name": "Freight Cost (USD)", "type": "float", "constraint": "50-5000", "_canonical_suggestion": "freight_cost"},
-            {"name": "Package Weight (kg)", "type": "float", "constraint": "0.1-1000", "_canonical_suggestion": "package_weight_kg"},
-            {"name": "Package Dimensions (cm)", "type": "string", "constraint": "", "_canonical_suggestion": "package_dimensions_cm"},
-        ]
-    },
-    "Travel Booking Records": {
-        "description": "Schema for travel booking information, covering booking ID, traveler details, destination, flight, hotel, and costs.",
-        "fields": [
-            {"name": "Booking ID", "type": "string", "constraint": "", "_canonical_suggestion": "booking_id"},
-            {"name": "Traveler Name", "type": "name", "constraint": "", "_canonical_suggestion": "traveler_name"},
-            {"name": "Destination", "type": "category", "constraint": ",".join(TRAVEL_DESTINATIONS_LIST[:10]), "_canonical_suggestion": "destination_city_travel"},
-            {"name": "Origin", "type": "category", "constraint": ",".join(TRAVEL_DESTINATIONS_LIST[10:20]), "_canonical_suggestion": "origin_city_travel"},
-            {"name": "Travel Date", "type": "date", "constraint": "", "_canonical_suggestion": "travel_date"},
-            {"name": "Return Date", "type": "date", "constraint": "", "_canonical_suggestion": "return_date"},
-            {"name": "Flight Number", "type": "string", "constraint": "", "_canonical_suggestion": "flight_number"},
-            {"name": "Airline", "type": "category", "constraint": ",".join(AIRLINE_NAMES_LIST[:5]), "_canonical_suggestion": "airline_name"},
-            {"name": "Hotel Name", "type": "string", "constraint": "", "_canonical_suggestion": "hotel_name"},
-            {"name": "Room Type", "type": "category", "constraint": ",".join(ROOM_TYPES_LIST[:4]), "_canonical_suggestion": "room_type"},
-            {"name": "Booking Status", "type": "category", "constraint": ",".join(TRAVEL_BOOKING_STATUSES_LIST), "_canonical_suggestion": "booking_status_travel"},
-            {"name": "Total Cost (USD)", "type": "float", "constraint": "200-8000", "_canonical_suggestion": "total_travel_cost"},
-            {"name": "Package Name", "type": "string", "constraint": "", "_canonical_suggestion": "travel_package_name"},
-            {"name": "Booked Activity", "type": "category", "constraint": ",".join(TRAVEL_ACTIVITY_TYPES_LIST[:5]), "_canonical_suggestion": "travel_activity"},
-        ]
-    },
-    # --- NEW TEMPLATES ---
-    "Sales CRM Leads": {
-        "description": "Schema for tracking sales leads in a CRM system, including lead source, deal stage, and opportunity details.",
-        "fields": [
-            {"name": "Lead ID", "type": "string", "constraint": "", "_canonical_suggestion": "lead_id"},
-            {"name": "Lead Name", "type": "name", "constraint": "", "_canonical_suggestion": "name"}, # Generic name
-            {"name": "Company Name", "type": "string", "constraint": "", "_canonical_suggestion": "company"},
-            {"name": "Email", "type": "email", "constraint": ""},
-            {"name": "Phone", "type": "phone", "constraint": ""},
-            {"name": "Lead Source", "type": "category", "constraint": ",".join(LEAD_SOURCES_LIST), "_canonical_suggestion": "lead_source"},
-            {"name": "Deal Stage", "type": "category", "constraint": ",".join(DEAL_STAGES_LIST), "_canonical_suggestion": "deal_stage"},
-            {"name": "Opportunity Amount", "type": "float", "constraint": "5000-500000", "_canonical_suggestion": "opportunity_amount"},
-            {"name": "Expected Close Date", "type": "date", "constraint": "", "_canonical_suggestion": "close_date"},
-            {"name": "Assigned To", "type": "name", "constraint": "", "_canonical_suggestion": "assignee_name"},
-        ]
-    },
-    "Marketing Campaign Performance": {
-        "description": "Data for analyzing marketing campaign performance, including ad spend, impressions, clicks, and conversion metrics.",
-        "fields": [
-            {"name": "Campaign ID", "type": "string", "constraint": "", "_canonical_suggestion": "campaign_id"},
-            {"name": "Campaign Name", "type": "string", "constraint": "", "_canonical_suggestion": "campaign_name"},
-            {"name": "Campaign Type", "type": "category", "constraint": ",".join(CAMPAIGN_TYPES_LIST), "_canonical_suggestion": "campaign_type"},
-            {"name": "Start Date", "type": "date", "constraint": "", "_canonical_suggestion": "date"},
-            {"name": "End Date", "type": "date", "constraint": "", "_canonical_suggestion": "date"},
-            {"name": "Ad Spend (USD)", "type": "float", "constraint": "100-20000", "_canonical_suggestion": "ad_spend"},
-            {"name": "Impressions", "type": "int", "constraint": "10000-5000000", "_canonical_suggestion": "impressions"},
-            {"name": "Clicks", "type": "int", "constraint": "100-50000", "_canonical_suggestion": "clicks"},
-            {"name": "CTR", "type": "float", "constraint": "0.005-0.05", "_canonical_suggestion": "ctr"},
-            {"name": "Conversions", "type": "int", "constraint": "10-1000"}, # No direct canonical, simple int
-            {"name": "Conversion Rate", "type": "float", "constraint": "0.01-0.15", "_canonical_suggestion": "conversion_rate"},
-        ]
-    },
-    "Software Issue Tracking": {
-        "description": "Schema for tracking software bugs, feature requests, and tasks, including status, priority, and assignee.",
-        "fields": [
-            {"name": "Issue ID", "type": "string", "constraint": "", "_canonical_suggestion": "id"}, # Generic ID
-            {"name": "Title", "type": "string", "constraint": "", "_canonical_suggestion": "description"}, # Using description for title
-            {"name": "Issue Type", "type": "category", "constraint": ",".join(ISSUE_TYPES_LIST), "_canonical_suggestion": "issue_type"},
-            {"name": "Status", "type": "category", "constraint": ",".join(ISSUE_STATUSES_LIST), "_canonical_suggestion": "issue_status"},
-            {"name": "Priority", "type": "category", "constraint": ",".join(TASK_PRIORITY_LIST), "_canonical_suggestion": "task_priority"},
-            {"name": "Reporter", "type": "name", "constraint": "", "_canonical_suggestion": "name"},
-            {"name": "Assignee", "type": "name", "constraint": "", "_canonical_suggestion": "assignee_name"},
-            {"name": "Created Date", "type": "date", "constraint": "datetime", "_canonical_suggestion": "timestamp"},
-            {"name": "Updated Date", "type": "date", "constraint": "datetime", "_canonical_suggestion": "timestamp"},
-            {"name": "Commit Hash", "type": "string", "constraint": "", "_canonical_suggestion": "commit_hash"},
-        ]
-    }
-}
+# The generate_domain_specific_data function is now effectively merged into generate_synthetic_data
 
 # Smart Schema Editor Section
 def show_smart_schema_editor(synthetic_df=None, num_rows=10):
@@ -3186,13 +1688,13 @@ def show_smart_schema_editor(synthetic_df=None, num_rows=10):
             st.session_state.num_rows_from_prompt = None
             
             # Clear other generated data to avoid confusion and focus on the editor
-            st.session_state.prompt_generated_df = None 
-            st.session_state.uploaded_df_for_schema = None
-            st.session_state.generated_data_frames = {}
+            datasets.prompt_generated_df = None 
+            datasets.uploaded_df_for_schema = None
+            datasets.generated_data_frames = {}
             st.session_state.active_display_table_name = None
-            st.session_state.playground_generated_df = None
-            st.session_state.newly_generated_df_tab3 = None
-            st.session_state.synthetic_df_from_file_tab3 = None
+            datasets.playground_generated_df = None
+            datasets.newly_generated_df_tab3 = None
+            datasets.synthetic_df_from_file_tab3 = None
             
             st.success(f"Schema from text prompt loaded into table '{target_table_name}'. You can now edit it.")
             st.rerun()
@@ -3232,44 +1734,23 @@ def show_smart_schema_editor(synthetic_df=None, num_rows=10):
     # This logic now applies to the active_table_schema
     if not st.session_state.initial_schema_populated and synthetic_df is not None and not active_table_schema and st.session_state.active_table_name:
             for col_name_from_df in synthetic_df.columns:
-                inferred_type = "string" # Default
-                inferred_constraint = ""
-                # Attempt to find a canonical mapping for the column name
-                # This helps in pre-filling schema with more specific types if the column name is recognized
-                
-                # Normalize col_name_from_df for matching (e.g., lower, replace space with underscore)
-                normalized_col_name = col_name_from_df.lower().replace(" ", "_")
-                canonical_match = None
-
-                # Check direct match in canonical map
-                if normalized_col_name in CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP:
-                    canonical_match = normalized_col_name
-                else: # Check synonyms
-                    for syn, can in FIELD_SYNONYM_TO_CANONICAL_MAP.items():
-                        if syn == normalized_col_name: # Prioritize exact synonym match
-                            if can in CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP:
-                                canonical_match = can
-                                break
-                        elif syn in normalized_col_name: # Broader match (less reliable)
-                             if can in CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP:
-                                 canonical_match = can # Take first broader match
-                                 # break # Don't break, allow more specific synonym match later
-                
+                # Shared inference engine: canonical/synonym match (incl. synonyms contained in the name), keyword rules, fuzzy fallback
+                inferred_field_schema = infer_field_schema_from_name(col_name_from_df, allow_partial_synonym=True)
                 field_details_for_schema = {"name": col_name_from_df}
 
-                if canonical_match and canonical_match in CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP:
-                    details = CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP[canonical_match]
-                    field_details_for_schema["type"] = details["type"]
-                    field_details_for_schema["constraint"] = details["constraint"]
-                    # Carry over relevant flags for generation if needed by schema editor (e.g. for display hints)
-                    # For now, type and constraint are primary.
-                else: # Fallback to regex-based inference if no canonical match
+                if inferred_field_schema["_original_canonical"] in CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP:
+                    field_details_for_schema["type"] = inferred_field_schema["type"]
+                    field_details_for_schema["constraint"] = inferred_field_schema["constraint"]
+                else: # Editor-specific regex rules first (PII types like Aadhaar/PAN), then the engine's keyword rules
                     for pattern, f_type, f_constraint in SCHEMA_INFERENCE_RULES:
                         if re.search(pattern, col_name_from_df, re.IGNORECASE):
                             field_details_for_schema["type"] = f_type
                             field_details_for_schema["constraint"] = f_constraint
-                            break 
-                
+                            break
+                    else:
+                        field_details_for_schema["type"] = inferred_field_schema["type"]
+                        field_details_for_schema["constraint"] = inferred_field_schema["constraint"]
+
                 # Ensure default type and constraint if still not set
                 field_details_for_schema.setdefault("type", "string")
                 field_details_for_schema.setdefault("constraint", "")
@@ -3311,17 +1792,17 @@ def show_smart_schema_editor(synthetic_df=None, num_rows=10):
                 is_sensitive = new_field["type"] in ["email", "phone", "aadhaar", "pan", "passport", "voterid", "ifsc", "upi", "name", "address"]
                 new_field["pii_handling"] = new_field.get("pii_handling", default_global_pii_strategy if is_sensitive else "realistic_fake")
                 st.session_state.table_schemas[st.session_state.active_table_name].append(new_field)
-            st.session_state.generated_data_frames = {} # Clear previously generated multi-table data
+            datasets.generated_data_frames = {} # Clear previously generated multi-table data
             st.session_state.initial_schema_populated = True # Mark as populated (by template)
             # Clear data from other generation paths
-            st.session_state.prompt_generated_df = None
-            st.session_state.uploaded_df_for_schema = None
-            st.session_state.playground_generated_df = None
-            st.session_state.newly_generated_df_tab3 = None
-            st.session_state.synthetic_df_from_file_tab3 = None
+            datasets.prompt_generated_df = None
+            datasets.uploaded_df_for_schema = None
+            datasets.playground_generated_df = None
+            datasets.newly_generated_df_tab3 = None
+            datasets.synthetic_df_from_file_tab3 = None
         else: # User selected "None (Custom Schema)"
             st.session_state.table_schemas[st.session_state.active_table_name] = [] # Clear active table's schema
-            st.session_state.generated_data_frames = {}
+            datasets.generated_data_frames = {}
             st.session_state.initial_schema_populated = False # Allow re-inference if data is available
         st.rerun()
 
@@ -3580,7 +2061,14 @@ def show_smart_schema_editor(synthetic_df=None, num_rows=10):
     )
 
     # Generate button
-    if st.button("🔄 Generate Data from All Schemas", use_container_width=True, key="generate_all_schemas_button"):
+    generate_cols = st.columns([3, 1])
+    generate_all_clicked = generate_cols[0].button("🔄 Generate Data from All Schemas", use_container_width=True, key="generate_all_schemas_button")
+    new_draw_clicked = generate_cols[1].button("🎲 New Random Draw", use_container_width=True, key="new_random_draw_button", disabled=active_seed is not None,
+                                               help="Without a fixed seed, runs reuse this session's random seed, so editing a field regenerates only "
+                                                    "that field and the fields that read it. This draws a new seed and regenerates every column.")
+    if generate_all_clicked or new_draw_clicked:
+        if new_draw_clicked:
+            st.session_state.schema_editor_random_seed = resolve_seed(None)
         if not st.session_state.table_schemas:
             st.error("No tables defined. Please add tables and define their schemas.")
         else:
@@ -3596,33 +2084,84 @@ def show_smart_schema_editor(synthetic_df=None, num_rows=10):
                     valid_relationships = False
             
             if valid_relationships:
-                st.session_state.generated_data_frames = generate_hierarchical_data(
+                st.session_state.generation_profile_schema_editor = GenerationProfiler("Smart Schema Editor")
+                st.session_state.schema_editor_stream_seed = ( # Kept so the virtual table preview matches this run
+                    active_seed if active_seed is not None else st.session_state.schema_editor_random_seed)
+                datasets.generated_data_frames = generate_hierarchical_data(
                     st.session_state.table_schemas,
                     st.session_state.relationships,
                     st.session_state.num_rows_smart_schema_editor, # Use session state value
                     st.session_state.edge_cases,
-                    st.session_state.get(DEFAULT_PII_STRATEGY_KEY, "realistic_fake")
+                    st.session_state.get(DEFAULT_PII_STRATEGY_KEY, "realistic_fake"),
+                    profiler=st.session_state.generation_profile_schema_editor, seed=st.session_state.schema_editor_stream_seed,
+                    column_cache=st.session_state.column_cache
                 )
                 # Clear data from other generation paths
-                st.session_state.prompt_generated_df = None
-                st.session_state.uploaded_df_for_schema = None
-                st.session_state.playground_generated_df = None
-                st.session_state.newly_generated_df_tab3 = None
-                st.session_state.synthetic_df_from_file_tab3 = None
-                if st.session_state.generated_data_frames:
+                datasets.prompt_generated_df = None
+                datasets.uploaded_df_for_schema = None
+                datasets.playground_generated_df = None
+                datasets.newly_generated_df_tab3 = None
+                datasets.synthetic_df_from_file_tab3 = None
+                if datasets.generated_data_frames:
                     st.success("Hierarchical data generated successfully!")
-                    if not st.session_state.active_display_table_name or st.session_state.active_display_table_name not in st.session_state.generated_data_frames:
-                        st.session_state.active_display_table_name = list(st.session_state.generated_data_frames.keys())[0]
+                    if st.session_state.column_cache.hits: # Only edited columns (and columns that read them) were regenerated
+                        st.caption(f"Reused {st.session_state.column_cache.hits} unchanged column(s) from the previous run; regenerated {st.session_state.column_cache.misses}.")
+                    if not st.session_state.active_display_table_name or st.session_state.active_display_table_name not in datasets.generated_data_frames:
+                        st.session_state.active_display_table_name = list(datasets.generated_data_frames.keys())[0]
                 else:
                     st.error("Failed to generate hierarchical data. Check errors above.")
             else:
                 st.error("Please fix relationship errors before generating data.")
 
+    # --- NEW: Virtual table preview (rows generated on demand, nothing materialized) ---
+    with st.expander("🔭 Virtual Table Preview (page through up to 1B rows)"):
+        child_tables = {rel["child_table"] for rel in st.session_state.relationships}
+        virtual_table_options = [t for t, fields in st.session_state.table_schemas.items() if fields and t not in child_tables]
+        if not virtual_table_options:
+            st.info("Define a root table (one that is not the child of a relationship) with at least one field to preview it.")
+        else:
+            # Without a fixed seed, use the session's random seed, the one full runs use until a new draw
+            virtual_seed = active_seed if active_seed is not None else st.session_state.schema_editor_random_seed
+            st.caption(
+                "Only the rows of the current page are generated, from the table's random streams. They match a full run with the same "
+                "schema and row count: the fixed seed when one is set, or else this session's random seed until '🎲 New Random Draw'. "
+                "Scrambled columns are shown unscrambled (scrambling permutes a whole column)."
+            )
+            vt_cols = st.columns(3)
+            virtual_table_name = vt_cols[0].selectbox("Table", virtual_table_options, key="virtual_table_selector")
+            virtual_num_rows = int(vt_cols[1].number_input("Virtual rows", min_value=1, max_value=MAX_VIRTUAL_ROWS, value=MAX_VIRTUAL_ROWS, step=1_000_000, key="virtual_num_rows"))
+            virtual_page_size = vt_cols[2].selectbox("Rows per page", [50, DEFAULT_VIRTUAL_PAGE_SIZE, 500, 1000], index=1, key="virtual_page_size")
+
+            virtual_fields = [dict(f) for f in st.session_state.table_schemas[virtual_table_name]]
+            virtual_edge_cases = [dict(rule) for rule in st.session_state.edge_cases]
+            virtual_signature = repr((virtual_table_name, virtual_fields, virtual_edge_cases, virtual_num_rows, virtual_seed,
+                                      st.session_state.get(DEFAULT_PII_STRATEGY_KEY)))
+            virtual_table = st.session_state.get("virtual_table")
+            if virtual_table is None or st.session_state.get("virtual_table_signature") != virtual_signature:
+                virtual_table = VirtualTable(
+                    lambda streams, i: generate_table_row(streams, i, virtual_fields, virtual_edge_cases, virtual_table_name,
+                                                          st.session_state.virtual_profiler),
+                    virtual_num_rows, seed=virtual_seed, columns=[f["name"] for f in virtual_fields]
+                )
+                st.session_state.virtual_table = virtual_table
+                st.session_state.virtual_table_signature = virtual_signature
+
+            virtual_pages = virtual_table.num_pages(virtual_page_size)
+            if st.session_state.get("virtual_page", 1) > virtual_pages: # Row count or page size shrank
+                st.session_state.virtual_page = virtual_pages
+            virtual_page = int(st.number_input(f"Page (of {virtual_pages:,})", min_value=1, max_value=virtual_pages, value=1, step=1, key="virtual_page"))
+            st.session_state.virtual_profiler = GenerationProfiler("Virtual Table") # Reset per page request: only this page's timings
+            page_start = perf_counter()
+            virtual_page_df = virtual_table.page(virtual_page - 1, virtual_page_size)
+            page_seconds = perf_counter() - page_start
+            st.dataframe(virtual_page_df)
+            st.caption(f"Rows {virtual_page_df.index[0]:,}–{virtual_page_df.index[-1]:,} of {len(virtual_table):,} · generated in {page_seconds:.3f}s")
+
     # Display generated data if available
-    if st.session_state.generated_data_frames:
+    if datasets.generated_data_frames:
         st.subheader("📊 Generated Datasets")
         
-        display_table_options = list(st.session_state.generated_data_frames.keys())
+        display_table_options = list(datasets.generated_data_frames.keys())
         # Ensure active_display_table_name is valid
         if st.session_state.active_display_table_name not in display_table_options and display_table_options:
             st.session_state.active_display_table_name = display_table_options[0]
@@ -3634,15 +2173,22 @@ def show_smart_schema_editor(synthetic_df=None, num_rows=10):
             key="display_table_selector"
         )
 
-        if st.session_state.active_display_table_name and st.session_state.active_display_table_name in st.session_state.generated_data_frames:
-            df_to_display = st.session_state.generated_data_frames[st.session_state.active_display_table_name]
+        if st.session_state.active_display_table_name and st.session_state.active_display_table_name in datasets.generated_data_frames:
+            df_to_display = datasets.generated_data_frames[st.session_state.active_display_table_name]
             st.dataframe(df_to_display)
+            schema_editor_profiler = st.session_state.get("generation_profile_schema_editor")
 
+            export_start = perf_counter()
             csv_selected = df_to_display.to_csv(index=False)
+            if schema_editor_profiler:
+                schema_editor_profiler.set_stage("Export (CSV)", perf_counter() - export_start, rows=len(df_to_display))
+            export_start = perf_counter()
             excel_buffer_selected = io.BytesIO()
             with pd.ExcelWriter(excel_buffer_selected, engine='openpyxl') as writer_excel_sel:
                 df_to_display.to_excel(writer_excel_sel, index=False, sheet_name=st.session_state.active_display_table_name)
             excel_data_selected = excel_buffer_selected.getvalue()
+            if schema_editor_profiler:
+                schema_editor_profiler.set_stage("Export (Excel)", perf_counter() - export_start, rows=len(df_to_display))
 
             dl_cols = st.columns(3)
             with dl_cols[0]:
@@ -3662,12 +2208,16 @@ def show_smart_schema_editor(synthetic_df=None, num_rows=10):
                     key=f"download_excel_selected_{st.session_state.active_display_table_name}"
                 )
 
-            if len(st.session_state.generated_data_frames) > 0: # Show only if there are tables
+            if len(datasets.generated_data_frames) > 0: # Show only if there are tables
                 with dl_cols[2]:
+                    export_start = perf_counter()
                     zip_buffer = io.BytesIO()
                     with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-                        for table_n, table_df in st.session_state.generated_data_frames.items():
+                        for table_n, table_df in datasets.generated_data_frames.items():
                             zip_file.writestr(f"{table_n}.csv", table_df.to_csv(index=False))
+                    if schema_editor_profiler:
+                        schema_editor_profiler.set_stage("Export (ZIP)", perf_counter() - export_start,
+                                                         rows=sum(len(t) for t in datasets.generated_data_frames.values()))
                     
                     st.download_button( # This button directly triggers download
                         label="Download All Tables (ZIP)",
@@ -3676,181 +2226,22 @@ def show_smart_schema_editor(synthetic_df=None, num_rows=10):
                         mime="application/zip",
                         key="download_all_zip_final"
                     )
+            render_generation_profile(schema_editor_profiler)
+            # --- NEW: Emit the run's metrics record (once per run) ---
+            if schema_editor_profiler:
+                record_generation_run(
+                    "schema_editor", datasets.generated_data_frames, profiler=schema_editor_profiler, seed=st.session_state.get("schema_editor_stream_seed"),
+                    schema={"tables": st.session_state.table_schemas, "relationships": st.session_state.relationships},
+                    bytes_written={"csv": len(csv_selected.encode("utf-8")), "excel": len(excel_data_selected), "zip": zip_buffer.getbuffer().nbytes}
+                )
     # Fallback to old single schema_df display if it exists and no multi-table data generated
-    elif "schema_df" in st.session_state and st.session_state.schema_df is not None and not st.session_state.generated_data_frames:
+    elif "schema_df" in st.session_state and st.session_state.schema_df is not None and not datasets.generated_data_frames:
         st.subheader(f"📊 Generated Data (Legacy Single Table: {st.session_state.active_table_name or 'N/A'})")
         st.dataframe(st.session_state.schema_df)
         # ... (old download buttons for single schema_df, if you want to keep them as a fallback)
 
 
 # --- Helper functions for Ethical AI Dashboard Scores ---
-def calculate_bias_score(df):
-    """Calculates a bias score based on categorical column distributions."""
-    if df is None or df.empty:
-        return 50 # Default score if no data
-
-    categorical_cols = df.select_dtypes(include='object').columns.tolist()
-    # Attempt to find more categoricals if 'object' type is not sufficient
-    if not categorical_cols:
-         categorical_cols = [col for col in df.columns if df[col].nunique() < 20 and df[col].nunique() > 1 and df[col].nunique() < len(df)]
-
-
-    if not categorical_cols:
-        return 100 # No categorical columns to assess bias, so perfectly unbiased in this context
-
-    column_scores = []
-    for col in categorical_cols:
-        counts = df[col].value_counts()
-        num_categories = len(counts)
-        if num_categories <= 1:
-            column_scores.append(100) # Perfectly uniform or single category
-            continue
-
-        # Handle potential NaN values in counts before calculating probabilities
-        probabilities = counts / len(df[col].dropna())
-        # Ensure probabilities sum to 1 (or close to it) and handle potential floating point issues
-        probabilities = probabilities[probabilities > 0] # Remove categories with 0 count after dropna
-        probabilities = probabilities / probabilities.sum() # Re-normalize
-
-        if len(probabilities) <= 1: # After cleaning, might have only one category left
-             column_scores.append(100)
-             continue
-
-        entropy = -np.sum(probabilities * np.log2(probabilities + 1e-9)) # Add epsilon to avoid log(0)
-        max_entropy = np.log2(num_categories)
-
-        normalized_entropy = entropy / max_entropy if max_entropy > 0 else 1.0
-        column_scores.append(normalized_entropy * 100)
-
-    return np.mean(column_scores) if column_scores else 50
-
-MIN_SAMPLES_FOR_DRIFT_TEST = 20 # Minimum samples required in each series for a reliable test
-DRIFT_P_VALUE_THRESHOLD = 0.05 # Standard p-value threshold
-
-def detect_numerical_drift(series1, series2, column_name):
-    """
-    Detects drift between two numerical series using the Kolmogorov-Smirnov (K-S) test.
-    Returns: (bool: drift_detected, str: message)
-    """
-    s1_clean = series1.dropna()
-    s2_clean = series2.dropna()
-
-    if len(s1_clean) < MIN_SAMPLES_FOR_DRIFT_TEST or len(s2_clean) < MIN_SAMPLES_FOR_DRIFT_TEST:
-        return False, f"Insufficient data for drift test in '{column_name}' (s1: {len(s1_clean)}, s2: {len(s2_clean)} samples)."
-
-    if s1_clean.nunique() == 1 and s2_clean.nunique() == 1 and s1_clean.iloc[0] == s2_clean.iloc[0]:
-        return False, f"No drift in '{column_name}'; both series are constant and identical."
-    
-    try:
-        ks_statistic, p_value = stats.ks_2samp(s1_clean, s2_clean)
-        if p_value < DRIFT_P_VALUE_THRESHOLD:
-            return True, f"Drift detected in '{column_name}' (K-S test, p={p_value:.3g}). Distributions likely differ."
-        else:
-            return False, f"No significant drift detected in '{column_name}' (K-S test, p={p_value:.3g})."
-    except Exception as e:
-        return False, f"Error during K-S test for '{column_name}': {e}"
-
-def detect_categorical_drift(series1, series2, column_name):
-    """
-    Detects drift between two categorical series using the Chi-squared test.
-    Returns: (bool: drift_detected, str: message)
-    """
-    s1_clean = series1.dropna()
-    s2_clean = series2.dropna()
-
-    if len(s1_clean) < MIN_SAMPLES_FOR_DRIFT_TEST or len(s2_clean) < MIN_SAMPLES_FOR_DRIFT_TEST:
-        return False, f"Insufficient data for drift test in '{column_name}' (s1: {len(s1_clean)}, s2: {len(s2_clean)} samples)."
-
-    if s1_clean.nunique() == 0 or s2_clean.nunique() == 0:
-         return False, f"No data to compare for drift in '{column_name}' after cleaning."
-
-    s1_counts = s1_clean.value_counts()
-    s2_counts = s2_clean.value_counts()
-
-    combined_index = sorted(list(set(s1_counts.index) | set(s2_counts.index)))
-
-    if not combined_index:
-        return False, f"No common categories or data to compare for '{column_name}'."
-
-    observed_df = pd.DataFrame({
-        's1': s1_counts.reindex(combined_index, fill_value=0),
-        's2': s2_counts.reindex(combined_index, fill_value=0)
-    })
-    
-    # Remove categories that are zero in both (shouldn't happen if combined_index is from actual counts)
-    observed_df = observed_df.loc[(observed_df['s1'] > 0) | (observed_df['s2'] > 0)]
-
-    if observed_df.shape[0] < 2 or observed_df.shape[1] < 2: # Need at least a 2x2 table for chi2
-        # This can happen if one series is all one value and the other is all another, or one is empty.
-        # Check if distributions are identical by comparing normalized value counts
-        s1_norm_counts = s1_clean.value_counts(normalize=True).sort_index()
-        s2_norm_counts = s2_clean.value_counts(normalize=True).sort_index()
-        if s1_norm_counts.equals(s2_norm_counts):
-            return False, f"No drift in '{column_name}'; distributions are identical (small sample/categories)."
-        else:
-            return True, f"Drift detected in '{column_name}'; distributions differ (small sample/categories)."
-
-    try:
-        chi2, p_value, dof, expected = stats.chi2_contingency(observed_df.values)
-        if p_value < DRIFT_P_VALUE_THRESHOLD:
-            # Check for low expected frequencies
-            if (expected < 5).any().any(): # If any cell in expected frequencies is < 5
-                 return True, f"Drift detected in '{column_name}' (Chi-squared, p={p_value:.3g}). Note: Some expected frequencies are low (<5), test may be less reliable."
-            return True, f"Drift detected in '{column_name}' (Chi-squared, p={p_value:.3g}). Distributions likely differ."
-        else:
-            return False, f"No significant drift detected in '{column_name}' (Chi-squared, p={p_value:.3g})."
-    except ValueError as e: # Catches errors like "The internally computed table of expected frequencies has a zero element at..."
-        # This can happen if a whole row/column sum is 0 in the contingency table.
-        # Fallback to comparing normalized value counts for equality.
-        s1_norm_counts = s1_clean.value_counts(normalize=True).sort_index()
-        s2_norm_counts = s2_clean.value_counts(normalize=True).sort_index()
-        if s1_norm_counts.equals(s2_norm_counts):
-            return False, f"No drift in '{column_name}'; distributions appear identical (Chi-squared error: {e})."
-        else:
-            return True, f"Drift detected in '{column_name}'; distributions differ (Chi-squared error: {e})."
-    except Exception as e:
-        return False, f"Error during Chi-squared test for '{column_name}': {e}"
-
-def calculate_bias_score(df): # Original calculate_bias_score function was here, moved the new one above it.
-    """Calculates a bias score based on categorical column distributions."""
-    if df is None or df.empty:
-        return 50 # Default score if no data
-
-    categorical_cols = df.select_dtypes(include='object').columns.tolist()
-    # Attempt to find more categoricals if 'object' type is not sufficient
-    if not categorical_cols:
-         categorical_cols = [col for col in df.columns if df[col].nunique() < 20 and df[col].nunique() > 1 and df[col].nunique() < len(df)]
-
-
-    if not categorical_cols:
-        return 100 # No categorical columns to assess bias, so perfectly unbiased in this context
-
-    column_scores = []
-    for col in categorical_cols:
-        counts = df[col].value_counts()
-        num_categories = len(counts)
-        if num_categories <= 1:
-            column_scores.append(100) # Perfectly uniform or single category
-            continue
-
-        # Handle potential NaN values in counts before calculating probabilities
-        probabilities = counts / len(df[col].dropna())
-        # Ensure probabilities sum to 1 (or close to it) and handle potential floating point issues
-        probabilities = probabilities[probabilities > 0] # Remove categories with 0 count after dropna
-        probabilities = probabilities / probabilities.sum() # Re-normalize
-
-        if len(probabilities) <= 1: # After cleaning, might have only one category left
-             column_scores.append(100)
-             continue
-
-        entropy = -np.sum(probabilities * np.log2(probabilities + 1e-9)) # Add epsilon to avoid log(0)
-        max_entropy = np.log2(num_categories)
-
-        normalized_entropy = entropy / max_entropy if max_entropy > 0 else 1.0
-        column_scores.append(normalized_entropy * 100)
-
-    return np.mean(column_scores) if column_scores else 50
-
 def calculate_compliance_score(pii_risk_level, dpdp_risk_level, bias_score_val):
     """Calculates a compliance score."""
     score = 100
@@ -3869,41 +2260,21 @@ def calculate_compliance_score(pii_risk_level, dpdp_risk_level, bias_score_val):
     return max(0, min(100, round(score))) # Ensure score is between 0 and 100
 
 # --- Helper functions for synthesizing data from uploaded file ---
-def _synthesize_numeric_column_from_upload(original_series, column_name, num_rows_to_generate):
-    """Generates a new numeric series with num_rows_to_generate, based on original_series characteristics."""
+def _synthesize_numeric_column_from_upload(original_series, column_name, num_rows_to_generate, profile=None):
+    """
+    Generates a new numeric series with num_rows_to_generate by sampling a model fitted to original_series
+    (empirical PMF or quantile function, with zero-inflation, integer and missing-value handling).
+    `profile` (a full-file DatasetProfile from chunked ingestion) supplies the exact range when the series is a sample.
+    """
     if not pd.api.types.is_numeric_dtype(original_series):
         st.warning(f"Attempted to synthesize non-numeric column '{column_name}' as numeric. Skipping.")
         return pd.Series([np.nan] * num_rows_to_generate, name=column_name)
 
-    valid_series = original_series.dropna()
-    if valid_series.empty:
+    full_file_range = profile.numeric_range(column_name) if profile is not None else None
+    column_model = fit_numeric_column(original_series, value_range=full_file_range)
+    if column_model is None: # No non-NaN values
         return pd.Series([np.nan] * num_rows_to_generate, name=column_name)
-
-    min_val, max_val = valid_series.min(), valid_series.max()
-    is_integer_type = pd.api.types.is_integer_dtype(original_series)
-
-    generated_values = []
-    for _ in range(num_rows_to_generate):
-        if min_val == max_val: # Only one unique non-NaN value
-            val = min_val
-        elif is_integer_type:
-            # Ensure min_val and max_val are integers for randint
-            val = random.randint(int(round(min_val)), int(round(max_val)))
-        else:
-            val = random.uniform(min_val, max_val)
-        
-        if any(keyword in column_name.lower() for keyword in ['age', 'salary', 'price', 'cost', 'amount', 'quantity', 'marks', 'bedrooms', 'bathrooms']):
-            val = max(1 if is_integer_type else 0.01, val) # Ensure positivity
-        
-        # If original was integer, round the result if it became float due to positivity adjustment
-        if is_integer_type and isinstance(val, float):
-            val = round(val)
-            
-        generated_values.append(val)
-    
-    # Attempt to cast back to original dtype if possible, esp. for integers
-    new_series = pd.Series(generated_values, name=column_name)
-    return new_series.astype(original_series.dtype, errors='ignore')
+    return column_model.sample_series(num_rows_to_generate, name=column_name)
 
 
 PII_FIELD_SYNTHESIZERS_FOR_UPLOAD = {
@@ -3921,26 +2292,74 @@ PII_FIELD_SYNTHESIZERS_FOR_UPLOAD = {
     # SSN is in PII_FIELDS but not DPDP_PII_FIELDS, add if needed: 'ssn': ("ssn", "")
 }
 
-def _synthesize_categorical_column_from_upload(original_series, column_name, num_rows_to_generate):
-    """Synthesizes a categorical/object column with num_rows_to_generate. Fakes PII, samples others."""
-    # Check for PII first
+PII_SCAN_TYPE_TO_SYNTHESIZER = {
+    # Maps content-scan PII types (nullbyte.pii_scan) to (field_type_for_generate_value, constraint_for_generate_value)
+    'email': ("email", ""),
+    'mobile': ("phone", ""),
+    'aadhaar': ("aadhaar", ""),
+    'pan': ("pan", ""),
+    'voter_id': ("voterid", ""),
+    'ifsc': ("ifsc", ""),
+    'upi': ("upi", ""),
+}
+
+SYNTHESIS_METHOD_INDEPENDENT = "Independent columns"
+SYNTHESIS_METHOD_COPULA = "Gaussian copula (keeps correlations)"
+TSTR_SKIP_OPTION = "(skip ML utility)" # Benchmark target selectbox: no TSTR run
+privacy_ledger = PrivacyLedger() # Cumulative ε/δ per dataset (name and columns) (JSON lines, NULLBYTE_DP_LEDGER)
+
+
+def _describe_pii_column(column_name, pii_scan=None):
+    """Column name, with the content-scan finding (e.g. "col_7 (Aadhaar in 98% of sampled values)") if any."""
+    detected_type = pii_scan.detected_type(column_name) if pii_scan is not None else None
+    if detected_type is None:
+        return column_name
+    return f"{column_name} ({PII_SCAN_TYPE_LABELS[detected_type]} in {pii_scan.hit_rates[column_name][detected_type]:.0%} of sampled values)"
+
+
+def _pii_synthesizer_for_upload_column(column_name, pii_scan=None):
+    """
+    (type, constraint) used to fake an uploaded PII column, or None if the column is not faked.
+    A content-scan finding (`pii_scan`) takes precedence over the column name.
+    """
+    detected_type = pii_scan.detected_type(column_name) if pii_scan is not None else None
+    if detected_type is not None:
+        return PII_SCAN_TYPE_TO_SYNTHESIZER[detected_type]
     for keyword, (gen_type, gen_constraint) in PII_FIELD_SYNTHESIZERS_FOR_UPLOAD.items():
         if keyword in column_name.lower() and (column_name in PII_FIELDS or is_dpdp_pii(column_name)):
-            default_pii_strategy = st.session_state.get(DEFAULT_PII_STRATEGY_KEY, "realistic_fake")
-            field_schema_for_gen = {"type": gen_type, "constraint": gen_constraint, "name": column_name, "pii_handling": default_pii_strategy}
-            return pd.Series([_generate_value_from_schema(field_schema_for_gen) for _ in range(num_rows_to_generate)], name=column_name)
+            return gen_type, gen_constraint
+    return None
+
+
+def _synthesize_categorical_column_from_upload(original_series, column_name, num_rows_to_generate, profile=None, pii_scan=None):
+    """
+    Synthesizes a categorical/object column with num_rows_to_generate. Fakes PII (by name or `pii_scan` content), samples others.
+    Category frequencies come from `profile` (full file) when chunked ingestion tracked them.
+    """
+    # Check for PII first
+    pii_synthesizer = _pii_synthesizer_for_upload_column(column_name, pii_scan)
+    if pii_synthesizer is not None:
+        gen_type, gen_constraint = pii_synthesizer
+        default_pii_strategy = st.session_state.get(DEFAULT_PII_STRATEGY_KEY, "realistic_fake")
+        field_schema_for_gen = {"type": gen_type, "constraint": gen_constraint, "name": column_name, "pii_handling": default_pii_strategy}
+        return pd.Series([_generate_value_from_schema(field_schema_for_gen) for _ in range(num_rows_to_generate)], name=column_name)
 
     # Non-PII: sample from original distribution
     cleaned_series = original_series.dropna()
     if cleaned_series.empty:
         return pd.Series([np.nan] * num_rows_to_generate, name=column_name)
 
-    value_counts = cleaned_series.value_counts(normalize=True)
-    if value_counts.empty: # Should be caught by cleaned_series.empty, but safeguard
-        return pd.Series([np.nan] * num_rows_to_generate, name=column_name)
-        
-    unique_values = value_counts.index
-    probabilities = value_counts.values
+    full_file_distribution = profile.category_distribution(column_name) if profile is not None else None
+    if full_file_distribution:
+        unique_values, probabilities = full_file_distribution
+    else:
+        value_counts = cleaned_series.value_counts(normalize=True)
+        value_counts = value_counts[value_counts > 0] # Unused categories of category-dtype columns
+        if value_counts.empty: # Should be caught by cleaned_series.empty, but safeguard
+            return pd.Series([np.nan] * num_rows_to_generate, name=column_name)
+
+        unique_values = value_counts.index
+        probabilities = value_counts.values
     
     # Ensure probabilities sum to 1 (can be off due to floating point issues)
     probabilities = probabilities / np.sum(probabilities)
@@ -3948,6 +2367,8 @@ def _synthesize_categorical_column_from_upload(original_series, column_name, num
     generated_values = np.random.choice(unique_values, size=num_rows_to_generate, p=probabilities)
     
     new_series = pd.Series(generated_values, name=column_name)
+    if isinstance(original_series.dtype, pd.CategoricalDtype): # Full-file values may be missing from the sample's categories
+        return new_series.astype("category")
     return new_series.astype(original_series.dtype, errors='ignore')
 
 
@@ -3958,32 +2379,34 @@ with tab1:
     # Main Content for Text-based Generation
     if prompt:
         should_regenerate_tab1 = False
-        if st.session_state.prompt_generated_df is None:
+        if datasets.prompt_generated_df is None:
             should_regenerate_tab1 = True
         elif prompt != st.session_state.get('last_processed_prompt_tab1', ""):
             should_regenerate_tab1 = True
 
         if should_regenerate_tab1:
             # synthetic_df = generate_synthetic_data(prompt) # Old
-            synthetic_df_tab1, num_rows_generated_tab1, inferred_schema_for_editor_tab1 = generate_synthetic_data(prompt) # New
+            st.session_state.generation_profile_prompt = GenerationProfiler("Prompt")
+            st.session_state.prompt_stream_seed = resolve_seed(active_seed) # Kept so renamed columns are drawn from the same run's streams
+            synthetic_df_tab1, num_rows_generated_tab1, inferred_schema_for_editor_tab1 = generate_synthetic_data(prompt, profiler=st.session_state.generation_profile_prompt, seed=st.session_state.prompt_stream_seed) # New
 
-            st.session_state.prompt_generated_df = synthetic_df_tab1 # Store for tab2 access
+            datasets.prompt_generated_df = synthetic_df_tab1 # Store for tab2 access
             st.session_state.num_rows_from_prompt = num_rows_generated_tab1 # Store for editor
             st.session_state.inferred_schema_from_prompt = inferred_schema_for_editor_tab1 # Store for editor
             st.session_state.last_processed_prompt_tab1 = prompt # Update last processed prompt
 
             if synthetic_df_tab1 is not None:
                 # Clear data from other generation paths only when new prompt data is generated
-                st.session_state.uploaded_df_for_schema = None
-                st.session_state.generated_data_frames = {} # From Smart Schema
+                datasets.uploaded_df_for_schema = None
+                datasets.generated_data_frames = {} # From Smart Schema
                 st.session_state.active_display_table_name = None
-                st.session_state.playground_generated_df = None
-                st.session_state.newly_generated_df_tab3 = None
-                st.session_state.synthetic_df_from_file_tab3 = None
+                datasets.playground_generated_df = None
+                datasets.newly_generated_df_tab3 = None
+                datasets.synthetic_df_from_file_tab3 = None
             # If synthetic_df_tab1 is None, prompt_generated_df will be None, and the UI below won't render.
 
-        # Always work with st.session_state.prompt_generated_df from this point onwards in Tab 1
-        if st.session_state.prompt_generated_df is not None:
+        # Always work with datasets.prompt_generated_df from this point onwards in Tab 1
+        if datasets.prompt_generated_df is not None:
             st.subheader("📊 Generated Synthetic Data")
             # st.dataframe(synthetic_df) # Old way
 
@@ -3993,7 +2416,7 @@ with tab1:
 
             # Use a form to batch column name changes
             with st.form(key="column_rename_form_prompt"):
-                current_df_for_rename = st.session_state.prompt_generated_df
+                current_df_for_rename = datasets.prompt_generated_df
                 original_column_names_list = list(current_df_for_rename.columns)
                 
                 proposed_new_names_inputs = {} # To store the st.text_input widgets' current values
@@ -4042,11 +2465,11 @@ with tab1:
                 
                 if valid_rename and actual_rename_map: # Proceed only if valid and there are changes
                     # Update DataFrame
-                    df_to_update = st.session_state.prompt_generated_df.copy()
+                    df_to_update = datasets.prompt_generated_df.copy()
                     
                     # --- NEW: Intelligent Data Re-generation based on new column name ---
                     updated_schema_fields_for_tab1 = []
-                    original_df_columns_before_rename = list(st.session_state.prompt_generated_df.columns) # For mapping to schema
+                    original_df_columns_before_rename = list(datasets.prompt_generated_df.columns) # For mapping to schema
 
                     # First, apply the structural rename to the DataFrame
                     df_to_update.rename(columns=actual_rename_map, inplace=True)
@@ -4059,50 +2482,22 @@ with tab1:
                             
                             # If the name actually changed, re-infer schema and re-generate data
                             if new_col_name_for_data != original_col_name_for_schema_lookup:
-                                st.write(f"Re-evaluating column: '{original_col_name_for_schema_lookup}' renamed to '{new_col_name_for_data}'") # Debug
-                                
-                                # 1. Infer schema for the new_col_name_for_data
-                                effective_field_schema_for_regen = {"name": new_col_name_for_data, "type": "string", "constraint": "", "pii_handling": st.session_state.get(DEFAULT_PII_STRATEGY_KEY, "realistic_fake")}
-                                
-                                new_name_lower = new_col_name_for_data.lower()
-                                new_canonical_match = None
-                                sorted_synonyms_for_regen = sorted(FIELD_SYNONYM_TO_CANONICAL_MAP.keys(), key=len, reverse=True)
-                                for syn in sorted_synonyms_for_regen: # Find best canonical match
-                                    if syn == new_name_lower:
-                                        if FIELD_SYNONYM_TO_CANONICAL_MAP[syn] in CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP:
-                                            new_canonical_match = FIELD_SYNONYM_TO_CANONICAL_MAP[syn]; break
-                                if not new_canonical_match:
-                                    for syn in sorted_synonyms_for_regen:
-                                        if syn in new_name_lower:
-                                            if FIELD_SYNONYM_TO_CANONICAL_MAP[syn] in CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP:
-                                                new_canonical_match = FIELD_SYNONYM_TO_CANONICAL_MAP[syn]; break
-                                
-                                if new_canonical_match:
-                                    canonical_details = CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP[new_canonical_match]
-                                    effective_field_schema_for_regen.update(canonical_details) # Add all flags and details
-                                    effective_field_schema_for_regen["type"] = canonical_details.get("type", "string") # Ensure type is set
-                                    effective_field_schema_for_regen["constraint"] = canonical_details.get("constraint", "") # Ensure constraint is set
-                                else: # Fallback to basic keyword inference for novel names
-                                    if any(kw in new_name_lower for kw in ["date", "time", "timestamp", "dob", "joining"]): effective_field_schema_for_regen["type"] = "date"
-                                    elif any(kw in new_name_lower for kw in ["id", "count", "age", "quantity", "salary", "year", "number", "level"]):
-                                        effective_field_schema_for_regen["type"] = "int"
-                                        if "age" in new_name_lower: effective_field_schema_for_regen["constraint"] = "18-80"
-                                        else: effective_field_schema_for_regen["constraint"] = "0-1000"
-                                    elif any(kw in new_name_lower for kw in ["rate", "percent", "ratio", "score", "price", "amount", "value", "balance"]):
-                                        effective_field_schema_for_regen["type"] = "float"; effective_field_schema_for_regen["constraint"] = "0.0-100.0"
-                                    elif "email" in new_name_lower: effective_field_schema_for_regen["type"] = "email"
-                                    elif "phone" in new_name_lower: effective_field_schema_for_regen["type"] = "phone"
-                                    elif any(kw in new_name_lower for kw in ["address", "location", "city", "state", "country", "pincode", "zipcode"]): effective_field_schema_for_regen["type"] = "address"
-                                    elif "name" in new_name_lower and not any(kw in new_name_lower for kw in ["user", "company", "product", "brand", "model", "sensor", "item", "file", "column", "field"]): effective_field_schema_for_regen["type"] = "name"
-                                
+                                # 1. Infer schema for the new_col_name_for_data (shared engine; a synonym contained in the name also counts)
+                                effective_field_schema_for_regen = infer_field_schema_from_name(
+                                    new_col_name_for_data, st.session_state.get(DEFAULT_PII_STRATEGY_KEY, "realistic_fake"), allow_partial_synonym=True
+                                )
+
                                 # Ensure the name in the schema is the new name for generation
                                 effective_field_schema_for_regen["name"] = new_col_name_for_data
 
-                                # 2. Re-generate data for this column in df_to_update
+                                # 2. Re-generate only this column in df_to_update, from its own stream of the prompt run
                                 num_rows_for_regen = len(df_to_update)
-                                df_to_update[new_col_name_for_data] = [generate_value(effective_field_schema_for_regen.copy()) for _ in range(num_rows_for_regen)] # Pass a copy
-                                st.write(f"Data for '{new_col_name_for_data}' re-generated with type '{effective_field_schema_for_regen['type']}' and constraint '{effective_field_schema_for_regen['constraint']}'.") # Debug
-                                
+                                with RandomStreams(st.session_state.get("prompt_stream_seed")) as rename_streams:
+                                    df_to_update[new_col_name_for_data] = stream_column(
+                                        rename_streams, PROMPT_TABLE, new_col_name_for_data, num_rows_for_regen,
+                                        lambda n, schema=effective_field_schema_for_regen: [_generate_value_from_schema(schema.copy()) for _ in range(n)] # Pass a copy
+                                    )
+
                                 # Update the schema list item
                                 current_field_schema_dict.update(effective_field_schema_for_regen)
                             else: # Name didn't change, just ensure the name in schema dict is current
@@ -4110,11 +2505,11 @@ with tab1:
                             
                             updated_schema_fields_for_tab1.append(current_field_schema_dict)
                         
-                        st.session_state.prompt_generated_df = df_to_update
+                        datasets.prompt_generated_df = df_to_update
                         st.session_state.inferred_schema_from_prompt = updated_schema_fields_for_tab1
                         st.success("Column names updated, relevant data re-generated, and schema updated!")
                     else:
-                        st.session_state.prompt_generated_df = df_to_update # Update DF even if schema couldn't be
+                        datasets.prompt_generated_df = df_to_update # Update DF even if schema couldn't be
                         st.warning("DataFrame column names updated and data re-generated. Could not update schema field names due to a mismatch or missing schema. The original schema structure (with old names) will be sent to the editor if you proceed.")
                     st.rerun()
                 elif valid_rename and not actual_rename_map:
@@ -4123,16 +2518,16 @@ with tab1:
 
             st.markdown("---")
             st.subheader("✏️ Edit Data Values (Optional)")
-            # Use st.data_editor for cell editing. It operates on st.session_state.prompt_generated_df
+            # Use st.data_editor for cell editing. It operates on datasets.prompt_generated_df
             edited_df_from_editor = st.data_editor(
-                st.session_state.prompt_generated_df, 
+                datasets.prompt_generated_df, 
                 key="prompt_data_editor_main_tab1", # A consistent key for the editor, ensure it's unique if used elsewhere
                 num_rows="dynamic", # Allows adding/deleting rows
                 use_container_width=True
             )
             # Check if the DataFrame was actually changed by the data_editor
-            if not edited_df_from_editor.equals(st.session_state.prompt_generated_df):
-                 st.session_state.prompt_generated_df = edited_df_from_editor
+            if not edited_df_from_editor.equals(datasets.prompt_generated_df):
+                 datasets.prompt_generated_df = edited_df_from_editor
                  # Note: num_rows_from_prompt might become inconsistent if rows are added/deleted.
                  # The schema editor uses its own row count, so this is acceptable for now.
                  st.success("Data edits applied. These edits are local to this tab. The 'Send to Editor' button will use the original inferred schema structure (with updated names if you applied them).")
@@ -4149,19 +2544,19 @@ with tab1:
                 st.caption("No detailed schema was inferred from the prompt (or it was lost). Cannot send to editor.")
 
             # Dataset Summary
-            st.markdown(f"**Rows:** {st.session_state.prompt_generated_df.shape[0]} | **Columns:** {st.session_state.prompt_generated_df.shape[1]}")
+            st.markdown(f"**Rows:** {datasets.prompt_generated_df.shape[0]} | **Columns:** {datasets.prompt_generated_df.shape[1]}")
 
             # --- Ethical AI Dashboard for Prompt-Generated Data ---
             st.subheader("🛡️ Ethical AI Dashboard (Prompt Data)")
             dash_col1, dash_col2, dash_col3, dash_col4 = st.columns(4)
 
-            pii_cols_prompt = [col for col in st.session_state.prompt_generated_df.columns if col in PII_FIELDS or is_dpdp_pii(col)] # Combine PII and DPDP for general risk
-            dpdp_cols_prompt_specific = [col for col in st.session_state.prompt_generated_df.columns if is_dpdp_pii(col)]
+            pii_cols_prompt = [col for col in datasets.prompt_generated_df.columns if col in PII_FIELDS or is_dpdp_pii(col)] # Combine PII and DPDP for general risk
+            dpdp_cols_prompt_specific = [col for col in datasets.prompt_generated_df.columns if is_dpdp_pii(col)]
 
             pii_risk_level_prompt = "High" if pii_cols_prompt else "Low"
             dpdp_risk_level_prompt = "High" if dpdp_cols_prompt_specific else "Low"
             
-            bias_score_prompt = calculate_bias_score(st.session_state.prompt_generated_df)
+            bias_score_prompt = calculate_bias_score(datasets.prompt_generated_df, fingerprint=datasets.fingerprint('prompt_generated_df'))
             compliance_score_prompt = calculate_compliance_score(pii_risk_level_prompt, dpdp_risk_level_prompt, bias_score_prompt)
 
             dash_col1.metric("Bias Score", f"{bias_score_prompt:.0f} / 100",
@@ -4175,10 +2570,10 @@ with tab1:
 
             # --- Bias Detection for Prompt-Generated Data ---
             st.subheader("📊 Bias Detection (Prompt Data)")
-            categorical_cols_prompt = st.session_state.prompt_generated_df.select_dtypes(include='object').columns.tolist()
+            categorical_cols_prompt = categorical_like_columns(datasets.prompt_generated_df)
             # Attempt to find more categoricals if 'object' type is not sufficient
             if not categorical_cols_prompt:
-                 categorical_cols_prompt = [col for col in st.session_state.prompt_generated_df.columns if st.session_state.prompt_generated_df[col].nunique() < 20 and st.session_state.prompt_generated_df[col].nunique() > 1]
+                 categorical_cols_prompt = [col for col in datasets.prompt_generated_df.columns if datasets.prompt_generated_df[col].nunique() < 20 and datasets.prompt_generated_df[col].nunique() > 1]
 
             if categorical_cols_prompt:
                 selected_col_prompt = st.selectbox(
@@ -4187,7 +2582,8 @@ with tab1:
                     key="bias_checker_prompt"
                 )
                 if selected_col_prompt:
-                    value_counts_prompt = st.session_state.prompt_generated_df[selected_col_prompt].value_counts(normalize=True) * 100
+                    value_counts_prompt = datasets.prompt_generated_df[selected_col_prompt].value_counts(normalize=True) * 100
+                    value_counts_prompt = value_counts_prompt[value_counts_prompt > 0] # Unused categories
                     fig_prompt = px.bar(
                         value_counts_prompt,
                         x=value_counts_prompt.index,
@@ -4208,7 +2604,7 @@ with tab1:
                 pdf.cell(200, 10, txt=f"{APP_NAME} - Synthetic Data Report (From Text Prompt)", ln=True, align="C")
                 pdf.ln(10)
                 pdf.cell(200, 10, txt=f"Dataset Source: Text Prompt", ln=True)
-                pdf.cell(200, 10, txt=f"Generated Rows: {st.session_state.prompt_generated_df.shape[0]}, Columns: {st.session_state.prompt_generated_df.shape[1]}", ln=True)
+                pdf.cell(200, 10, txt=f"Generated Rows: {datasets.prompt_generated_df.shape[0]}, Columns: {datasets.prompt_generated_df.shape[1]}", ln=True)
                 pdf.cell(200, 10, txt=f"Bias Score: {bias_score_prompt:.0f} / 100", ln=True)
                 pdf.cell(200, 10, txt=f"PII Risk: {pii_risk_level_prompt}", ln=True)
                 if pii_cols_prompt:
@@ -4230,13 +2626,20 @@ with tab1:
                 )
 
             # Download options for generated data
-            csv_prompt = st.session_state.prompt_generated_df.to_csv(index=False)
+            prompt_profiler = st.session_state.get("generation_profile_prompt")
+            export_start = perf_counter()
+            csv_prompt = datasets.prompt_generated_df.to_csv(index=False)
+            if prompt_profiler:
+                prompt_profiler.set_stage("Export (CSV)", perf_counter() - export_start, rows=len(datasets.prompt_generated_df))
 
             # Use openpyxl to create Excel file
+            export_start = perf_counter()
             excel_buffer = io.BytesIO()
             with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer_excel:
-                st.session_state.prompt_generated_df.to_excel(writer_excel, index=False, sheet_name='Sheet1')
+                datasets.prompt_generated_df.to_excel(writer_excel, index=False, sheet_name='Sheet1')
             excel_data = excel_buffer.getvalue()
+            if prompt_profiler:
+                prompt_profiler.set_stage("Export (Excel)", perf_counter() - export_start, rows=len(datasets.prompt_generated_df))
 
             col1, col2 = st.columns(2)
             col1, col2, col3 = st.columns(3)
@@ -4259,10 +2662,11 @@ with tab1:
             with col3:
                 explain_context_prompt = {
                     "method": "Text Prompt",
-                    "prompt": st.session_state.get('last_processed_prompt_tab1', 'N/A')
+                    "prompt": st.session_state.get('last_processed_prompt_tab1', 'N/A'),
+                    "profile": prompt_profiler
                 }
                 explain_dfs_info_prompt = {
-                    "PromptGeneratedTable": {"rows": st.session_state.prompt_generated_df.shape[0], "cols": st.session_state.prompt_generated_df.shape[1]}
+                    "PromptGeneratedTable": {"rows": datasets.prompt_generated_df.shape[0], "cols": datasets.prompt_generated_df.shape[1]}
                 }
                 # Add DP info to context if it was applied
                 if st.session_state.get('advanced_lab_selection') == "🛡️ Differential Privacy":
@@ -4279,18 +2683,26 @@ with tab1:
                     mime="application/pdf",
                     key="download_explain_pdf_prompt"
                 )
+            render_generation_profile(prompt_profiler)
+            # --- NEW: Emit the run's metrics record (once per run) ---
+            if prompt_profiler:
+                record_generation_run(
+                    "prompt", {"PromptGeneratedTable": datasets.prompt_generated_df}, profiler=prompt_profiler, seed=st.session_state.get("prompt_stream_seed"),
+                    schema=st.session_state.get("inferred_schema_from_prompt"),
+                    bytes_written={"csv": len(csv_prompt.encode("utf-8")), "excel": len(excel_data), "pdf": len(explain_pdf_data_prompt)}
+                )
 
 with tab2:
     # Smart Schema Editor tab
     synth_df = None
     rows = 10
     # Check if there's data from prompt generation first
-    if 'prompt_generated_df' in st.session_state and st.session_state.prompt_generated_df is not None:
-         synth_df = st.session_state.prompt_generated_df
+    if 'prompt_generated_df' in datasets and datasets.prompt_generated_df is not None:
+         synth_df = datasets.prompt_generated_df
          rows = max(1, len(synth_df)) # Use synth_df which is now populated
     # If not, check if there's data from file upload
-    elif 'uploaded_df_for_schema' in st.session_state and st.session_state.uploaded_df_for_schema is not None:
-        synth_df = st.session_state.uploaded_df_for_schema
+    elif 'uploaded_df_for_schema' in datasets and datasets.uploaded_df_for_schema is not None:
+        synth_df = datasets.uploaded_df_for_schema
         rows = max(1, len(synth_df))
     # If schema_df (old single table) exists from a previous schema generation, use its row count
     elif 'schema_df' in st.session_state and st.session_state.schema_df is not None:
@@ -4302,26 +2714,47 @@ with tab2:
 with tab3:
     st.header("File-based Synthetic Data Generation")
     uploaded_file = st.file_uploader("Upload your CSV or XLSX dataset", type=["csv", "xlsx"], key="file_uploader_tab3")
+    # --- NEW: Local path ingestion (multi-GB extracts bypass the browser upload limit) ---
+    local_path_tab3 = st.text_input(
+        "...or read a CSV/XLSX from a local path on the server",
+        key="local_path_tab3",
+        placeholder="e.g., reference/customers_2024.csv",
+        help=f"Relative to (and restricted to) the local data directory: set {LOCAL_DATA_DIR_ENV}, default './{DEFAULT_LOCAL_DATA_DIR}'."
+    )
 
+    source_tab3, source_name_tab3, source_key_tab3 = None, None, None
     if uploaded_file:
+        source_tab3, source_name_tab3 = uploaded_file, uploaded_file.name
+        source_key_tab3 = ("upload", uploaded_file.file_id, uploaded_file.size)
+    elif local_path_tab3.strip():
         try:
-            # File Size Check
-            MAX_APP_FILE_SIZE = 50 * 1024 * 1024 # 50 MB
-            if uploaded_file.size > MAX_APP_FILE_SIZE:
-                st.error(f"File is too large ({uploaded_file.size / (1024*1024):.1f} MB). Maximum allowed size is {MAX_APP_FILE_SIZE / (1024*1024):.1f} MB.")
-                # Clear related session state if file is rejected
-                st.session_state.uploaded_df_for_schema = None
-                st.session_state.file_action_tab3 = None
-                st.session_state.newly_generated_df_tab3 = None
-                st.session_state.synthetic_df_from_file_tab3 = None
-                st.session_state.uploaded_file_name_tab3 = None # Clear the filename
-                st.stop() # Stop further processing in this tab for this run
-
-            if uploaded_file.name.endswith(".csv"):
-                df = pd.read_csv(uploaded_file)
+            source_tab3 = resolve_local_path(local_path_tab3.strip())
+            source_name_tab3 = source_tab3.name
+            source_stat = source_tab3.stat()
+            source_key_tab3 = ("path", str(source_tab3), source_stat.st_mtime_ns, source_stat.st_size)
+        except IngestError as ie:
+            st.error(str(ie))
+            source_tab3 = None
+
+    if source_tab3 is not None:
+        try:
+            # Chunked, typed ingestion runs once per file; reruns reuse the stored result
+            if st.session_state.get("ingested_source_key_tab3") == source_key_tab3 and datasets.get("ingested_df_tab3") is not None:
+                df = datasets.ingested_df_tab3
             else:
-                df = pd.read_excel(uploaded_file)
-        except pd.errors.ParserError as pe:
+                ingest_progress = st.empty()
+                with st.spinner(f"Reading {source_name_tab3} in chunks..."):
+                    ingest_result = ingest_table(
+                        source_tab3, source_name_tab3, seed=active_seed,
+                        progress=lambda rows_read: ingest_progress.caption(f"Read {rows_read:,} rows...")
+                    )
+                ingest_progress.empty()
+                df = ingest_result.frame
+                datasets.ingested_df_tab3 = df
+                st.session_state.uploaded_profile_tab3 = ingest_result.profile
+                st.session_state.uploaded_sampled_tab3 = ingest_result.sampled
+                st.session_state.ingested_source_key_tab3 = source_key_tab3
+        except (pa.ArrowInvalid, IngestError) as pe:
             st.error(f"Error parsing the file: {pe}. Please ensure the file is a valid CSV or Excel file.")
             df = None
         except MemoryError:
@@ -4333,45 +2766,62 @@ with tab3:
 
         if df is None:
             # Ensure related states are reset if file processing failed
-            st.session_state.uploaded_df_for_schema = None
+            datasets.uploaded_df_for_schema = None
             st.session_state.file_action_tab3 = None
-            st.session_state.newly_generated_df_tab3 = None
-            st.session_state.synthetic_df_from_file_tab3 = None
+            datasets.newly_generated_df_tab3 = None
+            datasets.synthetic_df_from_file_tab3 = None
             # return # Stop further processing in this tab if file load failed
         else:
             # If df is loaded successfully, proceed
-            st.session_state.uploaded_df_for_schema = df # Store for tab2 access
-            # PII Detection on Uploaded File
-            pii_columns = [col for col in df.columns if col in PII_FIELDS]
-            dpdp_columns = [col for col in df.columns if is_dpdp_pii(col)]
+            datasets.uploaded_df_for_schema = df # Store for tab2 access
+            upload_profile_tab3 = st.session_state.get("uploaded_profile_tab3")
+            if st.session_state.get("uploaded_sampled_tab3") and upload_profile_tab3 is not None:
+                st.info(f"Large file: {upload_profile_tab3.rows:,} rows read in {upload_profile_tab3.chunks} chunks. "
+                        f"Working with a uniform sample of {len(df):,} rows; numeric ranges and category frequencies "
+                        f"used for synthesis come from the full file.")
+            # PII Detection on Uploaded File: column names plus a sampled scan of the values
+            pii_scan_tab3 = scan_frame(df, verify_checksums=st.session_state.get("pii_scan_verify_checksums_tab3", True),
+                                       fingerprint=datasets.fingerprint('uploaded_df_for_schema'))
+            pii_columns = [col for col in df.columns if col in PII_FIELDS or col in pii_scan_tab3.pii_columns]
+            dpdp_columns = [col for col in df.columns if is_dpdp_pii(col) or col in pii_scan_tab3.dpdp_columns]
 
             if pii_columns:
-                st.warning(f"⚠️ Uploaded dataset contains potential PII columns: {', '.join(pii_columns)}")
+                st.warning(f"⚠️ Uploaded dataset contains potential PII columns: {', '.join(_describe_pii_column(col, pii_scan_tab3) for col in pii_columns)}")
 
             # Display DPDP-specific warnings
             if dpdp_columns:
                 for field in dpdp_columns:
                     st.markdown(f"""
                     <div class="dpdp-warning">
-                    🔐 <strong>DPDP Compliance Note</strong>: "{field}" contains PII under India's DPDP Act
+                    🔐 <strong>DPDP Compliance Note</strong>: "{_describe_pii_column(field, pii_scan_tab3)}" contains PII under India's DPDP Act
                     </div>
                     """, unsafe_allow_html=True)
 
+            with st.expander("🔎 PII Content Scan (sampled values per column)"):
+                st.checkbox("Verify checksums (Aadhaar Verhoeff digit, PAN holder type)", value=True, key="pii_scan_verify_checksums_tab3")
+                pii_scan_df_tab3 = pii_scan_tab3.to_dataframe()
+                if pii_scan_df_tab3.empty:
+                    st.info("No Aadhaar, PAN, Voter ID, IFSC, UPI, mobile number or email patterns found in the sampled values.")
+                else:
+                    st.dataframe(pii_scan_df_tab3.style.format({"Hit Rate": "{:.1%}"}), use_container_width=True, hide_index=True)
+                st.caption(f"Columns are flagged when at least {PII_SCAN_MIN_HIT_RATE:.0%} of the scanned values match. "
+                           "Flagged columns are faked during synthesis, whatever their name.")
+
             st.subheader("📊 Preview of Original Data")
             st.dataframe(df.head())
 
             # Reset choice if a new file is uploaded
-            if st.session_state.get('uploaded_file_name_tab3') != uploaded_file.name:
+            if st.session_state.get('uploaded_file_name_tab3') != source_name_tab3:
                 st.session_state.file_action_tab3 = None
-                st.session_state.uploaded_file_name_tab3 = uploaded_file.name
+                st.session_state.uploaded_file_name_tab3 = source_name_tab3
                 # Clear synthetic data derived from a *previous* file
-                st.session_state.newly_generated_df_tab3 = None
-                st.session_state.synthetic_df_from_file_tab3 = None
+                datasets.newly_generated_df_tab3 = None
+                datasets.synthetic_df_from_file_tab3 = None
                 # Also clear data from other generation tabs as a new base file is being introduced
-                st.session_state.prompt_generated_df = None
-                st.session_state.generated_data_frames = {}
+                datasets.prompt_generated_df = None
+                datasets.generated_data_frames = {}
                 st.session_state.active_display_table_name = None
-                st.session_state.playground_generated_df = None
+                datasets.playground_generated_df = None
                 st.session_state.num_rows_for_file_upload_tab3 = len(df) # Reset num_rows default
 
             st.markdown("---")
@@ -4396,16 +2846,45 @@ with tab3:
                     step=max(1, len(df) // 10 if len(df) > 10 else 1),
                     key="num_rows_for_file_upload_tab3" # Use the session state variable itself as the key
                 )
+                # --- NEW: Synthesis method (independent columns vs. Gaussian copula) ---
+                synthesis_method_tab3 = st.radio(
+                    "Synthesis method:",
+                    [SYNTHESIS_METHOD_INDEPENDENT, SYNTHESIS_METHOD_COPULA],
+                    key="synthesis_method_tab3",
+                    horizontal=True,
+                    help="Independent sampling keeps each column's distribution. The Gaussian copula also keeps "
+                         "correlations between columns (e.g. age vs. salary, city vs. pincode). PII columns are always faked.",
+                )
 
                 if st.button("Generate Synthetic Data", key="generate_synthetic_from_file_tab3", use_container_width=True):
                     num_to_generate = st.session_state.num_rows_for_file_upload_tab3
                     new_synthetic_data = {}
+                    copula_df = None
+                    faked_numeric_columns = [] # Identifiers stored as numbers (e.g. Aadhaar); fakes are formatted strings
+                    if synthesis_method_tab3 == SYNTHESIS_METHOD_COPULA:
+                        copula_columns = [c for c in df.columns if _pii_synthesizer_for_upload_column(c, pii_scan_tab3) is None]
+                        copula_key = (source_key_tab3, tuple(copula_columns))
+                        if st.session_state.get("copula_model_key_tab3") != copula_key: # Fit once per file
+                            with st.spinner("Fitting Gaussian copula..."):
+                                st.session_state.copula_model_tab3 = fit_gaussian_copula(df, columns=copula_columns, profile=upload_profile_tab3)
+                            st.session_state.copula_model_key_tab3 = copula_key
+                        copula_model = st.session_state.copula_model_tab3
+                        if copula_model is not None:
+                            copula_df = copula_model.sample(num_to_generate)
+                            st.caption(f"Gaussian copula over {len(copula_model.columns)} columns, fitted on "
+                                       f"{copula_model.rows_fitted:,} rows in {copula_model.fit_seconds:.2f}s.")
                     for col_name in df.columns: # Use columns from the original uploaded df
                         original_column_series = df[col_name] # Base characteristics on original column
-                        if pd.api.types.is_numeric_dtype(original_column_series):
-                            new_synthetic_data[col_name] = _synthesize_numeric_column_from_upload(original_column_series, col_name, num_to_generate)
-                        elif pd.api.types.is_object_dtype(original_column_series) or pd.api.types.is_categorical_dtype(original_column_series):
-                            new_synthetic_data[col_name] = _synthesize_categorical_column_from_upload(original_column_series, col_name, num_to_generate)
+                        if copula_df is not None and col_name in copula_df.columns:
+                            new_synthetic_data[col_name] = copula_df[col_name]
+                        elif _pii_synthesizer_for_upload_column(col_name, pii_scan_tab3) is not None: # PII by name or content, even in numeric columns
+                            new_synthetic_data[col_name] = _synthesize_categorical_column_from_upload(original_column_series, col_name, num_to_generate, pii_scan=pii_scan_tab3)
+                            if pd.api.types.is_numeric_dtype(original_column_series):
+                                faked_numeric_columns.append(col_name)
+                        elif pd.api.types.is_numeric_dtype(original_column_series):
+                            new_synthetic_data[col_name] = _synthesize_numeric_column_from_upload(original_column_series, col_name, num_to_generate, profile=upload_profile_tab3)
+                        elif pd.api.types.is_object_dtype(original_column_series) or pd.api.types.is_categorical_dtype(original_column_series) or pd.api.types.is_string_dtype(original_column_series):
+                            new_synthetic_data[col_name] = _synthesize_categorical_column_from_upload(original_column_series, col_name, num_to_generate, profile=upload_profile_tab3)
                         else:
                             if not original_column_series.dropna().empty:
                                 # For other types, sample with replacement from the original column to generate new rows
@@ -4416,25 +2895,27 @@ with tab3:
 
                     newly_generated_df = pd.DataFrame(new_synthetic_data)
                     
-                    st.session_state.newly_generated_df_tab3 = newly_generated_df # Store for drift detection
+                    datasets.newly_generated_df_tab3 = newly_generated_df # Store for drift detection
                     # Concatenate original df with the newly generated_df
                     combined_df = pd.concat([df, newly_generated_df], ignore_index=True)
+                    if faked_numeric_columns:
+                        combined_df[faked_numeric_columns] = combined_df[faked_numeric_columns].astype("string")
 
                     # Clear data from other generation paths
-                    st.session_state.prompt_generated_df = None
-                    st.session_state.generated_data_frames = {} # From Smart Schema
+                    datasets.prompt_generated_df = None
+                    datasets.generated_data_frames = {} # From Smart Schema
                     st.session_state.active_display_table_name = None
-                    st.session_state.playground_generated_df = None
-                    st.session_state.synthetic_df_from_file_tab3 = combined_df # Store the combined df
+                    datasets.playground_generated_df = None
+                    datasets.synthetic_df_from_file_tab3 = combined_df # Store the combined df
 
-                if 'synthetic_df_from_file_tab3' in st.session_state and st.session_state.synthetic_df_from_file_tab3 is not None:
-                    synthetic_df_from_file = st.session_state.synthetic_df_from_file_tab3
+                if 'synthetic_df_from_file_tab3' in datasets and datasets.synthetic_df_from_file_tab3 is not None:
+                    synthetic_df_from_file = datasets.synthetic_df_from_file_tab3
                     st.success(f"Successfully generated {len(synthetic_df_from_file) - len(df)} additional synthetic rows and appended to original data!")
                     st.dataframe(synthetic_df_from_file) # Show all generated data
                     st.markdown(f"**Rows:** {synthetic_df_from_file.shape[0]} | **Columns:** {synthetic_df_from_file.shape[1]}")
 
-                    pii_cols_synthetic_file = [col for col in synthetic_df_from_file.columns if col in PII_FIELDS or is_dpdp_pii(col)]
-                    dpdp_cols_synthetic_file = [col for col in synthetic_df_from_file.columns if is_dpdp_pii(col)]
+                    pii_cols_synthetic_file = [col for col in synthetic_df_from_file.columns if col in PII_FIELDS or is_dpdp_pii(col) or col in pii_scan_tab3.pii_columns]
+                    dpdp_cols_synthetic_file = [col for col in synthetic_df_from_file.columns if is_dpdp_pii(col) or col in pii_scan_tab3.dpdp_columns]
 
                     if pii_cols_synthetic_file:
                         st.warning(f"⚠️ Generated synthetic data (from file) contains PII-like columns: {', '.join(pii_cols_synthetic_file)}")
@@ -4455,29 +2936,24 @@ with tab3:
                         st.download_button(label="Download Excel (Synthetic)", data=excel_data_syn_file, file_name="synthetic_data_from_file.xlsx", mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", key="download_excel_synthetic_file")
                     
                     # --- Data Drift Analysis ---
-                    if 'newly_generated_df_tab3' in st.session_state and st.session_state.newly_generated_df_tab3 is not None:
+                    if 'newly_generated_df_tab3' in datasets and datasets.newly_generated_df_tab3 is not None:
                         original_df_for_drift = df # Uploaded original
-                        synthetic_part_df_for_drift = st.session_state.newly_generated_df_tab3
+                        synthetic_part_df_for_drift = datasets.newly_generated_df_tab3
 
                         st.markdown("---")
                         st.subheader("🔬 Data Drift Analysis (Original vs. Synthetic Part)")
-                        drift_messages = []
-                        drift_count = 0
-                        for col in original_df_for_drift.columns:
-                            if col not in synthetic_part_df_for_drift.columns:
-                                drift_messages.append(f"Column '{col}' missing in synthetic part, cannot compare.")
-                                continue
-
-                            if pd.api.types.is_numeric_dtype(original_df_for_drift[col]):
-                                drifted, msg = detect_numerical_drift(original_df_for_drift[col], synthetic_part_df_for_drift[col], col)
-                            else: # Assume categorical for others
-                                drifted, msg = detect_categorical_drift(original_df_for_drift[col], synthetic_part_df_for_drift[col], col)
-                            
-                            if drifted:
-                                st.warning(msg)
-                                drift_count += 1
-                            drift_messages.append(msg) # Store all messages for a summary or detailed report later if needed
+                        # Profiles and reports are cached by the stored fingerprints (hashed once per dataset version), so reruns reuse them
+                        drift_report = compare_frames(original_df_for_drift, synthetic_part_df_for_drift,
+                                                      reference_fingerprint=datasets.fingerprint('uploaded_df_for_schema'),
+                                                      comparison_fingerprint=datasets.fingerprint('newly_generated_df_tab3'))
+                        for msg in drift_report.loc[drift_report["Drift"], "Message"]:
+                            st.warning(msg)
+                        drift_count = int(drift_report["Drift"].sum())
                         st.info(f"Drift analysis complete. {drift_count} column(s) showed significant drift out of {len(original_df_for_drift.columns)}.")
+                        with st.expander("Per-column drift statistics (K-S / Chi-squared, PSI, Wasserstein)"):
+                            st.dataframe(drift_report, use_container_width=True, hide_index=True)
+                            st.caption(("Cached result" if drift_report.attrs.get("cached") else "Computed") +
+                                       f" in {drift_report.attrs.get('seconds', 0):.2f}s. PSI above 0.1 suggests a moderate shift, above 0.25 a major one.")
 
             elif st.session_state.file_action_tab3 == "compliance":
                 st.markdown("---")
@@ -4485,7 +2961,7 @@ with tab3:
                 # Bias Checker for original uploaded data
                 st.subheader("📈 Bias Checker (Original Uploaded Data)")
                 if not df.empty:
-                    categorical_cols_upload = df.select_dtypes(include='object').columns.tolist()
+                    categorical_cols_upload = categorical_like_columns(df)
                     if not categorical_cols_upload:
                         categorical_cols_upload = [col for col in df.columns if df[col].nunique() < 20 and df[col].nunique() > 1]
                     
@@ -4503,11 +2979,12 @@ with tab3:
                 # Ethical Scorecard for original uploaded data
                 st.subheader("✅ Ethical Scorecard (Original Uploaded Data Analysis)")
                 score_col1, score_col2, score_col3 = st.columns(3)
-                pii_cols_uploaded_orig = [col for col in df.columns if col in PII_FIELDS or is_dpdp_pii(col)]
-                dpdp_cols_uploaded_specific_orig = [col for col in df.columns if is_dpdp_pii(col)]
+                pii_cols_uploaded_orig = [_describe_pii_column(col, pii_scan_tab3) for col in df.columns if col in PII_FIELDS or is_dpdp_pii(col) or col in pii_scan_tab3.pii_columns]
+                dpdp_cols_uploaded_specific_orig = [_describe_pii_column(col, pii_scan_tab3) for col in df.columns if is_dpdp_pii(col) or col in pii_scan_tab3.dpdp_columns]
                 pii_risk_level_uploaded_orig = "High" if pii_cols_uploaded_orig else "Low"
                 dpdp_risk_level_uploaded_orig = "High" if dpdp_cols_uploaded_specific_orig else "Low"
-                bias_score_uploaded_orig = calculate_bias_score(df)
+                bias_score_uploaded_orig = calculate_bias_score(df, full_file_profile=upload_profile_tab3,
+                                                                fingerprint=datasets.fingerprint('uploaded_df_for_schema'))
 
                 score_col1.metric("Bias Score (Original)", f"{bias_score_uploaded_orig:.0f} / 100")
                 score_col2.metric("PII Risk (Original)", pii_risk_level_uploaded_orig)
@@ -4521,7 +2998,7 @@ with tab3:
                     pdf_upload.set_font("Arial", size=12)
                     pdf_upload.cell(200, 10, txt=f"{APP_NAME} - Original Data Report", ln=True, align="C")
                     pdf_upload.ln(10)
-                    pdf_upload.cell(200, 10, txt=f"Dataset: {uploaded_file.name}", ln=True)
+                    pdf_upload.cell(200, 10, txt=f"Dataset: {source_name_tab3}", ln=True)
                     pdf_upload.cell(200, 10, txt=f"Bias Score: {bias_score_uploaded_orig:.0f} / 100", ln=True)
                     pdf_upload.cell(200, 10, txt=f"PII Risk: {pii_risk_level_uploaded_orig}", ln=True)
                     if pii_cols_uploaded_orig: pdf_upload.cell(200, 10, txt=f"Detected PII Fields: {', '.join(pii_cols_uploaded_orig)}", ln=True)
@@ -4570,7 +3047,7 @@ with tab4:
                 st.session_state.playground_schema_fields.append(new_field)
         else:
             st.session_state.playground_schema_fields = [] # Clear if "None" is selected
-        st.session_state.playground_generated_df = None # Clear previous results
+        datasets.playground_generated_df = None # Clear previous results
         st.session_state.playground_edge_cases = [] # Clear edge cases when template changes
         st.rerun()
 
@@ -4598,21 +3075,24 @@ with tab4:
 
     if st.button("🔄 Generate Scenario Data", key="generate_playground_data", disabled=not st.session_state.playground_schema_fields):
         if st.session_state.playground_schema_fields:
-            st.session_state.playground_generated_df = generate_single_table_data_with_edge_cases(
+            st.session_state.generation_profile_playground = GenerationProfiler("Scenario Playground")
+            st.session_state.playground_stream_seed = resolve_seed(active_seed) # Recorded in the run's metrics
+            datasets.playground_generated_df = generate_single_table_data_with_edge_cases(
                 schema_fields=st.session_state.playground_schema_fields,
                 num_rows=st.session_state.playground_num_rows,
                 edge_cases_list=st.session_state.playground_edge_cases,
                 pii_strategy_global=st.session_state.get(DEFAULT_PII_STRATEGY_KEY, "realistic_fake"),
-                table_name_for_conditions=st.session_state.playground_table_name_for_conditions
+                table_name_for_conditions=st.session_state.playground_table_name_for_conditions,
+                profiler=st.session_state.generation_profile_playground, seed=st.session_state.playground_stream_seed
             )
-            if st.session_state.playground_generated_df is not None:
+            if datasets.playground_generated_df is not None:
                 # Clear data from other main generation paths
-                st.session_state.prompt_generated_df = None
-                st.session_state.uploaded_df_for_schema = None
-                st.session_state.generated_data_frames = {}
+                datasets.prompt_generated_df = None
+                datasets.uploaded_df_for_schema = None
+                datasets.generated_data_frames = {}
                 st.session_state.active_display_table_name = None
-                st.session_state.newly_generated_df_tab3 = None
-                st.session_state.synthetic_df_from_file_tab3 = None
+                datasets.newly_generated_df_tab3 = None
+                datasets.synthetic_df_from_file_tab3 = None
                 st.success("Scenario data generated!")
             else:
                 st.error("Failed to generate scenario data. Check if schema is valid.")
@@ -4620,11 +3100,15 @@ with tab4:
             st.warning("Please select a schema template with fields before generating data.")
 
     # 4. Display Generated Scenario Data
-    if st.session_state.playground_generated_df is not None:
+    if datasets.playground_generated_df is not None:
         st.subheader("📊 Generated Scenario Data")
-        st.dataframe(st.session_state.playground_generated_df)
+        st.dataframe(datasets.playground_generated_df)
         
-        csv_playground = st.session_state.playground_generated_df.to_csv(index=False).encode('utf-8')
+        playground_profiler = st.session_state.get("generation_profile_playground")
+        export_start = perf_counter()
+        csv_playground = datasets.playground_generated_df.to_csv(index=False).encode('utf-8')
+        if playground_profiler:
+            playground_profiler.set_stage("Export (CSV)", perf_counter() - export_start, rows=len(datasets.playground_generated_df))
         st.download_button(
             label="Download Scenario CSV",
             data=csv_playground,
@@ -4632,6 +3116,14 @@ with tab4:
             mime="text/csv",
             key="download_csv_playground"
         )
+        render_generation_profile(playground_profiler)
+        # --- NEW: Emit the run's metrics record (once per run) ---
+        if playground_profiler:
+            record_generation_run(
+                "playground", {st.session_state.playground_table_name_for_conditions or "Scenario": datasets.playground_generated_df},
+                profiler=playground_profiler, seed=st.session_state.get("playground_stream_seed"), schema=st.session_state.playground_schema_fields,
+                bytes_written={"csv": len(csv_playground)}
+            )
 
 with tab5:
     st.header("🏛️ Community Schema Gallery")
@@ -4675,13 +3167,13 @@ with tab5:
                 st.session_state.active_table_name = target_table_name_for_gallery_load # Ensure this is the active table
                 st.session_state.selected_template_name = template_name # Update Tab 2's dropdown state
                 st.session_state.initial_schema_populated = True
-                st.session_state.generated_data_frames = {} # Clear any old generated data
+                datasets.generated_data_frames = {} # Clear any old generated data
                 # Clear data from other generation paths
-                st.session_state.prompt_generated_df = None
-                st.session_state.uploaded_df_for_schema = None
-                st.session_state.playground_generated_df = None
-                st.session_state.newly_generated_df_tab3 = None
-                st.session_state.synthetic_df_from_file_tab3 = None
+                datasets.prompt_generated_df = None
+                datasets.uploaded_df_for_schema = None
+                datasets.playground_generated_df = None
+                datasets.newly_generated_df_tab3 = None
+                datasets.synthetic_df_from_file_tab3 = None
                 st.success(f"Template '{template_name}' loaded into table '{target_table_name_for_gallery_load}' in the Smart Schema Editor. Please navigate there to continue.")
                 st.rerun() # Rerun to switch context to Tab 2 if user is on Tab 5
 
@@ -4724,27 +3216,93 @@ with tab_advanced_lab:
         )
 
         if st.session_state.deep_model_type in ["GAN (Tabular)", "VAE (Tabular)"]:
+            deep_model_key = "ctgan" if st.session_state.deep_model_type == "GAN (Tabular)" else "tvae"
             st.markdown(f"""
             {st.session_state.deep_model_type} models learn the underlying patterns from an existing tabular dataset to generate new, synthetic samples.
-            You would typically upload your real dataset here for the model to train on.
+            Training runs on CPU in a background process; trained models are saved and can be sampled again without retraining.
             """)
+            if not deep_models_available():
+                st.warning("Deep tabular models need the `ctgan` and `torch` packages (pinned in requirements.txt). Install them to enable training.")
+
             uploaded_deep_model_file = st.file_uploader(
                 f"Upload Training Data (CSV/XLSX) for {st.session_state.deep_model_type}",
                 type=["csv", "xlsx"],
                 key="deep_model_file_uploader"
             )
             if uploaded_deep_model_file:
-                st.success(f"File '{uploaded_deep_model_file.name}' uploaded. In a full implementation, this would be used for training.")
-                st.session_state.deep_model_data_uploaded = True
+                deep_source_key = (uploaded_deep_model_file.file_id, uploaded_deep_model_file.size)
+                try:
+                    if st.session_state.get("deep_model_source_key") != deep_source_key or datasets.get("deep_model_training_df") is None:
+                        with st.spinner(f"Reading {uploaded_deep_model_file.name} in chunks..."):
+                            datasets.deep_model_training_df = ingest_table(uploaded_deep_model_file, uploaded_deep_model_file.name, seed=active_seed).frame
+                        st.session_state.deep_model_source_key = deep_source_key
+                    st.success(f"File '{uploaded_deep_model_file.name}' loaded: {len(datasets.deep_model_training_df):,} rows for training.")
+                    st.session_state.deep_model_data_uploaded = True
+                except (pa.ArrowInvalid, IngestError) as e:
+                    st.error(f"Error reading training data: {e}")
+                    st.session_state.deep_model_data_uploaded = False
             else:
                 st.session_state.deep_model_data_uploaded = False
 
-            st.number_input("Number of Synthetic Rows to Generate:", min_value=10, value=100, key="deep_model_num_rows")
-            st.text_input("Model Parameters (e.g., epochs, batch_size - conceptual):", value="epochs=100, batch_size=32", key="deep_model_params_tabular", disabled=True)
-
-            if st.button(f"Train & Generate with {st.session_state.deep_model_type}", key="deep_model_generate_tabular_btn", disabled=not st.session_state.deep_model_data_uploaded):
-                st.info(f"Placeholder: Simulating training of {st.session_state.deep_model_type} and generation of data. This would involve significant computation in a real scenario.")
-                st.success("Conceptual generation complete! (No actual data generated in this placeholder).")
+            col_epochs, col_batch, col_threads, col_checkpoint = st.columns(4)
+            with col_epochs:
+                st.number_input("Epochs:", min_value=1, max_value=10000, value=100, key="deep_model_epochs")
+            with col_batch:
+                st.number_input("Batch size:", min_value=10, max_value=100000, value=500, step=10, key="deep_model_batch_size",
+                                help="CTGAN needs a multiple of 10 (its discriminator packs 10 rows).")
+            with col_threads:
+                st.number_input("Torch CPU threads:", min_value=1, max_value=max(1, os.cpu_count() or 1),
+                                value=max(1, (os.cpu_count() or 2) // 2), key="deep_model_threads")
+            with col_checkpoint:
+                st.number_input("Checkpoint every N epochs:", min_value=0, value=10, key="deep_model_checkpoint_every",
+                                help="0 disables intermediate checkpoints. A cancelled run keeps its last checkpoint as a model.")
+            default_model_name = f"{os.path.splitext(uploaded_deep_model_file.name)[0]}_{deep_model_key}" if uploaded_deep_model_file else deep_model_key
+            st.text_input("Model name:", value=default_model_name, key="deep_model_name")
+
+            training_job = st.session_state.deep_training_job
+            training_running = training_job is not None and not training_job.finished
+            if st.button(f"Train {st.session_state.deep_model_type} in Background", key="deep_model_generate_tabular_btn",
+                         disabled=not st.session_state.deep_model_data_uploaded or training_running or not deep_models_available()):
+                batch_size = int(st.session_state.deep_model_batch_size)
+                if deep_model_key == "ctgan" and batch_size % 10:
+                    st.error("CTGAN batch size must be a multiple of 10.")
+                else:
+                    st.session_state.deep_training_job = start_training(
+                        datasets.deep_model_training_df, deep_model_key, st.session_state.deep_model_name,
+                        epochs=int(st.session_state.deep_model_epochs), batch_size=batch_size,
+                        torch_threads=int(st.session_state.deep_model_threads),
+                        checkpoint_every=int(st.session_state.deep_model_checkpoint_every),
+                        source=uploaded_deep_model_file.name,
+                    )
+                    st.session_state.deep_training_job_reported = False
+            render_training_status(st.session_state.deep_training_job)
+
+            # --- NEW: Sampling from saved models ---
+            saved_models = list_saved_models(deep_model_key)
+            if saved_models:
+                st.markdown(f"**Generate from a saved {DEEP_MODEL_TYPES[deep_model_key]} model**")
+                saved_model_labels = {
+                    m["name"]: f"{m['name']} ({m.get('rows') or 0:,} rows, {m.get('epochs_trained') or '?'} epochs, {m.get('created_at', '')})"
+                    for m in saved_models
+                }
+                selected_saved_model = st.selectbox("Saved model:", list(saved_model_labels), format_func=saved_model_labels.get, key="deep_model_saved_selector")
+                st.number_input("Number of Synthetic Rows to Generate:", min_value=10, value=100, key="deep_model_num_rows")
+                if st.button("Generate from Saved Model", key="deep_model_sample_btn", disabled=not deep_models_available()):
+                    deep_sample_seed = resolve_seed(active_seed) % 2**32 # CTGAN/TVAE random states take 32-bit seeds
+                    with st.spinner(f"Sampling {st.session_state.deep_model_num_rows:,} rows..."):
+                        datasets.deep_model_generated_df = sample_saved_model(
+                            selected_saved_model, int(st.session_state.deep_model_num_rows),
+                            torch_threads=int(st.session_state.deep_model_threads), seed=deep_sample_seed,
+                        )
+                    record_generation_run(f"advanced_lab_{deep_model_key}", {selected_saved_model: datasets.deep_model_generated_df}, seed=deep_sample_seed,
+                                          workers=int(st.session_state.deep_model_threads))
+            if datasets.get("deep_model_generated_df") is not None:
+                deep_generated_df = datasets.deep_model_generated_df
+                st.dataframe(deep_generated_df.head(100), use_container_width=True)
+                st.download_button(
+                    "📥 Download CSV", deep_generated_df.to_csv(index=False).encode("utf-8"),
+                    file_name="deep_model_synthetic_data.csv", mime="text/csv", key="deep_model_download_csv",
+                )
 
         elif st.session_state.deep_model_type == "Transformer/GPT (Text/Structured from Prompt)":
             st.markdown("""
@@ -4794,11 +3352,12 @@ with tab_advanced_lab:
         - **Epsilon (ε):** The privacy loss parameter. A smaller epsilon means stronger privacy (less information leakage about individuals).
         - **Delta (δ):** The probability that the privacy guarantee might be broken. Often set to a very small number. (For simplicity, we are focusing on ε-DP here).
 
-        **Current Status:** This section is a placeholder for future development. Implementing true Differential Privacy is complex and requires specialized algorithms and careful calibration.
+        **How it works here:** the DP Histogram Synthesizer releases noisy histograms of the data uploaded in 'File-based Generation'
+        (the first column's histogram and a 2-way histogram of every column with the previous one), splitting ε (and δ) across them.
+        Synthetic rows are then sampled from the noisy tables, which costs no further privacy. Every release is recorded in a privacy ledger per dataset.
         """)
-        st.info("✨ **Coming Soon:** Full integration of Differential Privacy mechanisms for provably private synthetic data.")
 
-        st.markdown("Below are conceptual controls for how DP might be applied. Actual implementation would involve adding calibrated noise during the data generation or aggregation process.")
+        dp_source_df = datasets.get('uploaded_df_for_schema')
         st.session_state.dp_epsilon = st.number_input(
             "Privacy Budget - Epsilon (ε):",
             min_value=0.01, max_value=10.0, value=st.session_state.dp_epsilon, step=0.1,
@@ -4806,24 +3365,123 @@ with tab_advanced_lab:
             key="dp_epsilon_input"
         )
         st.session_state.dp_mechanism_numeric = st.selectbox(
-            "Conceptual DP Mechanism for Numerical Data:",
+            "Histogram Noise Mechanism:",
             options=["Laplace Mechanism", "Gaussian Mechanism"],
             index=["Laplace Mechanism", "Gaussian Mechanism"].index(st.session_state.dp_mechanism_numeric),
             key="dp_mech_numeric_selector",
-            help="Technique to add noise to numerical values to achieve DP."
-        )
-        st.session_state.dp_mechanism_categorical = st.selectbox(
-            "Conceptual DP Mechanism for Categorical Data:",
-            options=["Randomized Response", "Exponential Mechanism (for counts/histograms)"],
-            index=["Randomized Response", "Exponential Mechanism (for counts/histograms)"].index(st.session_state.dp_mechanism_categorical),
-            key="dp_mech_categorical_selector",
-            help="Technique to perturb categorical values or their distributions for DP."
+            help="Laplace gives pure ε-DP. Gaussian gives (ε, δ)-DP and needs ε ≤ 1 per noisy histogram."
         )
-        st.markdown("**Note on Data Utility:** Applying Differential Privacy involves adding noise, which can reduce the utility (accuracy or realism) of the synthetic data. There's always a trade-off between privacy (ε) and utility.")
-        if st.button("Generate Data with Conceptual DP", key="dp_generate_btn"):
-            st.info(f"Placeholder: Simulating data generation with Differential Privacy (ε={st.session_state.dp_epsilon}). This would involve applying noise based on the selected mechanisms and epsilon to the generation process.")
-            st.success("Conceptual DP-aware generation complete! (No actual data generated in this placeholder).")
-        st.markdown("A real DP implementation would typically provide a report detailing: Epsilon (ε) and Delta (δ) values, mechanisms used, assumptions, and interpretation guidance.")
+        dp_delta = st.number_input("Delta (δ):", min_value=1e-12, max_value=0.1, value=1e-6, format="%.1e", key="dp_delta_input",
+                                   disabled=st.session_state.dp_mechanism_numeric != "Gaussian Mechanism",
+                                   help="Only used by the Gaussian mechanism. Keep it well below 1 / number of rows.")
+
+        if dp_source_df is None:
+            st.warning("Upload a dataset in the 'File-based Generation' tab to synthesize it with Differential Privacy.")
+        else:
+            dp_dataset_name = st.session_state.get('uploaded_file_name_tab3') or "uploaded data"
+            dp_dataset_key = dp_ledger_key(dp_dataset_name, dp_source_df.columns)
+            dp_kinds, dp_identifier_columns = comparable_column_kinds(dp_source_df, dp_source_df)
+            dp_columns = st.multiselect(
+                "Columns to synthesize (in chain order; each column is modelled jointly with the one before it):",
+                options=list(dp_source_df.columns), default=list(dp_kinds), key="dp_columns_selector",
+                help="Identifier-like columns are left out by default: their category lists would reveal individual values."
+            )
+            dp_col1, dp_col2 = st.columns(2)
+            dp_bins = dp_col1.number_input("Bins per numeric column:", min_value=2, max_value=200, value=DP_DEFAULT_NUMERIC_BINS, key="dp_bins_input")
+            dp_num_rows = dp_col2.number_input("Number of synthetic rows:", min_value=1, value=len(dp_source_df), key="dp_num_rows_input")
+            st.markdown("**Note on Data Utility:** Applying Differential Privacy involves adding noise, which can reduce the utility (accuracy or realism) of the synthetic data. There's always a trade-off between privacy (ε) and utility.")
+
+            if st.button("Generate Data with DP", key="dp_generate_btn", disabled=not dp_columns):
+                dp_mechanism = DP_GAUSSIAN if st.session_state.dp_mechanism_numeric == "Gaussian Mechanism" else DP_LAPLACE
+                try:
+                    with st.spinner("Releasing noisy histograms and sampling..."):
+                        dp_model = fit_dp_histograms(dp_source_df, st.session_state.dp_epsilon, delta=dp_delta, mechanism=dp_mechanism,
+                                                     columns=dp_columns, bins=int(dp_bins), seed=active_seed)
+                        datasets.dp_generated_df = dp_model.sample(int(dp_num_rows), seed=active_seed)
+                    privacy_ledger.record(dp_dataset_key, "dp_histograms", dp_model.epsilon, dp_model.delta, dataset_name=dp_dataset_name,
+                                          columns=dp_columns, description=f"{DP_MECHANISM_LABELS[dp_mechanism]}, {dp_model.measurements} histograms")
+                    st.success(f"Generated {len(datasets.dp_generated_df):,} rows under ε={dp_model.epsilon:g}"
+                               + (f", δ={dp_model.delta:.1e}" if dp_model.delta else "") + f" ({dp_model.measurements} noisy histograms).")
+                except ValueError as e:
+                    st.error(f"DP generation failed: {e}")
+
+            if datasets.get('dp_generated_df') is not None:
+                st.dataframe(datasets.dp_generated_df.head(100), use_container_width=True)
+                st.download_button("Download DP Synthetic Data (CSV)", datasets.dp_generated_df.to_csv(index=False).encode("utf-8"),
+                                   file_name="dp_synthetic_data.csv", mime="text/csv", key="dp_download_csv")
+
+            # --- NEW: Privacy ledger ---
+            dp_epsilon_spent, dp_delta_spent = privacy_ledger.spent(dp_dataset_key)
+            ledger_col1, ledger_col2 = st.columns(2)
+            ledger_col1.metric(f"Cumulative ε spent on '{dp_dataset_name}'", f"{dp_epsilon_spent:g}")
+            ledger_col2.metric("Cumulative δ", f"{dp_delta_spent:.1e}" if dp_delta_spent else "0")
+            dp_ledger_entries = privacy_ledger.entries(dp_dataset_key)
+            if dp_ledger_entries:
+                with st.expander(f"Privacy ledger ({len(dp_ledger_entries)} releases)", expanded=False):
+                    st.dataframe(pd.DataFrame(dp_ledger_entries).drop(columns=["dataset"]), use_container_width=True)
+                    st.caption("Budgets add up across releases (basic composition). Releases on the same data are never forgotten; treat the total as the privacy loss.")
+
+        # --- NEW: Column-level DP transforms (randomized response / exponential mechanism) ---
+        st.markdown("---")
+        st.markdown("#### 🎲 Column-level DP Transforms for Categorical Data")
+        st.markdown("Privatize individual categorical columns of generated or uploaded data. **Randomized Response** keeps each value or replaces it "
+                    "with a random category (local DP; rows stay linked). **Exponential Mechanism** releases the column's category counts, "
+                    "optionally only its top-k categories, and regenerates the column from them (central DP). Half of each column's ε "
+                    f"privately selects its categories; rare values are reported as '{DP_OTHER_CATEGORY}'.")
+        dp_transform_sources = {
+            label: datasets.get(key) for label, key in (
+                ("Uploaded data (File-based Generation)", 'uploaded_df_for_schema'),
+                ("Synthetic data (File-based Generation)", 'newly_generated_df_tab3'),
+                ("Prompt-generated data", 'prompt_generated_df'),
+                ("DP synthetic data", 'dp_generated_df'),
+            ) if datasets.get(key) is not None
+        }
+        if not dp_transform_sources:
+            st.info("Generate or upload data first (Text Prompt or File-based Generation tabs) to apply column-level DP transforms.")
+        else:
+            dp_transform_source_label = st.selectbox("Data to transform:", list(dp_transform_sources), key="dp_transform_source")
+            dp_transform_df = dp_transform_sources[dp_transform_source_label]
+            st.session_state.dp_mechanism_categorical = st.selectbox(
+                "DP Mechanism for Categorical Data:",
+                options=list(DP_COLUMN_MECHANISMS.values()),
+                index=list(DP_COLUMN_MECHANISMS.values()).index(st.session_state.dp_mechanism_categorical),
+                key="dp_mech_categorical_selector",
+                help="Technique to perturb categorical values or their distributions for DP."
+            )
+            dp_column_mechanism = next(m for m, label in DP_COLUMN_MECHANISMS.items() if label == st.session_state.dp_mechanism_categorical)
+            dp_transform_columns = st.multiselect("Categorical columns:", options=list(dp_transform_df.columns),
+                                                  default=categorical_like_columns(dp_transform_df), key="dp_transform_columns")
+            dp_tcol1, dp_tcol2 = st.columns(2)
+            dp_column_epsilon = dp_tcol1.number_input("Epsilon (ε) per column:", min_value=0.01, max_value=10.0, value=1.0, step=0.1, key="dp_column_epsilon")
+            dp_top_k = dp_tcol2.number_input("Release only the top-k categories (0 = all):", min_value=0, value=0, key="dp_top_k",
+                                             disabled=dp_column_mechanism != DP_EXPONENTIAL,
+                                             help=f"Other categories are pooled into '{DP_OTHER_CATEGORY}'. Half of ε selects the top k, half releases the counts.")
+            if st.button("Apply to Columns", key="dp_transform_btn", disabled=not dp_transform_columns):
+                with st.spinner(f"Applying {st.session_state.dp_mechanism_categorical} to {len(dp_transform_columns)} column(s)..."):
+                    datasets.dp_transformed_df, dp_column_releases = privatize_columns(
+                        dp_transform_df, dp_transform_columns, dp_column_mechanism, dp_column_epsilon,
+                        top_k=int(dp_top_k) or None, seed=active_seed
+                    )
+                st.session_state.dp_column_release_summary = pd.DataFrame([
+                    {"Column": column, "Mechanism": DP_COLUMN_MECHANISMS[release.mechanism], "Effective ε": release.epsilon,
+                     "δ": release.delta, "Categories": release.details["categories"],
+                     "Keep Probability": release.details.get("keep_probability"), "Top-k": release.details.get("top_k")}
+                    for column, release in dp_column_releases.items()
+                ])
+                dp_transform_name = (st.session_state.get('uploaded_file_name_tab3') or dp_transform_source_label
+                                     if dp_transform_source_label.startswith("Uploaded data") else dp_transform_source_label)
+                privacy_ledger.record(dp_ledger_key(dp_transform_name, dp_transform_df.columns), dp_column_mechanism,
+                                      sum(release.epsilon for release in dp_column_releases.values()),
+                                      sum(release.delta for release in dp_column_releases.values()), dataset_name=dp_transform_source_label, columns=dp_transform_columns,
+                                      description=f"{st.session_state.dp_mechanism_categorical}, ε={dp_column_epsilon:g} per column")
+                st.success(f"Privatized {len(dp_column_releases)} column(s); total ε = {sum(r.epsilon for r in dp_column_releases.values()):g}, "
+                           f"δ = {sum(r.delta for r in dp_column_releases.values()):.1e}.")
+
+            if datasets.get('dp_transformed_df') is not None and st.session_state.get('dp_column_release_summary') is not None:
+                st.dataframe(st.session_state.dp_column_release_summary, use_container_width=True)
+                st.dataframe(datasets.dp_transformed_df.head(100), use_container_width=True)
+                st.download_button("Download Transformed Data (CSV)", datasets.dp_transformed_df.to_csv(index=False).encode("utf-8"),
+                                   file_name="dp_transformed_data.csv", mime="text/csv", key="dp_transform_download_csv")
 
     elif st.session_state.advanced_lab_selection == "🏆 Quality Benchmarking":
         # Content from old tab_quality
@@ -4836,13 +3494,14 @@ with tab_advanced_lab:
         - **Utility:** How well the synthetic data performs for a specific task (e.g., training a machine learning model) compared to real data.
         - **Privacy:** How well the synthetic data protects individual privacy from the original dataset.
 
-        **Current Status:** This is a placeholder for future development. Full integration requires a reference (real) dataset and implementation of various metrics, potentially using libraries like `sdmetrics`.
+        **Fidelity** is measured on the File-based Generation output: per-column marginal similarity (Column Shapes),
+        correlation / Cramér's V deltas between column pairs (Pair Trends) and range / category coverage, computed on
+        independent row batches within a time budget and reported with 95% confidence intervals.
         """)
-        st.info("✨ **Coming Soon:** Automated benchmarking with detailed reports on fidelity, utility, and privacy.")
 
         original_data_available = 'uploaded_file_name_tab3' in st.session_state and st.session_state.uploaded_file_name_tab3 is not None and \
-                                  'uploaded_df_for_schema' in st.session_state and st.session_state.uploaded_df_for_schema is not None
-        synthetic_data_available_tab3 = 'newly_generated_df_tab3' in st.session_state and st.session_state.newly_generated_df_tab3 is not None
+                                  'uploaded_df_for_schema' in datasets and datasets.uploaded_df_for_schema is not None
+        synthetic_data_available_tab3 = 'newly_generated_df_tab3' in datasets and datasets.newly_generated_df_tab3 is not None
 
         if original_data_available and synthetic_data_available_tab3:
             st.success(f"Original data ('{st.session_state.uploaded_file_name_tab3}') and its synthetic counterpart are available from 'File-based Generation'.")
@@ -4852,21 +3511,126 @@ with tab_advanced_lab:
                        "The most direct way to get this is by using the 'File-based Generation' tab to upload your data and then generate a synthetic version.")
             st.session_state.benchmark_data_source = None
 
-        if st.button("Run Conceptual Benchmark Analysis", key="run_benchmark_btn", disabled=(not original_data_available or not synthetic_data_available_tab3)):
-            st.info("Placeholder: Simulating benchmark analysis. This would involve complex calculations and comparisons.")
-            st.session_state.benchmark_fidelity_score = random.uniform(60, 95)
-            st.session_state.benchmark_utility_score = random.uniform(50, 90)
-            st.session_state.benchmark_privacy_score = random.uniform(70, 98)
-            st.success("Conceptual benchmark analysis complete!")
-
-        if st.session_state.benchmark_fidelity_score is not None:
+        benchmark_time_budget = st.slider("Time budget (seconds)", min_value=1, max_value=60, value=int(DEFAULT_BENCHMARK_SECONDS), key="benchmark_time_budget",
+                                          help="Metrics are computed on row batches until the budget is spent; more batches give tighter confidence intervals.")
+        utility_target_options = [TSTR_SKIP_OPTION]
+        if original_data_available and synthetic_data_available_tab3:
+            utility_target_options += [c for c in datasets.uploaded_df_for_schema.columns if c in datasets.newly_generated_df_tab3.columns]
+        benchmark_utility_target = st.selectbox("ML utility target column (train on synthetic, test on real)", options=utility_target_options, key="benchmark_utility_target",
+                                                help="Models trained on the synthetic data and on real data predict this column on held-out real rows.")
+        if st.button("Run Benchmark Analysis", key="run_benchmark_btn", disabled=(not original_data_available or not synthetic_data_available_tab3)):
+            with st.spinner("Benchmarking synthetic data against the original..."):
+                st.session_state.benchmark_report = benchmark_quality(datasets.uploaded_df_for_schema, datasets.newly_generated_df_tab3,
+                                                                      time_budget=float(benchmark_time_budget), seed=active_seed or 0)
+            with st.spinner("Searching the original for each synthetic row's closest record..."):
+                st.session_state.benchmark_privacy_report = distance_to_closest_record(datasets.uploaded_df_for_schema, datasets.newly_generated_df_tab3,
+                                                                                       seed=active_seed or 0)
+                st.session_state.benchmark_privacy_score = st.session_state.benchmark_privacy_report.score
+            st.session_state.benchmark_utility_report, st.session_state.benchmark_utility_score = None, None
+            if benchmark_utility_target != TSTR_SKIP_OPTION:
+                with st.spinner(f"Training models on synthetic and real data to predict '{benchmark_utility_target}'..."):
+                    try:
+                        st.session_state.benchmark_utility_report = tstr_benchmark(datasets.uploaded_df_for_schema, datasets.newly_generated_df_tab3,
+                                                                                   benchmark_utility_target, seed=active_seed or 0)
+                        st.session_state.benchmark_utility_score = st.session_state.benchmark_utility_report.score
+                    except ValueError as e:
+                        st.error(f"ML utility benchmark could not run: {e}")
+            benchmark_seconds = st.session_state.benchmark_report.seconds + st.session_state.benchmark_privacy_report.seconds + \
+                (st.session_state.benchmark_utility_report.seconds if st.session_state.benchmark_utility_report is not None else 0.0)
+            st.success(f"Benchmark analysis complete in {benchmark_seconds:.1f}s.")
+
+        benchmark_report = st.session_state.benchmark_report
+        if benchmark_report is not None:
             st.markdown(f"**Data Source for Benchmark:** {st.session_state.get('benchmark_data_source', 'N/A')}")
+            fidelity, fidelity_ci = benchmark_report.scores["Fidelity"]
             q_col1, q_col2, q_col3 = st.columns(3)
-            q_col1.metric("Fidelity Score", f"{st.session_state.benchmark_fidelity_score:.1f}/100", help="Statistical similarity. Higher is better.")
-            q_col2.metric("ML Utility Score", f"{st.session_state.benchmark_utility_score:.1f}/100", help="ML model performance. Higher is better.")
-            q_col3.metric("Privacy Protection Score", f"{st.session_state.benchmark_privacy_score:.1f}/100", help="Resistance to re-identification. Higher is better.")
-            st.markdown("Conceptual Metrics: Column Shape Similarity, Correlation Similarity, ML Task Performance, Membership Inference Resistance.")
-            st.caption("Actual implementation would use libraries like `sdmetrics`.")
+            if benchmark_report.columns.empty:
+                st.warning("The original and synthetic data share no comparable columns; fidelity could not be computed.")
+            q_col1.metric("Fidelity Score", f"{fidelity:.1f}/100" if pd.notna(fidelity) else "N/A", delta=f"± {fidelity_ci:.1f} (95% CI)" if pd.notna(fidelity_ci) else None,
+                          delta_color="off", help="Mean of Column Shapes, Pair Trends and Coverage. Higher is better.")
+            q_col2.metric("ML Utility Score", f"{st.session_state.benchmark_utility_score:.1f}/100" if pd.notna(st.session_state.benchmark_utility_score) else "Not computed",
+                          help="Synthetic-trained model performance on real test rows, relative to real-trained models. Higher is better. "
+                               "Models that fail to predict the target even when trained on real data (R² ≤ 0) are not scored.")
+            q_col3.metric("Privacy Protection Score", f"{st.session_state.benchmark_privacy_score:.1f}/100" if st.session_state.benchmark_privacy_score is not None else "Not computed",
+                          help="Share of synthetic rows that are not (near-)copies of original records. Higher is better.")
+
+            s_col1, s_col2, s_col3 = st.columns(3)
+            for s_col, score_name in zip((s_col1, s_col2, s_col3), ("Column Shapes", "Pair Trends", "Coverage")):
+                score, ci = benchmark_report.scores[score_name]
+                s_col.metric(score_name, f"{score:.1f}/100" if pd.notna(score) else "N/A",
+                             delta=f"± {ci:.1f}" if pd.notna(ci) else None, delta_color="off")
+            if benchmark_report.batches > 1:
+                st.caption(f"{benchmark_report.batches} batches of {benchmark_report.rows_per_batch:,} rows in {benchmark_report.seconds:.1f}s. "
+                           "Equally long tables are sampled at the same row positions, so identical data scores 100.")
+            else:
+                st.caption(f"Computed once on all rows in {benchmark_report.seconds:.1f}s (no confidence interval).")
+            if benchmark_report.skipped:
+                st.info(f"Identifier-like columns skipped: {', '.join(map(str, benchmark_report.skipped))}")
+
+            with st.expander("Per-column similarity", expanded=False):
+                st.dataframe(benchmark_report.columns, use_container_width=True)
+            pair_delta_matrix = benchmark_report.pair_delta_matrix()
+            if not pair_delta_matrix.empty:
+                with st.expander("Pair trend deltas", expanded=False):
+                    st.plotly_chart(px.imshow(pair_delta_matrix, zmin=0, zmax=1, color_continuous_scale="Reds",
+                                              title="|Original - Synthetic| association (Pearson / Cramér's V)"), use_container_width=True)
+                    st.dataframe(benchmark_report.pairs.sort_values("Similarity"), use_container_width=True)
+
+        if benchmark_report is not None:
+            explain_context_benchmark = {
+                "method": "File-based Generation",
+                "num_synthetic_rows_from_file": len(datasets.newly_generated_df_tab3) if synthetic_data_available_tab3 else 'N/A',
+                "benchmark": {"fidelity": benchmark_report, "utility": st.session_state.benchmark_utility_report,
+                              "privacy": st.session_state.benchmark_privacy_report},
+            }
+            explain_dfs_info_benchmark = {"SyntheticFromFile": {"rows": datasets.newly_generated_df_tab3.shape[0], "cols": datasets.newly_generated_df_tab3.shape[1]}} \
+                if synthetic_data_available_tab3 else {}
+            st.download_button(
+                label="Download Explainability Report (with Benchmark)",
+                data=generate_explainability_pdf(explain_context_benchmark, explain_dfs_info_benchmark),
+                file_name="explainability_report_benchmark.pdf",
+                mime="application/pdf",
+                key="download_explain_pdf_benchmark"
+            )
+
+        utility_report = st.session_state.benchmark_utility_report
+        if utility_report is not None:
+            st.markdown("#### 🤖 ML Utility: Train Synthetic, Test Real")
+            st.caption(f"Target '{utility_report.target}' ({utility_report.task}); {utility_report.train_rows['Real']:,} real and "
+                       f"{utility_report.train_rows['Synthetic']:,} synthetic training rows, {utility_report.test_rows:,} held-out real test rows, "
+                       f"{len(utility_report.features)} features. {utility_report.fits_reused} cached model fits reused; {utility_report.seconds:.1f}s.")
+            st.plotly_chart(px.bar(utility_report.results, x="Model", y=utility_report.headline_metric, color="Trained On", barmode="group",
+                                   title=f"{utility_report.headline_metric} on held-out real data"), use_container_width=True)
+            st.dataframe(utility_report.results, use_container_width=True)
+            if utility_report.results["Error"].notna().any():
+                st.warning("Some models could not be trained; see the Error column.")
+
+        privacy_report = st.session_state.benchmark_privacy_report
+        if privacy_report is not None and privacy_report.rows_checked:
+            st.markdown("#### 🔐 Privacy: Distance to Closest Record")
+            p_col1, p_col2, p_col3 = st.columns(3)
+            p_col1.metric("Exact Copies", f"{privacy_report.exact_copy_share:.2%}", help="Synthetic rows identical to an original row (on the compared columns).")
+            p_col2.metric("Near Copies", f"{privacy_report.near_copy_share:.2%}",
+                          help=f"Synthetic rows closer to an original row than {NEAR_COPY_QUANTILE:.0%} of original rows are to each other.")
+            p_col3.metric("Median DCR", f"{np.median(privacy_report.dcr):.4f}",
+                          delta=f"original spacing {privacy_report.baseline_quantiles.get(0.5, 0.0):.4f}", delta_color="off",
+                          help="Median distance from a synthetic row to its closest original row, next to the median distance between original rows.")
+            st.caption(f"{privacy_report.rows_checked:,} synthetic rows checked against {privacy_report.reference_rows_indexed:,} indexed original rows "
+                       f"({privacy_report.tree}, {len(privacy_report.columns)} columns) in {privacy_report.seconds:.1f}s. "
+                       f"{privacy_report.low_nndr_share:.1%} of rows have a nearest-neighbour distance ratio below {LOW_NNDR_THRESHOLD}.")
+            if privacy_report.exact_copy_share > 0:
+                st.warning(f"⚠️ {privacy_report.exact_copy_share:.2%} of the checked synthetic rows exactly reproduce an original record.")
+            with st.expander("DCR distribution and flagged rows", expanded=False):
+                dcr_fig = px.histogram(x=privacy_report.dcr, nbins=50, title="Distance to closest original record",
+                                       labels={"x": "DCR"})
+                dcr_fig.add_vline(x=privacy_report.near_copy_threshold, line_dash="dash", annotation_text="near-copy threshold")
+                st.plotly_chart(dcr_fig, use_container_width=True)
+                flagged_rows = privacy_report.flagged_rows(datasets.newly_generated_df_tab3, datasets.uploaded_df_for_schema) \
+                    if 'newly_generated_df_tab3' in datasets and datasets.newly_generated_df_tab3 is not None else pd.DataFrame()
+                if flagged_rows.empty:
+                    st.success("No synthetic rows are near-copies of original records.")
+                else:
+                    st.dataframe(flagged_rows, use_container_width=True)
 
     elif st.session_state.advanced_lab_selection == "🤝 Federated Generation":
         st.subheader("🤝 Federated Synthetic Data Generation")
@@ -4881,121 +3645,130 @@ with tab_advanced_lab:
         - **Fintech:** Banks and financial institutions can generate synthetic transaction data to improve fraud detection models or understand market trends collectively.
         - **Government:** Different government departments can contribute to synthetic datasets for policy making, urban planning, or public service improvement while respecting data silos and privacy mandates.
 
-        **Current Status:** This is a highly advanced feature and a placeholder for future exploration.
-        Implementing federated generation requires robust infrastructure for:
-        - Secure multi-party computation.
-        - Distributed model training and aggregation.
-        - Strong privacy-preserving techniques (like differential privacy) applied at each step.
+        **How it works here:** Every participant runs as its own local process and shares only compact statistics of its data
+        (per-column histograms and Gaussian-copula correlation sums), optionally with differential-privacy noise added first.
+        A coordinator adds them up into one global model and samples the synthetic table from it. Cross-organization
+        deployment would replace the local processes with remote participants and secure aggregation.
         """)
-        st.info("✨ **Vision for the Future:** Enabling collaborative, privacy-preserving synthetic data ecosystems.")
         st.markdown("---")
 
-        st.subheader("1. Define Participants (Conceptual)")
-        participant_cols = st.columns([3,1])
+        st.subheader("1. Define Participants")
+        st.caption(f"Each participant is a separate local process reading its own CSV/XLSX file from the local data directory "
+                   f"({LOCAL_DATA_DIR_ENV}, default './{DEFAULT_LOCAL_DATA_DIR}'). Its raw rows never leave that process.")
+        participant_cols = st.columns([2,2,1])
         st.session_state.federated_new_participant_name = participant_cols[0].text_input(
             "New Participant Name (e.g., Hospital A, Bank X)", 
             value=st.session_state.federated_new_participant_name,
             key="fed_new_participant_name_input"
         )
-        if participant_cols[1].button("Add Participant", key="fed_add_participant_btn", use_container_width=True):
-            if st.session_state.federated_new_participant_name and not any(p['name'] == st.session_state.federated_new_participant_name for p in st.session_state.federated_participants_list):
-                st.session_state.federated_participants_list.append({"name": st.session_state.federated_new_participant_name, "trained": False})
-                st.session_state.federated_new_participant_name = "" # Clear input
-                st.session_state.federated_aggregation_done = False # Reset aggregation if participants change
-                st.session_state.federated_generated_df_output = None
-                st.rerun()
-            elif not st.session_state.federated_new_participant_name:
+        federated_new_participant_path = participant_cols[1].text_input(
+            "Participant's local file", key="fed_new_participant_path_input", placeholder="e.g., hospital_a/patients.csv"
+        )
+        if participant_cols[2].button("Add Participant", key="fed_add_participant_btn", use_container_width=True):
+            if not st.session_state.federated_new_participant_name:
                 st.warning("Participant name cannot be empty.")
-            else:
+            elif any(p['name'] == st.session_state.federated_new_participant_name for p in st.session_state.federated_participants_list):
                 st.warning(f"Participant '{st.session_state.federated_new_participant_name}' already exists.")
+            else:
+                try:
+                    federated_participant_path = resolve_local_path(federated_new_participant_path.strip())
+                    st.session_state.federated_participants_list.append({"name": st.session_state.federated_new_participant_name, "path": str(federated_participant_path)})
+                    st.session_state.federated_new_participant_name = "" # Clear input
+                    st.session_state.federated_result = None # Reset the global model if participants change
+                    datasets.federated_generated_df_output = None
+                    st.rerun()
+                except IngestError as ie:
+                    st.warning(str(ie))
+
+        # --- NEW: Local stand-ins for participants ---
+        if datasets.get('uploaded_df_for_schema') is not None:
+            with st.expander("No participant files yet? Split the File-based Generation upload into local stand-ins"):
+                federated_standin_count = st.number_input("Number of stand-in participants:", min_value=2, max_value=16, value=3, key="fed_standin_count")
+                if st.button("Create Stand-in Participants", key="fed_standin_btn"):
+                    # Stand-ins are written to a temporary directory for each training run and removed afterwards
+                    st.session_state.federated_participants_list = [{"name": f"Participant {i + 1}", "path": None, "standin": True}
+                                                                    for i in range(int(federated_standin_count))]
+                    st.session_state.federated_result = None
+                    datasets.federated_generated_df_output = None
+                    st.rerun()
 
         if st.session_state.federated_participants_list:
             st.markdown("**Current Participants:**")
             for i, p_info in enumerate(st.session_state.federated_participants_list):
-                p_cols = st.columns([3,2,1])
-                p_cols[0].write(f"- **{p_info['name']}** (Status: {'Model Trained' if p_info['trained'] else 'Awaiting Training'})")
-                if not p_info['trained']:
-                    if p_cols[1].button(f"Simulate Local Training for {p_info['name']}", key=f"fed_train_{i}"):
-                        with st.spinner(f"Simulating local model training for {p_info['name']}..."):
-                            # In a real scenario, this would be a long, complex process.
-                            random_sleep_time = random.uniform(1, 3) # Simulate some work
-                            time.sleep(random_sleep_time)
-                        st.session_state.federated_participants_list[i]['trained'] = True
-                        st.session_state.federated_aggregation_done = False # Reset aggregation
-                        st.session_state.federated_generated_df_output = None
-                        st.rerun()
-                else:
-                    p_cols[1].success("Local Model Trained 👍")
-                
+                p_cols = st.columns([3,3,1])
+                p_cols[0].write(f"- **{p_info['name']}**")
+                p_cols[1].caption(p_info['path'] or "Stand-in: a temporary share of the upload, removed after each run")
                 if p_cols[2].button("Remove", key=f"fed_remove_p_{i}"):
                     st.session_state.federated_participants_list.pop(i)
-                    st.session_state.federated_aggregation_done = False
-                    st.session_state.federated_generated_df_output = None
+                    st.session_state.federated_result = None
+                    datasets.federated_generated_df_output = None
                     st.rerun()
             st.markdown("---")
 
-        st.subheader("2. Simulate Model Aggregation")
-        all_trained = all(p['trained'] for p in st.session_state.federated_participants_list)
-        if not st.session_state.federated_participants_list:
-            st.info("Add participants to enable aggregation.")
-        elif not all_trained:
-            st.info("All participants must complete 'Simulate Local Training' before aggregation.")
-        
-        if st.button("Simulate Secure Model Aggregation", key="fed_aggregate_btn", disabled=(not st.session_state.federated_participants_list or not all_trained)):
-            with st.spinner("Simulating secure aggregation of local models into a global model..."):
-                # Real aggregation is complex (FedAvg, secure MPC, etc.)
-                time.sleep(random.uniform(1,3)) # Simulate work
-            st.session_state.federated_aggregation_done = True
-            st.session_state.federated_generated_df_output = None
-            st.success("Global model aggregation simulated successfully! Ready to generate data.")
-            st.rerun()
+        st.subheader("2. Federated Training")
+        st.markdown("Participants compute histograms and copula correlation sums of their own data in parallel; "
+                    "the coordinator adds them up into one global model.")
+        fed_col1, fed_col2 = st.columns(2)
+        federated_bins = fed_col1.number_input("Histogram bins per numeric column:", min_value=8, max_value=1024, value=FEDERATED_DEFAULT_BINS, key="fed_bins")
+        federated_use_dp = fed_col2.checkbox("Add DP noise before sharing", key="fed_use_dp",
+                                             help="Each participant perturbs its statistics with its own privacy budget before they leave its process.")
+        federated_dp = {}
+        if federated_use_dp:
+            fed_dp_col1, fed_dp_col2, fed_dp_col3 = st.columns(3)
+            federated_dp["epsilon"] = fed_dp_col1.number_input("Epsilon (ε) per participant:", min_value=0.01, max_value=10.0, value=1.0, step=0.1, key="fed_epsilon")
+            federated_dp["mechanism"] = fed_dp_col2.selectbox("Noise mechanism:", list(DP_MECHANISM_LABELS), format_func=DP_MECHANISM_LABELS.get, key="fed_dp_mechanism")
+            federated_dp["delta"] = fed_dp_col3.number_input("Delta (δ) per participant:", min_value=0.0, max_value=0.1, value=1e-6 if federated_dp["mechanism"] == DP_GAUSSIAN else 0.0,
+                                                             format="%.1e", key="fed_delta", disabled=federated_dp["mechanism"] != DP_GAUSSIAN)
 
-        if st.session_state.federated_aggregation_done:
-            st.success("✅ Global Model Ready (Simulated)")
+        if not st.session_state.federated_participants_list:
+            st.info("Add participants to enable federated training.")
+        if st.button("Run Federated Training", key="fed_aggregate_btn", disabled=not st.session_state.federated_participants_list):
+            with st.spinner(f"Starting {len(st.session_state.federated_participants_list)} participant processes and aggregating their statistics..."):
+                try:
+                    federated_standin_names = [p['name'] for p in st.session_state.federated_participants_list if p.get('standin')]
+                    if federated_standin_names and datasets.get('uploaded_df_for_schema') is None:
+                        raise FederationError("Stand-in participants need the File-based Generation upload; upload it again or remove them.")
+                    with standin_participants(datasets.get('uploaded_df_for_schema'), federated_standin_names, seed=active_seed) as federated_standin_paths:
+                        st.session_state.federated_result = run_federation(
+                            {p['name']: federated_standin_paths.get(p['name'], p['path']) for p in st.session_state.federated_participants_list},
+                            bins=int(federated_bins), seed=active_seed, **federated_dp
+                        )
+                    datasets.federated_generated_df_output = None
+                except (FederationError, ValueError) as fe:
+                    st.error(f"Federated training failed: {fe}")
+
+        federated_result = st.session_state.federated_result
+        if federated_result is not None:
+            st.success(f"✅ Global model ready: {len(federated_result.columns)} columns from {federated_result.rows:,} rows "
+                       f"across {len(federated_result.participants)} participants in {federated_result.seconds:.1f} s.")
+            st.dataframe(federated_result.participants, use_container_width=True)
+            st.caption("Raw rows shared: 0. Only the statistics counted under 'Bytes Shared' left the participant processes"
+                       + (f", each perturbed under ε={federated_result.epsilon:g} per participant." if federated_result.epsilon else "."))
+            if federated_result.skipped:
+                st.caption(f"Not combined (missing at a participant, mismatched types or identifier-like): {', '.join(map(str, federated_result.skipped))}")
             st.markdown("---")
-            st.subheader("3. Generate Synthetic Data from Simulated Global Model")
-
-            fed_schema_options = list(SCHEMA_TEMPLATES.keys())
-            # Ensure the stored template name is valid, otherwise default
-            if st.session_state.federated_global_schema_template_output not in fed_schema_options:
-                st.session_state.federated_global_schema_template_output = "None (Custom Schema)"
-            
-            current_fed_schema_idx = fed_schema_options.index(st.session_state.federated_global_schema_template_output)
-
-            st.session_state.federated_global_schema_template_output = st.selectbox(
-                "Select Schema Template for Federated Output:",
-                options=fed_schema_options,
-                index=current_fed_schema_idx,
-                key="fed_output_schema_selector",
-                help="This schema will define the structure of the synthetic data generated by the simulated global model."
-            )
+            st.subheader("3. Generate Synthetic Data from the Global Model")
             st.session_state.federated_num_rows_output = st.number_input("Number of rows for federated output:", min_value=10, value=st.session_state.federated_num_rows_output, key="fed_num_rows_output")
 
-            if st.button("Generate Federated Data (Simulated)", key="fed_generate_output_btn", disabled=(st.session_state.federated_global_schema_template_output == "None (Custom Schema)")):
-                if st.session_state.federated_global_schema_template_output != "None (Custom Schema)":
-                    template_fields = SCHEMA_TEMPLATES[st.session_state.federated_global_schema_template_output].get("fields", [])
-                    if template_fields:
-                        # Use the single_table_data_with_edge_cases for simplicity, without edge cases for this simulation
-                        st.session_state.federated_generated_df_output = generate_single_table_data_with_edge_cases(
-                            schema_fields=template_fields,
-                            num_rows=st.session_state.federated_num_rows_output,
-                            edge_cases_list=[], # No edge cases for this simulation
-                            pii_strategy_global=st.session_state.get(DEFAULT_PII_STRATEGY_KEY, "realistic_fake"),
-                            table_name_for_conditions="FederatedOutputTable" # Dummy name
-                        )
-                        st.success("Federated synthetic data generated (simulated)!")
-                    else:
-                        st.error(f"Selected template '{st.session_state.federated_global_schema_template_output}' has no fields defined.")
-                else:
-                    st.warning("Please select a valid schema template for the output.")
+            if st.button("Generate Federated Data", key="fed_generate_output_btn"):
+                federated_sample_seed = resolve_seed(active_seed)
+                datasets.federated_generated_df_output = federated_result.model.sample(int(st.session_state.federated_num_rows_output), seed=federated_sample_seed)
+                record_generation_run("advanced_lab_federated", {"FederatedOutputTable": datasets.federated_generated_df_output}, seed=federated_sample_seed)
+                st.success("Federated synthetic data generated!")
 
-            if st.session_state.federated_generated_df_output is not None:
-                st.dataframe(st.session_state.federated_generated_df_output)
-                csv_fed_output = st.session_state.federated_generated_df_output.to_csv(index=False).encode('utf-8')
+            if datasets.federated_generated_df_output is not None:
+                st.dataframe(datasets.federated_generated_df_output.head(100))
+                csv_fed_output = datasets.federated_generated_df_output.to_csv(index=False).encode('utf-8')
                 st.download_button(
                     label="Download Federated Output CSV",
                     data=csv_fed_output,
                     file_name="federated_synthetic_data.csv",
                     mime="text/csv",
                     key="download_csv_federated_output"
-                )
\ No newline at end of file
+                )
+# --- NEW: Dataset store footprint (after this run's loads and demotions) ---
+store_stats = datasets.stats()
+st.sidebar.caption(
+    f"🗄️ Session datasets: {store_stats['hot'] / 1e6:.1f} MB in memory · "
+    f"{store_stats['warm'] / 1e6:.1f} MB compressed · {store_stats['cold'] / 1e6:.1f} MB spilled to disk"
+)
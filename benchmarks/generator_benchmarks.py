@@ -0,0 +1,225 @@
+"""
+Headless micro-benchmarks for the NullByte AI value generators.
+
+Measures rows/second and peak traced memory for:
+  * every entry of VALUE_GENERATOR_FUNCTIONS
+  * every is_* flag family handled by _generate_value_from_schema
+  * every entry of CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP
+  * every SCHEMA_TEMPLATES template at 10k / 100k / 1M rows (configurable)
+
+Usage (from the repository root):
+  python benchmarks/generator_benchmarks.py --save benchmarks/baseline.json
+  python benchmarks/generator_benchmarks.py --compare benchmarks/baseline.json --threshold 0.15
+
+--compare exits with status 1 when any benchmark is slower (rows/sec) or
+larger (peak memory) than the baseline by more than the threshold.
+"""
+import argparse
+import inspect
+import json
+import logging
+import platform
+import random
+import re
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import faker  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from faker import Faker  # noqa: E402
+
+from nullbyte.catalog import CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP, SCHEMA_TEMPLATES  # noqa: E402
+from nullbyte.generators import VALUE_GENERATOR_FUNCTIONS, _generate_value_from_schema  # noqa: E402
+
+DEFAULT_FIELD_ROWS = 10_000
+DEFAULT_TEMPLATE_ROWS = (10_000, 100_000, 1_000_000)
+DEFAULT_THRESHOLD = 0.15 # 15% slower / larger than baseline counts as a regression
+MEMORY_NOISE_FLOOR_MB = 0.5 # Peak-memory differences below this are ignored
+
+# Representative constraints for the typed generators
+SAMPLE_CONSTRAINTS = {"int": "0-1000", "float": "0.0-100.0", "category": "Alpha,Beta,Gamma,Delta"}
+
+
+def _quiet_streamlit():
+    """Generators may call st.warning; outside a Streamlit run those only log noise."""
+    for name in ("streamlit", "streamlit.runtime.scriptrunner_utils.script_run_context", "streamlit.runtime.state.session_state_proxy"):
+        logging.getLogger(name).setLevel(logging.ERROR)
+
+
+def _reseed(seed):
+    random.seed(seed)
+    Faker.seed(seed)
+    np.random.seed(seed)
+
+
+def _flag_families():
+    """is_* flags tested by _generate_value_from_schema, read from its source so new families are picked up."""
+    flags = []
+    for line in inspect.getsource(_generate_value_from_schema).splitlines():
+        if line.strip().startswith("#"):
+            continue
+        for flag in re.findall(r'field_schema\.get\("(_?is_\w+)"\)', line):
+            if flag not in flags:
+                flags.append(flag)
+    return flags
+
+
+def _schema_for_flag(flag):
+    """A canonical schema using the flag (so companion keys like suffix_from_list exist), else a minimal one."""
+    for canonical, details in CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP.items():
+        if details.get(flag):
+            return {"name": canonical, "pii_handling": "realistic_fake", **details}
+    return {"name": flag, "type": "string", "constraint": "", "pii_handling": "realistic_fake", flag: True}
+
+
+def _template_schema(template_name):
+    """Template fields resolved the way the Smart Schema Editor loads them (canonical suggestions applied)."""
+    fields = []
+    for field_template in SCHEMA_TEMPLATES[template_name].get("fields", []):
+        field = field_template.copy()
+        canonical_suggestion = field.pop("_canonical_suggestion", None)
+        if canonical_suggestion in CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP:
+            field = {**CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP[canonical_suggestion], **field,
+                     "type": CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP[canonical_suggestion].get("type", field["type"]),
+                     "constraint": CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP[canonical_suggestion].get("constraint", field["constraint"])}
+        field.setdefault("pii_handling", "realistic_fake")
+        fields.append(field)
+    return fields
+
+
+def _measure(run, rows, seed, track_memory):
+    """Runs `run(rows)` once timed and, optionally, once under tracemalloc for the peak."""
+    run(min(rows, 100)) # Warm-up: lazy Faker/provider setup is not part of the measurement
+    _reseed(seed)
+    start = time.perf_counter()
+    run(rows)
+    elapsed = time.perf_counter() - start
+    result = {"rows": rows, "seconds": round(elapsed, 4), "rows_per_sec": round(rows / elapsed, 1) if elapsed > 0 else None}
+    if track_memory:
+        _reseed(seed)
+        tracemalloc.start()
+        run(rows)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["peak_mb"] = round(peak / (1024 * 1024), 3)
+    return result
+
+
+def build_benchmarks(suites, field_rows, template_rows):
+    """Returns [(key, rows, run)] for the selected suites."""
+    benchmarks = []
+    if "values" in suites:
+        for field_type, generator_func in VALUE_GENERATOR_FUNCTIONS.items():
+            constraint = SAMPLE_CONSTRAINTS.get(field_type, "")
+            def run(n, f=generator_func, c=constraint, t=field_type):
+                return [f(c, t, "realistic_fake") for _ in range(n)]
+            benchmarks.append((f"value_generator/{field_type}", field_rows, run))
+    if "flags" in suites:
+        for flag in _flag_families():
+            schema = _schema_for_flag(flag)
+            def run(n, s=schema):
+                return [_generate_value_from_schema(s) for _ in range(n)]
+            benchmarks.append((f"flag/{flag}", field_rows, run))
+    if "canonical" in suites:
+        for canonical, details in CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP.items():
+            schema = {"name": details.get("display_name", canonical), "pii_handling": "realistic_fake", **details}
+            def run(n, s=schema):
+                return [_generate_value_from_schema(s) for _ in range(n)]
+            benchmarks.append((f"canonical/{canonical}", field_rows, run))
+    if "templates" in suites:
+        for template_name in SCHEMA_TEMPLATES:
+            fields = _template_schema(template_name)
+            if not fields:
+                continue
+            for rows in template_rows:
+                def run(n, fs=fields):
+                    return pd.DataFrame({f["name"]: [_generate_value_from_schema(f) for _ in range(n)] for f in fs})
+                benchmarks.append((f"template/{template_name}@{rows}", rows, run))
+    return benchmarks
+
+
+def run_benchmarks(suites, field_rows, template_rows, seed, track_memory, name_filter=None):
+    results = {}
+    for key, rows, run in build_benchmarks(suites, field_rows, template_rows):
+        if name_filter and name_filter.lower() not in key.lower():
+            continue
+        results[key] = _measure(run, rows, seed, track_memory)
+        print(f"{key:<70} {results[key]['rows_per_sec'] or 0:>14,.0f} rows/s"
+              + (f" {results[key]['peak_mb']:>10.2f} MB" if track_memory else ""), flush=True)
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "faker": faker.VERSION,
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """Returns a list of regression messages (empty when within threshold)."""
+    regressions = []
+    for key, base in baseline.get("results", {}).items():
+        cur = current["results"].get(key)
+        if not cur:
+            continue
+        if base.get("rows_per_sec") and cur.get("rows_per_sec") is not None and cur["rows_per_sec"] < base["rows_per_sec"] * (1 - threshold):
+            regressions.append(f"{key}: {cur['rows_per_sec']:,.0f} rows/s vs baseline {base['rows_per_sec']:,.0f} "
+                               f"({cur['rows_per_sec'] / base['rows_per_sec'] - 1:+.1%})")
+        if "peak_mb" in base and "peak_mb" in cur and cur["peak_mb"] - base["peak_mb"] > MEMORY_NOISE_FLOOR_MB \
+                and cur["peak_mb"] > base["peak_mb"] * (1 + threshold):
+            regressions.append(f"{key}: peak {cur['peak_mb']:.2f} MB vs baseline {base['peak_mb']:.2f} MB")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NullByte AI generator micro-benchmarks")
+    parser.add_argument("--suite", action="append", choices=["values", "flags", "canonical", "templates"],
+                        help="Suite(s) to run; repeat for several. Default: all.")
+    parser.add_argument("--rows", type=int, default=DEFAULT_FIELD_ROWS, help="Rows per field-level benchmark.")
+    parser.add_argument("--template-rows", default=",".join(str(r) for r in DEFAULT_TEMPLATE_ROWS),
+                        help="Comma-separated row counts for template benchmarks.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass (halves run time).")
+    parser.add_argument("--filter", help="Only run benchmarks whose key contains this text.")
+    parser.add_argument("--output", help="Write results JSON to this path.")
+    parser.add_argument("--save", help="Write results JSON as the new baseline at this path.")
+    parser.add_argument("--compare", help="Baseline JSON to compare against.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed relative regression (0.15 = 15%%).")
+    args = parser.parse_args(argv)
+
+    _quiet_streamlit()
+    suites = args.suite or ["values", "flags", "canonical", "templates"]
+    template_rows = [int(r) for r in args.template_rows.split(",") if r.strip()]
+    current = run_benchmarks(suites, args.rows, template_rows, args.seed, not args.no_memory, args.filter)
+
+    for path in (args.output, args.save):
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            Path(path).write_text(json.dumps(current, indent=2))
+            print(f"Results written to {path}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for message in regressions:
+                print(f"  - {message}")
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {args.compare}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Engine modules used by the NullByte AI Streamlit app (app.py)."""
@@ -0,0 +1,146 @@
+"""
+Bias scoring from category counts.
+
+The bias score is the mean normalized Shannon entropy (0-100) of a table's
+categorical columns. It is 100 when every category of every column is equally
+common. Scores come from a BiasProfile, which holds per-column category counts:
+  * the profile can be updated chunk by chunk as streamed data arrives
+  * all columns are scored in one vectorized pass over the concatenated counts
+  * calculate_bias_score() caches scores of in-memory frames by fingerprint
+    (pass a stored one, DatasetStore.fingerprint, to skip hashing the frame)
+If a table has no object/category/string columns, low-cardinality columns
+(fewer than FALLBACK_MAX_UNIQUE distinct values) are scored instead.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from nullbyte.dtypes import categorical_like_columns
+from nullbyte.fingerprint import frame_fingerprint
+
+FALLBACK_MAX_UNIQUE = 20
+EMPTY_TABLE_SCORE = 50 # Default score if no data
+NO_CATEGORICALS_SCORE = 100 # No categorical columns to assess bias, so perfectly unbiased in this context
+SCORE_CACHE_SIZE = 256
+
+_cache_lock = threading.Lock()
+_score_cache = OrderedDict()
+
+
+def _value_counts(series):
+    """Non-zero counts of the non-null values, indexed by plain (object) values."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+        present = counts > 0
+        return pd.Series(counts[present], index=pd.Index(np.asarray(series.cat.categories, dtype=object)[present], dtype=object))
+    counts = series.value_counts(dropna=True, sort=False)
+    counts.index = counts.index.astype(object)
+    return counts[counts > 0]
+
+
+class BiasProfile:
+    """Category counts per column, merged chunk by chunk."""
+
+    def __init__(self):
+        self.rows = 0
+        self.counts = {} # column -> pd.Series of counts
+        self.columns = None # Columns being tracked, fixed by the first chunk
+        self.fallback = False # True if tracking low-cardinality columns of a table without categoricals
+        self._dropped = set() # Fallback columns that reached FALLBACK_MAX_UNIQUE distinct values
+
+    def update(self, chunk):
+        """Adds the category counts of a DataFrame chunk."""
+        if self.columns is None:
+            self.columns = categorical_like_columns(chunk)
+            if not self.columns:
+                self.fallback, self.columns = True, list(chunk.columns)
+        for column in self.columns:
+            if column in self._dropped or column not in chunk.columns:
+                continue
+            self.add_counts(column, _value_counts(chunk[column]))
+        self.rows += len(chunk)
+        return self
+
+    def add_counts(self, column, counts):
+        """Merges pre-computed counts (Series or {value: count}) into `column`."""
+        counts = counts if isinstance(counts, pd.Series) else pd.Series(counts, dtype=float)
+        previous = self.counts.get(column)
+        self.counts[column] = counts if previous is None else previous.add(counts, fill_value=0)
+        if self.fallback and len(self.counts[column]) >= FALLBACK_MAX_UNIQUE:
+            self._dropped.add(column) # Not low-cardinality; no need to keep counting it
+            self.counts.pop(column)
+
+    def scored_columns(self):
+        if not self.fallback:
+            return list(self.counts)
+        return [c for c, counts in self.counts.items() if 1 < len(counts) < self.rows]
+
+    def column_scores(self):
+        """{column: normalized entropy * 100}, computed for all columns at once."""
+        columns = self.scored_columns()
+        if not columns:
+            return {}
+        arrays = [self.counts[c].to_numpy(dtype=float) for c in columns]
+        lengths = np.array([len(a) for a in arrays])
+        scores = np.full(len(columns), 100.0) # Empty or single-category columns count as uniform
+        multi = lengths > 1
+        if multi.any():
+            flat = np.concatenate([a for a, m in zip(arrays, multi) if m])
+            starts = np.concatenate(([0], np.cumsum(lengths[multi])[:-1]))
+            probabilities = flat / np.repeat(np.add.reduceat(flat, starts), lengths[multi])
+            entropy = -np.add.reduceat(probabilities * np.log2(probabilities + 1e-9), starts) # Epsilon avoids log(0)
+            scores[multi] = entropy / np.log2(lengths[multi]) * 100
+        return dict(zip(columns, scores.tolist()))
+
+    def score(self):
+        if not self.rows:
+            return EMPTY_TABLE_SCORE
+        column_scores = self.column_scores()
+        if not column_scores:
+            return NO_CATEGORICALS_SCORE
+        return float(np.mean(list(column_scores.values())))
+
+
+def _profile_key(full_file_profile):
+    """Content key of an ingestion DatasetProfile: its row count and tracked category counts."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(full_file_profile.rows).encode("utf-8"))
+    for name, column_profile in full_file_profile.columns.items():
+        counts = sorted(map(repr, (column_profile.category_counts or {}).items()))
+        digest.update(repr((str(name), counts)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def calculate_bias_score(df, full_file_profile=None, fingerprint=None):
+    """
+    Calculates a bias score (0-100) based on categorical column distributions.
+    `full_file_profile` (an ingestion DatasetProfile) replaces the counts of
+    columns it tracked when `df` is a sample. Scores are cached per dataset
+    fingerprint (`fingerprint`, or computed from `df`).
+    """
+    if df is None or df.empty:
+        return EMPTY_TABLE_SCORE
+    cache_key = (fingerprint or frame_fingerprint(df), _profile_key(full_file_profile) if full_file_profile is not None else None)
+    with _cache_lock:
+        if cache_key in _score_cache:
+            _score_cache.move_to_end(cache_key)
+            return _score_cache[cache_key]
+
+    profile = BiasProfile().update(df)
+    if full_file_profile is not None and not profile.fallback:
+        for column in profile.columns:
+            column_profile = full_file_profile.columns.get(column)
+            if column_profile is not None and column_profile.category_counts: # Untracked (high-cardinality) columns keep the sample's counts
+                profile.counts[column] = pd.Series(column_profile.category_counts, dtype=float)
+        profile.rows = max(profile.rows, full_file_profile.rows)
+    score = profile.score()
+
+    with _cache_lock:
+        _score_cache[cache_key] = score
+        while len(_score_cache) > SCORE_CACHE_SIZE:
+            _score_cache.popitem(last=False)
+    return score
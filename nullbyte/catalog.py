@@ -0,0 +1,925 @@
+"""
+Static lookup tables for NullByte AI: domain value lists, canonical field schemas,
+synonym/domain phrase maps, schema inference rules and schema templates.
+
+These live in an imported module (rather than in app.py) so that they are built once
+per process instead of on every Streamlit rerun. Treat them as read-only; copy a
+template or field schema before modifying it.
+"""
+from datetime import datetime
+
+_CURRENT_YEAR = datetime.now().year
+
+# --- Constants for Domain-Specific Data Generation ---
+DIAGNOSES_LIST = ["Hypertension", "Diabetes", "Asthma", "Arthritis", "Migraine",
+                  "Bronchitis", "Anemia", "Pneumonia", "Sinusitis", "Depression", "Anxiety",
+                  "Allergy", "Osteoporosis", "Glaucoma", "Eczema", "GERD", "COVID-19", "Influenza",
+                  "Chronic Kidney Disease", "Hyperlipidemia", "Hypothyroidism", "Sleep Apnea", "Obesity"]
+INSURANCE_PROVIDERS_LIST = ["United Health", "Aetna", "Blue Cross", "Cigna", "Humana",
+                            "Kaiser Permanente", "Anthem", "Centene", "Molina Healthcare", "WellCare"]
+BLOOD_TYPES_LIST = ["A+", "A-", "B+", "B-", "AB+", "AB-", "O+", "O-"]
+MEDICATIONS_LIST = ["Paracetamol", "Ibuprofen", "Amoxicillin", "Lisinopril", "Metformin",
+                    "Atorvastatin", "Omeprazole", "Losartan", "Albuterol", "Gabapentin",
+                    "Sertraline", "Amlodipine", "Simvastatin", "Hydrochlorothiazide", "Levothyroxine",
+                    "Azithromycin", "Ciprofloxacin", "Prednisone", "Insulin Glargine", "Warfarin", "Clopidogrel"]
+TRANSACTION_TYPES_LIST = ["Deposit", "Withdrawal", "Transfer", "Payment", "Refund", "Fee", "Interest"]
+PRODUCT_NAMES_LIST = ["Laptop", "Smartphone", "Headphones", "Smartwatch", "Tablet",
+                      "Camera", "Speaker", "Monitor", "Keyboard", "Mouse",
+                      "Desk Chair", "Coffee Maker", "Blender", "Backpack", "Water Bottle",
+                      "Running Shoes", "Yoga Mat", "Bluetooth Speaker", "External Hard Drive", "Webcam"]
+PRODUCT_NAMES_LIST.extend(["Drone", "VR Headset", "Air Fryer", "Electric Scooter", "Fitness Tracker",
+                           "Projector", "Robot Vacuum", "Security Camera System", "Portable SSD", "Gaming Console",
+                           "Wireless Charger", "E-reader", "Digital Photo Frame", "Smart Thermostat", "Air Purifier",
+                           "Electric Toothbrush", "Hair Dryer", "Instant Pot", "Microwave Oven", "Toaster", "Action Camera"])
+PAYMENT_METHODS_LIST = ["Credit Card", "Debit Card", "UPI", "Net Banking", "Cash on Delivery", "Wallet", "EMI"]
+PRODUCT_CATEGORIES_LIST = ["Electronics", "Clothing", "Home & Kitchen", "Books", "Beauty"]
+SHIPPING_STATUSES_LIST = ["Pending", "Shipped", "Delivered", "Cancelled", "Returned"]
+GRADES_LIST = ["A", "B", "C", "D", "F"]
+SUBJECTS_LIST = ["Math", "Science", "English", "History", "Geography"]
+DEPARTMENTS_LIST = ["IT", "HR", "Finance", "Marketing", "Operations"]
+DEPARTMENTS_LIST.extend(["Legal", "Customer Support", "Research & Development", "Product Management", "Quality Assurance",
+                         "Sales", "Supply Chain", "Administration", "Public Relations", "Design"])
+POSITIONS_LIST = ["Manager", "Developer", "Analyst", "Designer", "Accountant",
+                  "Consultant", "Specialist", "Coordinator", "Engineer", "Administrator",
+                  "Director", "Vice President", "Executive", "Intern", "Team Lead", "Architect", "Scientist"]
+DEGREES_LIST = ["B.Tech", "MBA", "B.Com", "B.A", "M.Sc"]
+SKILLS_LIST = ["Python", "Java", "SQL", "Excel", "Communication"]
+SKILLS_LIST.extend(["Project Management", "Data Analysis", "Machine Learning", "Cloud Computing", "Cybersecurity", "Agile Methodologies", "UI/UX Design",
+                    "JavaScript", "React", "Node.js", "Angular", "Vue.js", "DevOps", "Kubernetes", "Docker", "Terraform",
+                    "C++", "C#", ".NET", "PHP", "Ruby on Rails", "Go", "Swift", "Kotlin", "Mobile Development (iOS/Android)",
+                    "Technical Writing", "Problem Solving", "Critical Thinking", "Leadership", "Teamwork", "Creativity",
+                    "Digital Marketing", "SEO/SEM", "Content Creation", "Salesforce", "SAP", "Oracle", "Tableau", "Power BI"])
+PROPERTY_TYPES_LIST = ["Apartment", "Villa", "Plot", "Office", "Shop"]
+REALESTATE_STATUSES_LIST = ["Available", "Sold", "Rented", "Under Construction"]
+AMENITIES_LIST = ["Swimming Pool", "Gym", "Park", "Security", "Play Area"]
+FOOD_ITEMS_LIST = ["Pizza", "Burger", "Pasta", "Salad", "Fries", "Soda", "Sushi", "Tacos", "Biryani", "Noodles", "Sandwich", "Ice Cream",
+                   "Salad Bowl", "Smoothie", "Coffee", "Tea", "Milkshake", "Wrap", "Steak", "Seafood Platter", "Dim Sum", "Ramen", "Curry",
+                   "Dosa", "Idli", "Vada", "Samosa", "Spring Roll", "Momo", "Fried Chicken", "Hot Dog", "Pancakes", "Waffles",
+                   "Omelette", "Cereal", "Yogurt", "Fruit Salad", "Juice", "Cake", "Pastry", "Cookie", "Donut", "Muffin"]
+RESTAURANT_TYPES_LIST = ["Cafe", "Fine Dining", "Fast Food", "Pizzeria", "Bakery", "Cloud Kitchen"] # For restaurant name generation
+DELIVERY_STATUSES_LIST = ["Order Placed", "Preparing", "Out for Delivery", "Delivered", "Cancelled by User", "Cancelled by Restaurant", "Delayed"]
+ACADEMIC_JOURNALS_LIST = ["Nature", "Science", "Cell", "The Lancet", "JAMA", "IEEE Transactions", "Physical Review Letters",
+                          "New England Journal of Medicine (NEJM)", "PNAS", "BMJ", "Nature Communications", "Journal of the American Chemical Society (JACS)",
+                          "Angewandte Chemie", "Advanced Materials", "Nature Medicine", "Science Advances", "Cell Host & Microbe", "Immunity"]
+COMMON_HASHTAGS_LIST = ["#instagood", "#photooftheday", "#love", "#travel", "#tech", "#science", "#innovation", "#news", "#health",
+                        "#business", "#startup", "#motivation", "#art", "#foodie", "#fitness"]
+SENSOR_TYPES_LIST = ["Temperature", "Humidity", "Pressure", "Light", "Motion", "GPS",
+                     "Accelerometer", "Gyroscope", "Proximity", "Sound Level", "Air Quality", "CO2 Sensor",
+                     "Water Flow", "Soil Moisture", "Radiation", "Magnetic Field", "Vibration", "Ultrasonic"]
+SPECIES_LIST = ["Dog", "Cat", "Bird", "Fish", "Lion", "Tiger", "Elephant", "Bear", "Rabbit", "Horse", "Cow", "Sheep",
+                "Deer", "Fox", "Wolf", "Monkey", "Snake", "Lizard", "Frog", "Turtle", "Shark", "Whale", "Dolphin",
+                "Eagle", "Owl", "Penguin", "Crocodile", "Alligator", "Spider", "Ant", "Bee", "Butterfly"]
+COMMON_DOG_BREEDS_LIST = ["Labrador Retriever", "German Shepherd", "Golden Retriever", "Bulldog", "Poodle", "Beagle"]
+COMMON_CAT_BREEDS_LIST = ["Siamese", "Persian", "Maine Coon", "Ragdoll", "Bengal", "Sphynx"]
+LOGISTICS_CARRIER_SUFFIXES_LIST = ["Logistics", "Shipping Lines", "Freight", "Express", "Carriers", "Transport", "Movers"]
+LOGISTICS_SHIPMENT_STATUSES_LIST = ["Processing", "In Transit", "Out for Delivery", "Delivered",
+                                    "Delayed", "Held at Customs", "Returned to Sender", "Exception",
+                                    "Pending Pickup", "At Origin Facility", "At Destination Facility"]
+HABITAT_LIST = ["Forest", "Desert", "Ocean", "Grassland", "Mountain", "Domestic", "Urban", "Arctic",
+                "Jungle", "Savanna", "Wetland", "River", "Lake", "Cave", "Coral Reef", "Tundra", "Taiga", "Swamp"]
+PUBLICATION_TYPES_LIST = ["Journal Article", "Conference Paper", "Book Chapter", "Preprint", "Thesis",
+                          "Review Article", "Case Study", "Technical Report", "Poster Presentation", "Editorial",
+                          "Letter to Editor", "Book Review", "Dataset Paper", "Software Paper", "Patent"]
+
+# --- NEW LISTS FOR EXPANDED DOMAINS ---
+LEAD_SOURCES_LIST = ["Website", "Referral", "Cold Call", "Advertisement", "Trade Show", "Social Media", "Email Campaign"]
+DEAL_STAGES_LIST = ["Prospecting", "Qualification", "Needs Analysis", "Proposal", "Negotiation", "Closed Won", "Closed Lost"]
+CAMPAIGN_TYPES_LIST = ["Email Marketing", "Social Media Ads", "Search Engine Marketing (SEM)", "Content Marketing", "Influencer Marketing", "Affiliate Marketing"]
+WAREHOUSE_LOCATIONS_LIST = ["North Wing", "South Wing", "East Dock", "West Dock", "Central Hub", "Overflow Section"]
+EMPLOYEE_STATUS_LIST = ["Active", "On Leave", "Terminated", "Resigned", "Retired", "Contractor"]
+PROJECT_STATUS_LIST = ["Not Started", "In Progress", "Completed", "On Hold", "Cancelled"]
+TASK_PRIORITY_LIST = ["High", "Medium", "Low", "Critical"]
+VEHICLE_TYPES_LIST = ["Sedan", "SUV", "Truck", "Hatchback", "Coupe", "Minivan", "Motorcycle"]
+RETURN_REASONS_LIST = ["Wrong Item", "Damaged Item", "Changed Mind", "Doesn't Fit", "Not as Described"]
+POLICY_TYPES_LIST = ["Life Insurance", "Health Insurance", "Auto Insurance", "Home Insurance", "Travel Insurance"]
+CLAIM_STATUSES_LIST = ["Submitted", "Processing", "Approved", "Rejected", "Paid", "Pending Information"]
+TRANSPORT_MODES_LIST = ["Road", "Rail", "Air", "Sea", "Pipeline"]
+COURSE_LEVELS_LIST = ["Beginner", "Intermediate", "Advanced", "Expert"]
+PROPERTY_LISTING_STATUSES_LIST = ["For Sale", "For Rent", "Sold", "Rented", "Pending", "Off Market"]
+ISSUE_TYPES_LIST = ["Bug", "Feature Request", "Task", "Improvement", "Question"]
+ISSUE_STATUSES_LIST = ["Open", "In Progress", "Resolved", "Closed", "Reopened", "Pending QA"]
+LEGAL_CASE_TYPES_LIST = ["Civil", "Criminal", "Family Law", "Corporate Law", "Real Estate Law"]
+MEDIA_GENRES_LIST = ["Action", "Comedy", "Drama", "Sci-Fi", "Horror", "Romance", "Thriller", "Documentary", "Animation"]
+ENERGY_TARIFF_TYPES_LIST = ["Fixed Rate", "Variable Rate", "Time-of-Use", "Prepaid"]
+AGRICULTURE_CROP_TYPES_LIST = ["Wheat", "Rice", "Corn", "Soybean", "Cotton", "Sugarcane", "Fruits", "Vegetables"]
+URL_SCHEMES_LIST = ["http", "https"] # For URL generation
+FILE_EXTENSIONS_LIST = ["txt", "pdf", "jpg", "png", "docx", "xlsx", "csv", "py", "js", "html"]
+BOOLEAN_REPRESENTATIONS_LIST = ["True,False", "Yes,No", "1,0", "Active,Inactive"] # For boolean-like categories
+
+
+# Travel & Tourism Domain Lists
+TRAVEL_DESTINATIONS_LIST = ["Paris", "Rome", "London", "New York", "Tokyo", "Dubai", "Bali", "Barcelona", "Amsterdam", "Sydney", "Bangkok", "Singapore", "Venice", "Prague", "Vienna", "Berlin", "San Francisco", "Los Angeles", "Miami", "Chicago", "Toronto", "Vancouver", "Mexico City", "Rio de Janeiro", "Buenos Aires", "Cairo", "Cape Town", "Mumbai", "Delhi", "Beijing", "Shanghai", "Seoul", "Moscow", "Istanbul"]
+AIRLINE_NAMES_LIST = ["Emirates", "Qatar Airways", "Singapore Airlines", "ANA All Nippon Airways", "Qantas Airways", "Lufthansa", "British Airways", "Delta Air Lines", "American Airlines", "United Airlines", "Air France", "KLM", "Turkish Airlines", "Cathay Pacific", "IndiGo", "Southwest Airlines"]
+HOTEL_AMENITIES_LIST = ["WiFi", "Swimming Pool", "Gym", "Spa", "Restaurant", "Bar", "Room Service", "Parking", "Air Conditioning", "Breakfast Included", "Airport Shuttle", "Pet Friendly", "Business Center", "Concierge"]
+ROOM_TYPES_LIST = ["Standard Room", "Deluxe Room", "Suite", "Family Room", "Single Room", "Double Room", "King Room", "Queen Room", "Studio", "Apartment", "Villa", "Bungalow"]
+TRAVEL_BOOKING_STATUSES_LIST = ["Confirmed", "Pending", "Cancelled", "Modified", "Completed", "No-Show", "Waitlisted"]
+TRAVEL_ACTIVITY_TYPES_LIST = ["Sightseeing Tour", "Museum Visit", "Adventure Sport", "Cooking Class", "Wine Tasting", "Cultural Show", "Shopping Trip", "Beach Relaxation", "Hiking", "Cruise"]
+
+
+
+GENERAL_CATEGORIES_LIST = ["Category A", "Category B", "Category C", "Category D"]
+GENERAL_STATUSES_LIST = ["Active", "Inactive", "Pending", "Completed"]
+
+# --- NEW: Map of Canonical Field Names to their Schema Details (Type, Constraint) ---
+# This map will be used by the refactored generate_synthetic_data function
+CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP = {
+    # General & Common
+    "id": {"type": "string", "constraint": "", "is_generic_numeric_id": True, "display_name": "ID"},
+    "name": {"type": "name", "constraint": "", "display_name": "Name"},
+    "age": {"type": "int", "constraint": "18-80", "display_name": "Age"},
+    "gender": {"type": "category", "constraint": "Male,Female,Other", "display_name": "Gender"},
+    "email": {"type": "email", "constraint": "", "display_name": "Email"},
+    "phone": {"type": "phone", "constraint": "", "display_name": "Phone"},
+    "address": {"type": "address", "constraint": "", "display_name": "Address"},
+    "date": {"type": "date", "constraint": "", "display_name": "Date"}, # Generic date
+    "value": {"type": "float", "constraint": "10-1000", "display_name": "Value"},
+    "category": {"type": "category", "constraint": ",".join(GENERAL_CATEGORIES_LIST), "display_name": "Category"},
+    "description": {"type": "string", "constraint": "", "display_name": "Description"}, # Uses fake.sentence()
+    "status": {"type": "category", "constraint": ",".join(GENERAL_STATUSES_LIST), "display_name": "Status"},
+    "score": {"type": "float", "constraint": "0-100", "display_name": "Score"},
+    "city": {"type": "string", "constraint": "", "is_faker_city": True, "display_name": "City"},
+    "state": {"type": "string", "constraint": "", "is_faker_state": True, "display_name": "State"},
+    "country": {"type": "string", "constraint": "", "is_faker_country": True, "display_name": "Country"},
+    "pincode": {"type": "string", "constraint": "", "is_faker_postcode": True, "display_name": "Pincode"}, # also zipcode
+    "zipcode": {"type": "string", "constraint": "", "is_faker_postcode": True, "display_name": "Zipcode"},
+    "currency": {"type": "string", "constraint": "", "is_faker_currency_code": True, "display_name": "Currency"},
+    "job": {"type": "string", "constraint": "", "is_faker_job": True, "display_name": "Job Title"},
+    "company": {"type": "string", "constraint": "", "is_faker_company": True, "display_name": "Company"},
+    "aadhaar": {"type": "aadhaar", "constraint": "", "display_name": "Aadhaar"},
+    "pan": {"type": "pan", "constraint": "", "display_name": "PAN"},
+    "passport": {"type": "passport", "constraint": "", "display_name": "Passport"},
+    "url": {"type": "string", "constraint": "", "is_faker_url": True, "display_name": "URL"},
+    "ip_address": {"type": "string", "constraint": "", "is_faker_ipv4": True, "display_name": "IP Address"},
+    "mac_address": {"type": "string", "constraint": "", "is_faker_mac_address": True, "display_name": "MAC Address"},
+    "version_number": {"type": "string", "constraint": "", "is_version_number_pattern": True, "display_name": "Version"},
+    "blood_pressure_reading": {"type": "string", "constraint": "", "is_blood_pressure_pattern": True, "display_name": "Blood Pressure"},
+    "boolean_flag": {"type": "category", "constraint": BOOLEAN_REPRESENTATIONS_LIST[0], "display_name": "Flag"}, # Fixed choice so the table is identical across reruns
+    "timestamp_detailed": {"type": "date", "constraint": "datetime_utc", "display_name": "Timestamp (UTC)"}, # Special constraint for datetime with UTC
+    "file_name": {"type": "string", "constraint": "", "is_faker_file_name": True, "display_name": "File Name"},
+    "mime_type": {"type": "string", "constraint": "", "is_faker_mime_type": True, "display_name": "MIME Type"},
+    "voterid": {"type": "voterid", "constraint": "", "display_name": "Voter ID"},
+    "ifsc": {"type": "ifsc", "constraint": "", "display_name": "IFSC Code"}, # also ifsc_code
+    "upi": {"type": "upi", "constraint": "", "display_name": "UPI ID"}, # also upi_id
+
+    # Hospital Domain
+    "patient_id": {"type": "string", "constraint": "", "is_generic_numeric_id": True, "display_name": "Patient ID"},
+    "doctor_name": {"type": "name", "constraint": "", "prefix": "Dr.", "display_name": "Doctor Name"}, # Note: space after Dr. handled in generation
+    "hospital_name": {"type": "string", "constraint": "", "suffix": " Hospital", "is_faker_company": True, "display_name": "Hospital Name"},
+    "diagnosis": {"type": "category", "constraint": ",".join(DIAGNOSES_LIST), "display_name": "Diagnosis"},
+    "admission_date": {"type": "date", "constraint": "", "display_name": "Admission Date"}, # Needs relative date logic if "discharge_date" is also present
+    "discharge_date": {"type": "date", "constraint": "", "display_name": "Discharge Date"},
+    "room_number": {"type": "string", "constraint": "", "is_room_number_pattern": True, "display_name": "Room Number"}, # e.g., "101A"
+    "insurance_provider": {"type": "category", "constraint": ",".join(INSURANCE_PROVIDERS_LIST), "display_name": "Insurance Provider"},
+    "blood_type": {"type": "category", "constraint": ",".join(BLOOD_TYPES_LIST), "display_name": "Blood Type"},
+    "medication": {"type": "category", "constraint": ",".join(MEDICATIONS_LIST), "display_name": "Medication"},
+
+    # Finance Domain (Example, expand as needed)
+    "transaction_id": {"type": "string", "constraint": "", "is_generic_numeric_id": True, "display_name": "Transaction ID"},
+    "account_number": {"type": "string", "constraint": "digits:10-12", "is_digit_sequence": True, "display_name": "Account Number"}, # Custom constraint type
+    "bank_name": {"type": "string", "constraint": "", "is_faker_company": True, "suffix": " Bank", "display_name": "Bank Name"},
+    "balance": {"type": "float", "constraint": "-5000-50000", "display_name": "Balance"},
+    "reference_number": {"type": "string", "constraint": "", "is_reference_number_pattern": True, "display_name": "Reference Number"},
+    "amount": {"type": "float", "constraint": "100-10000", "display_name": "Amount"},
+    "salary": {"type": "int", "constraint": "20000-200000", "display_name": "Salary"},
+    "transaction_type": {"type": "category", "constraint": ",".join(TRANSACTION_TYPES_LIST), "display_name": "Transaction Type"},
+    "credit_card_number": {"type": "string", "constraint": "", "is_faker_credit_card_number": True, "display_name": "Credit Card Number"},
+
+    # Food Delivery Domain
+    "restaurant_name": {"type": "string", "constraint": "", "is_faker_company": True, "suffix_from_list": RESTAURANT_TYPES_LIST, "display_name": "Restaurant Name"},
+    "food_items": {"type": "category", "constraint": ",".join(FOOD_ITEMS_LIST), "display_name": "Food Items"}, # Could also be a multi-select or string for comma-separated items
+    "order_total": {"type": "int", "constraint": "100-2000", "display_name": "Order Total (INR)"},
+    "delivery_agent_name": {"type": "name", "constraint": "", "display_name": "Delivery Agent Name"},
+    "delivery_time_minutes": {"type": "int", "constraint": "15-75", "display_name": "Delivery Time (Minutes)"},
+    "delivery_rating": {"type": "int", "constraint": "1-5", "display_name": "Delivery Rating"},
+    "delivery_address": {"type": "address", "constraint": "", "display_name": "Delivery Address"}, # Already covered by general address
+    "payment_mode": {"type": "category", "constraint": ",".join(PAYMENT_METHODS_LIST), "display_name": "Payment Mode"}, # Re-use from e-commerce
+    "delivery_status": {"type": "category", "constraint": ",".join(DELIVERY_STATUSES_LIST), "display_name": "Delivery Status"},
+
+    # Education Domain
+    "student_id": {"type": "string", "constraint": "", "is_generic_numeric_id": True, "display_name": "Student ID"},
+    "school_name": {"type": "string", "constraint": "", "is_faker_company": True, "suffix": " School", "display_name": "School Name"},
+    "teacher_name": {"type": "name", "constraint": "", "prefix_options": ["Mr.", "Ms.", "Dr."], "display_name": "Teacher Name"},
+    "grade": {"type": "category", "constraint": ",".join(GRADES_LIST), "display_name": "Grade"},
+    "subject": {"type": "category", "constraint": ",".join(SUBJECTS_LIST), "display_name": "Subject"},
+    "attendance": {"type": "string", "constraint": "70-100", "is_percentage_pattern": True, "display_name": "Attendance"},
+    "course_name": {"type": "string", "constraint": "", "is_faker_bs": True, "display_name": "Course Name"},
+
+    # Employee Domain
+    "employee_id": {"type": "string", "constraint": "", "is_generic_numeric_id": True, "display_name": "Employee ID"},
+    "department": {"type": "category", "constraint": ",".join(DEPARTMENTS_LIST), "display_name": "Department"},
+    "position": {"type": "category", "constraint": ",".join(POSITIONS_LIST), "display_name": "Position"},
+    "employee_status": {"type": "category", "constraint": ",".join(EMPLOYEE_STATUS_LIST), "display_name": "Employee Status"},
+    "performance_rating": {"type": "float", "constraint": "1.0-5.0", "display_name": "Performance Rating"},
+
+    # Real Estate Domain
+    "property_id": {"type": "string", "constraint": "", "is_generic_numeric_id": True, "display_name": "Property ID"},
+    "area": {"type": "string", "constraint": "500-3000", "unit": "sq.ft.", "is_measurement_pattern": True, "display_name": "Area"},
+    "property_type": {"type": "category", "constraint": ",".join(PROPERTY_TYPES_LIST), "display_name": "Property Type"},
+    "listing_status": {"type": "category", "constraint": ",".join(PROPERTY_LISTING_STATUSES_LIST), "display_name": "Listing Status"},
+    "year_built": {"type": "int", "constraint": "1990-2023", "display_name": "Year Built"},
+
+    # E-commerce (some fields might be general or already covered)
+    "order_id": {"type": "string", "constraint": "", "is_generic_numeric_id": True, "display_name": "Order ID"},
+    "customer_name": {"type": "name", "constraint": "", "display_name": "Customer Name"},
+    "product_name": {"type": "category", "constraint": ",".join(PRODUCT_NAMES_LIST), "display_name": "Product Name"},
+    "price": {"type": "float", "constraint": "100-5000", "display_name": "Price"},
+    "quantity": {"type": "int", "constraint": "1-10", "display_name": "Quantity"},
+    "product_category": {"type": "category", "constraint": ",".join(PRODUCT_CATEGORIES_LIST), "display_name": "Product Category"},
+    "discount": {"type": "float", "constraint": "0-0.5", "display_name": "Discount"}, # as a percentage
+    "shipping_status": {"type": "category", "constraint": ",".join(SHIPPING_STATUSES_LIST), "display_name": "Shipping Status"},
+    # ... Add ALL other canonical fields from FIELD_GENERATORS here, mapping them to a type and constraint
+
+    # Academic/Research Domain
+    "publication_title": {"type": "string", "constraint": "", "display_name": "Publication Title"}, # Will use _generate_string_value
+    "author_names": {"type": "name", "constraint": "", "is_multi_name": True, "display_name": "Author Names"}, # Special handling for multiple authors
+    "journal_name": {"type": "category", "constraint": ",".join(ACADEMIC_JOURNALS_LIST), "display_name": "Journal Name"},
+    "publication_year": {"type": "int", "constraint": "2000-2024", "display_name": "Publication Year"},
+    "citation_count": {"type": "int", "constraint": "0-1000", "display_name": "Citation Count"},
+    "doi": {"type": "string", "constraint": "", "is_doi_pattern": True, "display_name": "DOI"},
+    "keywords": {"type": "string", "constraint": "", "is_keywords_list": True, "display_name": "Keywords"}, # Comma-separated list of words
+    "publication_type": {"type": "category", "constraint": ",".join(PUBLICATION_TYPES_LIST), "display_name": "Publication Type"},
+
+    # Social Media Domain
+    "username": {"type": "string", "constraint": "", "is_faker_user_name": True, "display_name": "Username"},
+    "post_text": {"type": "string", "constraint": "", "display_name": "Post Text"}, # Will use _generate_string_value
+    "like_count": {"type": "int", "constraint": "0-10000", "display_name": "Like Count"},
+    "share_count": {"type": "int", "constraint": "0-5000", "display_name": "Share Count"},
+    "comment_text": {"type": "string", "constraint": "", "display_name": "Comment Text"}, # Will use _generate_string_value
+    "hashtags": {"type": "category", "constraint": ",".join(COMMON_HASHTAGS_LIST), "is_multi_category": True, "display_name": "Hashtags"},
+
+    # IoT/Sensor Domain
+    "sensor_id": {"type": "string", "constraint": "", "is_generic_alphanum_id": True, "prefix": "SENSOR-", "display_name": "Sensor ID"},
+    "timestamp": {"type": "date", "constraint": "datetime", "display_name": "Timestamp"}, # Special constraint for datetime
+    "temperature": {"type": "float", "constraint": "-20.0-50.0", "unit": "°C", "is_measurement_pattern": True, "display_name": "Temperature"},
+    "humidity": {"type": "float", "constraint": "0.0-100.0", "unit": "%", "is_measurement_pattern": True, "display_name": "Humidity"},
+    "latitude": {"type": "float", "constraint": "-90.0-90.0", "is_faker_latitude": True, "display_name": "Latitude"},
+    "longitude": {"type": "float", "constraint": "-180.0-180.0", "is_faker_longitude": True, "display_name": "Longitude"},
+    "sensor_type": {"type": "category", "constraint": ",".join(SENSOR_TYPES_LIST), "display_name": "Sensor Type"},
+
+    # Animal Data Domain
+    "animal_name": {"type": "animal_name", "constraint": "", "display_name": "Animal Name"}, # Changed type to "animal_name"
+    "species": {"type": "category", "constraint": ",".join(SPECIES_LIST), "display_name": "Species"},
+    "breed": {"type": "category", "constraint": ",".join(COMMON_DOG_BREEDS_LIST + COMMON_CAT_BREEDS_LIST), "display_name": "Breed"}, # Combine or make dynamic
+    "animal_age": {"type": "int", "constraint": "0-25", "display_name": "Animal Age (Years)"},
+    "habitat": {"type": "category", "constraint": ",".join(HABITAT_LIST), "display_name": "Habitat"},
+    "animal_weight_kg": {"type": "float", "constraint": "0.1-1000", "display_name": "Weight (kg)"},
+    "animal_color": {"type": "string", "constraint": "", "is_faker_color_name": True, "display_name": "Color"},
+
+    # Logistics/Supply Chain Domain
+    "shipment_id": {"type": "string", "constraint": "", "is_generic_alphanum_id": True, "prefix": "SHP-", "display_name": "Shipment ID"},
+    "tracking_number": {"type": "string", "constraint": "", "is_tracking_number_pattern": True, "display_name": "Tracking Number"},
+    "carrier_name": {"type": "string", "constraint": "", "is_faker_company": True, "suffix_from_list": LOGISTICS_CARRIER_SUFFIXES_LIST, "display_name": "Carrier Name"},
+    "origin_location": {"type": "address", "constraint": "", "display_name": "Origin Location"}, # Reuses address type
+    "destination_location": {"type": "address", "constraint": "", "display_name": "Destination Location"}, # Reuses address type
+    "shipment_status_logistics": {"type": "category", "constraint": ",".join(LOGISTICS_SHIPMENT_STATUSES_LIST), "display_name": "Shipment Status"},
+    "freight_cost": {"type": "float", "constraint": "50-5000", "display_name": "Freight Cost"},
+    "estimated_delivery_date": {"type": "date", "constraint": "", "display_name": "Estimated Delivery Date"},
+    "actual_delivery_date": {"type": "date", "constraint": "", "display_name": "Actual Delivery Date"},
+    "package_weight_kg": {"type": "float", "constraint": "0.1-1000", "unit": "kg", "is_measurement_pattern": True, "display_name": "Package Weight (kg)"}, # Reused from animal, good generic
+    "package_dimensions_cm": {"type": "string", "constraint": "", "is_dimension_pattern": True, "display_name": "Package Dimensions (cm)"},
+
+    # Travel & Tourism Domain
+    "booking_id": {"type": "string", "constraint": "", "is_generic_alphanum_id": True, "prefix": "BKG-", "display_name": "Booking ID"},
+    "traveler_name": {"type": "name", "constraint": "", "display_name": "Traveler Name"},
+    "destination_city_travel": {"type": "category", "constraint": ",".join(TRAVEL_DESTINATIONS_LIST), "is_faker_city_if_empty_constraint": True, "display_name": "Destination City"},
+    "origin_city_travel": {"type": "category", "constraint": ",".join(TRAVEL_DESTINATIONS_LIST), "is_faker_city_if_empty_constraint": True, "display_name": "Origin City"},
+    "travel_date": {"type": "date", "constraint": "", "display_name": "Travel Date"}, # Departure date
+    "return_date": {"type": "date", "constraint": "", "display_name": "Return Date"}, # Needs to be after travel_date
+    "flight_number": {"type": "string", "constraint": "", "is_flight_number_pattern": True, "display_name": "Flight Number"},
+    "airline_name": {"type": "category", "constraint": ",".join(AIRLINE_NAMES_LIST), "is_faker_company_if_empty_constraint": True, "suffix": " Airlines", "display_name": "Airline Name"},
+    "hotel_name": {"type": "string", "constraint": "", "is_faker_company": True, "suffix_options": [" Hotel", " Resort", " Inn", " Lodge", " Suites"], "display_name": "Hotel Name"},
+    "room_type": {"type": "category", "constraint": ",".join(ROOM_TYPES_LIST), "display_name": "Room Type"},
+    "booking_status_travel": {"type": "category", "constraint": ",".join(TRAVEL_BOOKING_STATUSES_LIST), "display_name": "Booking Status"},
+    "total_travel_cost": {"type": "float", "constraint": "200-10000", "display_name": "Total Cost (USD)"}, # Assuming USD for now
+    "travel_package_name": {"type": "string", "constraint": "", "is_faker_bs": True, "prefix": "Package: ", "display_name": "Travel Package Name"}, # Using bs for catchy names
+    "hotel_amenities_included": {"type": "category", "constraint": ",".join(HOTEL_AMENITIES_LIST), "is_multi_category": True, "display_name": "Hotel Amenities"},
+    "travel_activity": {"type": "category", "constraint": ",".join(TRAVEL_ACTIVITY_TYPES_LIST), "display_name": "Activity Booked"},
+
+    # --- NEW DOMAINS ---
+    # Sales/CRM
+    "lead_id": {"type": "string", "constraint": "", "is_generic_alphanum_id": True, "prefix": "LEAD-", "display_name": "Lead ID"},
+    "lead_source": {"type": "category", "constraint": ",".join(LEAD_SOURCES_LIST), "display_name": "Lead Source"},
+    "deal_stage": {"type": "category", "constraint": ",".join(DEAL_STAGES_LIST), "display_name": "Deal Stage"},
+    "opportunity_amount": {"type": "float", "constraint": "1000-1000000", "display_name": "Opportunity Amount"},
+    "close_date": {"type": "date", "constraint": "", "display_name": "Close Date"},
+    "account_type": {"type": "category", "constraint": "Prospect,Customer,Partner,Vendor", "display_name": "Account Type"},
+    "industry": {"type": "string", "constraint": "", "is_faker_bs": True, "display_name": "Industry"}, # Using bs for variety
+
+    # Marketing
+    "campaign_id": {"type": "string", "constraint": "", "is_generic_alphanum_id": True, "prefix": "CAMP-", "display_name": "Campaign ID"},
+    "campaign_name": {"type": "string", "constraint": "", "is_faker_catch_phrase": True, "display_name": "Campaign Name"},
+    "campaign_type": {"type": "category", "constraint": ",".join(CAMPAIGN_TYPES_LIST), "display_name": "Campaign Type"},
+    "ad_spend": {"type": "float", "constraint": "100-10000", "display_name": "Ad Spend"},
+    "impressions": {"type": "int", "constraint": "1000-1000000", "display_name": "Impressions"},
+    "clicks": {"type": "int", "constraint": "10-10000", "display_name": "Clicks"},
+    "ctr": {"type": "float", "constraint": "0.001-0.1", "display_name": "Click-Through Rate (CTR)"}, # As a decimal
+    "conversion_rate": {"type": "float", "constraint": "0.01-0.2", "display_name": "Conversion Rate"}, # As a decimal
+
+    # Manufacturing/Inventory
+    "sku": {"type": "string", "constraint": "", "is_generic_alphanum_id": True, "prefix": "SKU-", "display_name": "SKU"},
+    "serial_number": {"type": "string", "constraint": "", "is_generic_alphanum_id": True, "length": 12, "display_name": "Serial Number"},
+    "batch_number": {"type": "string", "constraint": "", "is_generic_alphanum_id": True, "prefix": "BATCH-", "length": 8, "display_name": "Batch Number"},
+    "warehouse_location": {"type": "category", "constraint": ",".join(WAREHOUSE_LOCATIONS_LIST), "display_name": "Warehouse Location"},
+    "stock_level": {"type": "int", "constraint": "0-10000", "display_name": "Stock Level"},
+    "supplier_name": {"type": "string", "constraint": "", "is_faker_company": True, "display_name": "Supplier Name"},
+
+    # Project Management
+    "project_id": {"type": "string", "constraint": "", "is_generic_alphanum_id": True, "prefix": "PROJ-", "display_name": "Project ID"},
+    "project_name": {"type": "string", "constraint": "", "is_faker_bs": True, "display_name": "Project Name"},
+    "task_id": {"type": "string", "constraint": "", "is_generic_alphanum_id": True, "prefix": "TASK-", "display_name": "Task ID"},
+    "task_name": {"type": "string", "constraint": "", "is_faker_catch_phrase": True, "display_name": "Task Name"},
+    "assignee_name": {"type": "name", "constraint": "", "display_name": "Assignee"},
+    "due_date": {"type": "date", "constraint": "", "display_name": "Due Date"},
+    "project_status": {"type": "category", "constraint": ",".join(PROJECT_STATUS_LIST), "display_name": "Project Status"},
+    "task_priority": {"type": "category", "constraint": ",".join(TASK_PRIORITY_LIST), "display_name": "Task Priority"},
+
+    # Software Development
+    "bug_id": {"type": "string", "constraint": "", "is_generic_numeric_id": True, "prefix": "BUG-", "display_name": "Bug ID"},
+    "feature_id": {"type": "string", "constraint": "", "is_generic_numeric_id": True, "prefix": "FEAT-", "display_name": "Feature ID"},
+    "commit_hash": {"type": "string", "constraint": "", "is_faker_sha256": True, "display_name": "Commit Hash"}, # sha256 is a good proxy
+    "repository_url": {"type": "string", "constraint": "", "is_faker_url": True, "display_name": "Repository URL"},
+    "issue_type": {"type": "category", "constraint": ",".join(ISSUE_TYPES_LIST), "display_name": "Issue Type"},
+    "issue_status": {"type": "category", "constraint": ",".join(ISSUE_STATUSES_LIST), "display_name": "Issue Status"},
+
+
+    # This is a crucial step for the refactor to work comprehensively.
+}
+
+# --- NEW: Domain Prompt to Predefined Schema Mapping ---
+# Maps common domain phrases to a list of canonical field keys
+DOMAIN_PROMPT_TO_SCHEMA_MAP = {
+    "medical data": [
+        "patient_id", "patient_name", "age", "gender", "admission_date",
+        "discharge_date", "diagnosis", "doctor_name", "hospital_name", "blood_pressure_reading",
+        "blood_type", "medication", "phone", "email"
+    ],
+    "patient data": [ # New entry for "patient data"
+        "patient_id", "name", "age", "gender", "admission_date", "diagnosis", "phone", "email"
+    ],
+    "hospital data": [
+        "patient_id", "patient_name", "age", "gender", "admission_date",
+        "discharge_date", "diagnosis", "doctor_name", "hospital_name", "blood_pressure_reading",
+        "room_number", "insurance_provider", "blood_type", "medication", "phone", "email"
+    ],
+    "healthcare data": [
+        "patient_id", "patient_name", "age", "gender", "admission_date",
+        "discharge_date", "diagnosis", "doctor_name", "hospital_name",
+        "insurance_provider", "blood_type", "medication", "phone", "email"
+    ],
+    "e-commerce data": [
+        "order_id", "customer_name", "email", "product_name", "quantity", "price",
+        "order_date", "shipping_address", "shipping_status", "payment_method", "product_category"
+    ],
+    "retail data": [
+        "order_id", "customer_name", "email", "product_name", "quantity", "price",
+        "order_date", "shipping_address", "shipping_status", "payment_method", "product_category"
+    ],
+    "customer data": [ # New entry for "customer data"
+        "id", "customer_name", "email", "phone", "address",
+        "date", "category", "status" # Adding some generic fields
+    ],
+    "employee data": [
+        "employee_id", "name", "email", "phone", "job", 
+        "department", "salary", "date", 
+        "age", "gender", "address"
+    ],
+    "hr data": [
+        "employee_id", "name", "email", "phone", "job",
+        "department", "salary", "date", "age", "gender", "address"
+    ],
+    "financial data": [
+        "transaction_id", "account_number", "date", "amount", "transaction_type",
+        "description", "bank_name", "currency", "balance", "ifsc", "upi"
+    ],
+    "finance data": [ # Added for more direct matching
+        "transaction_id", "account_number", "date", "amount", "transaction_type",
+        "description", "bank_name", "currency", "balance", "ifsc", "upi"
+    ],
+    "banking data": [
+        "transaction_id", "account_number", "date", "amount", "transaction_type",
+        "description", "bank_name", "currency", "balance", "ifsc", "upi", "customer_name"
+    ],
+    "social media data": [
+        "id", "username", "post_text", "timestamp", "like_count",
+        "share_count", "comment_text", "hashtags"
+    ],
+    "logistics data": [
+        "shipment_id", "tracking_number", "carrier_name", "origin_location",
+        "destination_location", "shipment_status_logistics", "estimated_delivery_date",
+        "actual_delivery_date", "freight_cost", "package_weight_kg", "package_dimensions_cm"
+    ],
+    "supply chain data": [
+        "shipment_id", "tracking_number", "carrier_name", "origin_location",
+        "destination_location", "shipment_status_logistics", "estimated_delivery_date",
+        "actual_delivery_date", "freight_cost", "package_weight_kg", "package_dimensions_cm", "product_name"
+    ],
+    "travel data": [
+        "booking_id", "traveler_name", "destination_city_travel", "origin_city_travel",
+        "travel_date", "return_date", "flight_number", "airline_name", "hotel_name",
+        "room_type", "booking_status_travel", "total_travel_cost", "email", "phone"
+    ],
+    "tourism data": [
+        "booking_id", "traveler_name", "destination_city_travel", "origin_city_travel",
+        "travel_date", "return_date", "flight_number", "airline_name", "hotel_name",
+        "room_type", "booking_status_travel", "total_travel_cost", "email", "phone", "travel_activity"
+    ],
+    "iot data": [
+        "sensor_id", "timestamp", "temperature", "humidity", "latitude", "longitude", "sensor_type", "value"
+    ],
+    "sensor data": [
+        "sensor_id", "timestamp", "temperature", "humidity", "latitude", "longitude", "sensor_type", "value"
+    ],
+    "academic data": [
+        "id", "publication_title", "author_names", "journal_name", "publication_year", "doi", "keywords", "citation_count", "publication_type"
+    ],
+    "research data": [
+        "id", "publication_title", "author_names", "journal_name", "publication_year", "doi", "keywords", "citation_count", "publication_type"
+    ],
+     "student data": [
+        "student_id", "name", "age", "gender", "email", "phone", "address",
+        "school_name", "grade", "subject", "marks", "attendance"
+    ],
+    "education data": [
+        "student_id", "name", "age", "gender", "email", "school_name", "grade", "subject", "marks",
+        "teacher_name", "course_name" 
+    ],
+    "real estate data": [
+        "property_id", "property_type", "address", "city", "state", "pincode", "area",
+        "price", "bedrooms", "bathrooms", "year_built", "status"
+    ],
+    "property data": [
+        "property_id", "property_type", "address", "city", "state", "pincode", "area",
+        "price", "bedrooms", "bathrooms", "year_built", "status"
+    ],
+    "food delivery data": [
+        "order_id", "customer_name", "restaurant_name", "food_items", "order_total",
+        "delivery_agent_name", "delivery_time_minutes", "delivery_rating", "delivery_address",
+        "payment_mode", "delivery_status"
+    ],
+    "restaurant data": [
+        "restaurant_name", "address", "city", "phone", "category", 
+        "order_id", "food_items", "order_total", "delivery_status"
+    ],
+
+    # --- NEW DOMAINS MAPPINGS ---
+    "sales data": [
+        "lead_id", "customer_name", "email", "phone", "company", "lead_source",
+        "deal_stage", "opportunity_amount", "close_date", "account_type", "industry"
+    ],
+    "crm data": [
+        "lead_id", "customer_name", "email", "phone", "company", "lead_source",
+        "deal_stage", "opportunity_amount", "close_date", "account_type", "industry", "last_contact_date"
+    ],
+    "marketing campaign data": [
+        "campaign_id", "campaign_name", "campaign_type", "start_date", "end_date",
+        "ad_spend", "impressions", "clicks", "ctr", "conversion_rate", "target_audience"
+    ],
+    "inventory data": [
+        "sku", "product_name", "serial_number", "batch_number", "warehouse_location",
+        "stock_level", "supplier_name", "last_stocked_date", "unit_cost"
+    ],
+    "manufacturing data": [
+        "product_id", "product_name", "sku", "batch_number", "production_date", "quantity_produced",
+        "machine_id", "operator_name", "quality_check_status"
+    ],
+    "project management data": [
+        "project_id", "project_name", "task_id", "task_name", "assignee_name", "start_date",
+        "due_date", "project_status", "task_priority", "estimated_hours", "actual_hours"
+    ],
+    "software development data": [
+        "issue_id", "bug_id", "feature_id", "summary", "description", "reporter_name", "assignee_name",
+        "issue_type", "issue_status", "priority", "created_date", "updated_date", "commit_hash", "repository_url"
+    ],
+    "website traffic data": [
+        "session_id", "user_id", "timestamp_detailed", "ip_address", "url", "referrer_url",
+        "user_agent", "country", "city", "page_views", "bounce_rate"
+    ],
+}
+
+# --- Synonym and Phrase Mapping for Fields ---
+# Maps user-friendly terms/phrases to canonical field keys used in FIELD_GENERATORS
+FIELD_SYNONYM_TO_CANONICAL_MAP = {
+    # General
+    "identifier": "id", "record id": "id",
+    "full name": "name", "person name": "name",
+    "years old": "age",
+    "sex": "gender",
+    "email address": "email",
+    "phone number": "phone", "contact number": "phone", "mobile number": "phone",
+    "location address": "address", "street address": "address",
+    "specific date": "date", "transaction date": "date", "order date": "date", "join date": "date", "listing date": "date", "date of birth": "date", "dob": "date",
+    "monetary value": "value",
+    "type": "category", "classification": "category", # 'category' itself is a key
+    "details": "description",
+    "current status": "status", # 'status' itself is a key
+    "rating": "score", # 'score' itself is a key
+    "website address": "url", "web link": "url", "site url": "url",
+    "internet protocol address": "ip_address", "ipv4 address": "ip_address",
+    "media access control address": "mac_address",
+    "software version": "version_number", "build number": "version_number",
+    "yes/no flag": "boolean_flag", "true/false indicator": "boolean_flag", "is active": "boolean_flag",
+    "event timestamp": "timestamp_detailed", "log time": "timestamp_detailed",
+    "attachment name": "file_name", "document name": "file_name",
+
+    # Hospital
+    "patient id": "patient_id", "patient number": "patient_id", "medical record number": "patient_id", "mrn": "patient_id",
+    "patient name": "patient_name",
+    "doctor name": "doctor_name", "physician name": "doctor_name", "blood pressure": "blood_pressure_reading",
+    "hospital name": "hospital_name", "clinic name": "hospital_name",
+    "medical condition": "diagnosis", # 'diagnosis' itself is a key
+    "admission date": "admission_date", "date of admission": "admission_date",
+    "discharge date": "discharge_date", "date of discharge": "discharge_date",
+    "room number": "room_number", "hospital room": "room_number",
+    "insurance provider": "insurance_provider", "health insurance": "insurance_provider",
+    "blood type": "blood_type", "blood group": "blood_type",
+    "prescription": "medication", "drug name": "medication", # 'medication' itself is a key
+
+    # Finance
+    "transaction id": "transaction_id", "transaction number": "transaction_id", "txn id": "transaction_id",
+    "account number": "account_number", "acct no": "account_number", "bank account number": "account_number",
+    "transaction amount": "amount", # 'amount' itself is a key
+    "bank name": "bank_name",
+    "account holder": "account_holder", "account name": "account_holder",
+    "transaction type": "transaction_type", "type of transaction": "transaction_type",
+    "account balance": "balance", # 'balance' itself is a key
+    "ifsc code": "ifsc_code", "ifsc": "ifsc_code",
+    "bank branch": "branch", # 'branch' itself is a key
+    "upi id": "upi_id", "upi address": "upi_id",
+    "reference number": "reference_number", "ref no": "reference_number",
+
+    # Ecommerce
+    "order id": "order_id", "order number": "order_id",
+    "customer name": "customer_name",
+    "product name": "product_name", "item name": "product_name",
+    "cost": "price", "product price": "price", # 'price' itself is a key
+    "order total": "order_total", # Ensure "order total" maps to the canonical field
+    "number of items": "quantity", # 'quantity' itself is a key
+    "payment method": "payment_method", "mode of payment": "payment_method",
+    "delivery address": "delivery_address", "shipping address": "delivery_address",
+    "customer email": "customer_email",
+    "customer phone": "customer_phone",
+    "product category": "product_category", "item category": "product_category",
+    "price reduction": "discount", # 'discount' itself is a key
+    "shipping status": "shipping_status", "order status": "shipping_status",
+
+    # Education (many are already direct matches or covered by general)
+    "student id": "student_id", "student number": "student_id", "roll number": "student_id",
+    "student name": "student_name",
+    "class": "grade", "student grade": "grade", # 'grade' itself is a key
+    "college name": "school_name", "university name": "school_name", # 'school_name' itself is a key
+    "teacher name": "teacher_name", "instructor name": "teacher_name", "professor name": "teacher_name",
+    "course name": "subject", # 'subject' itself is a key
+    "student attendance": "attendance", # 'attendance' itself is a key
+    "score obtained": "marks", "exam score": "marks", # 'marks' itself is a key
+    "parent name": "parent_name", "guardian name": "parent_name",
+
+    # Employee (many are already direct matches or covered by general)
+    "employee id": "employee_id", "employee number": "employee_id", "staff id": "employee_id",
+    "employee name": "employee_name", "staff name": "employee_name",
+    "dept": "department", # 'department' itself is a key
+    "compensation": "salary", "pay": "salary", "income": "salary", # 'salary' itself is a key
+    "joining date": "date", "date of joining": "date", # Covered by general date
+    "job title": "position", "designation": "position", "role": "position", # 'position' itself is a key
+    "reporting manager": "manager", "supervisor": "manager", # 'manager' itself is a key
+    "qualification": "education", "degree": "education", # 'education' itself is a key
+    "abilities": "skills", "expertise": "skills", # 'skills' itself is a key
+    "performance rating": "performance_rating", "appraisal score": "performance_rating",
+
+    # Real Estate
+    "property id": "property_id", "property number": "property_id", "listing id": "property_id",
+    "type of property": "property_type", # 'property_type' itself is a key
+    "size": "area", "square feet": "area", "sq ft": "area", # 'area' itself is a key
+    "property location": "location", # 'location' itself is a key
+    "number of bedrooms": "bedrooms", "beds": "bedrooms", # 'bedrooms' itself is a key
+    "number of bathrooms": "bathrooms", "baths": "bathrooms", # 'bathrooms' itself is a key
+    "seller name": "owner_name", # 'owner_name' itself is a key
+    # "contact_phone" is direct
+    "facilities": "amenities", # 'amenities' itself is a key
+    "construction year": "year_built", # 'year_built' itself is a key
+
+    # Add direct keys from FIELD_GENERATORS if they are not complex phrases
+
+    # Food Delivery Synonyms
+    "restaurant": "restaurant_name", "eatery name": "restaurant_name", "food place": "restaurant_name",
+    "items ordered": "food_items", "dishes": "food_items", "menu items": "food_items",
+    "bill amount": "order_total", "total cost": "order_total",
+    "delivery boy name": "delivery_agent_name", "rider name": "delivery_agent_name", "delivery person": "delivery_agent_name",
+    "restaurant name": "restaurant_name", # Added for exact phrase match
+    "food items": "food_items",           # Added for exact phrase match
+    "delivery agent": "delivery_agent_name", # Added for common phrase match
+    "delivery agent name": "delivery_agent_name", # Added for exact phrase match
+    "time to deliver": "delivery_time_minutes", "estimated delivery time": "delivery_time_minutes",
+    "customer rating for delivery": "delivery_rating",
+    "drop address": "delivery_address",
+    "how paid": "payment_mode",
+    "order current status": "delivery_status", "status of delivery": "delivery_status",
+    **{key: key for key in CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP.keys()}, # Canonical names are their own primary synonym
+
+    # Academic/Research Synonyms
+    "paper title": "publication_title", "article name": "publication_title",
+    "authors": "author_names", "researchers": "author_names",
+    "published in": "journal_name",
+    "year of publication": "publication_year",
+    "citations": "citation_count", "cited by": "citation_count",
+    "digital object identifier": "doi",
+    "research keywords": "keywords", "tags": "keywords", # 'tags' also used in social media
+    "type of publication": "publication_type",
+
+    # Social Media Synonyms
+    "user name": "username", "handle": "username", "screen name": "username",
+    "post content": "post_text", "tweet text": "post_text",
+    "likes": "like_count", "number of likes": "like_count",
+    "shares": "share_count", "retweets": "share_count",
+    "comment": "comment_text", "reply": "comment_text",
+    # "hashtags" is direct
+
+    # IoT/Sensor Synonyms
+    "device id": "sensor_id",
+    "reading time": "timestamp", "event time": "timestamp",
+    "temp": "temperature",
+    # "humidity", "latitude", "longitude", "sensor_type" are fairly direct
+
+    # Animal Data Synonyms
+    "animal": "animal_name", # General term, might default to name
+    "animal species": "species", "type of animal": "species",
+    "animal breed": "breed",
+    "age of animal": "animal_age",
+    "natural environment": "habitat", "lives in": "habitat",
+    "animal weight": "animal_weight_kg",
+    "fur color": "animal_color", "coat color": "animal_color",
+}
+FIELD_SYNONYM_TO_CANONICAL_MAP.update({
+    # Logistics Synonyms
+    "shipment number": "shipment_id", "consignment id": "shipment_id",
+    "tracking id": "tracking_number", "awb number": "tracking_number", "air waybill": "tracking_number",
+    "shipping company": "carrier_name", "freight carrier": "carrier_name", "courier": "carrier_name",
+    "pickup location": "origin_location", "despatch point": "origin_location", "from address": "origin_location", "origin": "origin_location",
+    "delivery location": "destination_location", "drop-off point": "destination_location", "to address": "destination_location", "destination": "destination_location",
+    "logistics status": "shipment_status_logistics", "delivery progress": "shipment_status_logistics",
+    "shipping cost": "freight_cost", "transportation charges": "freight_cost",
+    "edd": "estimated_delivery_date", "expected delivery": "estimated_delivery_date",
+    "add": "actual_delivery_date", "delivered on": "actual_delivery_date",
+    "parcel weight": "package_weight_kg", "shipment weight": "package_weight_kg",
+    "box size": "package_dimensions_cm", "package size": "package_dimensions_cm", "dimensions": "package_dimensions_cm",
+})
+FIELD_SYNONYM_TO_CANONICAL_MAP.update({
+    # Travel & Tourism Synonyms
+    "booking reference": "booking_id", "reservation id": "booking_id", "confirmation number": "booking_id",
+    "passenger name": "traveler_name", "guest name": "traveler_name",
+    "travel destination": "destination_city_travel", "going to": "destination_city_travel", "arrival city": "destination_city_travel",
+    "departure city": "origin_city_travel", "flying from": "origin_city_travel", "source city": "origin_city_travel",
+    "departure date": "travel_date", "check-in date": "travel_date", "start date": "travel_date",
+    "arrival date": "return_date", "check-out date": "return_date", "end date": "return_date", # Can be ambiguous, but common
+    "flight code": "flight_number", "flight id": "flight_number",
+    "airline company": "airline_name", "carrier": "airline_name", # 'carrier' also in logistics
+    "accommodation name": "hotel_name", "place to stay": "hotel_name", "resort name": "hotel_name",
+    "room category": "room_type", "type of room": "room_type",
+    "reservation status": "booking_status_travel", "booking state": "booking_status_travel",
+    "trip cost": "total_travel_cost", "package price": "total_travel_cost", "total fare": "total_travel_cost",
+    "tour package": "travel_package_name", "vacation package": "travel_package_name",
+    "hotel features": "hotel_amenities_included", "included services": "hotel_amenities_included",
+    "booked activity": "travel_activity", "excursion": "travel_activity", "tour name": "travel_activity",
+})
+
+FIELD_SYNONYM_TO_CANONICAL_MAP.update({
+    # Sales/CRM Synonyms
+    "lead identifier": "lead_id",
+    "origin of lead": "lead_source",
+    "sales stage": "deal_stage", "pipeline stage": "deal_stage",
+    "deal size": "opportunity_amount", "potential revenue": "opportunity_amount",
+    "expected close date": "close_date",
+    "customer type": "account_type", "client type": "account_type",
+    "business sector": "industry", "market segment": "industry",
+
+    # Marketing Synonyms
+    "marketing campaign id": "campaign_id",
+    "promotion name": "campaign_name",
+    "type of campaign": "campaign_type",
+    "money spent on ads": "ad_spend", "advertising cost": "ad_spend",
+    "number of views": "impressions",
+    "number of clicks": "clicks",
+    "click rate": "ctr",
+    "conversion percentage": "conversion_rate",
+
+    # Manufacturing/Inventory Synonyms
+    "stock keeping unit": "sku",
+    "product serial": "serial_number",
+    "production batch": "batch_number",
+    "storage location": "warehouse_location",
+    "inventory count": "stock_level", "quantity on hand": "stock_level",
+    "vendor name": "supplier_name",
+
+    # Project Management Synonyms
+    "project identifier": "project_id",
+    "task identifier": "task_id",
+    "assigned to": "assignee_name", "responsible person": "assignee_name",
+    "deadline": "due_date", "target date": "due_date",
+    "current project phase": "project_status",
+    "task importance": "task_priority",
+
+    # Software Development Synonyms
+    "bug report id": "bug_id", "defect id": "bug_id",
+    "git commit id": "commit_hash", "revision code": "commit_hash",
+})
+
+# --- Schema Inference Rules for pre-populating Smart Schema Editor ---
+SCHEMA_INFERENCE_RULES = [
+    (r"(?:email)", "email", ""),
+    (r"(?:name)", "name", ""),
+    (r"(?:phone|contact)", "phone", ""),
+    (r"(?:address|location)", "address", ""),
+    (r"(?:age)", "int", "18-60"),
+    (r"(?:salary|income|pay)", "int", "20000-500000"),
+    (r"(?:gender)", "category", "Male, Female, Other"),
+    (r"(?:aadhaar)", "aadhaar", ""),
+    (r"(?:pan)", "pan", ""),
+    (r"(?:passport)", "passport", ""),
+    (r"(?:voter)", "voterid", ""), # voter or voter id
+    (r"(?:ifsc)", "ifsc", ""),
+    (r"(?:upi)", "upi", ""),
+    (r"(?:date|dob|joining_date|order_date)", "date", f"{_CURRENT_YEAR}-01-01 - {_CURRENT_YEAR}-12-31"), # Whole current year; evaluated once per process
+    (r"(?:price|amount|value|cost)", "float", "10.00-1000.00"),
+    (r"(?:id|number|code)$", "string", ""), # Ends with id, number, or code
+    (r"(?:status|type|category)$", "category", "Type A, Type B, Type C"), # Ends with status, type, or category
+]
+
+# --- Schema Templates ---
+SCHEMA_TEMPLATES = {
+    "None (Custom Schema)": { # Special value to indicate no template or custom editing
+        "description": "Start with a blank schema in the Smart Schema Editor.",
+        "fields": []
+    },
+    "E-commerce Customer Orders": {
+        "description": "A standard schema for tracking customer orders, including customer details, product information, and order status.",
+        "fields": [
+            {"name": "Order ID", "type": "string", "constraint": "", "_canonical_suggestion": "order_id"},
+            {"name": "Customer Name", "type": "name", "constraint": ""},
+            {"name": "Customer Email", "type": "email", "constraint": ""},
+            {"name": "Product Name", "type": "category", "constraint": "Laptop, Smartphone, Headphones, Charger, Case"},
+            {"name": "Quantity", "type": "int", "constraint": "1-5"},
+            {"name": "Price Per Unit", "type": "float", "constraint": "10.99-1299.99"},
+            {"name": "Order Date", "type": "date", "constraint": ""},
+            {"name": "Shipping Address", "type": "address", "constraint": ""},
+            {"name": "Order Status", "type": "category", "constraint": "Pending, Shipped, Delivered, Cancelled, Returned"},
+            {"name": "Payment Method", "type": "category", "constraint": "Credit Card, Debit Card, UPI, Net Banking"},
+        ]
+    },
+    "Basic Employee Records": {
+        "description": "Essential fields for managing employee information, such as ID, contact details, department, and salary.",
+        "fields": [
+            {"name": "Employee ID", "type": "string", "constraint": "", "_canonical_suggestion": "employee_id"},
+            {"name": "Full Name", "type": "name", "constraint": ""},
+            {"name": "Email", "type": "email", "constraint": ""},
+            {"name": "Phone Number", "type": "phone", "constraint": ""},
+            {"name": "Department", "type": "category", "constraint": "HR, Engineering, Marketing, Sales, Finance, Operations"},
+            {"name": "Position", "type": "string", "constraint": ""},
+            {"name": "Salary", "type": "int", "constraint": "30000-250000"},
+            {"name": "Joining Date", "type": "date", "constraint": ""},
+            {"name": "Age", "type": "int", "constraint": "22-60"},
+        ]
+    },
+    "Healthcare Patient Data (Demo)": {
+        "description": "A demonstration schema for patient records in a healthcare setting, including admission details and diagnosis.",
+        "fields": [
+            {"name": "Patient ID", "type": "string", "constraint": "", "_canonical_suggestion": "patient_id"},
+            {"name": "Patient Name", "type": "name", "constraint": ""},
+            {"name": "Age", "type": "int", "constraint": "0-90"},
+            {"name": "Gender", "type": "category", "constraint": "Male, Female, Other"},
+            {"name": "Admission Date", "type": "date", "constraint": ""},
+            {"name": "Discharge Date", "type": "date", "constraint": ""},
+            {"name": "Diagnosis", "type": "category", "constraint": "Flu, Common Cold, Hypertension, Diabetes, Injury"},
+            {"name": "Attending Doctor", "type": "name", "constraint": "", "_canonical_suggestion": "doctor_name"},
+            {"name": "Contact Phone", "type": "phone", "constraint": ""},
+        ]
+    },
+    "Financial Transactions (Simplified)": {
+        "description": "A simplified schema for financial transactions, covering transaction ID, account details, amount, and type.",
+        "fields": [
+            {"name": "Transaction ID", "type": "string", "constraint": "", "_canonical_suggestion": "transaction_id"},
+            {"name": "Account Number", "type": "string", "constraint": ""},
+            {"name": "Transaction Date", "type": "date", "constraint": ""},
+            {"name": "Amount", "type": "float", "constraint": "1.00-50000.00"},
+            {"name": "Transaction Type", "type": "category", "constraint": "Credit, Debit, Transfer, Payment"},
+            {"name": "Description", "type": "string", "constraint": ""},
+        ]
+    },
+    "Social Media Posts": {
+        "description": "Schema for social media post data, including user information, post content, engagement metrics, and timestamps.",
+        "fields": [
+            {"name": "Post ID", "type": "string", "constraint": "", "_canonical_suggestion": "id"},
+            {"name": "Username", "type": "string", "constraint": "", "_canonical_suggestion": "username"},
+            {"name": "Post Text", "type": "string", "constraint": "", "_canonical_suggestion": "post_text"},
+            {"name": "Timestamp", "type": "date", "constraint": "datetime", "_canonical_suggestion": "timestamp"},
+            {"name": "Likes", "type": "int", "constraint": "0-10000", "_canonical_suggestion": "like_count"},
+            {"name": "Shares", "type": "int", "constraint": "0-5000", "_canonical_suggestion": "share_count"},
+            {"name": "Hashtags", "type": "string", "constraint": "", "_canonical_suggestion": "hashtags"}
+        ]
+    },
+    "IoT Sensor Readings": {
+        "description": "Data structure for readings from IoT sensors, including sensor ID, timestamp, and various environmental measurements.",
+        "fields": [
+            {"name": "Sensor ID", "type": "string", "constraint": "", "_canonical_suggestion": "sensor_id"},
+            {"name": "Timestamp", "type": "date", "constraint": "datetime", "_canonical_suggestion": "timestamp"},
+            {"name": "Temperature (°C)", "type": "float", "constraint": "-10.0-40.0", "_canonical_suggestion": "temperature"},
+            {"name": "Humidity (%)", "type": "float", "constraint": "20.0-80.0", "_canonical_suggestion": "humidity"},
+            {"name": "Latitude", "type": "float", "constraint": "-90.0-90.0", "_canonical_suggestion": "latitude"},
+            {"name": "Longitude", "type": "float", "constraint": "-180.0-180.0", "_canonical_suggestion": "longitude"},
+            {"name": "Sensor Type", "type": "category", "constraint": "Temperature,Humidity,Pressure,Light", "_canonical_suggestion": "sensor_type"}
+        ]
+    },
+    "Academic Publications": {
+        "description": "Schema for academic publication metadata, including title, authors, journal, publication year, and citation information.",
+        "fields": [
+            {"name": "Publication ID", "type": "string", "constraint": "", "_canonical_suggestion": "id"},
+            {"name": "Title", "type": "string", "constraint": "", "_canonical_suggestion": "publication_title"},
+            {"name": "Authors", "type": "string", "constraint": "", "_canonical_suggestion": "author_names"},
+            {"name": "Journal", "type": "category", "constraint": "Nature, Science, Cell, The Lancet, PLOS One", "_canonical_suggestion": "journal_name"},
+            {"name": "Publication Year", "type": "int", "constraint": "2000-2024", "_canonical_suggestion": "publication_year"},
+            {"name": "DOI", "type": "string", "constraint": "", "_canonical_suggestion": "doi"},
+            {"name": "Keywords", "type": "string", "constraint": "", "_canonical_suggestion": "keywords"},
+            {"name": "Citation Count", "type": "int", "constraint": "0-500", "_canonical_suggestion": "citation_count"}
+        ]
+    },
+    "Logistics Shipment Tracking": {
+        "description": "Fields for tracking logistics shipments, including shipment ID, carrier, origin, destination, status, and costs.",
+        "fields": [
+            {"name": "Shipment ID", "type": "string", "constraint": "", "_canonical_suggestion": "shipment_id"},
+            {"name": "Tracking Number", "type": "string", "constraint": "", "_canonical_suggestion": "tracking_number"},
+            {"name": "Carrier Name", "type": "string", "constraint": "", "_canonical_suggestion": "carrier_name"},
+            {"name": "Origin", "type": "address", "constraint": "", "_canonical_suggestion": "origin_location"},
+            {"name": "Destination", "type": "address", "constraint": "", "_canonical_suggestion": "destination_location"},
+            {"name": "Status", "type": "category", "constraint": ",".join(LOGISTICS_SHIPMENT_STATUSES_LIST), "_canonical_suggestion": "shipment_status_logistics"},
+            {"name": "Estimated Delivery", "type": "date", "constraint": "", "_canonical_suggestion": "estimated_delivery_date"},
+            {"name": "Actual Delivery", "type": "date", "constraint": "", "_canonical_suggestion": "actual_delivery_date"},
+            {"name": "Freight Cost (USD)", "type": "float", "constraint": "50-5000", "_canonical_suggestion": "freight_cost"},
+            {"name": "Package Weight (kg)", "type": "float", "constraint": "0.1-1000", "_canonical_suggestion": "package_weight_kg"},
+            {"name": "Package Dimensions (cm)", "type": "string", "constraint": "", "_canonical_suggestion": "package_dimensions_cm"},
+        ]
+    },
+    "Travel Booking Records": {
+        "description": "Schema for travel booking information, covering booking ID, traveler details, destination, flight, hotel, and costs.",
+        "fields": [
+            {"name": "Booking ID", "type": "string", "constraint": "", "_canonical_suggestion": "booking_id"},
+            {"name": "Traveler Name", "type": "name", "constraint": "", "_canonical_suggestion": "traveler_name"},
+            {"name": "Destination", "type": "category", "constraint": ",".join(TRAVEL_DESTINATIONS_LIST[:10]), "_canonical_suggestion": "destination_city_travel"},
+            {"name": "Origin", "type": "category", "constraint": ",".join(TRAVEL_DESTINATIONS_LIST[10:20]), "_canonical_suggestion": "origin_city_travel"},
+            {"name": "Travel Date", "type": "date", "constraint": "", "_canonical_suggestion": "travel_date"},
+            {"name": "Return Date", "type": "date", "constraint": "", "_canonical_suggestion": "return_date"},
+            {"name": "Flight Number", "type": "string", "constraint": "", "_canonical_suggestion": "flight_number"},
+            {"name": "Airline", "type": "category", "constraint": ",".join(AIRLINE_NAMES_LIST[:5]), "_canonical_suggestion": "airline_name"},
+            {"name": "Hotel Name", "type": "string", "constraint": "", "_canonical_suggestion": "hotel_name"},
+            {"name": "Room Type", "type": "category", "constraint": ",".join(ROOM_TYPES_LIST[:4]), "_canonical_suggestion": "room_type"},
+            {"name": "Booking Status", "type": "category", "constraint": ",".join(TRAVEL_BOOKING_STATUSES_LIST), "_canonical_suggestion": "booking_status_travel"},
+            {"name": "Total Cost (USD)", "type": "float", "constraint": "200-8000", "_canonical_suggestion": "total_travel_cost"},
+            {"name": "Package Name", "type": "string", "constraint": "", "_canonical_suggestion": "travel_package_name"},
+            {"name": "Booked Activity", "type": "category", "constraint": ",".join(TRAVEL_ACTIVITY_TYPES_LIST[:5]), "_canonical_suggestion": "travel_activity"},
+        ]
+    },
+    # --- NEW TEMPLATES ---
+    "Sales CRM Leads": {
+        "description": "Schema for tracking sales leads in a CRM system, including lead source, deal stage, and opportunity details.",
+        "fields": [
+            {"name": "Lead ID", "type": "string", "constraint": "", "_canonical_suggestion": "lead_id"},
+            {"name": "Lead Name", "type": "name", "constraint": "", "_canonical_suggestion": "name"}, # Generic name
+            {"name": "Company Name", "type": "string", "constraint": "", "_canonical_suggestion": "company"},
+            {"name": "Email", "type": "email", "constraint": ""},
+            {"name": "Phone", "type": "phone", "constraint": ""},
+            {"name": "Lead Source", "type": "category", "constraint": ",".join(LEAD_SOURCES_LIST), "_canonical_suggestion": "lead_source"},
+            {"name": "Deal Stage", "type": "category", "constraint": ",".join(DEAL_STAGES_LIST), "_canonical_suggestion": "deal_stage"},
+            {"name": "Opportunity Amount", "type": "float", "constraint": "5000-500000", "_canonical_suggestion": "opportunity_amount"},
+            {"name": "Expected Close Date", "type": "date", "constraint": "", "_canonical_suggestion": "close_date"},
+            {"name": "Assigned To", "type": "name", "constraint": "", "_canonical_suggestion": "assignee_name"},
+        ]
+    },
+    "Marketing Campaign Performance": {
+        "description": "Data for analyzing marketing campaign performance, including ad spend, impressions, clicks, and conversion metrics.",
+        "fields": [
+            {"name": "Campaign ID", "type": "string", "constraint": "", "_canonical_suggestion": "campaign_id"},
+            {"name": "Campaign Name", "type": "string", "constraint": "", "_canonical_suggestion": "campaign_name"},
+            {"name": "Campaign Type", "type": "category", "constraint": ",".join(CAMPAIGN_TYPES_LIST), "_canonical_suggestion": "campaign_type"},
+            {"name": "Start Date", "type": "date", "constraint": "", "_canonical_suggestion": "date"},
+            {"name": "End Date", "type": "date", "constraint": "", "_canonical_suggestion": "date"},
+            {"name": "Ad Spend (USD)", "type": "float", "constraint": "100-20000", "_canonical_suggestion": "ad_spend"},
+            {"name": "Impressions", "type": "int", "constraint": "10000-5000000", "_canonical_suggestion": "impressions"},
+            {"name": "Clicks", "type": "int", "constraint": "100-50000", "_canonical_suggestion": "clicks"},
+            {"name": "CTR", "type": "float", "constraint": "0.005-0.05", "_canonical_suggestion": "ctr"},
+            {"name": "Conversions", "type": "int", "constraint": "10-1000"}, # No direct canonical, simple int
+            {"name": "Conversion Rate", "type": "float", "constraint": "0.01-0.15", "_canonical_suggestion": "conversion_rate"},
+        ]
+    },
+    "Software Issue Tracking": {
+        "description": "Schema for tracking software bugs, feature requests, and tasks, including status, priority, and assignee.",
+        "fields": [
+            {"name": "Issue ID", "type": "string", "constraint": "", "_canonical_suggestion": "id"}, # Generic ID
+            {"name": "Title", "type": "string", "constraint": "", "_canonical_suggestion": "description"}, # Using description for title
+            {"name": "Issue Type", "type": "category", "constraint": ",".join(ISSUE_TYPES_LIST), "_canonical_suggestion": "issue_type"},
+            {"name": "Status", "type": "category", "constraint": ",".join(ISSUE_STATUSES_LIST), "_canonical_suggestion": "issue_status"},
+            {"name": "Priority", "type": "category", "constraint": ",".join(TASK_PRIORITY_LIST), "_canonical_suggestion": "task_priority"},
+            {"name": "Reporter", "type": "name", "constraint": "", "_canonical_suggestion": "name"},
+            {"name": "Assignee", "type": "name", "constraint": "", "_canonical_suggestion": "assignee_name"},
+            {"name": "Created Date", "type": "date", "constraint": "datetime", "_canonical_suggestion": "timestamp"},
+            {"name": "Updated Date", "type": "date", "constraint": "datetime", "_canonical_suggestion": "timestamp"},
+            {"name": "Commit Hash", "type": "string", "constraint": "", "_canonical_suggestion": "commit_hash"},
+        ]
+    }
+}
@@ -0,0 +1,109 @@
+"""
+Column cache for incremental regeneration.
+
+With keyed random streams (nullbyte.streams) a generated column depends only
+on its plan: the seed, table, row count, the field's own schema, the edge-case
+rules that target it, and the columns it reads (dependency handlers, foreign
+keys). plan_key() hashes that plan, chaining the keys of the columns it reads,
+so editing one field changes its key and, through the dependency graph, the
+keys of every column downstream of it, and nothing else.
+
+A ColumnCache holds the columns of the latest run per session. A run looks
+each column up by key, generates only the misses, and on exit releases the
+entries it did not use, so the cache never holds more than one run's columns.
+Its estimated size (`nbytes`) is attached to the session's DatasetStore, so
+it counts against the same memory budgets as the session's datasets.
+
+Configuration (environment):
+  NULLBYTE_COLUMN_CACHE_BUDGET_MB  largest run kept for reuse, in megabytes (default 256)
+"""
+import hashlib
+import os
+import sys
+import threading
+from contextlib import contextmanager
+
+COLUMN_CACHE_BUDGET_ENV = "NULLBYTE_COLUMN_CACHE_BUDGET_MB"
+DEFAULT_COLUMN_CACHE_BUDGET_MB = 256
+SIZE_SAMPLE_VALUES = 1000 # Values sampled per column to estimate its size
+
+
+def _max_bytes():
+    try:
+        return int(float(os.environ.get(COLUMN_CACHE_BUDGET_ENV, DEFAULT_COLUMN_CACHE_BUDGET_MB)) * 1024 * 1024)
+    except ValueError:
+        return DEFAULT_COLUMN_CACHE_BUDGET_MB * 1024 * 1024
+
+
+def column_nbytes(values):
+    """Estimated size of a column (list of Python values): the list plus its values, from an evenly spaced sample."""
+    if not values:
+        return sys.getsizeof(values)
+    step = max(1, len(values) // SIZE_SAMPLE_VALUES)
+    sample = values[::step]
+    return sys.getsizeof(values) + sum(map(sys.getsizeof, sample)) * len(values) // len(sample)
+
+
+def plan_key(*parts):
+    """Stable hash of a column plan; dicts may be given in any key order."""
+    def normalize(value):
+        if isinstance(value, dict):
+            return tuple(sorted((str(k), normalize(v)) for k, v in value.items()))
+        if isinstance(value, (list, tuple)):
+            return tuple(normalize(v) for v in value)
+        return value
+    return hashlib.blake2b(repr(normalize(parts)).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ColumnCache:
+    """Generated columns ({plan key: values}) of the latest run, with hit / miss counts of the current one."""
+
+    def __init__(self, max_bytes=None):
+        self.max_bytes = max_bytes
+        self._columns = {} # {key: (values, nbytes)}
+        self._used = set()
+        self._run_nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._columns)
+
+    @property
+    def nbytes(self):
+        """Estimated size of the cached columns."""
+        with self._lock:
+            return sum(nbytes for _, nbytes in self._columns.values())
+
+    def get(self, key):
+        with self._lock:
+            entry = self._columns.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if key not in self._used:
+                self._used.add(key)
+                self._run_nbytes += entry[1]
+            return entry[0]
+
+    def put(self, key, values):
+        with self._lock:
+            nbytes = column_nbytes(values)
+            if self._run_nbytes + nbytes > (self.max_bytes if self.max_bytes is not None else _max_bytes()):
+                return # Run too large to keep; it is regenerated in full next time
+            self._columns[key] = (values, nbytes)
+            self._used.add(key)
+            self._run_nbytes += nbytes
+
+    @contextmanager
+    def run(self):
+        """Scope of one generation run: counts reset on entry, columns the run did not use released on exit."""
+        with self._lock:
+            self._used, self._run_nbytes, self.hits, self.misses = set(), 0, 0, 0
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._columns = {key: entry for key, entry in self._columns.items() if key in self._used}
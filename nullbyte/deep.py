@@ -0,0 +1,284 @@
+"""
+Background training of deep tabular synthesizers (CTGAN / TVAE from `ctgan`).
+
+Training runs in a separate spawned process, so the Streamlit script thread
+never blocks. The app and the worker communicate through files in a job directory:
+  data.parquet    training frame
+  status.json     state, epoch progress, latest losses, error (written atomically by the worker)
+  cancel          created by TrainingJob.cancel(); the worker stops after the current epoch
+  checkpoint.pkl  latest model, saved every `checkpoint_every` epochs
+Finished (or cancelled-with-checkpoint) models are saved to the model
+directory as <name>.pkl with a <name>.json sidecar, and can be sampled later
+without retraining. Everything runs on CPU.
+
+Configuration (environment):
+  NULLBYTE_MODEL_DIR  saved models and training jobs (default: ./models)
+"""
+import importlib
+import importlib.util
+import inspect
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+MODEL_DIR_ENV = "NULLBYTE_MODEL_DIR"
+DEFAULT_MODEL_DIR = "models"
+JOBS_SUBDIR = "jobs"
+DATA_FILE_NAME = "data.parquet"
+STATUS_FILE_NAME = "status.json"
+CANCEL_FILE_NAME = "cancel"
+CHECKPOINT_FILE_NAME = "checkpoint.pkl"
+SAMPLE_BATCH_ROWS = 50_000
+
+MODEL_TYPES = {"ctgan": "CTGAN", "tvae": "TVAE"} # model_type -> class name in `ctgan`
+
+QUEUED, RUNNING, COMPLETED, FAILED, CANCELLED = "queued", "running", "completed", "failed", "cancelled"
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+
+class TrainingCancelled(Exception):
+    """Raised inside the worker when the cancel flag is found after an epoch."""
+
+
+def deep_models_available():
+    """True if the optional `ctgan` and `torch` packages can be imported."""
+    return all(importlib.util.find_spec(name) is not None for name in ("ctgan", "torch"))
+
+
+def model_dir():
+    return Path(os.environ.get(MODEL_DIR_ENV, DEFAULT_MODEL_DIR))
+
+
+def safe_model_name(name):
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name.strip()).strip("._") or "model"
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def _atomic_write_json(path, payload):
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(payload, default=str), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def read_status(job_dir):
+    try:
+        return json.loads((Path(job_dir) / STATUS_FILE_NAME).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {"state": QUEUED}
+
+
+def discrete_columns(df):
+    """Columns CTGAN/TVAE should treat as discrete: everything that is not a non-bool number."""
+    return [c for c in df.columns
+            if not pd.api.types.is_numeric_dtype(df[c].dtype) or pd.api.types.is_bool_dtype(df[c].dtype)]
+
+
+# --- Worker side (runs in the spawned process) ---
+class _EpochTracker:
+    """Stands in for the tqdm epoch iterator inside ctgan's fit loops; calls back after every epoch."""
+
+    def __init__(self, iterable, on_epoch_end):
+        self._iterable = iterable
+        self._on_epoch_end = on_epoch_end
+
+    def __iter__(self):
+        for epoch, item in enumerate(self._iterable, start=1):
+            yield item
+            self._on_epoch_end(epoch)
+
+    def set_description(self, *args, **kwargs):
+        pass
+
+    def close(self):
+        pass
+
+
+def _build_synthesizer(model_type, epochs, batch_size):
+    import ctgan
+    synthesizer_class = getattr(ctgan, MODEL_TYPES[model_type])
+    params = inspect.signature(synthesizer_class).parameters
+    kwargs = {"epochs": epochs, "batch_size": batch_size}
+    if "enable_gpu" in params: # Renamed from `cuda` in newer ctgan releases
+        kwargs["enable_gpu"] = False
+    elif "cuda" in params:
+        kwargs["cuda"] = False
+    return synthesizer_class(**kwargs)
+
+
+def _last_losses(synthesizer):
+    losses = getattr(synthesizer, "loss_values", None)
+    if not isinstance(losses, pd.DataFrame) or losses.empty:
+        return {}
+    last = losses.iloc[-1]
+    return {str(k): float(v) for k, v in last.items() if k not in ("Epoch", "Batch") and pd.notna(v)}
+
+
+def _write_model_metadata(name, metadata):
+    directory = model_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    _atomic_write_json(directory / f"{name}.json", dict(metadata, name=name, created_at=_now()))
+    return directory / f"{name}.pkl"
+
+
+def _train_worker(job_dir, model_type, model_name, epochs, batch_size, torch_threads, checkpoint_every, metadata):
+    job_dir = Path(job_dir)
+    status = {"state": RUNNING, "model_type": model_type, "model_name": model_name, "epoch": 0,
+              "epochs": epochs, "started_at": _now(), "pid": os.getpid()}
+    _atomic_write_json(job_dir / STATUS_FILE_NAME, status)
+    checkpoint_path = job_dir / CHECKPOINT_FILE_NAME
+    try:
+        import torch
+        torch.set_num_threads(max(1, int(torch_threads)))
+        data = pd.read_parquet(job_dir / DATA_FILE_NAME)
+        synthesizer = _build_synthesizer(model_type, epochs, batch_size)
+
+        def on_epoch_end(epoch):
+            status["epoch"] = epoch
+            status["losses"] = _last_losses(synthesizer)
+            if checkpoint_every and epoch % checkpoint_every == 0 and epoch < epochs:
+                synthesizer.save(str(checkpoint_path))
+                status["checkpoint_epoch"] = epoch
+            _atomic_write_json(job_dir / STATUS_FILE_NAME, status)
+            if epoch < epochs and (job_dir / CANCEL_FILE_NAME).exists(): # After the last epoch the fit completes normally
+                raise TrainingCancelled()
+
+        # Epoch progress relies on ctgan internals: the fit loops of ctgan==0.11.0 (requirements.txt) iterate
+        # over `tqdm(range(epochs))`, with `tqdm` imported at module level in ctgan.synthesizers.<model_type>
+        fit_module = importlib.import_module(f"ctgan.synthesizers.{model_type}")
+        if not hasattr(fit_module, "tqdm"):
+            raise RuntimeError(f"Unsupported ctgan version: ctgan.synthesizers.{model_type} has no `tqdm` epoch loop "
+                               "to track; install the ctgan version pinned in requirements.txt.")
+        fit_module.tqdm = lambda iterable, *args, **kwargs: _EpochTracker(iterable, on_epoch_end)
+        synthesizer.fit(data, discrete_columns=discrete_columns(data))
+
+        model_path = _write_model_metadata(model_name, dict(metadata, epochs_trained=epochs))
+        synthesizer.save(str(model_path))
+        status.update(state=COMPLETED, model_path=str(model_path))
+    except TrainingCancelled:
+        status["state"] = CANCELLED
+        if checkpoint_path.exists(): # Keep the last checkpoint as a usable model
+            model_path = _write_model_metadata(model_name, dict(metadata, epochs_trained=status.get("checkpoint_epoch")))
+            shutil.move(str(checkpoint_path), model_path)
+            status["model_path"] = str(model_path)
+    except Exception as e: # Any training failure is reported to the UI through the status file
+        status.update(state=FAILED, error=f"{type(e).__name__}: {e}")
+    finally:
+        status["finished_at"] = _now()
+        _atomic_write_json(job_dir / STATUS_FILE_NAME, status)
+        for leftover in (job_dir / DATA_FILE_NAME, checkpoint_path):
+            try:
+                leftover.unlink()
+            except OSError:
+                pass
+
+
+# --- App side ---
+class TrainingJob:
+    """Handle on a background training process; keep it in st.session_state across reruns."""
+
+    def __init__(self, job_dir, process, model_type, model_name, epochs):
+        self.job_dir = Path(job_dir)
+        self.process = process
+        self.model_type = model_type
+        self.model_name = model_name
+        self.epochs = epochs
+
+    def status(self):
+        """Latest status; a worker that died without reporting shows as failed."""
+        status = read_status(self.job_dir)
+        if status.get("state") not in FINISHED_STATES and not self.process.is_alive():
+            status = dict(status, state=FAILED, error=f"Training process exited unexpectedly (exit code {self.process.exitcode}).")
+        return status
+
+    @property
+    def finished(self):
+        return self.status().get("state") in FINISHED_STATES
+
+    def cancel(self):
+        """Asks the worker to stop after the current epoch (the last checkpoint is kept as a model)."""
+        (self.job_dir / CANCEL_FILE_NAME).touch()
+
+
+def start_training(df, model_type, model_name, epochs=100, batch_size=500, torch_threads=1, checkpoint_every=10, source=None):
+    """
+    Starts training `model_type` ("ctgan" or "tvae") on `df` in a background
+    process and returns its TrainingJob. The model is saved as `model_name`.
+    """
+    if model_type not in MODEL_TYPES:
+        raise ValueError(f"Unknown model type '{model_type}'. Expected one of: {', '.join(MODEL_TYPES)}.")
+    model_name = safe_model_name(model_name)
+    job_dir = model_dir() / JOBS_SUBDIR / uuid.uuid4().hex
+    job_dir.mkdir(parents=True)
+    df.to_parquet(job_dir / DATA_FILE_NAME)
+    _atomic_write_json(job_dir / STATUS_FILE_NAME, {"state": QUEUED, "model_type": model_type, "model_name": model_name,
+                                                    "epoch": 0, "epochs": epochs})
+    metadata = {"model_type": model_type, "epochs": epochs, "batch_size": batch_size, "rows": len(df), "source": source,
+                "columns": list(map(str, df.columns)), "dtypes": {str(c): str(t) for c, t in df.dtypes.items()}}
+    process = multiprocessing.get_context("spawn").Process( # Spawn: no forked torch/Streamlit thread state
+        target=_train_worker,
+        args=(str(job_dir), model_type, model_name, epochs, batch_size, torch_threads, checkpoint_every, metadata),
+        name=f"nullbyte-train-{model_name}",
+        daemon=True,
+    )
+    process.start()
+    return TrainingJob(job_dir, process, model_type, model_name, epochs)
+
+
+def list_saved_models(model_type=None):
+    """Metadata of saved models, newest first; optionally only one model type."""
+    directory = model_dir()
+    models = []
+    for sidecar in directory.glob("*.json") if directory.exists() else []:
+        try:
+            metadata = json.loads(sidecar.read_text(encoding="utf-8"))
+        except ValueError:
+            continue
+        if (directory / f"{sidecar.stem}.pkl").exists() and (model_type is None or metadata.get("model_type") == model_type):
+            models.append(metadata)
+    return sorted(models, key=lambda m: m.get("created_at", ""), reverse=True)
+
+
+def _restore_dtypes(df, dtypes):
+    for column, dtype in (dtypes or {}).items():
+        if column in df.columns:
+            try:
+                df[column] = df[column].astype(dtype)
+            except (TypeError, ValueError):
+                pass # Keep the sampled dtype (e.g. NaN in an int column)
+    return df
+
+
+def sample_saved_model(name, num_rows, batch_rows=SAMPLE_BATCH_ROWS, torch_threads=None, seed=None):
+    """Samples `num_rows` rows from a saved model in batches of `batch_rows`."""
+    import ctgan # noqa: F401 - the pickled synthesizer classes live here
+    import torch
+
+    metadata = json.loads((model_dir() / f"{name}.json").read_text(encoding="utf-8"))
+    synthesizer = torch.load(model_dir() / f"{name}.pkl", map_location="cpu", weights_only=False)
+    if hasattr(synthesizer, "set_device"):
+        synthesizer.set_device(torch.device("cpu"))
+    if seed is not None:
+        if hasattr(synthesizer, "set_random_state"):
+            synthesizer.set_random_state(seed)
+        else:
+            torch.manual_seed(seed)
+
+    previous_threads = torch.get_num_threads()
+    if torch_threads:
+        torch.set_num_threads(max(1, int(torch_threads)))
+    try:
+        batches = [synthesizer.sample(min(batch_rows, num_rows - start)) for start in range(0, num_rows, batch_rows)]
+    finally:
+        torch.set_num_threads(previous_threads)
+    sampled = pd.concat(batches, ignore_index=True) if batches else pd.DataFrame(columns=metadata.get("columns", []))
+    return _restore_dtypes(sampled, metadata.get("dtypes"))
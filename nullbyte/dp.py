@@ -0,0 +1,471 @@
+"""
+Differentially private synthesis and column transforms, with a privacy ledger.
+
+fit_dp_histograms() discretizes the chosen columns (numeric columns into
+equal-width bins over their bounds, categorical columns onto their category
+domain, missing values as one more cell). It then releases, in column order:
+  * the histogram of the first column
+  * the 2-way histogram of every column with the column before it
+with Laplace noise (pure epsilon-DP) or Gaussian noise ((epsilon, delta)-DP;
+the classic bound needs epsilon <= 1 per measurement, larger shares are
+rejected). The budget is split evenly across those measurements (basic composition;
+one individual changes each histogram by at most 1). Everything after the
+release is post-processing: negative counts are clipped, the tables become
+conditional distributions, and DPHistogramModel.sample() draws rows along the
+chain with one multinomial draw per parent cell. The cost is a few bincounts
+over the data, whatever the row count.
+
+Integer columns with at most MAX_CATEGORIES distinct values are treated as
+categorical. Numeric bounds are treated as public metadata, as DP libraries
+require them to be declared; they default to the observed min/max, so pass
+`bounds` for a formal guarantee. Category domains are never read off the data:
+a column either has a declared domain (`domains`), or its categories are
+chosen by select_categories(), a thresholded noisy-count release that costs
+one more measurement and a small delta. Values outside the domain share the
+OTHER_CATEGORY cell and are never emitted verbatim.
+
+Column-level transforms for categorical data (generated or uploaded):
+  randomized_response()           each value kept or resampled in one
+                                  vectorized draw per column
+  exponential_mechanism_column()  central DP; releases the column's counts
+                                  (optionally only its top-k categories)
+                                  and regenerates the column from them
+Both work on the same kind of domain as the histograms: declared, or chosen
+by select_categories() with half of the column's epsilon. Both return a
+ColumnRelease carrying the effective (epsilon, delta) of the column.
+
+PrivacyLedger appends every release to a JSON-lines file keyed by
+dataset_key() (the dataset's name and columns, not its contents), so the
+cumulative epsilon spent on a dataset survives restarts, re-ingestion and
+resampling.
+
+Configuration (environment):
+  NULLBYTE_DP_LEDGER  ledger file (default: ./privacy_ledger.jsonl)
+"""
+import hashlib
+import json
+import math
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+LEDGER_ENV = "NULLBYTE_DP_LEDGER"
+DEFAULT_LEDGER_PATH = "privacy_ledger.jsonl"
+DEFAULT_NUMERIC_BINS = 20
+MAX_CATEGORIES = 100 # At most this many selected categories per column; the rest share the OTHER_CATEGORY cell
+SELECTION_DELTA = 1e-6 # Delta of a category selection under the Laplace mechanism (Gaussian runs split their own delta)
+
+LAPLACE, GAUSSIAN = "laplace", "gaussian"
+MECHANISM_LABELS = {LAPLACE: "Laplace Mechanism", GAUSSIAN: "Gaussian Mechanism"}
+RANDOMIZED_RESPONSE, EXPONENTIAL = "randomized_response", "exponential_mechanism"
+COLUMN_MECHANISMS = {RANDOMIZED_RESPONSE: "Randomized Response", EXPONENTIAL: "Exponential Mechanism (for counts/histograms)"}
+OTHER_CATEGORY = "Other" # Pooled categories outside a released top-k
+
+_ledger_lock = threading.Lock()
+
+
+def gaussian_sigma(epsilon, delta, sensitivity=1.0):
+    """Noise scale of the classic Gaussian mechanism for (epsilon, delta)-DP; the bound only holds for epsilon <= 1."""
+    if epsilon > 1:
+        raise ValueError(f"The Gaussian mechanism is only valid for ε ≤ 1 per release (got ε={epsilon:g}); "
+                         "lower epsilon or use the Laplace mechanism.")
+    return math.sqrt(2 * math.log(1.25 / delta)) * sensitivity / epsilon
+
+
+def noisy_counts(counts, epsilon, delta=0.0, mechanism=LAPLACE, rng=None, sensitivity=1.0):
+    """`counts` plus Laplace (scale sensitivity/epsilon) or Gaussian noise; same shape, float."""
+    rng = rng if rng is not None else np.random.default_rng()
+    counts = np.asarray(counts, dtype=float)
+    if mechanism == GAUSSIAN:
+        return counts + rng.normal(0.0, gaussian_sigma(epsilon, delta, sensitivity), size=counts.shape)
+    return counts + rng.laplace(0.0, sensitivity / epsilon, size=counts.shape)
+
+
+def _normalized_rows(table, fallback):
+    """Rows of a non-negative table as probabilities; all-zero rows take `fallback`."""
+    sums = table.sum(axis=1, keepdims=True)
+    return np.where(sums > 0, table / np.where(sums > 0, sums, 1.0), fallback)
+
+
+def _as_probabilities(counts):
+    counts = np.clip(counts, 0.0, None)
+    total = counts.sum()
+    return counts / total if total > 0 else np.full(len(counts), 1.0 / len(counts))
+
+
+def is_categorical_column(series, bounds=None):
+    """Whether ColumnDiscretizer treats `series` as categorical (everything but numeric columns with real ranges)."""
+    numeric = pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype)
+    if numeric and bounds is None and pd.api.types.is_integer_dtype(series.dtype) and series.nunique() <= MAX_CATEGORIES:
+        return True # Low-cardinality integers (codes, PIN codes, ratings) keep their exact values
+    return not numeric
+
+
+def select_categories(series, epsilon, delta, rng=None, limit=MAX_CATEGORIES):
+    """
+    DP choice of the categories to keep for a column without a declared domain:
+    every observed category gets a Laplace(1/epsilon) noisy count and is kept if
+    it clears 1 + ln(1/delta)/epsilon (stability-based histogram, (epsilon, delta)-DP).
+    At most `limit` categories with the highest noisy counts are returned; a
+    category seen once is kept with probability below delta.
+    """
+    if not 0 < delta < 1:
+        raise ValueError("Category selection needs 0 < delta < 1.")
+    rng = rng if rng is not None else np.random.default_rng()
+    counts = series.astype(object).value_counts(dropna=True, sort=False)
+    noisy = noisy_counts(counts.to_numpy(), epsilon, rng=rng)
+    threshold = 1 + math.log(1 / delta) / epsilon
+    kept = np.flatnonzero(noisy > threshold)
+    kept = kept[np.argsort(-noisy[kept], kind="stable")[:limit]]
+    return list(counts.index[kept])
+
+
+class ColumnDiscretizer:
+    """
+    Maps one column to integer cells and back; the last cell holds missing values.
+    Categorical columns need their `domain`; other values share one OTHER_CATEGORY cell.
+    """
+
+    def __init__(self, series, bins=DEFAULT_NUMERIC_BINS, bounds=None, domain=None):
+        self.name = series.name
+        self.dtype = series.dtype
+        self.numeric = not is_categorical_column(series, bounds)
+        if self.numeric:
+            values = series.to_numpy(dtype=float, na_value=np.nan)
+            if bounds is not None:
+                low, high = bounds
+            elif np.isfinite(values).any():
+                low, high = np.nanmin(values), np.nanmax(values)
+            else:
+                low, high = 0.0, 1.0
+            self.low = float(low)
+            self.high = float(high) if high > low else self.low + 1.0
+            self.is_integer = pd.api.types.is_integer_dtype(series.dtype)
+            self.bins = bins
+            self.categories = None
+        else:
+            if domain is None:
+                raise ValueError(f"Column '{series.name}' needs a declared category domain.")
+            self.categories = pd.Index(list(dict.fromkeys(domain)), dtype=object)
+            self.bins = len(self.categories) + 1 # + OTHER_CATEGORY
+
+    @property
+    def cells(self):
+        return self.bins + 1 # + missing
+
+    def encode(self, series):
+        if self.numeric:
+            values = series.to_numpy(dtype=float, na_value=np.nan)
+            width = (self.high - self.low) / self.bins
+            codes = np.clip(np.floor((np.nan_to_num(values, nan=self.low) - self.low) / width), 0, self.bins - 1).astype(np.int64)
+            return np.where(np.isnan(values), self.bins, codes)
+        codes = self.categories.get_indexer(series.astype(object)).astype(np.int64)
+        missing = series.isna().to_numpy()
+        codes = np.where(codes < 0, len(self.categories), codes) # Values outside the domain
+        return np.where(missing, self.bins, codes)
+
+    def decode(self, codes, rng):
+        missing = codes == self.bins
+        if self.numeric:
+            width = (self.high - self.low) / self.bins
+            values = self.low + (np.minimum(codes, self.bins - 1) + rng.random(len(codes))) * width # Uniform within the bin
+            if self.is_integer:
+                values = np.clip(np.round(values), math.ceil(self.low), math.floor(self.high))
+            values[missing] = np.nan
+            if self.is_integer:
+                return pd.Series(values, name=self.name).astype("Int64" if missing.any() else self.dtype)
+            return pd.Series(values, name=self.name)
+        lookup = np.array(list(self.categories) + [OTHER_CATEGORY, None], dtype=object)
+        values = lookup[codes]
+        values[missing] = None
+        if pd.api.types.is_integer_dtype(self.dtype) and not (codes == len(self.categories)).any():
+            return pd.Series(values, name=self.name).astype("Int64" if missing.any() else self.dtype)
+        return pd.Series(values, name=self.name, dtype=object)
+
+
+class DPHistogramModel:
+    """Noisy root marginal and conditional tables along a column chain; sampling is free post-processing."""
+
+    def __init__(self, discretizers, root_probabilities, conditionals, epsilon, delta, mechanism, measurements):
+        self.discretizers = discretizers
+        self.root_probabilities = root_probabilities
+        self.conditionals = conditionals # conditionals[i]: P(column i+1 | column i), shape (cells_i, cells_i+1)
+        self.epsilon = epsilon
+        self.delta = delta
+        self.mechanism = mechanism
+        self.measurements = measurements
+
+    @property
+    def columns(self):
+        return [d.name for d in self.discretizers]
+
+    def sample(self, num_rows, seed=None):
+        rng = np.random.default_rng(seed)
+        codes = np.repeat(np.arange(len(self.root_probabilities)), rng.multinomial(num_rows, self.root_probabilities))
+        rng.shuffle(codes)
+        columns = [codes]
+        for conditional in self.conditionals:
+            parent = columns[-1]
+            child = np.empty(num_rows, dtype=np.int64)
+            order = np.argsort(parent, kind="stable") # Rows grouped by parent cell
+            counts = np.bincount(parent, minlength=conditional.shape[0])
+            start = 0
+            for cell in np.flatnonzero(counts):
+                group = order[start:start + counts[cell]]
+                draws = np.repeat(np.arange(conditional.shape[1]), rng.multinomial(len(group), conditional[cell]))
+                child[group] = rng.permutation(draws)
+                start += counts[cell]
+            columns.append(child)
+        return pd.DataFrame({d.name: d.decode(c, rng) for d, c in zip(self.discretizers, columns)})
+
+
+def fit_dp_histograms(df, epsilon, delta=0.0, mechanism=LAPLACE, columns=None, bins=DEFAULT_NUMERIC_BINS, bounds=None,
+                      domains=None, seed=None):
+    """
+    Releases the noisy histograms of `columns` (in chain order; default all) of
+    `df` under (epsilon, delta) and returns the DPHistogramModel. `bounds` maps
+    numeric columns to public (low, high) bounds and `domains` maps categorical
+    columns to their public categories; categorical columns without one spend a
+    share of the budget on select_categories().
+    """
+    if epsilon <= 0:
+        raise ValueError("Epsilon must be positive.")
+    if mechanism == GAUSSIAN and not 0 < delta < 1:
+        raise ValueError("The Gaussian mechanism needs 0 < delta < 1.")
+    columns = list(columns if columns is not None else df.columns)
+    if not columns:
+        raise ValueError("Select at least one column.")
+    rng = np.random.default_rng(seed)
+    bounds, domains = bounds or {}, domains or {}
+    selections = [c for c in columns if c not in domains and is_categorical_column(df[c], bounds.get(c))]
+    measurements = len(columns) + len(selections) # Root marginal + one 2-way table per following column + category selections
+    epsilon_each = epsilon / measurements
+    if mechanism == GAUSSIAN:
+        delta_each = selection_delta = delta / measurements
+        gaussian_sigma(epsilon_each, delta_each) # Rejects epsilon_each > 1 before anything is released
+    else:
+        delta_each, selection_delta = 0.0, SELECTION_DELTA
+
+    domains = {**domains, **{c: select_categories(df[c], epsilon_each, selection_delta, rng) for c in selections}}
+    discretizers = [ColumnDiscretizer(df[c], bins=bins, bounds=bounds.get(c), domain=domains.get(c)) for c in columns]
+    codes = [d.encode(df[c]) for d, c in zip(discretizers, columns)]
+    root_counts = np.bincount(codes[0], minlength=discretizers[0].cells)
+    root_probabilities = _as_probabilities(noisy_counts(root_counts, epsilon_each, delta_each, mechanism, rng))
+
+    conditionals = []
+    for i in range(1, len(columns)):
+        parent_cells, child_cells = discretizers[i - 1].cells, discretizers[i].cells
+        joint = np.bincount(codes[i - 1] * child_cells + codes[i], minlength=parent_cells * child_cells).reshape(parent_cells, child_cells)
+        noisy_joint = np.clip(noisy_counts(joint, epsilon_each, delta_each, mechanism, rng), 0.0, None)
+        conditionals.append(_normalized_rows(noisy_joint, _as_probabilities(noisy_joint.sum(axis=0))))
+    total_delta = delta if mechanism == GAUSSIAN else SELECTION_DELTA * len(selections) # Laplace is pure only with declared domains
+    return DPHistogramModel(discretizers, root_probabilities, conditionals, epsilon, total_delta, mechanism, measurements)
+
+
+# --- Column-level transforms: randomized response and exponential mechanism ---
+def _column_domain(series, epsilon, domain, delta, rng, limit=MAX_CATEGORIES):
+    """
+    (domain, epsilon left, delta spent) for a column transform: a declared
+    `domain` is used as is; otherwise half of epsilon selects one with
+    select_categories().
+    """
+    if domain is not None:
+        return [c for c in domain if pd.notna(c)], epsilon, 0.0
+    return select_categories(series, epsilon / 2, delta, rng, limit=limit), epsilon / 2, delta
+
+
+def _column_codes(series, domain):
+    """
+    (codes, categories) of a column over `domain` + OTHER_CATEGORY + missing.
+    The categories never depend on the data: values outside the domain share
+    the OTHER_CATEGORY cell and missing values the last one.
+    """
+    known = pd.Index(list(dict.fromkeys([*domain, OTHER_CATEGORY])), dtype=object)
+    codes = known.get_indexer(series.astype(object)).astype(np.int64)
+    codes = np.where(codes < 0, known.get_loc(OTHER_CATEGORY), codes)
+    codes = np.where(series.isna().to_numpy(), len(known), codes)
+    return codes, known.append(pd.Index([None], dtype=object))
+
+
+def _from_codes(codes, categories, like):
+    """Rebuilds a column of `like`'s dtype family from codes into `categories`."""
+    if isinstance(like.dtype, pd.CategoricalDtype):
+        present = pd.notna(categories)
+        remap = np.where(present, np.cumsum(present) - 1, -1)
+        return pd.Series(pd.Categorical.from_codes(remap[codes], categories[present]), index=like.index, name=like.name)
+    values = pd.Series(np.asarray(categories, dtype=object).take(codes), index=like.index, name=like.name)
+    if pd.api.types.is_numeric_dtype(like.dtype) and values.notna().all():
+        try:
+            return values.astype(like.dtype)
+        except (TypeError, ValueError):
+            pass
+    if (values == OTHER_CATEGORY).any():
+        values = values.where(values.isna(), values.astype(str)) # One type per column next to OTHER_CATEGORY (dates, numbers)
+    return values
+
+
+class ColumnRelease:
+    """A privatized column with the epsilon and delta it cost."""
+
+    def __init__(self, values, mechanism, epsilon, details, delta=0.0):
+        self.values = values
+        self.mechanism = mechanism
+        self.epsilon = epsilon # Effective epsilon of this column, category selection included
+        self.delta = delta # Delta of the category selection (0 with a declared domain)
+        self.details = details # Mechanism parameters; "released" holds a released histogram (exponential mechanism)
+
+
+def randomized_response(series, epsilon, domain=None, delta=SELECTION_DELTA, seed=None):
+    """
+    k-ary randomized response over the column's domain (see _column_domain):
+    every value is kept with probability keep = (e^eps - 1) / (e^eps + k - 1)
+    and otherwise replaced by a uniform draw from the k cells, so the true cell
+    is reported with probability e^eps / (e^eps + k - 1). One vectorized
+    keep-or-resample draw for the whole column. With a declared domain this is
+    local DP; a selected domain makes the release central (epsilon, delta)-DP.
+    """
+    if epsilon <= 0:
+        raise ValueError("Epsilon must be positive.")
+    rng = np.random.default_rng(seed)
+    domain, response_epsilon, delta = _column_domain(series, epsilon, domain, delta, rng)
+    codes, categories = _column_codes(series, domain)
+    k = len(categories)
+    keep_probability = math.expm1(response_epsilon) / (math.exp(response_epsilon) + k - 1)
+    keep = rng.random(len(codes)) < keep_probability
+    released = np.where(keep, codes, rng.integers(0, k, len(codes)))
+    effective_epsilon = math.log1p(k * keep_probability / (1 - keep_probability)) + (epsilon - response_epsilon)
+    return ColumnRelease(_from_codes(released, categories, series), RANDOMIZED_RESPONSE, effective_epsilon,
+                         {"categories": k, "keep_probability": keep_probability}, delta=delta)
+
+
+def debiased_frequencies(values, keep_probability, categories):
+    """Unbiased category shares from a randomized-response column (clipped to [0, 1] and renormalized)."""
+    observed = values.astype(object).value_counts(normalize=True, dropna=False).reindex(categories, fill_value=0.0).to_numpy()
+    estimate = np.clip((observed - (1 - keep_probability) / len(categories)) / keep_probability, 0.0, None)
+    return pd.Series(estimate / estimate.sum() if estimate.sum() > 0 else estimate, index=categories)
+
+
+def exponential_mechanism_counts(counts, epsilon, top_k=None, rng=None):
+    """
+    Releases category counts with the exponential mechanism (utility -|c - count|,
+    sensitivity 1: two-sided geometric noise). With `top_k`, half of epsilon
+    first selects k categories by Gumbel-max (the one-shot form of k rounds of
+    the exponential mechanism with utility = count); the rest are pooled into
+    OTHER_CATEGORY. The OTHER_CATEGORY and missing cells are always released.
+    `counts` must cover a public domain (zero counts included).
+    Returns (released counts Series, epsilon spent).
+    """
+    if epsilon <= 0:
+        raise ValueError("Epsilon must be positive.")
+    rng = rng if rng is not None else np.random.default_rng()
+    counts = counts.astype(float)
+    count_epsilon = epsilon
+    pinned = pd.isna(counts.index) | (counts.index == OTHER_CATEGORY)
+    candidates = np.flatnonzero(~pinned)
+    if top_k is not None and top_k < len(candidates):
+        selection_epsilon = count_epsilon = epsilon / 2
+        scores = counts.to_numpy()[candidates] + rng.gumbel(0.0, 2.0 * top_k / selection_epsilon, len(candidates)) # Each of k picks gets selection_epsilon / k
+        selected = np.sort(candidates[np.argpartition(-scores, top_k - 1)[:top_k]])
+        pooled = counts.iloc[np.setdiff1d(candidates, selected)].sum()
+        other = counts[counts.index == OTHER_CATEGORY].sum() + pooled
+        counts = pd.concat([counts.iloc[selected], pd.Series([other], index=[OTHER_CATEGORY]), counts[pd.isna(counts.index)]])
+    alpha = math.exp(-count_epsilon / 2) # P(noise = z) proportional to exp(-eps |z| / 2)
+    noise = rng.geometric(1 - alpha, len(counts)) - rng.geometric(1 - alpha, len(counts))
+    return (counts + noise).clip(lower=0), float(epsilon)
+
+
+def exponential_mechanism_column(series, epsilon, top_k=None, domain=None, delta=SELECTION_DELTA, seed=None):
+    """
+    Central-DP column release: the column's histogram over its domain (see
+    _column_domain; optionally only its top-k categories plus OTHER_CATEGORY)
+    is released with exponential_mechanism_counts() and the column is
+    regenerated from it with one multinomial draw. Values are no longer tied
+    to their original rows. A selected domain already holds at most `top_k`
+    categories, so no second selection is made.
+    """
+    rng = np.random.default_rng(seed)
+    limit = min(top_k, MAX_CATEGORIES) if top_k is not None else MAX_CATEGORIES
+    domain, count_epsilon, delta = _column_domain(series, epsilon, domain, delta, rng, limit=limit)
+    codes, categories = _column_codes(series, domain)
+    counts = pd.Series(np.bincount(codes, minlength=len(categories)), index=categories)
+    released, spent = exponential_mechanism_counts(counts, count_epsilon, top_k=top_k, rng=rng)
+    probabilities = _as_probabilities(released.to_numpy())
+    new_codes = np.repeat(np.arange(len(released)), rng.multinomial(len(series), probabilities))
+    rng.shuffle(new_codes)
+    values = _from_codes(new_codes, pd.Index(released.index, dtype=object), series)
+    return ColumnRelease(values, EXPONENTIAL, spent + (epsilon - count_epsilon),
+                         {"categories": len(categories), "top_k": top_k, "released": released}, delta=delta)
+
+
+def privatize_columns(df, columns, mechanism, epsilon, top_k=None, domains=None, seed=None):
+    """
+    Applies randomized_response or exponential_mechanism_column (`mechanism`) with
+    `epsilon` to each of `columns`; `domains` maps columns to declared categories.
+    Returns (new DataFrame, {column: ColumnRelease}); the total cost is the sum of
+    the column epsilons and deltas.
+    """
+    if mechanism not in COLUMN_MECHANISMS:
+        raise ValueError(f"Unknown mechanism '{mechanism}'. Expected one of: {', '.join(COLUMN_MECHANISMS)}.")
+    seeds = np.random.SeedSequence(seed).spawn(len(columns))
+    domains = domains or {}
+    result, releases = df.copy(), {}
+    for column, column_seed in zip(columns, seeds):
+        if mechanism == RANDOMIZED_RESPONSE:
+            release = randomized_response(df[column], epsilon, domain=domains.get(column), seed=column_seed)
+        else:
+            release = exponential_mechanism_column(df[column], epsilon, top_k=top_k, domain=domains.get(column), seed=column_seed)
+        result[column] = release.values
+        releases[column] = release
+    return result, releases
+
+
+def dataset_key(name, columns):
+    """
+    Stable ledger key of a dataset: its source name and column names. Unlike a
+    content hash it survives re-ingesting or resampling the same data.
+    """
+    payload = json.dumps([str(name), sorted(map(str, columns))])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class PrivacyLedger:
+    """Append-only record of DP releases per dataset (JSON lines)."""
+
+    def __init__(self, path=None):
+        self.path = Path(path or os.environ.get(LEDGER_ENV, DEFAULT_LEDGER_PATH))
+
+    def record(self, dataset_key, mechanism, epsilon, delta=0.0, dataset_name=None, columns=None, description=None):
+        entry = {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "dataset": dataset_key, "dataset_name": dataset_name, "mechanism": mechanism,
+            "epsilon": float(epsilon), "delta": float(delta), "columns": list(map(str, columns or [])), "description": description,
+        }
+        with _ledger_lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as ledger_file:
+                ledger_file.write(json.dumps(entry, default=str) + "\n")
+        return entry
+
+    def entries(self, dataset_key=None):
+        if not self.path.exists():
+            return []
+        with _ledger_lock:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        entries = []
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue # A torn last line from a crash must not hide the rest of the ledger
+            if dataset_key is None or entry.get("dataset") == dataset_key:
+                entries.append(entry)
+        return entries
+
+    def spent(self, dataset_key):
+        """(epsilon, delta) spent on a dataset so far, by basic composition."""
+        entries = self.entries(dataset_key)
+        return sum(e["epsilon"] for e in entries), sum(e.get("delta", 0.0) for e in entries)
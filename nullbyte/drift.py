@@ -0,0 +1,250 @@
+"""
+Drift analysis between an original table and its synthetic counterpart.
+
+Each column is summarised once into a compact profile, and profiles are
+cached by a fingerprint of the frame, so reruns and repeated clicks reuse
+them. Callers holding a stored fingerprint (DatasetStore.fingerprint) pass
+it in, so a cached report costs no hashing at all. The profile cache is
+bounded by the bytes of its subsamples (PROFILE_CACHE_BYTES). A numeric profile is a seeded subsample plus a quantile grid. A
+categorical profile holds the top category counts. All columns are compared
+in one pass:
+  numeric      K-S test on the subsamples, PSI over the reference deciles,
+               Wasserstein-1 distance from the quantile grids
+  categorical  Chi-squared test on the category counts, PSI over categories
+Columns are profiled in a thread pool; sorting, hashing and value_counts
+release the GIL for most of their work.
+
+Configuration (environment):
+  NULLBYTE_DRIFT_KS_SAMPLE  rows per column kept for the K-S test (default 20000)
+  NULLBYTE_DRIFT_WORKERS    profiling threads (default: min(8, CPU count))
+"""
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from nullbyte.fingerprint import frame_fingerprint
+
+MIN_SAMPLES_FOR_DRIFT_TEST = 20 # Minimum samples required in each series for a reliable test
+DRIFT_P_VALUE_THRESHOLD = 0.05 # Standard p-value threshold
+DEFAULT_KS_SAMPLE_SIZE = 20_000
+QUANTILE_GRID_POINTS = 201 # Quantile midpoints used for the Wasserstein distance
+PSI_NUMERIC_BINS = 10 # Reference deciles
+PSI_MIN_SHARE = 1e-4 # Floor on bin shares so empty bins do not make PSI infinite
+MAX_CATEGORIES = 1000 # Categories beyond the most frequent ones are pooled into one bucket
+PROFILE_CACHE_BYTES = 64 * 1024 * 1024 # Column profiles, by the size of their subsamples and quantile grids
+REPORT_CACHE_SIZE = 32
+
+NUMERIC, CATEGORICAL = "numeric", "categorical"
+_OTHER = object() # Pooled bucket for categories beyond MAX_CATEGORIES
+
+_cache_lock = threading.Lock()
+_profile_cache = OrderedDict()
+_report_cache = OrderedDict()
+
+
+def _env_int(name, default):
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def _cache_get(cache, key):
+    with _cache_lock:
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+    return None
+
+
+def _cache_put(cache, key, value, max_size):
+    with _cache_lock:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > max_size:
+            cache.popitem(last=False)
+
+
+_profile_cache_bytes = 0
+
+
+def _put_profile(key, profile):
+    """Caches a column profile, evicting the least recently used ones past PROFILE_CACHE_BYTES."""
+    global _profile_cache_bytes
+    with _cache_lock:
+        previous = _profile_cache.pop(key, None)
+        if previous is not None:
+            _profile_cache_bytes -= previous.nbytes
+        _profile_cache[key] = profile
+        _profile_cache_bytes += profile.nbytes
+        while _profile_cache_bytes > PROFILE_CACHE_BYTES and len(_profile_cache) > 1:
+            _, evicted = _profile_cache.popitem(last=False)
+            _profile_cache_bytes -= evicted.nbytes
+
+
+class ColumnProfile:
+    """Compact summary of one column; see module docstring."""
+
+    def __init__(self, kind, n_valid, sample=None, quantiles=None, counts=None):
+        self.kind = kind
+        self.n_valid = n_valid
+        self.sample = sample # Sorted float subsample (numeric)
+        self.quantiles = quantiles # Values at the QUANTILE_GRID_POINTS midpoints (numeric)
+        self.counts = counts # {category: count}, with _OTHER pooling the tail (categorical)
+
+    @property
+    def nbytes(self):
+        """Approximate size: the numeric arrays, or ~100 bytes per category count."""
+        if self.kind == NUMERIC:
+            return self.sample.nbytes + (self.quantiles.nbytes if self.quantiles is not None else 0)
+        return 100 * len(self.counts)
+
+
+def profile_column(series, kind, ks_sample_size, seed=0):
+    """Builds the ColumnProfile of `series`, treated as `kind` (numeric or categorical)."""
+    if kind == NUMERIC:
+        if pd.api.types.is_numeric_dtype(series.dtype):
+            values = series.to_numpy(dtype=float, na_value=np.nan)
+        else:
+            values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=float)
+        values = values[~np.isnan(values)]
+        n_valid = len(values)
+        if n_valid > ks_sample_size: # Seeded, so the profile (and its cache entry) is deterministic
+            values = np.random.default_rng(seed).choice(values, size=ks_sample_size, replace=False)
+        sample = np.sort(values)
+        grid = (np.arange(QUANTILE_GRID_POINTS) + 0.5) / QUANTILE_GRID_POINTS
+        quantiles = np.quantile(sample, grid) if n_valid else None
+        return ColumnProfile(NUMERIC, n_valid, sample=sample, quantiles=quantiles)
+
+    value_counts = series.value_counts(dropna=True)
+    value_counts = value_counts[value_counts > 0] # Unused categories of category-dtype columns
+    counts = dict(value_counts.iloc[:MAX_CATEGORIES].items())
+    if len(value_counts) > MAX_CATEGORIES:
+        counts[_OTHER] = int(value_counts.iloc[MAX_CATEGORIES:].sum())
+    return ColumnProfile(CATEGORICAL, int(value_counts.sum()), counts=counts)
+
+
+def _psi(expected_shares, actual_shares):
+    expected = np.maximum(expected_shares, PSI_MIN_SHARE)
+    actual = np.maximum(actual_shares, PSI_MIN_SHARE)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def _compare_numeric(column, ref, cmp, subsampled):
+    if ref.n_valid < MIN_SAMPLES_FOR_DRIFT_TEST or cmp.n_valid < MIN_SAMPLES_FOR_DRIFT_TEST:
+        return dict(drifted=False, message=f"Insufficient data for drift test in '{column}' (s1: {ref.n_valid}, s2: {cmp.n_valid} samples).")
+    if ref.sample[0] == ref.sample[-1] == cmp.sample[0] == cmp.sample[-1]:
+        return dict(drifted=False, test="K-S", statistic=0.0, p_value=1.0, psi=0.0, wasserstein=0.0,
+                    message=f"No drift in '{column}'; both series are constant and identical.")
+
+    ks_statistic, p_value = stats.ks_2samp(ref.sample, cmp.sample)
+    edges = np.unique(np.quantile(ref.sample, np.linspace(0, 1, PSI_NUMERIC_BINS + 1)[1:-1]))
+    ref_shares = np.diff(np.searchsorted(ref.sample, edges, side="right"), prepend=0, append=len(ref.sample)) / len(ref.sample)
+    cmp_shares = np.diff(np.searchsorted(cmp.sample, edges, side="right"), prepend=0, append=len(cmp.sample)) / len(cmp.sample)
+    wasserstein = float(np.mean(np.abs(ref.quantiles - cmp.quantiles)))
+    test_label = "K-S test on subsamples" if subsampled else "K-S test"
+    drifted = bool(p_value < DRIFT_P_VALUE_THRESHOLD)
+    message = (f"Drift detected in '{column}' ({test_label}, p={p_value:.3g}). Distributions likely differ." if drifted
+               else f"No significant drift detected in '{column}' ({test_label}, p={p_value:.3g}).")
+    return dict(drifted=drifted, test="K-S", statistic=float(ks_statistic), p_value=float(p_value),
+                psi=_psi(ref_shares, cmp_shares), wasserstein=wasserstein, message=message)
+
+
+def _compare_categorical(column, ref, cmp):
+    if ref.n_valid < MIN_SAMPLES_FOR_DRIFT_TEST or cmp.n_valid < MIN_SAMPLES_FOR_DRIFT_TEST:
+        return dict(drifted=False, message=f"Insufficient data for drift test in '{column}' (s1: {ref.n_valid}, s2: {cmp.n_valid} samples).")
+
+    categories = list(dict.fromkeys(list(ref.counts) + list(cmp.counts)))
+    observed = np.array([[ref.counts.get(c, 0) for c in categories], [cmp.counts.get(c, 0) for c in categories]], dtype=float)
+    psi = _psi(observed[0] / observed[0].sum(), observed[1] / observed[1].sum())
+    if len(categories) < 2:
+        return dict(drifted=False, test="Chi-squared", psi=psi,
+                    message=f"No drift in '{column}'; distributions are identical (small sample/categories).")
+    try:
+        chi2, p_value, _, expected = stats.chi2_contingency(observed)
+    except ValueError as e: # E.g. a zero expected frequency
+        drifted = not np.allclose(observed[0] / observed[0].sum(), observed[1] / observed[1].sum())
+        return dict(drifted=drifted, test="Chi-squared", psi=psi,
+                    message=(f"Drift detected in '{column}'; distributions differ (Chi-squared error: {e})." if drifted
+                             else f"No drift in '{column}'; distributions appear identical (Chi-squared error: {e})."))
+    drifted = bool(p_value < DRIFT_P_VALUE_THRESHOLD)
+    if drifted and (expected < 5).any():
+        message = f"Drift detected in '{column}' (Chi-squared, p={p_value:.3g}). Note: Some expected frequencies are low (<5), test may be less reliable."
+    elif drifted:
+        message = f"Drift detected in '{column}' (Chi-squared, p={p_value:.3g}). Distributions likely differ."
+    else:
+        message = f"No significant drift detected in '{column}' (Chi-squared, p={p_value:.3g})."
+    return dict(drifted=drifted, test="Chi-squared", statistic=float(chi2), p_value=float(p_value), psi=psi, message=message)
+
+
+def _column_profiles(df, fingerprint, kinds, ks_sample_size, executor):
+    """Profiles of the `kinds` ({column: kind}) of `df`, reusing cached ones."""
+    profiles, missing = {}, []
+    for position, (column, kind) in enumerate(kinds.items()):
+        key = (fingerprint, column, kind, ks_sample_size)
+        cached = _cache_get(_profile_cache, key)
+        if cached is not None:
+            profiles[column] = cached
+        else:
+            missing.append((position, column, kind, key))
+
+    def build(item):
+        position, column, kind, key = item
+        profile = profile_column(df[column], kind, ks_sample_size, seed=position)
+        _put_profile(key, profile)
+        return column, profile
+
+    profiles.update(executor.map(build, missing))
+    return profiles
+
+
+def compare_frames(reference, comparison, ks_sample_size=None, workers=None, reference_fingerprint=None, comparison_fingerprint=None):
+    """
+    Drift report of every column of `reference` against `comparison`, one row per column:
+    Column, Type, Test, Statistic, p-value, PSI, Wasserstein, Drift, Message.
+    Reports are cached by the fingerprints of both frames (given, or computed
+    here); report.attrs holds "seconds" (compute time) and "cached".
+    """
+    ks_sample_size = ks_sample_size or _env_int("NULLBYTE_DRIFT_KS_SAMPLE", DEFAULT_KS_SAMPLE_SIZE)
+    workers = workers or _env_int("NULLBYTE_DRIFT_WORKERS", min(8, os.cpu_count() or 1))
+    started = perf_counter()
+    reference_fp = reference_fingerprint or frame_fingerprint(reference)
+    comparison_fp = comparison_fingerprint or frame_fingerprint(comparison)
+    report_key = (reference_fp, comparison_fp, ks_sample_size)
+    cached_report = _cache_get(_report_cache, report_key)
+    if cached_report is not None:
+        report = cached_report.copy()
+        report.attrs.update(seconds=perf_counter() - started, cached=True)
+        return report
+
+    kinds = {c: NUMERIC if pd.api.types.is_numeric_dtype(reference[c].dtype) else CATEGORICAL for c in reference.columns}
+    shared_kinds = {c: k for c, k in kinds.items() if c in comparison.columns}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="nullbyte-drift") as executor:
+        reference_profiles = _column_profiles(reference, reference_fp, kinds, ks_sample_size, executor)
+        comparison_profiles = _column_profiles(comparison, comparison_fp, shared_kinds, ks_sample_size, executor)
+
+    rows = []
+    for column, kind in kinds.items():
+        if column not in comparison_profiles:
+            result = dict(drifted=False, message=f"Column '{column}' missing in synthetic part, cannot compare.")
+        elif kind == NUMERIC:
+            ref, cmp = reference_profiles[column], comparison_profiles[column]
+            result = _compare_numeric(column, ref, cmp, subsampled=max(ref.n_valid, cmp.n_valid) > ks_sample_size)
+        else:
+            result = _compare_categorical(column, reference_profiles[column], comparison_profiles[column])
+        rows.append({
+            "Column": column, "Type": kind, "Test": result.get("test"), "Statistic": result.get("statistic"),
+            "p-value": result.get("p_value"), "PSI": result.get("psi"), "Wasserstein": result.get("wasserstein"),
+            "Drift": result["drifted"], "Message": result["message"],
+        })
+    report = pd.DataFrame(rows, columns=["Column", "Type", "Test", "Statistic", "p-value", "PSI", "Wasserstein", "Drift", "Message"])
+    _cache_put(_report_cache, report_key, report, REPORT_CACHE_SIZE)
+    report = report.copy()
+    report.attrs.update(seconds=perf_counter() - started, cached=False)
+    return report
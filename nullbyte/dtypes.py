@@ -0,0 +1,124 @@
+"""
+Compact dtypes for generated tables.
+
+Generators produce Python objects, so every column would otherwise land as
+`object` or int64/float64. compact_dataframe() converts a finished table:
+  * category fields and low-cardinality text -> dictionary-encoded `category`
+  * int fields -> the smallest integer dtype covering the declared range and
+    the observed values (nullable IntN if edge cases injected missing values)
+  * remaining text -> Arrow-backed `string[pyarrow]` (plain `string` without pyarrow)
+Columns with mixed value types (e.g. an edge case wrote text into an int
+field) are left untouched.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow # noqa: F401
+    TEXT_DTYPE = "string[pyarrow]"
+except ImportError:
+    TEXT_DTYPE = "string"
+
+# Dtypes the bias / distribution views treat as categorical (select_dtypes include list)
+CATEGORICAL_LIKE_DTYPES = ["object", "category", "string"]
+
+LOW_CARDINALITY_MAX_RATIO = 0.5 # Text columns with at most this share of distinct values become `category`
+LOW_CARDINALITY_MAX_UNIQUE = 1000
+
+_INT_RANGE_PATTERN = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*-\s*(-?\d+(?:\.\d+)?)\s*$")
+_INT_DTYPES = [np.int8, np.int16, np.int32, np.int64]
+
+
+def categorical_like_columns(df):
+    """Columns to offer for bias / distribution checks (object, category and string dtypes)."""
+    return df.select_dtypes(include=CATEGORICAL_LIKE_DTYPES).columns.tolist()
+
+
+def _declared_int_range(constraint):
+    match = _INT_RANGE_PATTERN.match(constraint or "")
+    if not match:
+        return None
+    low, high = (int(float(v)) for v in match.groups())
+    return (low, high) if low <= high else None
+
+
+def _smallest_int_dtype(low, high):
+    for dtype in _INT_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return dtype
+    return None
+
+
+def _compact_int(series, constraint=""):
+    """Downcasts an integer column; None-padded ints (float64 with NaN) become nullable IntN."""
+    non_null = series.dropna()
+    if non_null.empty:
+        return series
+    if series.dtype == object:
+        if not all(isinstance(v, (int, np.integer)) and not isinstance(v, (bool, np.bool_)) for v in non_null):
+            return series # Mixed values (edge cases / masking); leave as-is
+    elif pd.api.types.is_float_dtype(series.dtype):
+        if not np.all(np.mod(non_null.to_numpy(), 1) == 0):
+            return series
+    elif not pd.api.types.is_integer_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+        return series
+    low, high = int(non_null.min()), int(non_null.max())
+    declared = _declared_int_range(constraint)
+    if declared:
+        low, high = min(low, declared[0]), max(high, declared[1])
+    dtype = _smallest_int_dtype(low, high)
+    if dtype is None:
+        return series
+    if len(non_null) < len(series):
+        return series.astype(dtype.__name__.capitalize()) # Nullable Int8/Int16/...
+    return series.astype(dtype)
+
+
+def _is_text(series):
+    return all(isinstance(v, str) for v in series.dropna())
+
+
+def _to_category(series, declared_values=()):
+    """Categories: declared values that occur (in declared order), then other observed values."""
+    observed = pd.unique(series.dropna())
+    observed_set = set(observed)
+    categories = [v for v in dict.fromkeys(declared_values) if v in observed_set]
+    declared_seen = set(categories)
+    categories += [v for v in observed if v not in declared_seen]
+    return pd.Categorical(series, categories=categories)
+
+
+def compact_series(series, field_schema=None):
+    """Returns `series` converted to a compact dtype, per its schema field (if any) and its values."""
+    field_schema = field_schema or {}
+    field_type = field_schema.get("type")
+    constraint = field_schema.get("constraint", "") or ""
+
+    if field_type == "int" or (pd.api.types.is_integer_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype)):
+        return _compact_int(series, constraint)
+    if series.dtype != object or not _is_text(series) or series.dropna().empty:
+        return series
+    if field_type == "category":
+        declared = [v.strip() for v in constraint.split(",") if v.strip()]
+        return pd.Series(_to_category(series, declared), index=series.index, name=series.name)
+    n_unique = series.nunique(dropna=True)
+    if n_unique <= LOW_CARDINALITY_MAX_UNIQUE and n_unique <= LOW_CARDINALITY_MAX_RATIO * len(series):
+        return pd.Series(_to_category(series), index=series.index, name=series.name)
+    return series.astype(TEXT_DTYPE)
+
+
+def compact_dataframe(df, schema_fields=None):
+    """
+    Converts the columns of a generated table to compact dtypes (see module docstring).
+    `schema_fields` is the table's field list; columns without a field are compacted by value.
+    """
+    if df is None or df.empty:
+        return df
+    fields_by_name = {f.get("name"): f for f in (schema_fields or [])}
+    compacted = df.copy(deep=False)
+    for position, col in enumerate(df.columns): # Positional, so duplicate column names are safe
+        compacted.isetitem(position, compact_series(df.iloc[:, position], fields_by_name.get(col)))
+    return compacted
@@ -0,0 +1,47 @@
+"""
+Faker instances and value pools cached across Streamlit reruns and sessions.
+
+Building a Faker for a locale loads every provider module, which is far more
+expensive than generating a value, so instances are created once per
+(locale, focus, seed) and reused. Providers with a small fixed value list
+(countries, currency codes, colour names, MIME types) are pre-generated into
+pools and sampled with `random`, which keeps the fixed-seed option
+reproducible. Open-ended providers (cities, postcodes, companies, jobs, ...)
+are always drawn fresh, so large tables keep their full variety.
+"""
+import streamlit as st
+from faker import Faker
+
+GLOBAL_FOCUS_LOCALE = "en_US" # Locale used when the data generation focus is "global"
+VALUE_POOL_SIZE = 10_000 # Values pre-generated per pooled provider; dozens of draws per value, so pool frequencies stay close to uniform
+POOLED_FAKER_PROVIDERS = ("country", "currency_code", "color_name", "mime_type")
+
+
+def resolve_faker_locale(locale, focus):
+    """Returns the Faker locale actually used for a (locale, focus) pair."""
+    return locale if focus == "indian" else GLOBAL_FOCUS_LOCALE
+
+
+@st.cache_resource(show_spinner=False)
+def get_faker(locale, focus, seed=None):
+    """
+    Returns the shared Faker for (locale, focus, seed), created once per process.
+    The instance draws from Faker's module-level random, so Faker.seed() still
+    controls reproducibility; `seed` only keeps seeded and unseeded runs apart.
+    """
+    return Faker(resolve_faker_locale(locale, focus))
+
+
+@st.cache_resource(show_spinner=False)
+def get_value_pools(locale, focus, seed=None):
+    """
+    Returns {provider: [values]} for POOLED_FAKER_PROVIDERS.
+    Pools are built by a dedicated Faker seeded with `seed`, so their content is
+    deterministic for a fixed seed and does not disturb the shared instance.
+    """
+    pool_faker = Faker(resolve_faker_locale(locale, focus))
+    pool_faker.seed_instance(seed)
+    return {
+        provider: [getattr(pool_faker, provider)() for _ in range(VALUE_POOL_SIZE)]
+        for provider in POOLED_FAKER_PROVIDERS
+    }
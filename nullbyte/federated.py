@@ -0,0 +1,424 @@
+"""
+Federated synthesis across local participant processes.
+
+Each participant is a separate spawned process that reads its own local
+CSV/XLSX file (nullbyte.ingest) and answers the coordinator over a pipe.
+Raw rows never leave the participant process; only the statistics of three
+rounds cross the process boundary:
+  1. schema      column kinds, numeric ranges and precision, and the names of
+                 categories seen at least MIN_SHARED_CATEGORY_COUNT times
+                 (rarer ones stay local and are pooled into OTHER_CATEGORY;
+                 identifier-like text columns are not shared at all)
+  2. histograms  per-column counts over the bins / categories the coordinator
+                 agreed on (missing values as one more cell)
+  3. moments     Z^T Z sums of normal scores under the *global* marginals
+                 (nullbyte.synthesis.score_moments)
+All participants compute a round in parallel. The coordinator adds up the
+histograms into global marginals and the moments into one copula
+correlation, and samples the global table from the resulting
+GaussianCopulaModel.
+
+With `epsilon`, every participant adds noise before sharing (Laplace or
+Gaussian, as in nullbyte.dp): HISTOGRAM_BUDGET_SHARE of its budget goes to
+the histograms, the rest to the moments, whose normal scores are clipped to
++-SCORE_CLIP to bound each row's contribution. The schema round is treated
+as public metadata, as nullbyte.dp does for bounds and category domains.
+
+Participants hold at most NULLBYTE_INGEST_MAX_ROWS rows (a uniform sample of
+larger files). standin_participants() splits one table into temporary local
+files for the length of one run, so a federation can be tried on one machine.
+
+Configuration (environment):
+  NULLBYTE_FEDERATED_TIMEOUT  seconds to wait for a participant per round (default 600)
+"""
+import multiprocessing
+import os
+import pickle
+import re
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtri
+
+from nullbyte.dp import GAUSSIAN, LAPLACE, MAX_CATEGORIES, OTHER_CATEGORY, gaussian_sigma, noisy_counts
+from nullbyte.ingest import ingest_table
+from nullbyte.quality import CATEGORICAL, NUMERIC
+from nullbyte.synthesis import (
+    CategoricalColumnModel,
+    GaussianCopulaModel,
+    NumericColumnModel,
+    correlation_from_moments,
+    fit_numeric_column,
+    nearest_correlation,
+    score_moments,
+)
+
+TIMEOUT_ENV = "NULLBYTE_FEDERATED_TIMEOUT"
+DEFAULT_TIMEOUT_SECONDS = 600
+DEFAULT_HISTOGRAM_BINS = 64
+MIN_SHARED_CATEGORY_COUNT = 5
+IDENTIFIER_MIN_DISTINCT_RATIO = 0.5 # Text columns with a larger share of distinct values are not shared
+HISTOGRAM_BUDGET_SHARE = 0.5
+SCORE_CLIP = 3.0
+SCORE_EPSILON = 1e-6 # Uniforms are kept inside (0, 1) before the normal quantile
+STANDIN_PREFIX = "nullbyte-federated-" # Temporary directory of stand-in participant files
+
+
+class FederationError(Exception):
+    """Raised when a participant fails or the participants' data cannot be combined."""
+
+
+def _timeout():
+    try:
+        return max(1, int(os.environ.get(TIMEOUT_ENV, DEFAULT_TIMEOUT_SECONDS)))
+    except ValueError:
+        return DEFAULT_TIMEOUT_SECONDS
+
+
+# --- Participant side (runs in the participant process) ---
+def _is_numeric(series):
+    return pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype)
+
+
+def _is_categorical(series):
+    if pd.api.types.is_object_dtype(series.dtype): # Text, not dates or other Python objects
+        return pd.api.types.infer_dtype(series, skipna=True) in ("string", "boolean", "empty")
+    return (pd.api.types.is_bool_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype)
+            or isinstance(series.dtype, pd.CategoricalDtype))
+
+
+def _cell_codes(series, spec):
+    """Histogram cell of every value under a coordinator spec; missing values take the last cell."""
+    if spec["kind"] == NUMERIC:
+        edges = spec["edges"]
+        values = series.to_numpy(dtype=float, na_value=np.nan)
+        codes = np.clip(np.searchsorted(edges, np.nan_to_num(values, nan=edges[0]), side="right") - 1, 0, len(edges) - 2)
+        return np.where(np.isnan(values), len(edges) - 1, codes)
+    categories = spec["categories"]
+    codes = pd.Index(categories, dtype=object).get_indexer(series.astype(object))
+    codes = np.where(codes < 0, len(categories), codes) # Categories kept local -> OTHER_CATEGORY
+    return np.where(series.isna().to_numpy(), len(categories) + 1, codes)
+
+
+def _normal_scores(series, spec):
+    """Normal scores of a column under the global marginal (NaN for missing values)."""
+    if spec["kind"] == NUMERIC:
+        values = series.to_numpy(dtype=float, na_value=np.nan)
+        u = np.interp(values, spec["edges"], spec["cdf"])
+        u[np.isnan(values)] = np.nan
+    else:
+        values = series.astype(object)
+        known = pd.Index(spec["values"], dtype=object)
+        values = values.where(values.isna() | values.isin(known), OTHER_CATEGORY)
+        u = CategoricalColumnModel(spec["values"], spec["probabilities"], 0.0).encode(values)
+    return ndtri(np.clip(u, SCORE_EPSILON, 1.0 - SCORE_EPSILON))
+
+
+class _Participant:
+    """Participant-side state: the local frame, and the answer to each coordinator request."""
+
+    def __init__(self, frame, seed):
+        self.frame = frame
+        self.rng = np.random.default_rng(seed)
+
+    def schema(self):
+        columns = {}
+        for column in self.frame.columns:
+            series = self.frame[column]
+            if _is_numeric(series):
+                values = series.to_numpy(dtype=float, na_value=np.nan)
+                valid = values[np.isfinite(values)]
+                model = fit_numeric_column(series)
+                columns[column] = {
+                    "kind": NUMERIC,
+                    "range": (float(valid.min()), float(valid.max())) if len(valid) else None,
+                    "integer": pd.api.types.is_integer_dtype(series.dtype) or bool(np.all(valid == np.round(valid))),
+                    "decimals": model.params.get("decimals") if model is not None else None,
+                }
+            elif _is_categorical(series):
+                counts = series.astype(object).value_counts(dropna=True)
+                if len(counts) > IDENTIFIER_MIN_DISTINCT_RATIO * max(len(series), 1) and len(counts) > MIN_SHARED_CATEGORY_COUNT:
+                    columns[column] = {"kind": None}
+                    continue
+                shared = counts[counts >= MIN_SHARED_CATEGORY_COUNT].index[:MAX_CATEGORIES]
+                dtype = "bool" if pd.api.types.is_bool_dtype(series.dtype) else "category" if isinstance(series.dtype, pd.CategoricalDtype) else "text"
+                columns[column] = {"kind": CATEGORICAL, "categories": list(shared), "dtype": dtype}
+            else:
+                columns[column] = {"kind": None}
+        return {"rows": len(self.frame), "columns": columns}
+
+    def histograms(self, plan, epsilon=None, delta=0.0, mechanism=LAPLACE):
+        counts = {}
+        for column, spec in plan.items():
+            cells = spec["cells"]
+            counts[column] = np.bincount(_cell_codes(self.frame[column], spec), minlength=cells)
+        if epsilon: # Every row falls in one cell of every histogram: split the budget across columns
+            epsilon_each, delta_each = epsilon / len(plan), delta / len(plan)
+            counts = {c: noisy_counts(v, epsilon_each, delta_each, mechanism, self.rng) for c, v in counts.items()}
+        return counts
+
+    def moments(self, scoring, epsilon=None, delta=0.0, mechanism=LAPLACE):
+        scores = np.column_stack([_normal_scores(self.frame[c], spec) for c, spec in scoring.items()])
+        if not epsilon:
+            return score_moments(scores)
+        cross, _ = score_moments(np.clip(scores, -SCORE_CLIP, SCORE_CLIP))
+        upper = np.triu_indices(len(scoring))
+        entries = len(upper[0])
+        # One row changes each released entry by at most SCORE_CLIP^2
+        sensitivity = SCORE_CLIP ** 2 * (np.sqrt(entries) if mechanism == GAUSSIAN else entries)
+        released = np.zeros_like(cross)
+        released[upper] = noisy_counts(cross[upper], epsilon, delta, mechanism, self.rng, sensitivity=sensitivity)
+        return released + np.triu(released, 1).T, None
+
+
+def _reply(connection, status, payload, seconds=0.0):
+    connection.send_bytes(pickle.dumps((status, payload, seconds), protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _participant_worker(connection, path, max_rows, seed):
+    """Participant process: loads its file, then answers requests until told to stop."""
+    try:
+        started = perf_counter()
+        path = Path(path)
+        participant = _Participant(ingest_table(path, path.name, max_rows=max_rows, seed=seed).frame, seed)
+        _reply(connection, "ok", {"rows": len(participant.frame)}, perf_counter() - started)
+        while True:
+            request, arguments = pickle.loads(connection.recv_bytes())
+            if request == "stop":
+                break
+            started = perf_counter()
+            _reply(connection, "ok", getattr(participant, request)(**arguments), perf_counter() - started)
+    except EOFError: # Coordinator went away
+        pass
+    except Exception as e: # Reported to the coordinator, which raises FederationError
+        _reply(connection, "error", f"{type(e).__name__}: {e}")
+    finally:
+        connection.close()
+
+
+# --- Coordinator side ---
+def _plan_columns(schemas, bins):
+    """Histogram specs for the columns every participant shares with the same kind, plus the skipped columns."""
+    names = list(schemas)
+    first = schemas[names[0]]["columns"]
+    plan, skipped = {}, []
+    for column in first:
+        infos = [schemas[n]["columns"].get(column) for n in names]
+        kinds = {info["kind"] if info else None for info in infos}
+        if len(kinds) != 1 or None in kinds:
+            skipped.append(column)
+            continue
+        if kinds == {NUMERIC}:
+            ranges = [info["range"] for info in infos if info["range"] is not None]
+            if not ranges:
+                skipped.append(column)
+                continue
+            low, high = min(r[0] for r in ranges), max(r[1] for r in ranges)
+            integer = all(info["integer"] for info in infos)
+            decimals = [info["decimals"] for info in infos]
+            if integer and high - low + 1 <= bins:
+                edges = np.arange(low - 0.5, high + 1.0) # One bin per integer value
+            else:
+                edges = np.linspace(low, high if high > low else low + 1.0, bins + 1)
+            plan[column] = {"kind": NUMERIC, "edges": edges, "cells": len(edges), "range": (low, high), "integer": integer,
+                            "decimals": None if integer or None in decimals else max(decimals)}
+        else:
+            categories = list(dict.fromkeys(c for info in infos for c in info["categories"]))
+            dtypes = {info["dtype"] for info in infos}
+            plan[column] = {"kind": CATEGORICAL, "categories": categories, "cells": len(categories) + 2,
+                            "dtype": dtypes.pop() if len(dtypes) == 1 else "text"}
+    return plan, skipped
+
+
+def _numeric_marginal(spec, counts):
+    """NumericColumnModel whose inverse CDF is linear inside each non-empty bin of the pooled histogram."""
+    cell_counts, missing = np.clip(counts[:-1], 0.0, None), max(float(counts[-1]), 0.0)
+    total = cell_counts.sum()
+    if total <= 0:
+        return None, None
+    edges = spec["edges"]
+    cdf = np.concatenate([[0.0], np.cumsum(cell_counts) / total])
+    points = [] # (cumulative probability, value), strictly increasing in probability
+    for j in np.flatnonzero(cell_counts > 0):
+        if not points:
+            points.append((cdf[j], edges[j]))
+        elif points[-1][1] != edges[j]: # Gap of empty bins: jump over it
+            points.append((np.nextafter(points[-1][0], 1.0), edges[j]))
+        points.append((max(cdf[j + 1], np.nextafter(points[-1][0], 1.0)), edges[j + 1]))
+    probabilities, quantiles = (np.array(p) for p in zip(*points))
+    low, high = spec["range"]
+    model = NumericColumnModel(
+        "quantile", spec["integer"], missing / (total + missing),
+        probabilities=probabilities / probabilities[-1], quantiles=quantiles,
+        zero_share=0.0, body_share_below_zero=0.0, decimals=spec["decimals"], low=low, high=high,
+    )
+    return model, {"kind": NUMERIC, "edges": edges, "cdf": cdf}
+
+
+def _categorical_marginal(spec, counts):
+    counts = np.clip(counts, 0.0, None)
+    values = list(spec["categories"]) + [OTHER_CATEGORY]
+    present = counts[:-1] > 0
+    if not present.any():
+        return None, None
+    values = [v for v, keep in zip(values, present) if keep]
+    probabilities = counts[:-1][present]
+    missing = float(counts[-1])
+    if spec["dtype"] == "bool":
+        dtype = "boolean" if missing > 0 else bool
+    else:
+        dtype = pd.CategoricalDtype() if spec["dtype"] == "category" else None
+    model = CategoricalColumnModel(values, probabilities, missing / (probabilities.sum() + missing), dtype=dtype)
+    return model, {"kind": CATEGORICAL, "values": list(model.values), "probabilities": model.probabilities}
+
+
+class FederatedResult:
+    """Global model and per-participant accounting of a run_federation() call."""
+
+    def __init__(self, model, participants, skipped, epsilon, delta, mechanism, seconds):
+        self.model = model # GaussianCopulaModel over the shared columns
+        self.participants = participants # DataFrame: rows, bytes shared and compute seconds per participant
+        self.skipped = skipped
+        self.epsilon = epsilon # Per participant (None: no noise)
+        self.delta = delta
+        self.mechanism = mechanism
+        self.seconds = seconds
+
+    @property
+    def columns(self):
+        return self.model.columns
+
+    @property
+    def rows(self):
+        return self.model.rows_fitted
+
+
+def _gather(connections, timeout, report, round_name):
+    """Waits for every participant's reply to the current round."""
+    replies = {}
+    for name, connection in connections.items():
+        try:
+            if not connection.poll(timeout):
+                raise FederationError(f"Participant '{name}' did not answer the {round_name} round within {timeout} s.")
+            data = connection.recv_bytes()
+        except (EOFError, OSError):
+            raise FederationError(f"Participant '{name}' exited during the {round_name} round.") from None
+        status, payload, seconds = pickle.loads(data)
+        if status == "error":
+            raise FederationError(f"Participant '{name}' failed in the {round_name} round: {payload}")
+        report[name]["Bytes Shared"] += len(data)
+        report[name]["Compute Seconds"] += seconds
+        replies[name] = payload
+    return replies
+
+
+def _request(connections, request, arguments=None):
+    message = pickle.dumps((request, arguments or {}), protocol=pickle.HIGHEST_PROTOCOL)
+    for connection in connections.values():
+        connection.send_bytes(message)
+
+
+def run_federation(participants, epsilon=None, delta=0.0, mechanism=LAPLACE, bins=DEFAULT_HISTOGRAM_BINS,
+                   max_rows=None, seed=None, timeout=None):
+    """
+    Runs the three rounds (see module docstring) with one process per entry of
+    `participants` ({name: local file path}) and returns a FederatedResult.
+    `epsilon` / `delta` are each participant's budget; None shares exact statistics.
+    """
+    if not participants:
+        raise FederationError("Add at least one participant.")
+    if epsilon is not None and epsilon <= 0:
+        raise ValueError("Epsilon must be positive.")
+    if epsilon and mechanism == GAUSSIAN and not 0 < delta < 1:
+        raise ValueError("The Gaussian mechanism needs 0 < delta < 1.")
+    if epsilon and mechanism == GAUSSIAN:
+        gaussian_sigma(epsilon, delta) # Rejects epsilon > 1 before any participant starts
+    timeout = timeout or _timeout()
+    started = perf_counter()
+    context = multiprocessing.get_context("spawn") # Spawn: no forked Streamlit thread state
+    seeds = np.random.SeedSequence(seed).spawn(len(participants))
+    connections, processes = {}, []
+    report = {name: {"Participant": name, "Rows": 0, "Bytes Shared": 0, "Compute Seconds": 0.0} for name in participants}
+    try:
+        for (name, path), participant_seed in zip(participants.items(), seeds):
+            parent, child = context.Pipe()
+            process = context.Process(target=_participant_worker, args=(child, str(path), max_rows, participant_seed),
+                                      name=f"nullbyte-participant-{name}", daemon=True)
+            process.start()
+            child.close()
+            connections[name] = parent
+            processes.append(process)
+        for name, ready in _gather(connections, timeout, report, "loading").items():
+            report[name]["Rows"] = ready["rows"]
+
+        _request(connections, "schema")
+        plan, skipped = _plan_columns(_gather(connections, timeout, report, "schema"), bins)
+        if not plan:
+            raise FederationError("The participants share no columns that can be combined.")
+
+        dp = {"epsilon": epsilon * HISTOGRAM_BUDGET_SHARE, "delta": delta * HISTOGRAM_BUDGET_SHARE, "mechanism": mechanism} if epsilon else {}
+        _request(connections, "histograms", {"plan": plan, **dp})
+        histograms = _gather(connections, timeout, report, "histogram")
+        marginals, scoring = {}, {}
+        for column, spec in plan.items():
+            pooled = sum(np.asarray(h[column], dtype=float) for h in histograms.values())
+            build = _numeric_marginal if spec["kind"] == NUMERIC else _categorical_marginal
+            model, score_spec = build(spec, pooled)
+            if model is None:
+                skipped.append(column)
+                continue
+            marginals[column], scoring[column] = model, score_spec
+
+        dp = {"epsilon": epsilon - dp["epsilon"], "delta": delta - dp["delta"], "mechanism": mechanism} if epsilon else {}
+        _request(connections, "moments", {"scoring": scoring, **dp})
+        moments = _gather(connections, timeout, report, "moments")
+        cross = sum(m[0] for m in moments.values())
+        if epsilon: # Noisy sums: normalize by the pooled sums of squares
+            squares = np.tile(np.clip(np.diag(cross), 1e-9, None)[:, None], (1, len(scoring)))
+        else:
+            squares = sum(m[1] for m in moments.values())
+        correlation = nearest_correlation(correlation_from_moments(cross, squares))
+        _request(connections, "stop")
+    finally:
+        for connection in connections.values():
+            connection.close()
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+    seconds = perf_counter() - started
+    model = GaussianCopulaModel(marginals, correlation, rows_fitted=sum(r["Rows"] for r in report.values()), fit_seconds=seconds)
+    return FederatedResult(model, pd.DataFrame(list(report.values())), skipped, epsilon, delta if epsilon else 0.0,
+                           mechanism if epsilon else None, seconds)
+
+
+def write_standin_participants(df, names, directory, seed=None):
+    """
+    Deals the rows of `df` out at random into one CSV per participant name in
+    `directory`, as local stand-ins for separate organizations; returns
+    {name: path}. File names are numbered, so names that sanitize alike do not collide.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    assignment = np.random.default_rng(seed).integers(0, len(names), len(df))
+    paths = {}
+    for i, name in enumerate(names):
+        path = directory / f"{i + 1:02d}_{re.sub(r'[^A-Za-z0-9_.-]+', '_', name).strip('._') or 'participant'}.csv"
+        df[assignment == i].to_csv(path, index=False)
+        paths[name] = path
+    return paths
+
+
+@contextmanager
+def standin_participants(df, names, seed=None):
+    """
+    write_standin_participants() into a temporary directory that is removed,
+    with the raw row copies, when the block exits (after run_federation()).
+    """
+    with tempfile.TemporaryDirectory(prefix=STANDIN_PREFIX) as directory:
+        yield write_standin_participants(df, names, directory, seed=seed)
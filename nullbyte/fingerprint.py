@@ -0,0 +1,21 @@
+"""Content fingerprints of DataFrames, used as cache keys by the drift, bias, PII and benchmark engines."""
+import hashlib
+
+import pandas as pd
+
+
+def frame_fingerprint(df):
+    """
+    Fingerprint of a DataFrame: shape, column names, dtypes and a vectorized
+    hash of every row, so an edit anywhere in the frame changes it. Cells that
+    cannot be hashed (lists, dicts) are hashed by their string form.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((df.shape, [str(c) for c in df.columns], [str(t) for t in df.dtypes])).encode("utf-8"))
+    if len(df):
+        try:
+            row_hashes = pd.util.hash_pandas_object(df, index=False)
+        except TypeError: # Unhashable cell values
+            row_hashes = pd.util.hash_pandas_object(df.astype(str), index=False)
+        digest.update(row_hashes.to_numpy().tobytes())
+    return digest.hexdigest()
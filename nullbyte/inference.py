@@ -0,0 +1,334 @@
+"""
+Field-name schema inference shared by prompt parsing, the rename form,
+generate_value and the Smart Schema Editor.
+
+Every keyword the rules test for is compiled into one KeywordMatcher, so a
+name is scanned once and each rule is a set lookup on the keywords found.
+Results are memoized per normalized name, and names that match nothing are
+retried once after fuzzy token correction ("custmer_emial" -> "customer_email").
+"""
+import random
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+from nullbyte.catalog import (
+    BLOOD_TYPES_LIST, BOOLEAN_REPRESENTATIONS_LIST, CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP,
+    FIELD_SYNONYM_TO_CANONICAL_MAP,
+)
+from nullbyte.matcher import SYNONYM_MATCHER, KeywordMatcher
+
+INFERENCE_CACHE_SIZE = 4096 # Distinct field names memoized per process
+
+# --- Keyword groups used by the inference rules (order of the rules matters, see _apply_keyword_rules) ---
+DATE_KEYWORDS = ("date", "time", "timestamp", "dob", "joining", "day", "month", "year_of_birth", "birth_date") # "year" is too generic alone
+BIRTH_DATE_KEYWORDS = ("dob", "birth_date", "year_of_birth")
+JOINING_DATE_KEYWORDS = ("joining", "hire_date")
+INT_KEYWORDS = ("id", "count", "age", "quantity", "salary", "year", "number", "level", "amount", "total", "seq", "num", "digit", "numeric", "integer", "score_value", "points")
+MONEY_INT_KEYWORDS = ("salary", "amount", "total", "revenue", "income")
+QUANTITY_KEYWORDS = ("quantity", "count", "stock", "inventory")
+LEVEL_KEYWORDS = ("level", "rank", "grade_numeric")
+POINTS_KEYWORDS = ("score_value", "points")
+FLOAT_KEYWORDS = ("rate", "percent", "ratio", "score_decimal", "efficiency", "integrity", "price", "value", "balance", "temp", "humidity", "factor", "decimal", "float", "measurement", "latitude", "longitude", "coordinate")
+MONEY_FLOAT_KEYWORDS = ("price", "value", "balance", "cost")
+PROPORTION_KEYWORDS = ("rate", "percent", "ratio", "factor", "coefficient")
+PHONE_KEYWORDS = ("phone", "mobile", "contact number")
+ADDRESS_KEYWORDS = ("address", "location", "city", "state", "country", "pincode", "zipcode", "street", "area", "place")
+POSTCODE_KEYWORDS = ("pincode", "zipcode")
+NON_PERSON_NAME_KEYWORDS = ("user_name", "company_name", "product_name", "brand_name", "model_name", "sensor_name", "item_name", "file_name", "column_name", "field_name", "campaign_name", "project_name", "program_name", "course_name", "animal_name", "login_name", "screen_name", "domain_name", "event_name", "team_name", "group_name", "font_name", "color_name", "style_name")
+PERSON_NAME_FIELDS = ("person_name", "full_name", "customer_name", "employee_name", "student_name", "doctor_name", "author_name", "contact_name")
+CATEGORY_KEYWORDS = ("type", "category", "kind", "class", "group", "segment", "tier")
+URL_KEYWORDS = ("url", "website", "link", "webpage", "site")
+COLOR_KEYWORDS = ("color", "colour")
+JOB_KEYWORDS = ("job", "position", "role", "occupation", "designation")
+COMPANY_KEYWORDS = ("company", "organization", "employer", "firm", "business", "vendor", "supplier", "client_company")
+CAR_HINT_KEYWORDS = ("dream", "favorite", "model", "type")
+FESTIVAL_HINT_KEYWORDS = ("favorite", "preferred")
+PREFERENCE_KEYWORDS = ("favorite", "dream", "preference", "choice", "opinion", "hobby", "interest", "skill")
+CODE_KEYWORDS = ("code", "key", "token", "serial_no", "reference_id", "identifier_code", "tracking_id", "item_code", "product_code", "user_token", "api_key_value")
+NON_CODE_KEYWORDS = ("currency", "country_code", "zip_code", "area_code", "ifsc_code", "promo_code", "discount_code") # Already specific types
+
+# Business/tech refinements applied by generate_value on top of the inferred schema
+BUSINESS_MONEY_KEYWORDS = ("revenue", "income", "price", "cost", "amount", "value")
+API_KEYWORDS = ("api", "endpoint", "url", "path")
+VERSION_KEYWORDS = ("version", "release")
+ENVIRONMENT_KEYWORDS = ("environment", "env")
+ANALYTICS_RATE_KEYWORDS = ("rate", "percentage", "ratio")
+DURATION_KEYWORDS = ("duration", "time")
+
+_SINGLE_KEYWORDS = (
+    "age", "year", "temp", "humidity", "latitude", "longitude", "email", "city", "state", "country", "name",
+    "gender", "status", "flag", "ip_address", "animal", "car", "festival", "birthstone", "zodiac", "sign",
+    "blood", "group", "rate", "percentage", "millisecond", "second",
+)
+RULE_KEYWORD_MATCHER = KeywordMatcher(
+    kw for group in (
+        DATE_KEYWORDS, BIRTH_DATE_KEYWORDS, JOINING_DATE_KEYWORDS, INT_KEYWORDS, MONEY_INT_KEYWORDS, QUANTITY_KEYWORDS,
+        LEVEL_KEYWORDS, POINTS_KEYWORDS, FLOAT_KEYWORDS, MONEY_FLOAT_KEYWORDS, PROPORTION_KEYWORDS, PHONE_KEYWORDS,
+        ADDRESS_KEYWORDS, POSTCODE_KEYWORDS, NON_PERSON_NAME_KEYWORDS, CATEGORY_KEYWORDS, URL_KEYWORDS, COLOR_KEYWORDS,
+        JOB_KEYWORDS, COMPANY_KEYWORDS, CAR_HINT_KEYWORDS, FESTIVAL_HINT_KEYWORDS, PREFERENCE_KEYWORDS, CODE_KEYWORDS,
+        NON_CODE_KEYWORDS, BUSINESS_MONEY_KEYWORDS, API_KEYWORDS, VERSION_KEYWORDS, ENVIRONMENT_KEYWORDS,
+        ANALYTICS_RATE_KEYWORDS, DURATION_KEYWORDS, _SINGLE_KEYWORDS,
+    ) for kw in group
+)
+
+
+def _any(hits, keywords):
+    return not hits.isdisjoint(keywords)
+
+
+def _keyword_hits(field_lower):
+    """Set of rule keywords contained in `field_lower` (one matcher pass)."""
+    return {keyword for _, _, keyword in RULE_KEYWORD_MATCHER.iter_matches(field_lower)}
+
+
+def _match_canonical(field_lower, allow_partial_synonym):
+    """Canonical key for a name: exact canonical, exact synonym, then (optionally) the longest contained synonym."""
+    normalized_field_name = field_lower.replace(" ", "_")
+    if normalized_field_name in CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP:
+        return normalized_field_name
+    potential_canonical = FIELD_SYNONYM_TO_CANONICAL_MAP.get(normalized_field_name)
+    if potential_canonical in CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP:
+        return potential_canonical
+    if allow_partial_synonym:
+        synonym = SYNONYM_MATCHER.best_match(field_lower, accept=lambda syn: FIELD_SYNONYM_TO_CANONICAL_MAP[syn] in CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP)
+        if synonym:
+            return FIELD_SYNONYM_TO_CANONICAL_MAP[synonym]
+    return None
+
+
+def _apply_keyword_rules(field_schema, field_lower, display_name):
+    """Applies the general inference rules in priority order. Returns False if no rule matched."""
+    hits = _keyword_hits(field_lower)
+    if _any(hits, DATE_KEYWORDS):
+        field_schema["type"] = "date"
+        # More specific date constraints
+        if _any(hits, BIRTH_DATE_KEYWORDS):
+            start_def = datetime.now() - timedelta(days=365*70) # Up to 70 years ago
+            end_def = datetime.now() - timedelta(days=365*18)   # At least 18 years ago
+        elif _any(hits, JOINING_DATE_KEYWORDS):
+            start_def = datetime.now() - timedelta(days=365*10) # Up to 10 years ago
+            end_def = datetime.now()
+        else: # Generic date
+            start_def = datetime.now() - timedelta(days=365)
+            end_def = datetime.now()
+        field_schema["constraint"] = f"{start_def.strftime('%Y-%m-%d')} - {end_def.strftime('%Y-%m-%d')}"
+    elif _any(hits, INT_KEYWORDS):
+        field_schema["type"] = "int"
+        if "age" in hits: field_schema["constraint"] = "18-80"
+        elif "year" in hits and "year_of_birth" not in hits: field_schema["constraint"] = f"{datetime.now().year - 10}-{datetime.now().year}" # For general year fields
+        elif _any(hits, MONEY_INT_KEYWORDS): field_schema["constraint"] = "1000-100000"
+        elif _any(hits, QUANTITY_KEYWORDS): field_schema["constraint"] = "1-100"
+        elif _any(hits, LEVEL_KEYWORDS): field_schema["constraint"] = "1-10"
+        elif _any(hits, POINTS_KEYWORDS): field_schema["constraint"] = "0-100"
+        else: field_schema["constraint"] = "0-1000"
+    elif _any(hits, FLOAT_KEYWORDS):
+        field_schema["type"] = "float"
+        if _any(hits, MONEY_FLOAT_KEYWORDS): field_schema["constraint"] = "0.0-1000.0"
+        elif _any(hits, PROPORTION_KEYWORDS): field_schema["constraint"] = "0.0-1.0" # Often proportions
+        elif "temp" in hits: field_schema["constraint"] = "-10.0-40.0"
+        elif "humidity" in hits: field_schema["constraint"] = "0.0-100.0"
+        elif "latitude" in hits: field_schema["constraint"] = "-90.0-90.0"
+        elif "longitude" in hits: field_schema["constraint"] = "-180.0-180.0"
+        else: field_schema["constraint"] = "0.0-100.0"
+    elif "email" in hits: field_schema["type"] = "email"
+    elif _any(hits, PHONE_KEYWORDS): field_schema["type"] = "phone"
+    elif _any(hits, ADDRESS_KEYWORDS):
+        field_schema["type"] = "address" # Generic address type
+        if "city" in hits: field_schema["is_faker_city"] = True
+        elif "state" in hits: field_schema["is_faker_state"] = True
+        elif "country" in hits: field_schema["is_faker_country"] = True
+        elif _any(hits, POSTCODE_KEYWORDS): field_schema["is_faker_postcode"] = True
+    # More specific name checks to avoid overly broad matching
+    elif ("name" in hits and not _any(hits, NON_PERSON_NAME_KEYWORDS)) or field_lower in PERSON_NAME_FIELDS:
+        field_schema["type"] = "name"
+    elif "gender" in hits:
+        field_schema["type"] = "category"; field_schema["constraint"] = "Male,Female,Other,Prefer not to say"
+    elif "status" in hits:
+        field_schema["type"] = "category"; field_schema["constraint"] = "Active,Inactive,Pending,Completed,Cancelled,Open,Closed,Resolved,Shipped,Delivered"
+    elif _any(hits, CATEGORY_KEYWORDS):
+        field_schema["type"] = "category"; field_schema["constraint"] = "Type A,Type B,Type C,Type D" # Generic categories
+    elif "flag" in hits or field_lower.startswith(("is_", "has_")) or field_lower.endswith(("_enabled", "_available")):
+        field_schema["type"] = "category"; field_schema["_pick_boolean_representation"] = True # Chosen per call, see infer_field_schema_from_name
+    elif _any(hits, URL_KEYWORDS):
+        field_schema["type"] = "string"; field_schema["is_faker_url"] = True
+    elif "ip_address" in hits or field_lower == "ip":
+        field_schema["type"] = "string"; field_schema["is_faker_ipv4"] = True
+    elif _any(hits, COLOR_KEYWORDS):
+        field_schema["type"] = "string"; field_schema["is_faker_color_name"] = True
+    elif _any(hits, JOB_KEYWORDS):
+        field_schema["type"] = "string"; field_schema["is_faker_job"] = True
+    elif _any(hits, COMPANY_KEYWORDS):
+        field_schema["type"] = "string"; field_schema["is_faker_company"] = True
+    elif "animal" in hits and "name" in hits: field_schema["type"] = "animal_name" # More specific
+    elif "car" in hits and _any(hits, CAR_HINT_KEYWORDS): field_schema["type"] = "string"; field_schema["_hint_vehicle"] = True
+    elif "festival" in hits and _any(hits, FESTIVAL_HINT_KEYWORDS): field_schema["type"] = "string"; field_schema["_hint_event_name"] = True
+    elif "birthstone" in hits:
+        field_schema["type"] = "category"; field_schema["constraint"] = "Garnet,Amethyst,Aquamarine,Diamond,Emerald,Pearl,Ruby,Peridot,Sapphire,Opal,Topaz,Turquoise"
+    elif "zodiac" in hits and ("sign" in hits or field_lower == "zodiac_sign"):
+        field_schema["type"] = "category"; field_schema["constraint"] = "Aries,Taurus,Gemini,Cancer,Leo,Virgo,Libra,Scorpio,Sagittarius,Capricorn,Aquarius,Pisces"
+    elif "blood" in hits and ("group" in hits or "type" in hits):
+        field_schema["type"] = "category"; field_schema["constraint"] = ",".join(BLOOD_TYPES_LIST)
+    elif _any(hits, PREFERENCE_KEYWORDS): # For general preference-like text
+        field_schema["type"] = "string"; field_schema["_hint_short_phrase"] = True
+    # Infer alphanumeric ID for novel fields that look like codes/keys but weren't caught by canonicals
+    elif _any(hits, CODE_KEYWORDS) and not _any(hits, NON_CODE_KEYWORDS):
+        field_schema["_is_inferred_alphanum_id"] = True
+        # Try to make a somewhat meaningful prefix from the display name
+        prefix_candidate = "".join(filter(str.isalnum, display_name.replace(" ", "")))
+        field_schema["_inferred_prefix"] = prefix_candidate.upper()[:min(len(prefix_candidate), 4)] + "-" if prefix_candidate else "ID-"
+    else:
+        return False
+    return True
+
+
+def _infer_from_name(field_lower, display_name, default_pii_strategy, allow_partial_synonym):
+    """One inference attempt for a lowercased name; None if neither a canonical field nor a rule matched."""
+    field_schema = {
+        "name": display_name,
+        "type": "string",  # Default type
+        "constraint": "",
+        "pii_handling": default_pii_strategy,
+        # Store a normalized version for internal use or as a fallback canonical key
+        "_original_canonical": field_lower.replace(" ", "_")
+    }
+    canonical_match = _match_canonical(field_lower, allow_partial_synonym)
+    if canonical_match:
+        field_schema.update(CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP[canonical_match])
+        field_schema["name"] = display_name # Ensure original name (title cased) is used for display
+        field_schema["_original_canonical"] = canonical_match # Store the matched canonical key
+        return field_schema
+    return field_schema if _apply_keyword_rules(field_schema, field_lower, display_name) else None
+
+
+# --- Fuzzy correction of near-miss tokens ("custmer" -> "customer") ---
+def _trigrams(token):
+    padded = f"${token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@lru_cache(maxsize=1)
+def _fuzzy_vocabulary():
+    """(known tokens, trigram -> tokens inverted index) over synonym, canonical and rule keyword tokens."""
+    tokens = set()
+    for phrase in list(FIELD_SYNONYM_TO_CANONICAL_MAP) + list(CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP) + RULE_KEYWORD_MATCHER.keywords:
+        tokens.update(t for t in phrase.replace("_", " ").split() if len(t) >= 3)
+    index = {}
+    for token in tokens:
+        for gram in _trigrams(token):
+            index.setdefault(gram, []).append(token)
+    return tokens, index
+
+
+def _edit_distance(a, b, limit):
+    """Optimal string alignment distance (adjacent transpositions count as one edit), capped at limit + 1."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2, prev = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        prev2, prev = prev, cur
+    return prev[len(b)]
+
+
+def _correct_token(token):
+    """Closest known token within 1 edit (2 for tokens of 8+ chars), or the token itself."""
+    tokens, index = _fuzzy_vocabulary()
+    if len(token) < 4 or token in tokens:
+        return token
+    limit = 2 if len(token) >= 8 else 1
+    shared = {}
+    for gram in _trigrams(token):
+        for candidate in index.get(gram, ()):
+            shared[candidate] = shared.get(candidate, 0) + 1
+    best, best_key = token, None
+    for candidate, overlap in shared.items():
+        distance = _edit_distance(token, candidate, limit)
+        if distance <= limit:
+            key = (distance, -overlap, candidate)
+            if best_key is None or key < best_key:
+                best, best_key = candidate, key
+    return best
+
+
+def correct_field_name(field_lower):
+    """Replaces near-miss tokens of a lowercased field name with known vocabulary tokens."""
+    separator = "_" if "_" in field_lower else " "
+    return separator.join(_correct_token(t) for t in field_lower.replace("_", " ").split())
+
+
+@lru_cache(maxsize=INFERENCE_CACHE_SIZE)
+def _infer_schema_template(field_lower, default_pii_strategy, allow_partial_synonym, today):
+    """Memoized inference; `today` is part of the key so relative date ranges roll over daily."""
+    display_name = field_lower.replace("_", " ").title()
+    field_schema = _infer_from_name(field_lower, display_name, default_pii_strategy, allow_partial_synonym)
+    if field_schema is None:
+        corrected = correct_field_name(field_lower)
+        if corrected != field_lower:
+            field_schema = _infer_from_name(corrected, display_name, default_pii_strategy, allow_partial_synonym)
+            if field_schema is not None and field_schema["_original_canonical"] not in CANONICAL_FIELD_TO_SCHEMA_DETAILS_MAP:
+                field_schema["_original_canonical"] = field_lower.replace(" ", "_") # Keep the user's name unless a canonical field matched
+    if field_schema is None:
+        field_schema = {"name": display_name, "type": "string", "constraint": "", "pii_handling": default_pii_strategy,
+                        "_original_canonical": field_lower.replace(" ", "_")}
+    return field_schema
+
+
+def infer_field_schema_from_name(field_name_str, default_pii_strategy="realistic_fake", allow_partial_synonym=False):
+    """
+    Infers a basic field schema (type, constraint, etc.) from a field name string.
+    With allow_partial_synonym, a synonym contained in the name (e.g. "customer email id") also counts.
+    Returns a new dict the caller may modify.
+    """
+    field_schema = dict(_infer_schema_template(str(field_name_str).strip().lower(), default_pii_strategy, allow_partial_synonym, date.today()))
+    if field_schema.pop("_pick_boolean_representation", False):
+        field_schema["constraint"] = random.choice(BOOLEAN_REPRESENTATIONS_LIST)
+    if field_schema.get("_is_inferred_alphanum_id") and "length" not in field_schema:
+        field_schema["length"] = random.randint(6,12) # Default length for inferred IDs
+    return field_schema
+
+
+def infer_value_schema(field_name_str):
+    """
+    Schema used by generate_value: the inferred schema plus business, tech and
+    analytics refinements (prices, API paths, versions, rates, durations).
+    """
+    inferred_schema = infer_field_schema_from_name(field_name_str)
+    hits = _keyword_hits(str(field_name_str).lower())
+
+    # Business/Finance specific enhancements
+    if _any(hits, BUSINESS_MONEY_KEYWORDS):
+        inferred_schema["type"] = "float"
+        if "rate" in hits or "percentage" in hits:
+            inferred_schema["constraint"] = "0.0-1.0"  # Represent as decimal
+        else:
+            inferred_schema["constraint"] = "10.0-10000.0"  # Business-appropriate range
+    # Tech/SaaS specific enhancements
+    elif _any(hits, API_KEYWORDS):
+        inferred_schema["type"] = "string"
+        inferred_schema["_hint_api_path"] = True
+    elif _any(hits, VERSION_KEYWORDS):
+        inferred_schema["type"] = "string"
+        inferred_schema["_hint_version"] = True
+    elif _any(hits, ENVIRONMENT_KEYWORDS):
+        inferred_schema["type"] = "category"
+        inferred_schema["constraint"] = "development,staging,production"
+    # Analytics specific enhancements
+    elif _any(hits, ANALYTICS_RATE_KEYWORDS):
+        inferred_schema["type"] = "float"
+        inferred_schema["constraint"] = "0.0-1.0"
+    elif _any(hits, DURATION_KEYWORDS):
+        if "millisecond" in hits:
+            inferred_schema["type"] = "float"
+            inferred_schema["constraint"] = "0.0-1000.0"
+        elif "second" in hits:
+            inferred_schema["type"] = "float"
+            inferred_schema["constraint"] = "0.0-60.0"
+        else:
+            inferred_schema["type"] = "int"
+            inferred_schema["constraint"] = "0-3600"
+    return inferred_schema
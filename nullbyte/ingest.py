@@ -0,0 +1,401 @@
+"""
+Chunked, typed ingestion of CSV / XLSX reference data.
+
+Files are read in chunks. CSV uses the pyarrow streaming reader, XLSX uses
+openpyxl in read-only mode. Column types are inferred once from a sample and
+then enforced on every chunk. When a later chunk does not fit (e.g. text in a
+column that looked numeric), that column is widened and the read restarts.
+While streaming, a DatasetProfile (counts, min/max, mean/variance, category
+frequencies) and a uniform row reservoir are built incrementally. Files up to
+NULLBYTE_INGEST_MAX_ROWS rows are kept whole; larger ones are represented by
+the reservoir sample plus the exact full-file profile.
+
+Sources are an uploaded file (file-like) or a local path, so multi-GB
+extracts can bypass the browser upload limit. Local paths must resolve inside
+NULLBYTE_LOCAL_DATA_DIR (default: ./data).
+"""
+import io
+import os
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+from nullbyte.dtypes import compact_dataframe
+
+CSV_BLOCK_SIZE = 16 * 1024 * 1024 # Bytes per CSV chunk
+CSV_SAMPLE_BYTES = 4 * 1024 * 1024 # Head of the file used for type inference
+EXCEL_CHUNK_ROWS = 50_000
+EXCEL_SAMPLE_ROWS = 10_000
+MAX_TRACKED_CATEGORIES = 10_000 # Per column; beyond this the column is treated as high-cardinality
+DICTIONARY_MAX_RATIO = 0.5 # Sample columns with at most this share of distinct strings are read dictionary-encoded
+DICTIONARY_MAX_UNIQUE = 1000
+LOCAL_DATA_DIR_ENV = "NULLBYTE_LOCAL_DATA_DIR"
+DEFAULT_LOCAL_DATA_DIR = "data"
+
+_CSV_COLUMN_ERROR = re.compile(r"In CSV column #(\d+).*?invalid value '(.*)'", re.DOTALL)
+_DICT_STRING = pa.dictionary(pa.int32(), pa.string())
+
+
+class IngestError(Exception):
+    """Raised for sources that cannot be read (bad path, unsupported format, ...)."""
+
+
+def max_rows_in_memory():
+    try:
+        return int(os.environ.get("NULLBYTE_INGEST_MAX_ROWS", 1_000_000))
+    except ValueError:
+        return 1_000_000
+
+
+def resolve_local_path(path_str):
+    """Resolves a user-entered path; it must be an existing CSV/XLSX file inside the local data directory."""
+    root = Path(os.environ.get(LOCAL_DATA_DIR_ENV, DEFAULT_LOCAL_DATA_DIR)).expanduser().resolve()
+    candidate = Path(path_str).expanduser()
+    path = (candidate if candidate.is_absolute() else root / candidate).resolve()
+    if root != path and root not in path.parents:
+        raise IngestError(f"Local files must be inside {root} (set {LOCAL_DATA_DIR_ENV} to change it).")
+    if not path.is_file():
+        raise IngestError(f"File not found: {path}")
+    if path.suffix.lower() not in (".csv", ".xlsx"):
+        raise IngestError("Only .csv and .xlsx files are supported.")
+    return path
+
+
+# --- Incremental profile ---
+class ColumnProfile:
+    """Running statistics for one column, merged chunk by chunk."""
+
+    def __init__(self, name, arrow_type):
+        self.name = name
+        self.arrow_type = arrow_type
+        self.count = 0 # Non-null values
+        self.nulls = 0
+        self.min = None
+        self.max = None
+        self.mean = 0.0
+        self.m2 = 0.0 # Sum of squared deviations (Chan et al. parallel merge)
+        self.category_counts = {}
+        self.high_cardinality = False
+
+    @property
+    def is_numeric(self):
+        return pa.types.is_integer(self.arrow_type) or pa.types.is_floating(self.arrow_type)
+
+    @property
+    def is_integer(self):
+        return pa.types.is_integer(self.arrow_type)
+
+    @property
+    def is_categorical(self):
+        return (pa.types.is_string(self.arrow_type) or pa.types.is_dictionary(self.arrow_type)
+                or pa.types.is_boolean(self.arrow_type))
+
+    @property
+    def std(self):
+        return (self.m2 / self.count) ** 0.5 if self.count else None
+
+    def update(self, column):
+        n = len(column) - column.null_count
+        self.nulls += column.null_count
+        if n == 0:
+            return
+        if self.is_numeric or pa.types.is_temporal(self.arrow_type):
+            bounds = pc.min_max(column)
+            low, high = bounds["min"].as_py(), bounds["max"].as_py()
+            self.min = low if self.min is None else min(self.min, low)
+            self.max = high if self.max is None else max(self.max, high)
+        if self.is_numeric:
+            chunk_mean = pc.mean(column).as_py()
+            chunk_m2 = pc.variance(column, ddof=0).as_py() * n
+            delta = chunk_mean - self.mean
+            total = self.count + n
+            self.mean += delta * n / total
+            self.m2 += chunk_m2 + delta * delta * self.count * n / total
+        elif self.is_categorical and not self.high_cardinality:
+            counts = pc.value_counts(column)
+            for value, count in zip(counts.field("values").to_pylist(), counts.field("counts").to_pylist()):
+                if value is None:
+                    continue
+                self.category_counts[value] = self.category_counts.get(value, 0) + count
+            if len(self.category_counts) > MAX_TRACKED_CATEGORIES:
+                self.high_cardinality = True
+                self.category_counts = {}
+        self.count += n
+
+    def category_distribution(self):
+        """(values, probabilities) over the full file, or None if not tracked."""
+        if not self.category_counts:
+            return None
+        values = list(self.category_counts)
+        counts = np.array([self.category_counts[v] for v in values], dtype=float)
+        return values, counts / counts.sum()
+
+
+class DatasetProfile:
+    """Full-file profile: row count, chunk count and a ColumnProfile per column."""
+
+    def __init__(self, schema):
+        self.rows = 0
+        self.chunks = 0
+        self.columns = {field.name: ColumnProfile(field.name, field.type) for field in schema}
+
+    def update(self, table):
+        self.rows += table.num_rows
+        self.chunks += 1
+        for name in table.column_names:
+            self.columns[name].update(table.column(name))
+
+    def numeric_range(self, column_name):
+        col = self.columns.get(column_name)
+        if col is None or not col.is_numeric or col.min is None:
+            return None
+        return col.min, col.max
+
+    def category_distribution(self, column_name):
+        col = self.columns.get(column_name)
+        return col.category_distribution() if col is not None else None
+
+
+class _Reservoir:
+    """Uniform sample of k rows without replacement (bottom-k of random keys), in original row order."""
+
+    def __init__(self, k, seed=None):
+        self.k = k
+        self.rng = np.random.default_rng(seed)
+        self.table = None
+        self.keys = np.empty(0)
+        self.positions = np.empty(0, dtype=np.int64)
+
+    def update(self, table, offset):
+        keys = self.rng.random(table.num_rows)
+        positions = np.arange(offset, offset + table.num_rows, dtype=np.int64)
+        if self.table is not None:
+            table = pa.concat_tables([self.table, table])
+            keys = np.concatenate([self.keys, keys])
+            positions = np.concatenate([self.positions, positions])
+        if table.num_rows > self.k:
+            keep = np.sort(np.argpartition(keys, self.k)[:self.k])
+            table, keys, positions = table.take(pa.array(keep)), keys[keep], positions[keep]
+        self.table, self.keys, self.positions = table, keys, positions
+
+    def result(self):
+        order = np.argsort(self.positions, kind="stable")
+        return self.table.take(pa.array(order))
+
+
+class IngestResult:
+    def __init__(self, frame, profile, sampled, source_name):
+        self.frame = frame # Whole file, or a uniform row sample when `sampled`
+        self.profile = profile # Exact over the whole file
+        self.sampled = sampled
+        self.source_name = source_name
+
+
+# --- Type inference ---
+def _settle_type(arrow_type, sample_column):
+    if pa.types.is_null(arrow_type):
+        return pa.string()
+    if pa.types.is_integer(arrow_type):
+        return pa.int64()
+    if pa.types.is_floating(arrow_type):
+        return pa.float64()
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        n = len(sample_column) - sample_column.null_count
+        n_unique = len(pc.unique(sample_column.drop_null()))
+        if n and n_unique <= DICTIONARY_MAX_UNIQUE and n_unique <= DICTIONARY_MAX_RATIO * n:
+            return _DICT_STRING
+        return pa.string()
+    return arrow_type
+
+
+def _widen(arrow_type, offending_value=None):
+    """int64 -> float64 (if the offending value is numeric) -> string; everything else -> string."""
+    if pa.types.is_integer(arrow_type) and offending_value is not None:
+        try:
+            float(offending_value)
+            return pa.float64()
+        except ValueError:
+            pass
+    return pa.string()
+
+
+def _csv_head(source):
+    """The first CSV_SAMPLE_BYTES, cut at the last complete line."""
+    if isinstance(source, Path):
+        with open(source, "rb") as f:
+            head = f.read(CSV_SAMPLE_BYTES)
+        complete = os.path.getsize(source) <= CSV_SAMPLE_BYTES
+    else:
+        head = source[:CSV_SAMPLE_BYTES].to_pybytes()
+        complete = source.size <= CSV_SAMPLE_BYTES
+    if not complete and b"\n" in head:
+        head = head[:head.rindex(b"\n") + 1]
+    return head
+
+
+def _infer_csv_types(source):
+    sample = pacsv.read_csv(pa.BufferReader(_csv_head(source)))
+    return {field.name: _settle_type(field.type, sample.column(field.name)) for field in sample.schema}
+
+
+def _excel_value_type(values):
+    present = [v for v in values if v is not None]
+    if not present:
+        return pa.string()
+    if all(isinstance(v, bool) for v in present):
+        return pa.bool_()
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in present):
+        return pa.int64()
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        return pa.float64()
+    if all(hasattr(v, "year") and hasattr(v, "hour") for v in present):
+        return pa.timestamp("us")
+    strings = pa.array([str(v) for v in present])
+    return _settle_type(pa.string(), strings)
+
+
+# --- Chunk readers (yield pa.Table chunks with the given column types) ---
+class _WidenColumn(Exception):
+    def __init__(self, name, value=None):
+        self.name = name
+        self.value = value
+
+
+def _widen_on_conversion_error(error, names):
+    """Turns a pyarrow CSV conversion error into _WidenColumn for the offending column."""
+    match = _CSV_COLUMN_ERROR.search(str(error))
+    if not match:
+        raise error
+    raise _WidenColumn(names[int(match.group(1))], match.group(2)) from error
+
+
+def _iter_csv(source, column_types):
+    reader_source = pa.memory_map(str(source), "r") if isinstance(source, Path) else pa.BufferReader(source)
+    names = list(column_types)
+    try: # open_csv already converts the first block
+        reader = pacsv.open_csv(
+            reader_source,
+            read_options=pacsv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+            convert_options=pacsv.ConvertOptions(column_types=column_types, strings_can_be_null=True),
+        )
+    except pa.ArrowInvalid as e:
+        _widen_on_conversion_error(e, names)
+    while True:
+        try:
+            batch = reader.read_next_batch()
+        except StopIteration:
+            return
+        except pa.ArrowInvalid as e:
+            _widen_on_conversion_error(e, names)
+        yield pa.Table.from_batches([batch])
+
+
+def _excel_rows(source):
+    import openpyxl
+    workbook = openpyxl.load_workbook(source if isinstance(source, Path) else io.BytesIO(source.to_pybytes()),
+                                      read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        names = [str(h) if h is not None else f"Unnamed: {i}" for i, h in enumerate(header)]
+        yield names
+        for row in rows:
+            if any(v is not None for v in row):
+                yield row
+    finally:
+        workbook.close()
+
+
+def _excel_chunks(source, chunk_rows):
+    """Yields (names, [row tuples]) chunks."""
+    rows = _excel_rows(source)
+    names = next(rows, None)
+    if names is None:
+        return
+    chunk = []
+    for row in rows:
+        chunk.append(tuple(row[:len(names)]) + (None,) * (len(names) - len(row)))
+        if len(chunk) >= chunk_rows:
+            yield names, chunk
+            chunk = []
+    if chunk:
+        yield names, chunk
+
+
+def _infer_excel_types(source):
+    for names, rows in _excel_chunks(source, EXCEL_SAMPLE_ROWS):
+        columns = list(zip(*rows))
+        return {name: _excel_value_type(values) for name, values in zip(names, columns)}
+    raise IngestError("The Excel sheet is empty.")
+
+
+def _iter_excel(source, column_types):
+    for names, rows in _excel_chunks(source, EXCEL_CHUNK_ROWS):
+        arrays = []
+        for name, values in zip(names, zip(*rows)):
+            arrow_type = column_types[name]
+            try:
+                if pa.types.is_string(arrow_type) or pa.types.is_dictionary(arrow_type):
+                    array = pa.array([None if v is None else str(v) for v in values], type=pa.string())
+                    array = array.dictionary_encode() if pa.types.is_dictionary(arrow_type) else array
+                else:
+                    array = pa.array(values, type=arrow_type)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, OverflowError) as e:
+                raise _WidenColumn(name) from e
+            arrays.append(array)
+        yield pa.Table.from_arrays(arrays, names=names)
+
+
+# --- Entry point ---
+def ingest_table(source, name, max_rows=None, seed=None, progress=None):
+    """
+    Reads an uploaded file (bytes / file-like) or a local Path in chunks.
+    `progress(rows_read)` is called after every chunk.
+    """
+    max_rows = max_rows or max_rows_in_memory()
+    is_excel = name.lower().endswith(".xlsx")
+    if not isinstance(source, Path):
+        source = pa.py_buffer(source.getvalue() if hasattr(source, "getvalue") else source)
+    column_types = _infer_excel_types(source) if is_excel else _infer_csv_types(source)
+    read_chunks = _iter_excel if is_excel else _iter_csv
+
+    while True: # Restarted when a column has to be widened
+        schema = pa.schema([(n, t) for n, t in column_types.items()])
+        profile = DatasetProfile(schema)
+        reservoir = None # Started once the file outgrows max_rows
+        kept = [] # All chunks, while the file still fits in max_rows
+        try:
+            for table in read_chunks(source, column_types):
+                if kept is not None and profile.rows + table.num_rows > max_rows:
+                    reservoir = _Reservoir(max_rows, seed)
+                    offset = 0
+                    for earlier in kept:
+                        reservoir.update(earlier, offset)
+                        offset += earlier.num_rows
+                    kept = None
+                if reservoir is not None:
+                    reservoir.update(table, profile.rows)
+                else:
+                    kept.append(table)
+                profile.update(table)
+                if progress:
+                    progress(profile.rows)
+        except _WidenColumn as widen:
+            column_types[widen.name] = _widen(column_types[widen.name], widen.value)
+            continue
+        break
+
+    sampled = kept is None
+    if sampled:
+        table = reservoir.result()
+    else:
+        table = pa.concat_tables(kept) if kept else schema.empty_table()
+    frame = table.unify_dictionaries().combine_chunks().to_pandas(types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get)
+    return IngestResult(compact_dataframe(frame), profile, sampled, name)
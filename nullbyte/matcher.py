@@ -0,0 +1,76 @@
+"""
+Multi-pattern keyword matching (Aho-Corasick) for prompt parsing.
+
+The synonym and domain-keyword vocabularies are compiled into one automaton
+each, once per process, so matching a prompt or field name is a single pass
+over the text instead of a substring scan per keyword.
+"""
+from collections import deque
+
+from nullbyte.catalog import DOMAIN_PROMPT_TO_SCHEMA_MAP, FIELD_SYNONYM_TO_CANONICAL_MAP
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a fixed keyword list.
+    Keywords are ranked like `sorted(keywords, key=len, reverse=True)`: longer
+    first, ties in insertion order, so results match the old sorted scans.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(keywords)) # De-duplicate, keep order
+        ranked = sorted(range(len(self.keywords)), key=lambda i: -len(self.keywords[i]))
+        self._rank = {self.keywords[i]: r for r, i in enumerate(ranked)}
+
+        self._goto = [{}] # state -> {char: next_state}
+        self._fail = [0]
+        self._out = [[]] # state -> keywords ending here (incl. via fail links)
+        for keyword in self.keywords:
+            if not keyword:
+                continue
+            state = 0
+            for ch in keyword:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({}); self._fail.append(0); self._out.append([])
+                state = nxt
+            self._out[state].append(keyword)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text):
+        """Yields (start, end, keyword) for every keyword occurrence in `text`."""
+        state = 0
+        for end, ch in enumerate(text, start=1):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for keyword in self._out[state]:
+                yield end - len(keyword), end, keyword
+
+    def best_match(self, text, accept=None):
+        """
+        Returns the highest-ranked keyword found in `text` (longest first), or None.
+        `accept` optionally filters candidates, e.g. to skip already used fields.
+        """
+        best = None
+        for _, _, keyword in self.iter_matches(text):
+            if (best is None or self._rank[keyword] < self._rank[best]) and (accept is None or accept(keyword)):
+                best = keyword
+        return best
+
+
+# Built once per process at import time; the vocabularies are read-only.
+SYNONYM_MATCHER = KeywordMatcher(FIELD_SYNONYM_TO_CANONICAL_MAP.keys())
+DOMAIN_KEYWORD_MATCHER = KeywordMatcher(DOMAIN_PROMPT_TO_SCHEMA_MAP.keys())
@@ -0,0 +1,204 @@
+"""
+Machine-readable metrics for generation runs.
+
+Every finished run (prompt, Smart Schema Editor, Scenario Playground, or a
+library caller) produces one record: rows per table, bytes written, wall time
+per stage, peak RSS, worker count, seed and schema hash. Records are appended
+to a JSON-lines log and summarised into a Prometheus textfile-collector file
+that a local node exporter can scrape.
+
+Configuration (environment):
+  NULLBYTE_METRICS_DIR  output directory (default: ./metrics)
+  NULLBYTE_METRICS=0    disable metrics output
+"""
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import resource # POSIX only
+except ImportError:
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+METRICS_DIR_ENV = "NULLBYTE_METRICS_DIR"
+METRICS_ENABLED_ENV = "NULLBYTE_METRICS"
+DEFAULT_METRICS_DIR = "metrics"
+JSONL_FILE_NAME = "generation_runs.jsonl"
+PROMETHEUS_FILE_NAME = "nullbyte_generation.prom"
+STATE_FILE_NAME = ".nullbyte_generation_state.json" # Cumulative counters; not scraped (no .prom suffix)
+
+_write_lock = threading.Lock()
+
+
+def metrics_enabled():
+    return os.environ.get(METRICS_ENABLED_ENV, "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def metrics_dir():
+    return Path(os.environ.get(METRICS_DIR_ENV, DEFAULT_METRICS_DIR))
+
+
+def schema_hash(schema):
+    """Stable short hash of a schema (field list or {table: fields}); None if there is no schema."""
+    if not schema:
+        return None
+    payload = json.dumps(schema, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process, or None where the platform does not report it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024 # Linux reports KiB, macOS bytes
+
+
+def build_run_record(source, tables, profiler=None, seed=None, schema=None, bytes_written=None, workers=1):
+    """
+    Builds the metrics record of one run.
+    `tables` maps table name -> DataFrame (or row count); `bytes_written` maps
+    export format -> bytes. `seed` is the resolved seed the run drew from, so
+    the run can be reproduced; `workers` is the number of threads or
+    processes that generated the rows (1 for the row generators).
+    """
+    rows = {name: (int(t) if isinstance(t, int) else int(len(t))) for name, t in (tables or {}).items()}
+    bytes_written = {fmt: int(n) for fmt, n in (bytes_written or {}).items()}
+    stages = {name: round(v["seconds"], 6) for name, v in profiler.stages.items()} if profiler else {}
+    duration = profiler.total_seconds if profiler and profiler.total_seconds is not None else None
+    return {
+        "run_id": uuid.uuid4().hex,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "source": source,
+        "rows": rows,
+        "total_rows": sum(rows.values()),
+        "bytes_written": bytes_written,
+        "total_bytes_written": sum(bytes_written.values()),
+        "duration_seconds": round(duration, 6) if duration is not None else None,
+        "stage_seconds": stages,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "workers": workers,
+        "seed": seed,
+        "schema_hash": schema_hash(schema),
+    }
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels.items()) + "}"
+
+
+def render_prometheus(state):
+    """Renders cumulative counters and last-run gauges in the Prometheus text exposition format."""
+    metrics = [
+        ("nullbyte_generation_runs_total", "counter", "Generation runs completed.", []),
+        ("nullbyte_generation_rows_total", "counter", "Rows generated across all tables.", []),
+        ("nullbyte_generation_bytes_written_total", "counter", "Bytes produced by exports.", []),
+        ("nullbyte_generation_seconds_total", "counter", "Wall time spent generating.", []),
+        ("nullbyte_generation_last_duration_seconds", "gauge", "Wall time of the last run.", []),
+        ("nullbyte_generation_last_rows_per_second", "gauge", "Throughput of the last run.", []),
+        ("nullbyte_generation_last_table_rows", "gauge", "Rows per table in the last run.", []),
+        ("nullbyte_generation_last_stage_seconds", "gauge", "Wall time per stage in the last run.", []),
+        ("nullbyte_generation_last_peak_rss_bytes", "gauge", "Peak RSS of the process after the last run.", []),
+        ("nullbyte_generation_last_workers", "gauge", "Worker count of the last run.", []),
+        ("nullbyte_generation_last_run_timestamp_seconds", "gauge", "Unix time the last run finished.", []),
+    ]
+    samples = {name: lines for name, _, _, lines in metrics}
+    for source, s in sorted(state.get("sources", {}).items()):
+        samples["nullbyte_generation_runs_total"].append((_labels(source=source), s["runs"]))
+        samples["nullbyte_generation_rows_total"].append((_labels(source=source), s["rows"]))
+        samples["nullbyte_generation_bytes_written_total"].append((_labels(source=source), s["bytes"]))
+        samples["nullbyte_generation_seconds_total"].append((_labels(source=source), round(s["seconds"], 6)))
+        last = s["last"]
+        if last.get("duration_seconds") is not None:
+            samples["nullbyte_generation_last_duration_seconds"].append((_labels(source=source), last["duration_seconds"]))
+            if last["duration_seconds"] > 0:
+                samples["nullbyte_generation_last_rows_per_second"].append(
+                    (_labels(source=source), round(last["total_rows"] / last["duration_seconds"], 3)))
+        for table, n in sorted(last.get("rows", {}).items()):
+            samples["nullbyte_generation_last_table_rows"].append((_labels(source=source, table=table), n))
+        for stage, seconds in sorted(last.get("stage_seconds", {}).items()):
+            samples["nullbyte_generation_last_stage_seconds"].append((_labels(source=source, stage=stage), seconds))
+        if last.get("peak_rss_bytes") is not None:
+            samples["nullbyte_generation_last_peak_rss_bytes"].append((_labels(source=source), last["peak_rss_bytes"]))
+        samples["nullbyte_generation_last_workers"].append((_labels(source=source), last.get("workers", 1)))
+        samples["nullbyte_generation_last_run_timestamp_seconds"].append(
+            (_labels(source=source), int(datetime.fromisoformat(last["timestamp"]).timestamp())))
+
+    out = []
+    for name, metric_type, help_text, _ in metrics:
+        if not samples[name]:
+            continue
+        out.append(f"# HELP {name} {help_text}")
+        out.append(f"# TYPE {name} {metric_type}")
+        out.extend(f"{name}{labels} {value}" for labels, value in samples[name])
+    return "\n".join(out) + "\n"
+
+
+def _atomic_write(path, text):
+    """Write-then-rename so the node exporter never scrapes a half-written file."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def emit_run_record(record, directory=None):
+    """
+    Appends `record` to the JSON-lines log and refreshes the Prometheus textfile.
+    Returns the directory written to, or None if metrics are disabled or the
+    write failed (metrics never break a generation run).
+    """
+    if not metrics_enabled():
+        return None
+    directory = Path(directory) if directory else metrics_dir()
+    try:
+        with _write_lock:
+            directory.mkdir(parents=True, exist_ok=True)
+            with open(directory / JSONL_FILE_NAME, "a", encoding="utf-8") as log:
+                log.write(json.dumps(record, default=str) + "\n")
+
+            state_path = directory / STATE_FILE_NAME
+            try:
+                state = json.loads(state_path.read_text(encoding="utf-8"))
+            except (FileNotFoundError, ValueError):
+                state = {}
+            source = state.setdefault("sources", {}).setdefault(
+                record["source"], {"runs": 0, "rows": 0, "bytes": 0, "seconds": 0.0, "last": {}})
+            source["runs"] += 1
+            source["rows"] += record["total_rows"]
+            source["bytes"] += record["total_bytes_written"]
+            source["seconds"] += record["duration_seconds"] or 0.0
+            source["last"] = record
+            _atomic_write(state_path, json.dumps(state, default=str))
+            _atomic_write(directory / PROMETHEUS_FILE_NAME, render_prometheus(state))
+    except OSError as e:
+        logger.warning("Could not write generation metrics to %s: %s", directory, e)
+        return None
+    return directory
+
+
+def record_generation_run(source, tables, profiler=None, seed=None, schema=None, bytes_written=None, workers=1, directory=None):
+    """
+    Library entry point: builds and emits the record of one run.
+    With a profiler the record is emitted once per run, so callers may invoke
+    this on every Streamlit rerun that displays the result.
+    """
+    if profiler is not None:
+        if profiler.metrics_emitted:
+            return None
+        profiler.metrics_emitted = True
+    record = build_run_record(source, tables, profiler=profiler, seed=seed, schema=schema,
+                              bytes_written=bytes_written, workers=workers)
+    emit_run_record(record, directory=directory)
+    return record
@@ -0,0 +1,193 @@
+"""
+Content-based PII / DPDP detection for uploaded tables.
+
+Column names are not a reliable signal: "col_7" can hold Aadhaar numbers
+while "company" holds none. scan_frame() samples values of every text or
+integer column and searches them with ONE compiled alternation of Indian
+identifier patterns (Aadhaar, PAN, Voter ID / EPIC, IFSC, UPI ID, Indian
+mobile number, email) through a vectorized `.str.extract`.
+With `verify_checksums`, Aadhaar matches must pass the Verhoeff check and
+PAN's fourth character must be a valid holder type. Aadhaar-shaped values
+that fail the check are re-tried as mobile numbers, so 12-digit numbers with
+the 91 country code and no separator ("919876543210") are still found.
+
+Sampling is adaptive: each column is first scanned on INITIAL_SAMPLE_SIZE
+values and only extended, up to its share of SCAN_BUDGET_VALUES, if that
+first batch had hits. Wide, multi-GB files therefore cost a bounded number
+of regex evaluations. Reports are cached by dataset fingerprint; pass a
+stored one (DatasetStore.fingerprint) to skip hashing the frame.
+"""
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from nullbyte.fingerprint import frame_fingerprint
+
+INITIAL_SAMPLE_SIZE = 256
+MAX_SAMPLE_SIZE = 4096 # Per column
+SCAN_BUDGET_VALUES = 500_000 # Across all columns; wide tables get fewer values per column
+DETECTION_MIN_HIT_RATE = 0.05 # Share of scanned values that must match for a column to be flagged
+DETECTION_MIN_HITS = 3
+REPORT_CACHE_SIZE = 64
+
+# Order matters: at the same position the first alternative wins (email before UPI, Aadhaar before mobile)
+PII_PATTERNS = {
+    "email": r"[A-Z0-9._%+-]+@[A-Z0-9-]+(?:\.[A-Z0-9-]+)*\.[A-Z]{2,}",
+    "upi": r"[A-Z0-9._-]{2,256}@[A-Z][A-Z0-9]{1,63}(?![A-Z0-9.@-])",
+    "pan": r"(?<![A-Z0-9])[A-Z]{5}[0-9]{4}[A-Z](?![A-Z0-9])",
+    "ifsc": r"(?<![A-Z0-9])[A-Z]{4}0[A-Z0-9]{6}(?![A-Z0-9])",
+    "voter_id": r"(?<![A-Z0-9])[A-Z]{3}[0-9]{7}(?![A-Z0-9])",
+    "aadhaar": r"(?<![0-9])[0-9]{4}[ -]?[0-9]{4}[ -]?[0-9]{4}(?![0-9])",
+    "mobile": r"(?<![0-9+])(?:\+?91[ -]?|0)?[6-9][0-9]{4}[ -]?[0-9]{5}(?![0-9])",
+}
+PII_SCAN_PATTERN = re.compile("|".join(f"(?P<{kind}>{pattern})" for kind, pattern in PII_PATTERNS.items()), re.IGNORECASE)
+MOBILE_PATTERN = re.compile(PII_PATTERNS["mobile"])
+
+PII_TYPE_LABELS = {
+    "email": "Email", "upi": "UPI ID", "pan": "PAN", "ifsc": "IFSC Code",
+    "voter_id": "Voter ID", "aadhaar": "Aadhaar", "mobile": "Mobile Number",
+}
+DPDP_PII_TYPES = {"upi", "pan", "ifsc", "voter_id", "aadhaar", "mobile"} # Email is PII but not DPDP-specific
+PAN_HOLDER_TYPES = set("ABCFGHJLPT") # Fourth character of a PAN
+REJECTED_AADHAAR = "aadhaar_rejected" # 12-digit values failing Verhoeff; ~10% of random numbers pass by chance
+
+_VERHOEFF_D = np.array([
+    [0, 1, 2, 3, 4, 5, 6, 7, 8, 9], [1, 2, 3, 4, 0, 6, 7, 8, 9, 5], [2, 3, 4, 0, 1, 7, 8, 9, 5, 6],
+    [3, 4, 0, 1, 2, 8, 9, 5, 6, 7], [4, 0, 1, 2, 3, 9, 5, 6, 7, 8], [5, 9, 8, 7, 6, 0, 4, 3, 2, 1],
+    [6, 5, 9, 8, 7, 1, 0, 4, 3, 2], [7, 6, 5, 9, 8, 2, 1, 0, 4, 3], [8, 7, 6, 5, 9, 3, 2, 1, 0, 4],
+    [9, 8, 7, 6, 5, 4, 3, 2, 1, 0]])
+_VERHOEFF_P = np.array([
+    [0, 1, 2, 3, 4, 5, 6, 7, 8, 9], [1, 5, 7, 6, 2, 8, 3, 0, 9, 4], [5, 8, 0, 3, 7, 9, 6, 1, 4, 2],
+    [8, 9, 1, 6, 0, 4, 3, 5, 2, 7], [9, 4, 5, 3, 1, 2, 6, 8, 7, 0], [4, 2, 8, 6, 5, 7, 3, 9, 0, 1],
+    [2, 7, 9, 3, 8, 0, 6, 4, 1, 5], [7, 0, 4, 6, 9, 1, 3, 2, 5, 8]])
+
+_cache_lock = threading.Lock()
+_report_cache = OrderedDict()
+
+
+def verhoeff_valid(numbers):
+    """Vectorized Verhoeff check of equal-length digit strings; returns a bool array."""
+    if len(numbers) == 0:
+        return np.zeros(0, dtype=bool)
+    digits = np.frombuffer("".join(numbers).encode("ascii"), dtype=np.uint8).reshape(len(numbers), -1) - ord("0")
+    checksum = np.zeros(len(numbers), dtype=np.int64)
+    for i, column in enumerate(digits[:, ::-1].T): # Rightmost digit first
+        checksum = _VERHOEFF_D[checksum, _VERHOEFF_P[i % 8, column]]
+    return checksum == 0
+
+
+def _scannable_text(series):
+    """Values of a column as Python-regex-searchable strings, or None if the column cannot hold identifiers."""
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_datetime64_any_dtype(dtype):
+        return None
+    if pd.api.types.is_integer_dtype(dtype):
+        return series.astype("Int64").astype(str)
+    if pd.api.types.is_float_dtype(dtype):
+        if not np.all(np.mod(series.to_numpy(), 1) == 0): # Only integral floats (IDs read as float because of blanks)
+            return None
+        return series.astype("Int64").astype(str)
+    return series.astype(object).astype(str) # Object dtype: Python `re` (Arrow's RE2 has no lookbehind)
+
+
+def _match_kinds(values, verify_checksums):
+    """
+    PII type of the first match in each value (None if no match). Aadhaar-shaped
+    numbers failing the checksum count as mobile numbers if they hold one, and
+    are marked REJECTED_AADHAAR otherwise.
+    """
+    groups = values.str.extract(PII_SCAN_PATTERN)
+    matched = groups.notna().to_numpy()
+    kinds = np.where(matched.any(axis=1), np.array(groups.columns, dtype=object)[matched.argmax(axis=1)], None)
+    if verify_checksums:
+        aadhaar = kinds == "aadhaar"
+        if aadhaar.any():
+            numbers = groups["aadhaar"][aadhaar].str.replace(r"\D", "", regex=True)
+            valid = verhoeff_valid(numbers.tolist()) & (numbers.str[0] >= "2").to_numpy() # Aadhaar never starts with 0 or 1
+            rejected = np.flatnonzero(aadhaar)[~valid]
+            mobile = values.iloc[rejected].str.contains(MOBILE_PATTERN).to_numpy(dtype=bool)
+            kinds[rejected] = np.where(mobile, "mobile", REJECTED_AADHAAR)
+        pan = kinds == "pan"
+        if pan.any():
+            valid = groups["pan"][pan].str[3].str.upper().isin(PAN_HOLDER_TYPES).to_numpy()
+            kinds[np.flatnonzero(pan)[~valid]] = None
+    return kinds
+
+
+class PiiScanReport:
+    """Per-column hit rates of a content scan."""
+
+    def __init__(self, hit_rates, scanned, rejected=None):
+        self.hit_rates = hit_rates # {column: {pii_type: share of scanned values}}
+        self.scanned = scanned # {column: values scanned}
+        self.rejected = rejected or {} # {column: share of Aadhaar-shaped values failing the checksum}
+
+    def detected_type(self, column):
+        """Most frequent PII type of `column` if it passes the detection thresholds, else None."""
+        rates = self.hit_rates.get(column)
+        if not rates:
+            return None
+        kind, rate = max(rates.items(), key=lambda item: item[1])
+        if kind == "aadhaar" and self.rejected.get(column, 0.0) > rate: # Mostly invalid: random 12-digit numbers
+            return None
+        if rate >= DETECTION_MIN_HIT_RATE and rate * self.scanned[column] >= DETECTION_MIN_HITS:
+            return kind
+        return None
+
+    @property
+    def pii_columns(self):
+        return [c for c in self.hit_rates if self.detected_type(c)]
+
+    @property
+    def dpdp_columns(self):
+        return [c for c in self.hit_rates if self.detected_type(c) in DPDP_PII_TYPES]
+
+    def to_dataframe(self):
+        rows = [
+            {"Column": column, "Detected Type": PII_TYPE_LABELS[kind], "Hit Rate": rate,
+             "Values Scanned": self.scanned[column], "Flagged": self.detected_type(column) == kind}
+            for column, rates in self.hit_rates.items() for kind, rate in sorted(rates.items(), key=lambda item: -item[1])
+        ]
+        return pd.DataFrame(rows, columns=["Column", "Detected Type", "Hit Rate", "Values Scanned", "Flagged"])
+
+
+def scan_frame(df, verify_checksums=True, seed=0, fingerprint=None):
+    """Scans a sample of every column's values for PII (see module docstring); returns a PiiScanReport."""
+    cache_key = (fingerprint or frame_fingerprint(df), verify_checksums)
+    with _cache_lock:
+        if cache_key in _report_cache:
+            _report_cache.move_to_end(cache_key)
+            return _report_cache[cache_key]
+
+    rng = np.random.default_rng(seed)
+    per_column_cap = max(INITIAL_SAMPLE_SIZE, min(MAX_SAMPLE_SIZE, SCAN_BUDGET_VALUES // max(len(df.columns), 1)))
+    hit_rates, scanned, rejected = {}, {}, {}
+    for position in range(len(df.columns)):
+        column = df.columns[position]
+        series = df.iloc[:, position]
+        positions = rng.choice(len(series), size=min(per_column_cap, len(series)), replace=False) if len(series) else []
+        sample = series.iloc[positions].dropna()
+        text = _scannable_text(sample) if len(sample) else None
+        if text is None:
+            continue
+        kinds = _match_kinds(text.iloc[:INITIAL_SAMPLE_SIZE], verify_checksums)
+        if len(text) > INITIAL_SAMPLE_SIZE and any(k is not None for k in kinds): # Hits (or checksum rejects): extend to the full sample
+            kinds = np.concatenate([kinds, _match_kinds(text.iloc[INITIAL_SAMPLE_SIZE:], verify_checksums)])
+        found = pd.Series(kinds).dropna()
+        scanned[column] = len(kinds)
+        if not found.empty:
+            rates = (found.value_counts() / len(kinds)).to_dict()
+            if REJECTED_AADHAAR in rates:
+                rejected[column] = rates.pop(REJECTED_AADHAAR)
+            if rates:
+                hit_rates[column] = rates
+
+    report = PiiScanReport(hit_rates, scanned, rejected)
+    with _cache_lock:
+        _report_cache[cache_key] = report
+        while len(_report_cache) > REPORT_CACHE_SIZE:
+            _report_cache.popitem(last=False)
+    return report
@@ -0,0 +1,227 @@
+"""
+Distance-to-closest-record (DCR) privacy check of a synthetic table.
+
+Rows of both tables are encoded into one mixed-type space in which every
+column contributes at most 1 to the distance:
+  numeric      scaled by the original's min-max range (missing -> -1)
+  categorical  one-hot * sqrt(1/2) for up to MAX_ONE_HOT_CATEGORIES original
+               categories, so two different categories are 1 apart; columns
+               with more categories use their frequency rank in [0, 1]
+Identifier-like text columns are left out (see nullbyte.quality).
+
+Every original row is indexed once in a scikit-learn KD-tree (a ball tree
+above KD_TREE_MAX_DIMENSIONS dimensions). Synthetic rows are queried for
+their two nearest originals in chunks of QUERY_CHUNK_ROWS on a thread pool,
+so memory stays bounded and no all-pairs distance matrix is ever built. For
+each synthetic row this gives:
+  DCR   distance to the closest original row
+  NNDR  DCR / distance to the second-closest original row
+A synthetic row is a near-copy if its DCR is at most the NEAR_COPY_QUANTILE
+of the originals' own nearest-neighbour distances (0 when the original has
+duplicates: only exact copies are flagged then). Fresh real rows would fall
+under that threshold NEAR_COPY_QUANTILE of the time, so only the excess
+near-copy share lowers the privacy score. Reports are cached by the
+fingerprints of both frames.
+
+Configuration (environment):
+  NULLBYTE_DCR_MAX_QUERY_ROWS      synthetic rows checked (default 100000)
+  NULLBYTE_DCR_WORKERS             query threads (default: min(8, CPU count))
+"""
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import BallTree, KDTree
+
+from nullbyte.fingerprint import frame_fingerprint
+from nullbyte.quality import CATEGORICAL, comparable_column_kinds
+
+DEFAULT_MAX_QUERY_ROWS = 100_000
+QUERY_CHUNK_ROWS = 20_000
+BASELINE_ROWS = 10_000 # Original rows queried against the original for the distance baseline
+MAX_ONE_HOT_CATEGORIES = 20
+KD_TREE_MAX_DIMENSIONS = 16 # KD-trees degrade in high dimensions; ball trees hold up better
+NEAR_COPY_QUANTILE = 0.01
+EXACT_COPY_DISTANCE = 1e-9
+LOW_NNDR_THRESHOLD = 0.5 # NNDR below this: much closer to one original than to any other
+REPORT_CACHE_SIZE = 16
+MISSING_NUMERIC = -1.0
+
+_cache_lock = threading.Lock()
+_report_cache = OrderedDict()
+
+
+def _env_int(name, default):
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+class MixedTypeEncoder:
+    """Fits the mixed-type distance space (see module docstring) on the original; transform() encodes any frame into it."""
+
+    def __init__(self, reference, kinds):
+        self.kinds = kinds
+        self.ranges, self.categories, self.one_hot = {}, {}, {}
+        for column, kind in kinds.items():
+            series = reference[column]
+            if kind == CATEGORICAL:
+                counts = series.astype(object).value_counts(dropna=True)
+                self.categories[column] = pd.Index(counts.index, dtype=object) # Most frequent first
+                self.one_hot[column] = len(counts) <= MAX_ONE_HOT_CATEGORIES
+            else:
+                values = pd.to_numeric(series, errors="coerce")
+                low, high = values.min(), values.max()
+                low = 0.0 if pd.isna(low) else float(low)
+                self.ranges[column] = (low, float(high) - low if pd.notna(high) and high > low else 1.0)
+
+    @property
+    def dimensions(self):
+        return sum(len(self.categories[c]) if self.one_hot.get(c) else 1 for c in self.kinds)
+
+    def transform(self, df):
+        blocks = []
+        for column, kind in self.kinds.items():
+            series = df[column]
+            if kind == CATEGORICAL:
+                categories = self.categories[column]
+                codes = categories.get_indexer(series.astype(object))
+                if self.one_hot[column]:
+                    block = np.zeros((len(series), len(categories)))
+                    present = codes >= 0 # Missing / unseen categories stay all-zero
+                    block[np.flatnonzero(present), codes[present]] = np.sqrt(0.5)
+                    blocks.append(block)
+                else:
+                    ranks = np.where(codes >= 0, codes / max(len(categories) - 1, 1), MISSING_NUMERIC)
+                    blocks.append(ranks[:, None])
+            else:
+                low, span = self.ranges[column]
+                values = (pd.to_numeric(series, errors="coerce").to_numpy(dtype=float, na_value=np.nan) - low) / span
+                blocks.append(np.where(np.isnan(values), MISSING_NUMERIC, values)[:, None])
+        return np.hstack(blocks) if blocks else np.zeros((len(df), 0))
+
+
+def _sample_positions(rows, limit, seed):
+    if rows <= limit:
+        return np.arange(rows)
+    return np.sort(np.random.default_rng(seed).choice(rows, size=limit, replace=False))
+
+
+class PrivacyReport:
+    """Result of distance_to_closest_record()."""
+
+    def __init__(self, dcr, nndr, synthetic_positions, nearest_reference_positions, near_copy_threshold,
+                 baseline_quantiles, columns, skipped, reference_rows_indexed, tree, seconds):
+        self.dcr = dcr # Per checked synthetic row
+        self.nndr = nndr
+        self.synthetic_positions = synthetic_positions # Row positions in the synthetic frame that were checked
+        self.nearest_reference_positions = nearest_reference_positions # Row positions in the original frame
+        self.near_copy_threshold = near_copy_threshold
+        self.baseline_quantiles = baseline_quantiles # {quantile: original-to-original nearest-neighbour distance}
+        self.columns = columns
+        self.skipped = skipped
+        self.reference_rows_indexed = reference_rows_indexed
+        self.tree = tree
+        self.seconds = seconds
+
+    @property
+    def rows_checked(self):
+        return len(self.dcr)
+
+    @property
+    def exact_copy_share(self):
+        return float(np.mean(self.dcr <= EXACT_COPY_DISTANCE)) if len(self.dcr) else 0.0
+
+    @property
+    def near_copy_mask(self):
+        return self.dcr <= max(self.near_copy_threshold, EXACT_COPY_DISTANCE)
+
+    @property
+    def near_copy_share(self):
+        return float(np.mean(self.near_copy_mask)) if len(self.dcr) else 0.0
+
+    @property
+    def low_nndr_share(self):
+        return float(np.mean(self.nndr < LOW_NNDR_THRESHOLD)) if len(self.nndr) else 0.0
+
+    @property
+    def score(self):
+        """
+        Privacy protection score (0-100): 100 minus the exact-copy share or the
+        near-copy share in excess of what fresh real rows would show, whichever is larger.
+        """
+        excess = max(0.0, self.near_copy_share - NEAR_COPY_QUANTILE) / (1.0 - NEAR_COPY_QUANTILE)
+        return 100.0 * (1.0 - max(excess, self.exact_copy_share))
+
+    def flagged_rows(self, synthetic, reference=None, limit=1000):
+        """Near-copy synthetic rows (closest first) with their DCR, NNDR and nearest original row."""
+        mask = self.near_copy_mask
+        order = np.argsort(self.dcr[mask], kind="stable")[:limit]
+        positions = self.synthetic_positions[mask][order]
+        flagged = synthetic.iloc[positions].copy()
+        flagged.insert(0, "DCR", self.dcr[mask][order])
+        flagged.insert(1, "NNDR", self.nndr[mask][order])
+        nearest = self.nearest_reference_positions[mask][order]
+        flagged.insert(2, "Nearest Original Row", reference.index[nearest] if reference is not None else nearest)
+        return flagged
+
+
+def distance_to_closest_record(reference, synthetic, seed=0, max_query_rows=None, workers=None):
+    """
+    DCR / NNDR of `synthetic` rows against all `reference` rows (see module
+    docstring); only the synthetic side is subsampled. Returns a PrivacyReport.
+    """
+    max_query_rows = max_query_rows or _env_int("NULLBYTE_DCR_MAX_QUERY_ROWS", DEFAULT_MAX_QUERY_ROWS)
+    workers = workers or _env_int("NULLBYTE_DCR_WORKERS", min(8, os.cpu_count() or 1))
+    cache_key = (frame_fingerprint(reference), frame_fingerprint(synthetic), seed, max_query_rows)
+    with _cache_lock:
+        if cache_key in _report_cache:
+            _report_cache.move_to_end(cache_key)
+            return _report_cache[cache_key]
+
+    started = perf_counter()
+    kinds, skipped = comparable_column_kinds(reference, synthetic)
+    encoder = MixedTypeEncoder(reference, kinds)
+    indexed = encoder.transform(reference) # Every original row: a copy of an unindexed row would go unnoticed
+    tree_class = KDTree if encoder.dimensions <= KD_TREE_MAX_DIMENSIONS else BallTree
+    tree = tree_class(indexed) if len(indexed) and kinds else None
+
+    synthetic_positions = _sample_positions(len(synthetic), max_query_rows, seed + 1)
+    k = min(2, len(indexed))
+
+    def query(positions):
+        distances, neighbours = tree.query(encoder.transform(synthetic.iloc[positions]), k=k)
+        return distances, neighbours
+
+    if tree is None or not len(synthetic_positions):
+        report = PrivacyReport(np.zeros(0), np.zeros(0), np.zeros(0, dtype=int), np.zeros(0, dtype=int), 0.0, {},
+                               list(kinds), skipped, len(indexed), None, perf_counter() - started)
+    else:
+        chunks = [synthetic_positions[i:i + QUERY_CHUNK_ROWS] for i in range(0, len(synthetic_positions), QUERY_CHUNK_ROWS)]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="nullbyte-dcr") as executor: # Tree queries release the GIL
+            results = list(executor.map(query, chunks))
+        distances = np.vstack([d for d, _ in results])
+        neighbours = np.vstack([n for _, n in results])
+        dcr = distances[:, 0]
+        second = distances[:, 1] if k > 1 else np.full(len(dcr), np.inf)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            nndr = np.where(second > 0, dcr / second, 1.0) # Equidistant duplicates count as not singled out
+
+        # Baseline: how close original rows are to each other (second neighbour; the first is the row itself)
+        baseline_rows = indexed[_sample_positions(len(indexed), BASELINE_ROWS, seed + 2)]
+        baseline = tree.query(baseline_rows, k=k)[0][:, -1] if k > 1 else np.zeros(len(baseline_rows))
+        baseline_quantiles = {q: float(np.quantile(baseline, q)) for q in (NEAR_COPY_QUANTILE, 0.5)}
+        report = PrivacyReport(dcr, nndr, synthetic_positions, neighbours[:, 0],
+                               baseline_quantiles[NEAR_COPY_QUANTILE], baseline_quantiles, list(kinds), skipped,
+                               len(indexed), tree_class.__name__, perf_counter() - started)
+
+    with _cache_lock:
+        _report_cache[cache_key] = report
+        while len(_report_cache) > REPORT_CACHE_SIZE:
+            _report_cache.popitem(last=False)
+    return report
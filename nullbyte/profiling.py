@@ -0,0 +1,100 @@
+"""
+Lightweight wall-time instrumentation for generation runs.
+
+A GenerationProfiler collects per-field timings (wall time, calls, rows) and
+per-stage timings (FK fan-out, edge-case assignment, PII masking, scrambling,
+export, ...). The app renders it as a profile table and the explainability
+PDF lists it, so slow columns and stages can be spotted without bisecting the
+schema by hand.
+"""
+import threading
+from contextlib import contextmanager
+from time import perf_counter
+
+import pandas as pd
+
+_active = threading.local()
+
+
+class GenerationProfiler:
+    """Accumulates timings for one generation run (prompt, single-table or hierarchical)."""
+
+    def __init__(self, label):
+        self.label = label
+        self.fields = {} # (table, field) -> {"seconds", "calls", "rows"}
+        self.stages = {} # stage -> {"seconds", "calls", "rows"}
+        self._post_run_stages = set() # Stages timed outside the generation run (export)
+        self._started = perf_counter()
+        self.total_seconds = None
+        self.metrics_emitted = False # Set by nullbyte.metrics once the run record is written
+
+    def add_field(self, table, field_name, seconds, calls=1, rows=1):
+        entry = self.fields.setdefault((table, field_name), {"seconds": 0.0, "calls": 0, "rows": 0})
+        entry["seconds"] += seconds
+        entry["calls"] += calls
+        entry["rows"] += rows
+
+    def add_stage(self, stage, seconds, rows=0, calls=1):
+        entry = self.stages.setdefault(stage, {"seconds": 0.0, "calls": 0, "rows": 0})
+        entry["seconds"] += seconds
+        entry["calls"] += calls
+        entry["rows"] += rows
+
+    def set_stage(self, stage, seconds, rows=0):
+        """Records a stage that is recomputed on every rerun (e.g. export), replacing earlier timings."""
+        self.stages[stage] = {"seconds": seconds, "calls": 1, "rows": rows}
+        self._post_run_stages.add(stage)
+
+    @contextmanager
+    def stage(self, stage, rows=0):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(stage, perf_counter() - start, rows)
+
+    def finish(self):
+        self.total_seconds = perf_counter() - self._started
+        return self
+
+    def rows(self):
+        """Profile rows sorted by wall time (largest first)."""
+        total = (self.total_seconds or sum(v["seconds"] for v in self.fields.values())) \
+            + sum(self.stages[s]["seconds"] for s in self._post_run_stages) or 1e-9
+        records = []
+        for (table, field_name), v in self.fields.items():
+            records.append(("Field", table, field_name, v))
+        for stage, v in self.stages.items():
+            records.append(("Stage", "", stage, v))
+        out = []
+        for kind, table, name, v in sorted(records, key=lambda r: r[3]["seconds"], reverse=True):
+            out.append({
+                "Kind": kind,
+                "Table": table,
+                "Name": name,
+                "Calls": v["calls"],
+                "Rows": v["rows"],
+                "Wall time (s)": round(v["seconds"], 4),
+                "Rows/sec": round(v["rows"] / v["seconds"], 1) if v["seconds"] > 0 and v["rows"] else None,
+                "Share of run (%)": round(100 * v["seconds"] / total, 1),
+            })
+        return out
+
+    def to_dataframe(self):
+        return pd.DataFrame(self.rows(), columns=["Kind", "Table", "Name", "Calls", "Rows", "Wall time (s)", "Rows/sec", "Share of run (%)"])
+
+
+@contextmanager
+def profiling(profiler):
+    """Makes `profiler` the active one on this thread, so nested helpers (e.g. PII masking) can report into it."""
+    previous = getattr(_active, "profiler", None)
+    _active.profiler = profiler
+    try:
+        yield profiler
+    finally:
+        _active.profiler = previous
+
+
+def active_profiler():
+    """The profiler of the run executing on this thread, or None."""
+    return getattr(_active, "profiler", None)
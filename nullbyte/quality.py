@@ -0,0 +1,317 @@
+"""
+Fidelity benchmarking of a synthetic table against its original.
+
+benchmark_quality() reports:
+  column shapes  per-column marginal similarity: 1 - K-S statistic (numeric)
+                 or 1 - total variation distance (categorical)
+  pair trends    per-pair association deltas: Pearson correlation between
+                 numeric columns, Cramer's V for all other pairs (numeric
+                 columns binned at the original's deciles)
+  coverage       share of the original's numeric range / categories that the
+                 synthetic data reaches
+Each frame is encoded once (a seeded subsample of at most MAX_ENCODED_ROWS
+rows as float arrays and category codes), cached by fingerprint. Both sides
+use the same seed, so equally long frames keep the same row positions. When
+the smaller encoding fits in BATCH_ROWS, the metrics are computed once on all
+rows of both. Larger encodings are compared on row batches, in parallel, until
+the time budget is spent; the spread of the batch results gives a t-based
+confidence interval, so million-row inputs finish in bounded time with an
+honest error bar. Batches of equally long sides use the same positions on
+both, so identical frames score 100.
+
+Configuration (environment):
+  NULLBYTE_BENCHMARK_SECONDS  time budget per benchmark (default 10)
+"""
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from nullbyte.fingerprint import frame_fingerprint
+
+MAX_ENCODED_ROWS = 200_000
+BATCH_ROWS = 20_000
+MIN_BATCHES = 3
+MAX_BATCHES = 20
+DEFAULT_TIME_BUDGET_SECONDS = 10.0
+CONFIDENCE_LEVEL = 0.95
+IDENTIFIER_UNIQUE_RATIO = 0.5 # Text columns with more distinct values than this share of rows are identifiers, not categories
+MAX_PAIR_COLUMNS = 50 # Pair trends use at most this many columns (k^2 pairs)
+MAX_PAIR_CATEGORIES = 100 # Categorical columns with more categories are left out of Cramer's V
+DECILE_EDGES = np.linspace(0, 1, 11)[1:-1]
+CACHE_SIZE = 32
+
+NUMERIC, CATEGORICAL = "numeric", "categorical"
+
+_cache_lock = threading.Lock()
+_encoding_cache = OrderedDict()
+_report_cache = OrderedDict()
+
+
+def _cached(cache, key, build):
+    with _cache_lock:
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+    value = build()
+    with _cache_lock:
+        cache[key] = value
+        while len(cache) > CACHE_SIZE:
+            cache.popitem(last=False)
+    return value
+
+
+def comparable_column_kinds(reference, synthetic):
+    """{column: kind} for the shared columns; identifier-like text columns are skipped."""
+    kinds, skipped = {}, []
+    for column in reference.columns:
+        if column not in synthetic.columns:
+            continue
+        series = reference[column]
+        if pd.api.types.is_bool_dtype(series.dtype) or not pd.api.types.is_numeric_dtype(series.dtype):
+            if series.nunique(dropna=True) > IDENTIFIER_UNIQUE_RATIO * max(series.notna().sum(), 1):
+                skipped.append(column)
+                continue
+            kinds[column] = CATEGORICAL
+        else:
+            kinds[column] = NUMERIC
+    return kinds, skipped
+
+
+class _EncodedFrame:
+    """Seeded row subsample of a frame: float arrays for numeric columns, codes + categories for categorical ones."""
+
+    def __init__(self, df, kinds, seed):
+        rows = len(df)
+        positions = np.sort(np.random.default_rng(seed).choice(rows, size=MAX_ENCODED_ROWS, replace=False)) if rows > MAX_ENCODED_ROWS else None
+        sample = df.iloc[positions] if positions is not None else df
+        self.rows = len(sample)
+        self.numeric, self.codes, self.categories = {}, {}, {}
+        for column, kind in kinds.items():
+            series = sample[column]
+            if kind == NUMERIC:
+                self.numeric[column] = pd.to_numeric(series, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+            else:
+                codes, uniques = pd.factorize(series.astype(object), use_na_sentinel=True)
+                self.codes[column], self.categories[column] = codes, pd.Index(uniques, dtype=object)
+
+
+def _encode(df, fingerprint, kinds, seed):
+    key = (fingerprint, tuple(kinds.items()), seed)
+    return _cached(_encoding_cache, key, lambda: _EncodedFrame(df, kinds, seed))
+
+
+def _cramers_v(codes_a, codes_b, k_a, k_b):
+    valid = (codes_a >= 0) & (codes_b >= 0)
+    n = int(valid.sum())
+    if n == 0 or k_a < 2 or k_b < 2:
+        return 0.0
+    observed = np.bincount(codes_a[valid] * k_b + codes_b[valid], minlength=k_a * k_b).reshape(k_a, k_b).astype(float)
+    observed = observed[observed.sum(axis=1) > 0][:, observed.sum(axis=0) > 0]
+    if min(observed.shape) < 2:
+        return 0.0
+    expected = observed.sum(axis=1, keepdims=True) * observed.sum(axis=0, keepdims=True) / n
+    chi2 = float(((observed - expected) ** 2 / expected).sum())
+    return float(np.sqrt(chi2 / (n * (min(observed.shape) - 1))))
+
+
+def _pearson(a, b):
+    valid = ~(np.isnan(a) | np.isnan(b))
+    if valid.sum() < 3 or np.std(a[valid]) == 0 or np.std(b[valid]) == 0:
+        return 0.0
+    return float(np.corrcoef(a[valid], b[valid])[0, 1])
+
+
+class _Comparison:
+    """Aligned encodings of one reference/synthetic pair: shared category codes and decile bins."""
+
+    def __init__(self, ref, syn, kinds):
+        self.kinds = kinds
+        self.ref, self.syn = ref, syn
+        self.syn_codes, self.n_categories, self.decile_edges = {}, {}, {}
+        for column, kind in kinds.items():
+            if kind == CATEGORICAL: # Synthetic codes re-indexed into the reference's categories (unseen -> extra code)
+                n_ref = len(ref.categories[column])
+                mapped = ref.categories[column].get_indexer(syn.categories[column])
+                mapped = np.where(mapped < 0, n_ref, mapped)
+                codes = syn.codes[column]
+                self.syn_codes[column] = np.where(codes >= 0, mapped[np.maximum(codes, 0)] if len(mapped) else -1, -1)
+                self.n_categories[column] = n_ref + 1
+            else:
+                values = ref.numeric[column]
+                values = values[~np.isnan(values)]
+                self.decile_edges[column] = np.unique(np.quantile(values, DECILE_EDGES)) if len(values) else np.array([])
+        pair_columns = [c for c in kinds if kinds[c] == NUMERIC or self.n_categories[c] <= MAX_PAIR_CATEGORIES + 1][:MAX_PAIR_COLUMNS]
+        self.pairs = [(a, b) for i, a in enumerate(pair_columns) for b in pair_columns[i + 1:]]
+
+    def _binned(self, side, column, rows):
+        """Category codes of `column` for the given rows (numeric columns binned at the reference deciles)."""
+        if self.kinds[column] == CATEGORICAL:
+            codes = (self.ref.codes if side == "ref" else self.syn_codes)[column][rows]
+            return codes, self.n_categories[column]
+        values = (self.ref if side == "ref" else self.syn).numeric[column][rows]
+        edges = self.decile_edges[column]
+        codes = np.where(np.isnan(values), -1, np.searchsorted(edges, values, side="right"))
+        return codes, len(edges) + 1
+
+    def batch_metrics(self, ref_rows, syn_rows):
+        """Per-column similarities and per-pair similarities on one batch of rows."""
+        shapes = {}
+        for column, kind in self.kinds.items():
+            if kind == NUMERIC:
+                a, b = self.ref.numeric[column][ref_rows], self.syn.numeric[column][syn_rows]
+                a, b = a[~np.isnan(a)], b[~np.isnan(b)]
+                shapes[column] = 1.0 - float(stats.ks_2samp(a, b).statistic) if len(a) and len(b) else np.nan
+            else:
+                k = self.n_categories[column]
+                a, b = self.ref.codes[column][ref_rows], self.syn_codes[column][syn_rows]
+                p = np.bincount(a[a >= 0], minlength=k) / max((a >= 0).sum(), 1)
+                q = np.bincount(b[b >= 0], minlength=k) / max((b >= 0).sum(), 1)
+                shapes[column] = 1.0 - 0.5 * float(np.abs(p - q).sum())
+
+        pairs = {}
+        for a, b in self.pairs:
+            if self.kinds[a] == NUMERIC and self.kinds[b] == NUMERIC:
+                ref_value = _pearson(self.ref.numeric[a][ref_rows], self.ref.numeric[b][ref_rows])
+                syn_value = _pearson(self.syn.numeric[a][syn_rows], self.syn.numeric[b][syn_rows])
+                pairs[(a, b)] = (ref_value, syn_value, 1.0 - abs(ref_value - syn_value) / 2.0)
+            else:
+                (ref_a, k_a), (ref_b, k_b) = self._binned("ref", a, ref_rows), self._binned("ref", b, ref_rows)
+                (syn_a, _), (syn_b, _) = self._binned("syn", a, syn_rows), self._binned("syn", b, syn_rows)
+                ref_value, syn_value = _cramers_v(ref_a, ref_b, k_a, k_b), _cramers_v(syn_a, syn_b, k_a, k_b)
+                pairs[(a, b)] = (ref_value, syn_value, 1.0 - abs(ref_value - syn_value))
+        return shapes, pairs
+
+    def coverage(self):
+        """Per-column coverage on the full encodings: numeric range overlap or share of reference categories seen."""
+        coverage = {}
+        for column, kind in self.kinds.items():
+            if kind == NUMERIC:
+                a, b = self.ref.numeric[column], self.syn.numeric[column]
+                a, b = a[~np.isnan(a)], b[~np.isnan(b)]
+                if not len(a) or not len(b):
+                    coverage[column] = 0.0 if len(a) else 1.0
+                    continue
+                low, high = a.min(), a.max()
+                if high == low:
+                    coverage[column] = float(b.min() <= low <= b.max())
+                else:
+                    coverage[column] = float(np.clip((min(high, b.max()) - max(low, b.min())) / (high - low), 0.0, 1.0))
+            else:
+                n_ref = self.n_categories[column] - 1
+                seen = np.unique(self.syn_codes[column])
+                coverage[column] = float(((seen >= 0) & (seen < n_ref)).sum()) / n_ref if n_ref else 1.0
+        return coverage
+
+
+def _mean_and_ci(values):
+    """Mean and half-width of the t-based confidence interval over batch results."""
+    values = np.asarray([v for v in values if not np.isnan(v)], dtype=float)
+    if len(values) == 0:
+        return np.nan, np.nan
+    if len(values) < 2:
+        return float(values.mean()), np.nan
+    half_width = stats.t.ppf(0.5 + CONFIDENCE_LEVEL / 2, len(values) - 1) * values.std(ddof=1) / np.sqrt(len(values))
+    return float(values.mean()), float(half_width)
+
+
+class QualityReport:
+    """Result of benchmark_quality(); scores are 0-100 with CI half-widths."""
+
+    def __init__(self, scores, columns, pairs, skipped, batches, rows_per_batch, seconds):
+        self.scores = scores # {"Fidelity" | "Column Shapes" | "Pair Trends" | "Coverage": (score, ci_half_width)}
+        self.columns = columns # DataFrame: Column, Type, Similarity, CI +/-, Coverage
+        self.pairs = pairs # DataFrame: Column A, Column B, Metric, Original, Synthetic, Similarity
+        self.skipped = skipped # Identifier-like columns left out
+        self.batches = batches
+        self.rows_per_batch = rows_per_batch
+        self.seconds = seconds
+
+    def pair_delta_matrix(self):
+        """Square matrix of |original - synthetic| association per column pair (for a heatmap)."""
+        if self.pairs.empty:
+            return pd.DataFrame()
+        names = list(dict.fromkeys(list(self.pairs["Column A"]) + list(self.pairs["Column B"])))
+        matrix = pd.DataFrame(0.0, index=names, columns=names)
+        for a, b, delta in zip(self.pairs["Column A"], self.pairs["Column B"], (self.pairs["Original"] - self.pairs["Synthetic"]).abs()):
+            matrix.loc[a, b] = matrix.loc[b, a] = delta
+        return matrix
+
+
+def benchmark_quality(reference, synthetic, time_budget=None, seed=0, workers=None):
+    """
+    Benchmarks `synthetic` against `reference` (see module docstring). Results are
+    cached by the fingerprints of both frames.
+    """
+    if time_budget is None:
+        try:
+            time_budget = float(os.environ.get("NULLBYTE_BENCHMARK_SECONDS", DEFAULT_TIME_BUDGET_SECONDS))
+        except ValueError:
+            time_budget = DEFAULT_TIME_BUDGET_SECONDS
+    reference_fp, synthetic_fp = frame_fingerprint(reference), frame_fingerprint(synthetic)
+    return _cached(_report_cache, (reference_fp, synthetic_fp, time_budget, seed),
+                   lambda: _run_benchmark(reference, synthetic, reference_fp, synthetic_fp, time_budget, seed, workers))
+
+
+def _run_benchmark(reference, synthetic, reference_fp, synthetic_fp, time_budget, seed, workers):
+    started = perf_counter()
+    kinds, skipped = comparable_column_kinds(reference, synthetic)
+    comparison = _Comparison(_encode(reference, reference_fp, kinds, seed), _encode(synthetic, synthetic_fp, kinds, seed), kinds)
+    smaller_side = min(comparison.ref.rows, comparison.syn.rows)
+    rows_per_batch = min(BATCH_ROWS, max(smaller_side // 2, min(smaller_side, 1))) # At most half the rows, so batches differ
+    rng = np.random.default_rng(seed)
+    workers = workers or min(4, os.cpu_count() or 1)
+    same_length = comparison.syn.rows == comparison.ref.rows
+
+    def run_batch(batch_seed):
+        batch_rng = np.random.default_rng(batch_seed)
+        ref_rows = batch_rng.choice(comparison.ref.rows, size=rows_per_batch, replace=False)
+        syn_rows = ref_rows if same_length else batch_rng.choice(comparison.syn.rows, size=rows_per_batch, replace=False)
+        return comparison.batch_metrics(ref_rows, syn_rows)
+
+    results = []
+    if kinds and 0 < smaller_side <= BATCH_ROWS: # Small enough to compare in full: batches would bias KS and TVD downward
+        rows_per_batch = smaller_side
+        results.append(comparison.batch_metrics(np.arange(comparison.ref.rows), np.arange(comparison.syn.rows)))
+    elif kinds and smaller_side:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="nullbyte-benchmark") as executor:
+            while len(results) < MAX_BATCHES:
+                group = min(workers, MAX_BATCHES - len(results))
+                results.extend(executor.map(run_batch, rng.integers(0, 2**63 - 1, size=group)))
+                if len(results) >= MIN_BATCHES and perf_counter() - started >= time_budget * len(results) / (len(results) + group):
+                    break # The next group would likely overrun the budget
+
+    coverage = comparison.coverage()
+    column_rows = []
+    for column, kind in kinds.items():
+        mean, ci = _mean_and_ci([shapes[column] for shapes, _ in results])
+        column_rows.append({"Column": column, "Type": kind, "Similarity": mean, "CI +/-": ci, "Coverage": coverage[column]})
+    columns = pd.DataFrame(column_rows, columns=["Column", "Type", "Similarity", "CI +/-", "Coverage"])
+
+    pair_rows = []
+    for a, b in comparison.pairs:
+        metric = "Pearson" if kinds[a] == NUMERIC and kinds[b] == NUMERIC else "Cramer's V"
+        per_batch = np.array([pairs[(a, b)] for _, pairs in results]) if results else np.full((0, 3), np.nan)
+        pair_rows.append({"Column A": a, "Column B": b, "Metric": metric,
+                          "Original": float(np.nanmean(per_batch[:, 0])) if len(per_batch) else np.nan,
+                          "Synthetic": float(np.nanmean(per_batch[:, 1])) if len(per_batch) else np.nan,
+                          "Similarity": float(np.nanmean(per_batch[:, 2])) if len(per_batch) else np.nan})
+    pairs = pd.DataFrame(pair_rows, columns=["Column A", "Column B", "Metric", "Original", "Synthetic", "Similarity"])
+
+    coverage_score = float(np.mean(list(coverage.values()))) if coverage else np.nan
+    shape_scores = [np.nanmean(list(shapes.values())) if shapes else np.nan for shapes, _ in results]
+    pair_scores = [np.nanmean([p[2] for p in pair_values.values()]) if pair_values else np.nan for _, pair_values in results]
+    fidelity_scores = [np.nanmean([s, p, coverage_score]) for s, p in zip(shape_scores, pair_scores)]
+    scores = {
+        "Fidelity": _mean_and_ci(fidelity_scores),
+        "Column Shapes": _mean_and_ci(shape_scores),
+        "Pair Trends": _mean_and_ci(pair_scores),
+        "Coverage": (coverage_score, np.nan),
+    }
+    scores = {name: (mean * 100, ci * 100) for name, (mean, ci) in scores.items()}
+    return QualityReport(scores, columns, pairs, skipped, len(results), rows_per_batch, perf_counter() - started)
@@ -0,0 +1,98 @@
+"""
+Column scrambling for PII fields ("scramble_column" handling).
+
+A scrambled column keeps its values but detaches them from their rows. All
+work is done on integer arrays: a column is permuted with one row index
+array, or factorized once and remapped through an array of codes, so a
+scramble is O(rows) whatever the value type.
+
+Columns joined by relationships (a parent key and every child foreign key
+copied from it) form one logical entity. An entity is scrambled with a
+single bijection over its distinct values, applied to every column of the
+entity in every table, so each child row still joins to the (relabelled)
+parent row it was generated for. Scrambling any column of an entity
+scrambles the whole entity. Other columns get a row permutation of their own.
+With `streams` (nullbyte.streams.RandomStreams), every permutation is drawn
+from a keyed stream of its column (the entity's first column for an entity),
+so a fixed seed reproduces the scramble; otherwise the global NumPy RNG is used.
+"""
+import numpy as np
+import pandas as pd
+
+from nullbyte.streams import SCRAMBLE_STREAM
+
+
+def entity_groups(relationships):
+    """Lists of (table, column) that hold the same logical entity, from parent PK -> child FK relationships."""
+    parent = {}
+
+    def find(node):
+        parent.setdefault(node, node)
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for rel in relationships:
+        parent[find((rel["child_table"], rel["child_fk"]))] = find((rel["parent_table"], rel["parent_pk"]))
+    groups = {}
+    for node in parent:
+        groups.setdefault(find(node), []).append(node)
+    return list(groups.values())
+
+
+def permute_rows(series, rng=None):
+    """`series` with its values in a random row order (index and dtype kept)."""
+    rng = rng if rng is not None else np.random
+    return series.take(rng.permutation(len(series))).set_axis(series.index)
+
+
+def _entity_codes(columns):
+    """Codes of every column into the entity's distinct values (-1 for missing), and those values."""
+    uniques = pd.Index(pd.unique(columns[0].dropna()))
+    codes = []
+    for series in columns:
+        column_codes = uniques.get_indexer(series)
+        unseen = series[(column_codes < 0) & series.notna().to_numpy()]
+        if len(unseen): # E.g. a child FK value missing from the parent key
+            uniques = uniques.append(pd.Index(pd.unique(unseen)))
+            column_codes = uniques.get_indexer(series)
+        codes.append(column_codes)
+    return codes, uniques
+
+
+def scramble_entity(columns, rng=None):
+    """Applies one random bijection over the distinct values of `columns` (Series) to each of them."""
+    rng = rng if rng is not None else np.random
+    codes, uniques = _entity_codes(columns)
+    mapping = rng.permutation(len(uniques))
+    scrambled = []
+    for series, column_codes in zip(columns, codes):
+        present = column_codes >= 0
+        values = pd.Series(uniques.take(mapping[np.where(present, column_codes, 0)]), index=series.index, name=series.name)
+        scrambled.append(values.where(present, series))
+    return scrambled
+
+
+def scramble_tables(frames, columns, relationships=(), streams=None):
+    """
+    Scrambles `columns` ({(table, column)}) of `frames` ({table: DataFrame})
+    in place; columns linked by `relationships` are scrambled as one entity
+    (see module docstring). Returns `frames`.
+    """
+    def rng_for(table, column):
+        return streams.select(table, f"{SCRAMBLE_STREAM}{column}").generator if streams is not None else None
+
+    grouped = set()
+    for group in entity_groups(relationships):
+        grouped.update(group)
+        present = [(t, c) for t, c in group if t in frames and c in frames[t].columns]
+        if not present or not any(node in columns for node in group):
+            continue
+        entity_rng = rng_for(*min(group, key=repr)) # Keyed by the entity, not by which of its tables exist
+        for (table, column), values in zip(present, scramble_entity([frames[t][c] for t, c in present], rng=entity_rng)):
+            frames[table][column] = values
+    for table, column in columns:
+        if (table, column) not in grouped and table in frames and column in frames[table].columns:
+            frames[table][column] = permute_rows(frames[table][column], rng=rng_for(table, column))
+    return frames
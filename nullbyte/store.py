@@ -0,0 +1,358 @@
+"""
+Tiered storage for per-session datasets.
+
+Streamlit keeps every session's results resident between reruns. The
+DatasetStore holds them in three tiers instead:
+  hot   - the live DataFrame (or {table: DataFrame} dict)
+  warm  - zstd-compressed Arrow IPC bytes in memory
+  cold  - the same IPC stream spilled to a local file, read back memory-mapped
+Reads load a dataset back to hot transparently. The most recently used
+dataset of a session always stays hot; other hot datasets are demoted
+(least recently used first) when the session or the whole process exceeds its
+memory budget, and warm bytes spill to disk past the process compressed budget.
+Other per-session caches can be attach()ed: their `nbytes` count as hot data,
+so datasets are demoted to make room for them.
+
+fingerprint() hashes a stored dataset once per version (every put() with a
+new value is a new version) and keeps the result across tier moves, so the
+analysis engines can take it instead of re-hashing the frame on every rerun.
+Stored frames must therefore not be edited in place: put() a changed copy.
+
+Configuration (environment, megabytes):
+  NULLBYTE_SESSION_MEMORY_BUDGET_MB     hot data per session (default 512)
+  NULLBYTE_PROCESS_MEMORY_BUDGET_MB     hot data across sessions (default 2048)
+  NULLBYTE_COMPRESSED_MEMORY_BUDGET_MB  warm data across sessions before spilling (default 1024)
+  NULLBYTE_SPILL_DIR                    spill directory (default: system temp dir)
+"""
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import uuid
+import weakref
+from time import monotonic
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from nullbyte.fingerprint import frame_fingerprint
+
+_MB = 1024 * 1024
+MIN_DEMOTE_BYTES = 1 * _MB # Smaller datasets are cheaper to keep hot than to round-trip
+ARROW_CODEC = "zstd"
+
+HOT, WARM, COLD = "hot", "warm", "cold"
+
+
+def _budget_bytes(env_name, default_mb):
+    try:
+        return int(float(os.environ.get(env_name, default_mb)) * _MB)
+    except ValueError:
+        return default_mb * _MB
+
+
+def frame_nbytes(value):
+    """In-memory size of a DataFrame or {table: DataFrame} dict."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True, index=True).sum())
+    if isinstance(value, dict):
+        return sum(frame_nbytes(v) for v in value.values())
+    return 0
+
+
+def _is_storable(value):
+    return isinstance(value, pd.DataFrame) or (
+        isinstance(value, dict) and value and all(isinstance(v, pd.DataFrame) for v in value.values()))
+
+
+# --- Serialization: zstd Arrow IPC, with a zstd pickle fallback for frames Arrow cannot type ---
+DTYPES_METADATA_KEY = b"nullbyte.dtypes" # Pickled df.dtypes, restored after the Arrow round trip
+
+
+def _serialize_frame(df):
+    table = None
+    if all(isinstance(c, str) for c in df.columns): # Arrow turns other column labels (ints, tuples) into strings
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=True)
+        except (pa.ArrowException, TypeError, ValueError): # Mixed-type object columns, duplicate names, ...
+            pass
+    if table is None:
+        raw = pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)
+        return ("pickle", len(raw), pa.compress(raw, codec=ARROW_CODEC, asbytes=True))
+    metadata = {**(table.schema.metadata or {}), DTYPES_METADATA_KEY: pickle.dumps(df.dtypes, protocol=pickle.HIGHEST_PROTOCOL)}
+    table = table.replace_schema_metadata(metadata)
+    sink = pa.BufferOutputStream()
+    with ipc.new_file(sink, table.schema, options=ipc.IpcWriteOptions(compression=ARROW_CODEC)) as writer:
+        writer.write_table(table)
+    return ("arrow", None, sink.getvalue().to_pybytes())
+
+
+def _table_to_frame(table):
+    """Arrow table back to pandas with the stored dtypes (e.g. string[pyarrow], object ints next to None)."""
+    df = table.to_pandas(integer_object_nulls=True) # Object ints with None stay ints instead of becoming float64
+    dtypes = (table.schema.metadata or {}).get(DTYPES_METADATA_KEY)
+    if dtypes is not None:
+        for column, dtype in pickle.loads(dtypes).items():
+            if df[column].dtype != dtype:
+                df[column] = df[column].astype(dtype)
+    return df
+
+
+def _deserialize_frame(kind, raw_size, source):
+    """`source` is bytes (warm) or a file path (cold, memory-mapped)."""
+    if kind == "pickle":
+        if isinstance(source, bytes):
+            data = source
+        else:
+            with open(source, "rb") as f:
+                data = f.read()
+        return pickle.loads(pa.decompress(data, decompressed_size=raw_size, codec=ARROW_CODEC, asbytes=True))
+    if isinstance(source, bytes):
+        return _table_to_frame(ipc.open_file(pa.py_buffer(source)).read_all())
+    with pa.memory_map(source, "r") as mapped:
+        return _table_to_frame(ipc.open_file(mapped).read_all())
+
+
+class _Entry:
+    __slots__ = ("tier", "value", "nbytes", "payload", "is_group", "last_used", "fingerprints")
+
+    def __init__(self, value):
+        self.tier = HOT
+        self.value = value
+        self.nbytes = frame_nbytes(value)
+        self.payload = None # {table_or_None: (kind, raw_size, bytes_or_path)} while warm/cold
+        self.is_group = isinstance(value, dict)
+        self.last_used = monotonic()
+        self.fingerprints = {} # {table_or_None: frame_fingerprint}, computed on first request
+
+    def compressed_nbytes(self):
+        if self.tier != WARM:
+            return 0
+        return sum(len(p[2]) for p in self.payload.values())
+
+
+_stores = weakref.WeakSet()
+_registry_lock = threading.Lock()
+
+
+class DatasetStore:
+    """
+    Per-session tiered dataset store with attribute access, so it can stand
+    in for the dataset keys of st.session_state (`datasets.prompt_generated_df`).
+    Non-DataFrame values (None, empty dicts) are kept as plain values.
+    """
+
+    def __init__(self, session_budget_bytes=None, spill_dir=None):
+        object.__setattr__(self, "_entries", {})
+        object.__setattr__(self, "_lock", threading.RLock())
+        object.__setattr__(self, "_active_key", None)
+        object.__setattr__(self, "_attached", {}) # {name: object with an `nbytes` attribute}
+        object.__setattr__(self, "_session_budget", session_budget_bytes or _budget_bytes("NULLBYTE_SESSION_MEMORY_BUDGET_MB", 512))
+        base_dir = spill_dir or os.environ.get("NULLBYTE_SPILL_DIR") or tempfile.gettempdir()
+        object.__setattr__(self, "_spill_dir", os.path.join(base_dir, f"nullbyte-spill-{uuid.uuid4().hex}"))
+        object.__setattr__(self, "_finalizer", weakref.finalize(self, shutil.rmtree, self._spill_dir, True))
+        with _registry_lock:
+            _stores.add(self)
+
+    # --- Mapping / attribute access ---
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __getattr__(self, key):
+        if key.startswith("_"):
+            raise AttributeError(key)
+        try:
+            return self.get(key, _missing=True)
+        except KeyError:
+            raise AttributeError(f"DatasetStore has no dataset '{key}'") from None
+
+    def __setattr__(self, key, value):
+        self.put(key, value)
+
+    def __getitem__(self, key):
+        return self.get(key, _missing=True)
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def keys(self):
+        return list(self._entries)
+
+    def get(self, key, default=None, _missing=False):
+        """Returns the dataset, loading it back to the hot tier if it was demoted."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if _missing:
+                    raise KeyError(key)
+                return default
+            if entry.tier != HOT:
+                self._promote(entry)
+            entry.last_used = monotonic()
+            if entry.nbytes:
+                object.__setattr__(self, "_active_key", key)
+            value = entry.value
+        self._enforce_budgets()
+        return value
+
+    def put(self, key, value):
+        """Stores `value` hot and makes it the session's active dataset."""
+        with self._lock:
+            old = self._entries.get(key)
+            if old is not None:
+                self._drop_payload(old)
+            entry = _Entry(value)
+            if old is not None and old.tier == HOT and old.value is value:
+                entry.fingerprints = old.fingerprints # Same object stored again (reruns): same version
+            self._entries[key] = entry
+            if entry.nbytes:
+                object.__setattr__(self, "_active_key", key)
+        self._enforce_budgets()
+
+    def fingerprint(self, key, table=None):
+        """
+        frame_fingerprint() of the stored DataFrame `key` (or of `table` in a
+        {table: DataFrame} dataset), computed once per stored version; None if
+        there is no such frame.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if table not in entry.fingerprints:
+                value = self.get(key)
+                frame = value.get(table) if entry.is_group else value if table is None else None
+                if not isinstance(frame, pd.DataFrame):
+                    return None
+                entry.fingerprints[table] = frame_fingerprint(frame)
+            return entry.fingerprints[table]
+
+    def delete(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._drop_payload(entry)
+
+    @property
+    def session_budget(self):
+        return self._session_budget
+
+    def attach(self, name, cache):
+        """Counts `cache.nbytes` (e.g. a ColumnCache) as hot data of this session."""
+        with self._lock:
+            self._attached[name] = cache
+        self._enforce_budgets()
+
+    def attached_nbytes(self):
+        return sum(cache.nbytes for cache in list(self._attached.values()))
+
+    def stats(self):
+        """Bytes per tier for this session: {"hot", "warm", "cold"}; attached caches count as hot."""
+        totals = {HOT: self.attached_nbytes(), WARM: 0, COLD: 0}
+        with self._lock:
+            for entry in self._entries.values():
+                if entry.tier == HOT:
+                    totals[HOT] += entry.nbytes
+                elif entry.tier == WARM:
+                    totals[WARM] += entry.compressed_nbytes()
+                else:
+                    totals[COLD] += sum(os.path.getsize(p[2]) for p in entry.payload.values() if os.path.exists(p[2]))
+        return totals
+
+    # --- Tier transitions (caller holds self._lock) ---
+    def _demote(self, entry):
+        """hot -> warm: serialize the current value (so in-place edits are kept) and drop the frame."""
+        value = entry.value
+        frames = value if entry.is_group else {None: value}
+        entry.payload = {name: _serialize_frame(df) for name, df in frames.items()}
+        entry.value = None
+        entry.tier = WARM
+
+    def _spill(self, entry):
+        """warm -> cold: write the compressed streams to local files."""
+        os.makedirs(self._spill_dir, exist_ok=True)
+        spilled = {}
+        for name, (kind, raw_size, data) in entry.payload.items():
+            path = os.path.join(self._spill_dir, f"{uuid.uuid4().hex}.{'arrow' if kind == 'arrow' else 'pkl.zst'}")
+            with open(path, "wb") as f:
+                f.write(data)
+            spilled[name] = (kind, raw_size, path)
+        entry.payload = spilled
+        entry.tier = COLD
+
+    def _promote(self, entry):
+        frames = {name: _deserialize_frame(*p) for name, p in entry.payload.items()}
+        self._drop_payload(entry)
+        entry.value = frames if entry.is_group else frames[None]
+        entry.nbytes = frame_nbytes(entry.value)
+        entry.tier = HOT
+
+    def _drop_payload(self, entry):
+        if entry.tier == COLD:
+            for _, _, path in entry.payload.values():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        entry.payload = None
+
+    def _demotable(self):
+        """Hot entries other than the active one, least recently used first."""
+        return sorted(
+            ((key, e) for key, e in self._entries.items()
+             if e.tier == HOT and key != self._active_key and e.nbytes >= MIN_DEMOTE_BYTES and _is_storable(e.value)),
+            key=lambda item: item[1].last_used)
+
+    def _hot_nbytes(self):
+        return sum(e.nbytes for e in self._entries.values() if e.tier == HOT) + self.attached_nbytes()
+
+    # --- Budgets ---
+    def _enforce_budgets(self):
+        with self._lock:
+            for _, entry in self._demotable():
+                if self._hot_nbytes() <= self._session_budget:
+                    break
+                self._demote(entry)
+        _enforce_process_budgets()
+
+
+def _enforce_process_budgets():
+    """
+    Demotes least recently used hot datasets across all sessions past the
+    process budget, then spills the oldest warm ones past the compressed budget.
+    Locks are taken one store at a time (non-blocking), so sessions never wait on each other.
+    """
+    process_budget = _budget_bytes("NULLBYTE_PROCESS_MEMORY_BUDGET_MB", 2048)
+    compressed_budget = _budget_bytes("NULLBYTE_COMPRESSED_MEMORY_BUDGET_MB", 1024)
+    with _registry_lock:
+        stores = list(_stores)
+
+    hot = [(e.last_used, store, e) for store in stores for key, e in list(store._entries.items())
+           if e.tier == HOT and key != store._active_key and e.nbytes >= MIN_DEMOTE_BYTES and _is_storable(e.value)]
+    hot_total = sum(e.nbytes for store in stores for e in list(store._entries.values()) if e.tier == HOT)
+    hot_total += sum(store.attached_nbytes() for store in stores)
+    for _, store, entry in sorted(hot, key=lambda item: item[0]):
+        if hot_total <= process_budget:
+            break
+        if store._lock.acquire(blocking=False):
+            try:
+                if entry.tier == HOT:
+                    hot_total -= entry.nbytes
+                    store._demote(entry)
+            finally:
+                store._lock.release()
+
+    warm = [(e.last_used, store, e) for store in stores for e in list(store._entries.values()) if e.tier == WARM]
+    warm_total = sum(e.compressed_nbytes() for _, _, e in warm)
+    for _, store, entry in sorted(warm, key=lambda item: item[0]):
+        if warm_total <= compressed_budget:
+            break
+        if store._lock.acquire(blocking=False):
+            try:
+                if entry.tier == WARM:
+                    warm_total -= entry.compressed_nbytes()
+                    store._spill(entry)
+            finally:
+                store._lock.release()
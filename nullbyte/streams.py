@@ -0,0 +1,144 @@
+"""
+Counter-based random streams for reproducible, order-independent generation.
+
+Every stream is a NumPy Philox generator seeded through a SeedSequence keyed
+by (base seed, table, column, chunk), where a chunk is STREAM_CHUNK_ROWS
+consecutive rows. Because no stream depends on any other draw:
+  * each column draws from its own streams, so adding, removing or
+    reordering columns leaves the other columns' values unchanged
+  * growing the row count keeps the existing rows
+  * any chunk of any column can be regenerated in isolation, on any worker
+Streams do not depend on interaction history either, only on the base seed
+(a fresh one per run when no fixed seed is set).
+
+Generators keep their `random`-module style: `stream_random` (and every
+Faker registered through nullbyte.generators.use_faker) forwards to the
+stream selected on the current thread by RandomStreams.select(), and to the
+global `random` / Faker random otherwise, as before. numpy_random() is the
+NumPy counterpart.
+"""
+import hashlib
+import random as random_module
+import threading
+
+import numpy as np
+
+STREAM_CHUNK_ROWS = 1024
+STREAM_BUFFER_SIZE = 64 # Uniforms drawn from Philox per refill of a StreamRandom
+PROMPT_TABLE = "Prompt" # Table name of prompt-based generation streams
+EDGE_CASES_STREAM = "__edge_cases__" # Per-table stream for edge-case rule draws
+FAN_OUT_STREAM = "__fan_out__" # Per-child-table stream for children-per-parent counts
+SCRAMBLE_STREAM = "__scramble__" # Prefix of the per-column streams of PII scrambling permutations
+
+_active = threading.local()
+
+
+def _key(name):
+    """Stable integer for a table / column name (Python's hash() is salted per process)."""
+    return int.from_bytes(hashlib.blake2b(str(name).encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def stream_generator(seed, table, column, chunk=0):
+    """NumPy Philox generator of the (seed, table, column, chunk) stream."""
+    return np.random.Generator(np.random.Philox(np.random.SeedSequence(seed, spawn_key=(_key(table), _key(column), chunk))))
+
+
+class StreamRandom(random_module.Random):
+    """random.Random API over a NumPy generator (choice, randint, uniform, ... all draw from it)."""
+
+    def __init__(self, generator):
+        self.generator = generator
+        self._buffer = []
+        super().__init__()
+
+    def seed(self, *args, **kwargs):
+        pass # Keyed at construction
+
+    def random(self):
+        if not self._buffer:
+            self._buffer = self.generator.random(STREAM_BUFFER_SIZE).tolist()[::-1]
+        return self._buffer.pop()
+
+    def getrandbits(self, k):
+        return int.from_bytes(self.generator.bytes((k + 7) // 8), "little") >> (-k % 8)
+
+
+class _ThreadRandom(random_module.Random):
+    """Forwards draws to the stream selected on the current thread, or to `fallback` outside a stream."""
+
+    def __init__(self, fallback):
+        self._fallback = None
+        super().__init__()
+        self._fallback = fallback
+
+    def _target(self):
+        return getattr(_active, "stream", None) or self._fallback
+
+    def seed(self, *args, **kwargs):
+        if self._fallback is not None: # Seeding reaches the fallback (e.g. random.seed(42) at script start)
+            self._fallback.seed(*args, **kwargs)
+
+    def random(self):
+        return self._target().random()
+
+    def getrandbits(self, k):
+        return self._target().getrandbits(k)
+
+    def getstate(self):
+        return self._target().getstate()
+
+    def setstate(self, state):
+        self._target().setstate(state)
+
+
+stream_random = _ThreadRandom(random_module._inst) # Drop-in for the `random` module
+
+
+def thread_random(fallback):
+    """A random.Random for libraries (Faker) that draws from the current thread's stream, else from `fallback`."""
+    return fallback if isinstance(fallback, _ThreadRandom) else _ThreadRandom(fallback)
+
+
+def numpy_random():
+    """NumPy generator of the selected stream, or the global `np.random` outside a stream."""
+    stream = getattr(_active, "stream", None)
+    return stream.generator if stream is not None else np.random
+
+
+def chunk_bounds(num_rows):
+    """(first row, row count) of every stream chunk of `num_rows` rows."""
+    return [(start, min(STREAM_CHUNK_ROWS, num_rows - start)) for start in range(0, num_rows, STREAM_CHUNK_ROWS)]
+
+
+def resolve_seed(seed):
+    """`seed`, or fresh entropy for an unseeded run (keep it to regenerate the same streams later)."""
+    return seed if seed is not None else np.random.SeedSequence().entropy
+
+
+class RandomStreams:
+    """
+    The streams of one generation run. Use as a context manager on the
+    generating thread and select() the stream before each field's draws.
+    """
+
+    def __init__(self, seed=None):
+        self.seed = resolve_seed(seed)
+        self._current = {} # (table, column) -> (chunk, StreamRandom); rows are generated in order
+        self._previous = None
+
+    def select(self, table, column, row=0):
+        """Makes `row`'s chunk of the (table, column) stream the active one on this thread."""
+        chunk = row // STREAM_CHUNK_ROWS
+        current = self._current.get((table, column))
+        if current is None or current[0] != chunk:
+            current = self._current[(table, column)] = (chunk, StreamRandom(stream_generator(self.seed, table, column, chunk)))
+        _active.stream = current[1]
+        return current[1]
+
+    def __enter__(self):
+        self._previous = getattr(_active, "stream", None)
+        return self
+
+    def __exit__(self, *exc_info):
+        _active.stream = self._previous
+        return False
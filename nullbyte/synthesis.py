@@ -0,0 +1,321 @@
+"""
+Column models for synthesizing uploaded data.
+
+A NumericColumnModel is fitted once per column and then samples any number
+of values in a few vectorized NumPy calls. It keeps the shape of the source
+distribution rather than drawing uniformly between min and max:
+  * constant  - a single repeated value
+  * bool      - Bernoulli with the observed share of True
+  * discrete  - empirical PMF for integer columns with few distinct values
+                (bedrooms, ratings, counts)
+  * quantile  - inverse CDF from QUANTILE_POINTS empirical quantiles, linearly
+                interpolated, with separate zero-inflation mass and integer
+                rounding
+Missing-value share and decimal precision are preserved. Sampling uses the
+global NumPy RNG (or a passed Generator), so the app's fixed seed makes runs
+reproducible.
+
+GaussianCopulaModel joins these marginals (plus CategoricalColumnModel for
+text/category columns, frequency-interval encoded) through a correlation
+matrix of normal scores, so cross-column relationships survive synthesis.
+Fitting is one rank/encode pass per column plus a row-chunked Z^T Z, and
+sampling is batched standard normals times the Cholesky factor, so both stay
+near-linear in rows. The Z^T Z sums add up across row sets, which lets
+nullbyte.federated pool them across participants.
+"""
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr, ndtri
+
+QUANTILE_POINTS = 1025
+DISCRETE_MAX_UNIQUE = 64
+ZERO_INFLATION_MIN_SHARE = 0.05 # Zeros above this share get their own point mass
+MAX_DECIMALS = 6
+PRECISION_SAMPLE_SIZE = 10_000
+COPULA_CHUNK_ROWS = 262_144 # Rows per matmul chunk when fitting and per batch when sampling
+MIN_EIGENVALUE = 1e-6 # Floor applied when repairing a non positive-definite correlation matrix
+
+
+def _decimals(values):
+    """Smallest number of decimals (<= MAX_DECIMALS) that represents every sampled value exactly."""
+    sample = values[:PRECISION_SAMPLE_SIZE]
+    for d in range(MAX_DECIMALS + 1):
+        scaled = sample * (10 ** d)
+        if np.allclose(scaled, np.round(scaled), rtol=0, atol=1e-6):
+            return d
+    return None
+
+
+class NumericColumnModel:
+    """Compact per-column model; see module docstring for the kinds."""
+
+    def __init__(self, kind, is_integer, null_share, **params):
+        self.kind = kind
+        self.is_integer = is_integer
+        self.null_share = null_share
+        self.params = params
+
+    def ppf(self, u):
+        """Inverse CDF: maps uniforms u in [0, 1) to values (never NaN)."""
+        p = self.params
+        if self.kind == "constant":
+            return np.full(len(u), p["value"], dtype=float)
+        if self.kind == "bool":
+            return (u >= 1.0 - p["true_share"]).astype(float) # True on the upper interval, so ranks keep their order
+        if self.kind == "discrete":
+            index = np.searchsorted(p["cumulative"], u, side="right")
+            return p["values"][np.minimum(index, len(p["values"]) - 1)].astype(float)
+
+        zero_share = p["zero_share"]
+        if zero_share > 0: # Mixture CDF: body below zero, point mass at zero, body above zero
+            body_u = np.asarray(u, dtype=float).copy()
+            zero_low = (1.0 - zero_share) * p["body_share_below_zero"]
+            is_zero = (u >= zero_low) & (u < zero_low + zero_share)
+            above = u >= zero_low + zero_share
+            body_u[above] -= zero_share
+            body_u = np.clip(body_u / (1.0 - zero_share), 0.0, 1.0)
+        else:
+            body_u, is_zero = u, None
+        values = np.interp(body_u, p["probabilities"], p["quantiles"])
+        if is_zero is not None:
+            values[is_zero] = 0.0
+        if self.is_integer:
+            values = np.round(values)
+        elif p["decimals"] is not None:
+            values = np.round(values, p["decimals"])
+        return np.clip(values, p["low"], p["high"])
+
+    def sample(self, n, u=None, rng=None):
+        """
+        Returns a NumPy array of n values (float with NaN where nulls are drawn).
+        `u` supplies the uniforms (e.g. from a copula); by default they are drawn independently.
+        """
+        rng = rng if rng is not None else np.random
+        values = self.ppf(rng.random(n) if u is None else u)
+        if self.null_share > 0:
+            values[rng.random(n) < self.null_share] = np.nan
+        return values
+
+    def sample_series(self, n, name=None, u=None):
+        """Samples into a Series with a dtype matching the source column."""
+        return self.to_series(self.sample(n, u=u), name=name)
+
+    def to_series(self, values, name=None):
+        """Wraps sampled values in a Series with a dtype matching the source column."""
+        has_nulls = np.isnan(values).any()
+        if self.kind == "bool":
+            return pd.Series(values, name=name).astype("boolean" if has_nulls else bool)
+        if self.is_integer:
+            return pd.Series(values, name=name).astype("Int64" if has_nulls else np.int64)
+        return pd.Series(values, name=name)
+
+
+def fit_numeric_column(series, value_range=None):
+    """
+    Fits a NumericColumnModel to a numeric (or bool) Series; None if it has no values.
+    `value_range` (low, high), e.g. from a full-file profile, widens the tails
+    when `series` is only a sample.
+    """
+    null_share = float(series.isna().mean()) if len(series) else 0.0
+    valid = series.dropna()
+    if valid.empty:
+        return None
+    if pd.api.types.is_bool_dtype(valid.dtype):
+        return NumericColumnModel("bool", False, null_share, true_share=float(valid.astype(bool).mean()))
+
+    values = valid.to_numpy(dtype=float)
+    is_integer = pd.api.types.is_integer_dtype(valid.dtype) or bool(np.all(values == np.round(values)))
+    low, high = float(values.min()), float(values.max())
+    if value_range:
+        low, high = min(low, float(value_range[0])), max(high, float(value_range[1]))
+    if low == high:
+        return NumericColumnModel("constant", is_integer, null_share, value=low)
+
+    if is_integer:
+        uniques, counts = np.unique(values, return_counts=True)
+        if len(uniques) <= DISCRETE_MAX_UNIQUE:
+            return NumericColumnModel("discrete", True, null_share, values=uniques, cumulative=np.cumsum(counts) / counts.sum())
+
+    zero_share = float(np.mean(values == 0))
+    if zero_share >= ZERO_INFLATION_MIN_SHARE and zero_share < 1:
+        body = values[values != 0]
+    else:
+        zero_share, body = 0.0, values
+    probabilities = np.linspace(0.0, 1.0, QUANTILE_POINTS)
+    quantiles = np.quantile(body, probabilities)
+    if low < values.min(): # Full-file range wider than the sample: stretch the tails
+        quantiles[0] = low
+    if high > values.max():
+        quantiles[-1] = high
+    return NumericColumnModel(
+        "quantile", is_integer, null_share,
+        probabilities=probabilities, quantiles=quantiles, zero_share=zero_share,
+        body_share_below_zero=float(np.mean(body < 0)),
+        decimals=None if is_integer else _decimals(values), low=low, high=high,
+    )
+
+
+class CategoricalColumnModel:
+    """
+    Empirical distribution of a text/category column. Categories are ordered by
+    descending frequency and each owns an interval of [0, 1) as wide as its share
+    (frequency-interval encoding), so a uniform maps to a category and back.
+    """
+
+    def __init__(self, values, probabilities, null_share, dtype=None):
+        probabilities = np.asarray(probabilities, dtype=float)
+        order = np.argsort(-probabilities, kind="stable")
+        self.values = np.asarray(list(values), dtype=object)[order]
+        self.probabilities = probabilities[order] / probabilities.sum()
+        self.cumulative = np.cumsum(self.probabilities)
+        self.null_share = null_share
+        self.dtype = dtype
+
+    def encode(self, series):
+        """Interval midpoints of each value (NaN for missing or unknown values)."""
+        codes = pd.Categorical(series, categories=self.values).codes
+        lows = self.cumulative - self.probabilities
+        u = np.full(len(codes), np.nan)
+        known = codes >= 0
+        u[known] = lows[codes[known]] + self.probabilities[codes[known]] / 2.0
+        return u
+
+    def ppf(self, u):
+        index = np.searchsorted(self.cumulative, u, side="right")
+        return self.values[np.minimum(index, len(self.values) - 1)]
+
+    def sample(self, n, u=None, rng=None):
+        rng = rng if rng is not None else np.random
+        values = self.ppf(rng.random(n) if u is None else u)
+        if self.null_share > 0:
+            values[rng.random(n) < self.null_share] = None
+        return values
+
+    def to_series(self, values, name=None):
+        series = pd.Series(values, name=name)
+        if isinstance(self.dtype, pd.CategoricalDtype):
+            return series.astype("category")
+        return series.astype(self.dtype, errors="ignore") if self.dtype is not None else series
+
+
+def fit_categorical_column(series, distribution=None):
+    """
+    Fits a CategoricalColumnModel; None if the column has no values.
+    `distribution` (values, probabilities), e.g. from a full-file profile, replaces the sample's frequencies.
+    """
+    null_share = float(series.isna().mean()) if len(series) else 0.0
+    if distribution:
+        values, probabilities = distribution
+    else:
+        counts = series.value_counts()
+        counts = counts[counts > 0] # Unused categories of category-dtype columns
+        if counts.empty:
+            return None
+        values, probabilities = counts.index, counts.to_numpy()
+    return CategoricalColumnModel(values, probabilities, null_share, dtype=series.dtype)
+
+
+def _normal_scores(series):
+    """Ranks of a numeric column mapped to standard normal scores (NaN stays NaN)."""
+    ranks = series.astype(float).rank(method="average").to_numpy()
+    n_valid = np.count_nonzero(~np.isnan(ranks))
+    return ndtri((ranks - 0.5) / max(n_valid, 1))
+
+
+def nearest_correlation(matrix):
+    """Clips eigenvalues so the matrix is positive definite, then rescales it to a unit diagonal."""
+    eigenvalues, eigenvectors = np.linalg.eigh((matrix + matrix.T) / 2.0)
+    repaired = (eigenvectors * np.maximum(eigenvalues, MIN_EIGENVALUE)) @ eigenvectors.T
+    scale = np.sqrt(np.diag(repaired))
+    return repaired / np.outer(scale, scale)
+
+
+def score_moments(scores):
+    """
+    (cross, squares) sums of normal-score columns (n x k, NaN for missing),
+    accumulated in row chunks so memory stays bounded. Sums over disjoint row
+    sets add up, so they can be pooled before correlation_from_moments().
+    """
+    n, k = scores.shape
+    cross = np.zeros((k, k))
+    squares = np.zeros((k, k))
+    for start in range(0, n, COPULA_CHUNK_ROWS):
+        chunk = scores[start:start + COPULA_CHUNK_ROWS]
+        valid = ~np.isnan(chunk)
+        z = np.where(valid, chunk, 0.0)
+        cross += z.T @ z
+        squares += (z * z).T @ valid # squares[i, j]: sum of z_i^2 over rows where z_j is also present
+    return cross, squares
+
+
+def correlation_from_moments(cross, squares):
+    """Correlation over pairwise complete rows from score_moments() sums."""
+    denominator = np.sqrt(squares * squares.T)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        correlation = np.where(denominator > 0, cross / denominator, 0.0)
+    np.fill_diagonal(correlation, 1.0)
+    return np.clip(correlation, -1.0, 1.0)
+
+
+class GaussianCopulaModel:
+    """Marginal models per column joined by a Gaussian copula (see module docstring)."""
+
+    def __init__(self, marginals, correlation, rows_fitted, fit_seconds):
+        self.marginals = marginals # {column: NumericColumnModel | CategoricalColumnModel}
+        self.columns = list(marginals)
+        self.correlation = correlation
+        self.rows_fitted = rows_fitted
+        self.fit_seconds = fit_seconds
+        self._cholesky = np.linalg.cholesky(correlation)
+
+    def sample(self, n, seed=None):
+        """Samples n rows as a DataFrame, COPULA_CHUNK_ROWS rows per batch; `seed` draws from a Generator of its own."""
+        rng = np.random.default_rng(seed) if seed is not None else np.random
+        k = len(self.columns)
+        parts = {column: [] for column in self.columns}
+        for start in range(0, n, COPULA_CHUNK_ROWS):
+            batch = min(COPULA_CHUNK_ROWS, n - start)
+            u = ndtr(rng.standard_normal((batch, k)) @ self._cholesky.T)
+            for j, column in enumerate(self.columns):
+                parts[column].append(self.marginals[column].sample(batch, u=u[:, j], rng=rng))
+        return pd.DataFrame({
+            column: self.marginals[column].to_series(np.concatenate(parts[column]) if parts[column] else np.array([]), name=column)
+            for column in self.columns
+        })
+
+
+def fit_gaussian_copula(df, columns=None, profile=None):
+    """
+    Fits a GaussianCopulaModel to the numeric, bool and text/category `columns`
+    of `df` (default: all such columns); columns without values are skipped.
+    `profile` (a full-file DatasetProfile) supplies exact ranges and category
+    frequencies when `df` is a sample.
+    """
+    started = perf_counter()
+    marginals, scores = {}, []
+    for column in (columns if columns is not None else df.columns):
+        series = df[column]
+        if pd.api.types.is_numeric_dtype(series.dtype):
+            value_range = profile.numeric_range(column) if profile is not None else None
+            model = fit_numeric_column(series, value_range=value_range)
+            column_scores = _normal_scores(series) if model is not None else None
+        elif (pd.api.types.is_object_dtype(series.dtype) or isinstance(series.dtype, pd.CategoricalDtype)
+              or pd.api.types.is_string_dtype(series.dtype)):
+            distribution = profile.category_distribution(column) if profile is not None else None
+            model = fit_categorical_column(series, distribution=distribution)
+            encoder = fit_categorical_column(series) if distribution else model # Scores follow the rows actually present
+            column_scores = ndtri(encoder.encode(series)) if encoder is not None else None
+            model = model if encoder is not None else None
+        else:
+            model = None
+        if model is None:
+            continue
+        marginals[column] = model
+        scores.append(column_scores)
+
+    if not marginals:
+        return None
+    correlation = nearest_correlation(correlation_from_moments(*score_moments(np.column_stack(scores))))
+    return GaussianCopulaModel(marginals, correlation, rows_fitted=len(df), fit_seconds=perf_counter() - started)
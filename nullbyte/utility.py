@@ -0,0 +1,274 @@
+"""
+Train-synthetic-test-real (TSTR) machine-learning utility benchmark.
+
+For a chosen target column, the original table is split (stratified) into a
+training part and a held-out real test part. A small set of scikit-learn
+models is trained once on the real training part and once on the synthetic
+table, and every model is evaluated on the same real test rows:
+  classification  macro F1 (headline) and accuracy
+  regression      R^2 (headline) and mean absolute error
+The utility score is the mean, over models, of synthetic-trained / real-trained
+headline metric, clipped to [0, 1], times 100. Models whose real-trained
+metric is not positive (e.g. R^2 <= 0 on a target the features cannot
+predict) have no meaningful ratio: they are reported as NaN and left out of
+the score, which is NaN if no model is scorable.
+
+Large inputs are subsampled by stratum: the target's classes, or the
+target's deciles for regression. Features share one encoding fitted on the
+original (nullbyte.privacy.MixedTypeEncoder). Encoded matrices and fitted
+models are cached by dataset fingerprint. After the synthetic table changes,
+only the synthetic side is re-encoded and refitted. Fits that are not cached
+run in parallel through joblib.
+
+Configuration (environment):
+  NULLBYTE_TSTR_MAX_TRAIN_ROWS  training rows per side (default 100000)
+  NULLBYTE_TSTR_N_JOBS          parallel model fits (default: min(6, CPU count))
+"""
+import os
+import threading
+from collections import OrderedDict
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.ensemble import (HistGradientBoostingClassifier, HistGradientBoostingRegressor, RandomForestClassifier,
+                              RandomForestRegressor)
+from sklearn.linear_model import LogisticRegression, Ridge
+from sklearn.metrics import accuracy_score, f1_score, mean_absolute_error, r2_score
+
+from nullbyte.fingerprint import frame_fingerprint
+from nullbyte.privacy import MixedTypeEncoder
+from nullbyte.quality import comparable_column_kinds
+
+DEFAULT_MAX_TRAIN_ROWS = 100_000
+TEST_SHARE = 0.3
+MAX_TEST_ROWS = 50_000
+MIN_ROWS = 20 # Fewer usable original rows than this cannot be split meaningfully
+CLASSIFICATION_MAX_CLASSES = 20 # Numeric targets with at most this many distinct values are treated as classes
+REGRESSION_STRATA = 10
+CACHE_SIZE = 16
+MODEL_CACHE_SIZE = 64
+
+CLASSIFICATION, REGRESSION = "classification", "regression"
+MODEL_FACTORIES = {
+    CLASSIFICATION: {
+        "Logistic Regression": lambda seed: LogisticRegression(max_iter=300),
+        "Random Forest": lambda seed: RandomForestClassifier(n_estimators=50, max_depth=10, min_samples_leaf=5, random_state=seed),
+        "Gradient Boosting": lambda seed: HistGradientBoostingClassifier(random_state=seed),
+    },
+    REGRESSION: {
+        "Ridge Regression": lambda seed: Ridge(),
+        "Random Forest": lambda seed: RandomForestRegressor(n_estimators=50, max_depth=10, min_samples_leaf=5, random_state=seed),
+        "Gradient Boosting": lambda seed: HistGradientBoostingRegressor(random_state=seed),
+    },
+}
+
+_cache_lock = threading.Lock()
+_split_cache = OrderedDict()
+_synthetic_cache = OrderedDict()
+_model_cache = OrderedDict()
+
+
+def _env_int(name, default):
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def _cached(cache, key, build, max_size=CACHE_SIZE):
+    with _cache_lock:
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+    value = build()
+    with _cache_lock:
+        cache[key] = value
+        while len(cache) > max_size:
+            cache.popitem(last=False)
+    return value
+
+
+def target_task(series):
+    """CLASSIFICATION or REGRESSION for a target column."""
+    if pd.api.types.is_bool_dtype(series.dtype) or not pd.api.types.is_numeric_dtype(series.dtype):
+        return CLASSIFICATION
+    return CLASSIFICATION if series.nunique(dropna=True) <= CLASSIFICATION_MAX_CLASSES else REGRESSION
+
+
+def _labels(series, task):
+    """
+    Target values as model labels: strings for classes, floats for regression (NaN marks unusable rows).
+    Integral numbers are labelled as integers, so a float column with blanks ("1.0") and an Int64 one ("1") agree.
+    """
+    if task == CLASSIFICATION:
+        if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+            numbers = series.to_numpy(dtype=float, na_value=np.nan)
+            labels = np.full(len(numbers), None, dtype=object)
+            integral = np.isfinite(numbers) & (numbers == np.round(numbers))
+            other = ~np.isnan(numbers) & ~integral
+            labels[integral] = numbers[integral].astype(np.int64).astype(str)
+            labels[other] = numbers[other].astype(str)
+            return labels
+        return np.where(series.notna(), series.astype(str), None).astype(object)
+    return pd.to_numeric(series, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+
+
+def _strata(y, task, edges=None):
+    """Stratum code per row: class code, or decile bin of the target for regression."""
+    if task == CLASSIFICATION:
+        return pd.factorize(y)[0]
+    return np.searchsorted(edges, y, side="right")
+
+
+def stratified_sample(strata, limit, rng):
+    """Sorted positions of about `limit` rows keeping each stratum's share (every stratum keeps at least one row)."""
+    rows = len(strata)
+    if rows <= limit:
+        return np.arange(rows)
+    shuffled = rng.permutation(rows)
+    order = shuffled[np.argsort(strata[shuffled], kind="stable")]
+    sorted_strata = strata[order]
+    values, starts, counts = np.unique(sorted_strata, return_index=True, return_counts=True)
+    quotas = np.maximum(1, np.round(counts * limit / rows)).astype(int)
+    rank = np.arange(rows) - np.repeat(starts, counts)
+    return np.sort(order[rank < np.repeat(quotas, counts)])
+
+
+class _RealSplit:
+    """Encoded real training and test matrices for one target."""
+
+    def __init__(self, reference, target, task, feature_kinds, max_train_rows, seed):
+        rng = np.random.default_rng(seed)
+        y = _labels(reference[target], task)
+        usable = np.flatnonzero(pd.notna(y))
+        if len(usable) < MIN_ROWS:
+            raise ValueError(f"Target '{target}' has only {len(usable)} usable rows; at least {MIN_ROWS} are needed.")
+        y = y[usable]
+        self.edges = np.unique(np.quantile(y, np.linspace(0, 1, REGRESSION_STRATA + 1)[1:-1])) if task == REGRESSION else None
+        strata = _strata(y, task, self.edges)
+        test_positions = stratified_sample(strata, min(int(len(y) * TEST_SHARE), MAX_TEST_ROWS), rng)
+        train_mask = np.ones(len(y), dtype=bool)
+        train_mask[test_positions] = False
+        train_positions = np.flatnonzero(train_mask)
+        train_positions = train_positions[stratified_sample(strata[train_positions], max_train_rows, rng)]
+
+        features = reference.iloc[usable]
+        self.encoder = MixedTypeEncoder(features.iloc[train_positions], feature_kinds)
+        self.X_train, self.y_train = self.encoder.transform(features.iloc[train_positions]), y[train_positions]
+        self.X_test, self.y_test = self.encoder.transform(features.iloc[test_positions]), y[test_positions]
+
+
+def _encode_synthetic(split, synthetic, target, task, max_train_rows, seed):
+    y = _labels(synthetic[target], task)
+    usable = np.flatnonzero(pd.notna(y))
+    positions = usable[stratified_sample(_strata(y[usable], task, split.edges), max_train_rows, np.random.default_rng(seed + 1))]
+    return split.encoder.transform(synthetic.iloc[positions]), y[positions]
+
+
+def _fit(task, model_name, X, y, seed):
+    """Fits one model; returns (model, seconds, error)."""
+    started = perf_counter()
+    try:
+        if task == CLASSIFICATION and len(np.unique(y)) < 2:
+            raise ValueError("training data has a single class")
+        model = MODEL_FACTORIES[task][model_name](seed).fit(X, y)
+        return model, perf_counter() - started, None
+    except Exception as e: # A failed fit is reported per model rather than failing the benchmark
+        return None, perf_counter() - started, f"{type(e).__name__}: {e}"
+
+
+def _evaluate(task, model, X, y):
+    predictions = model.predict(X)
+    if task == CLASSIFICATION:
+        return {"F1 (macro)": f1_score(y, predictions, average="macro"), "Accuracy": accuracy_score(y, predictions)}
+    return {"R2": r2_score(y, predictions), "MAE": mean_absolute_error(y, predictions)}
+
+
+class UtilityReport:
+    """Result of tstr_benchmark()."""
+
+    def __init__(self, target, task, results, features, train_rows, test_rows, seconds, fits_reused):
+        self.target = target
+        self.task = task
+        self.results = results # DataFrame: Model, Trained On, <metrics>, Fit Seconds, Error
+        self.features = features
+        self.train_rows = train_rows # {"Real": rows, "Synthetic": rows}
+        self.test_rows = test_rows
+        self.seconds = seconds
+        self.fits_reused = fits_reused
+
+    @property
+    def headline_metric(self):
+        return "F1 (macro)" if self.task == CLASSIFICATION else "R2"
+
+    def model_ratios(self):
+        """
+        {model: synthetic-trained / real-trained headline metric, clipped to [0, 1]};
+        NaN where the real-trained metric is missing or not positive (not scorable).
+        """
+        metric = self.headline_metric
+        table = self.results.pivot(index="Model", columns="Trained On", values=metric)
+        ratios = {}
+        for model, row in table.iterrows():
+            real, synthetic = row.get("Real"), row.get("Synthetic")
+            if pd.isna(real) or real <= 0:
+                ratios[model] = float("nan")
+            else:
+                ratios[model] = 0.0 if pd.isna(synthetic) else float(np.clip(synthetic / real, 0.0, 1.0)) # A failed synthetic fit scores 0
+        return ratios
+
+    @property
+    def score(self):
+        scorable = [ratio for ratio in self.model_ratios().values() if pd.notna(ratio)]
+        return 100.0 * float(np.mean(scorable)) if scorable else float("nan")
+
+
+def tstr_benchmark(reference, synthetic, target, seed=0, max_train_rows=None, n_jobs=None):
+    """Runs the TSTR benchmark (see module docstring) for `target`; returns a UtilityReport."""
+    started = perf_counter()
+    max_train_rows = max_train_rows or _env_int("NULLBYTE_TSTR_MAX_TRAIN_ROWS", DEFAULT_MAX_TRAIN_ROWS)
+    n_jobs = n_jobs or _env_int("NULLBYTE_TSTR_N_JOBS", min(6, os.cpu_count() or 1))
+    if target not in reference.columns or target not in synthetic.columns:
+        raise ValueError(f"Target '{target}' must be a column of both the original and the synthetic data.")
+    task = target_task(reference[target])
+    kinds, _ = comparable_column_kinds(reference, synthetic)
+    feature_kinds = {c: k for c, k in kinds.items() if c != target}
+    if not feature_kinds:
+        raise ValueError("No feature columns are shared by the original and the synthetic data.")
+
+    reference_fp, synthetic_fp = frame_fingerprint(reference), frame_fingerprint(synthetic)
+    split_key = (reference_fp, target, tuple(feature_kinds.items()), max_train_rows, seed)
+    split = _cached(_split_cache, split_key, lambda: _RealSplit(reference, target, task, feature_kinds, max_train_rows, seed))
+    X_synthetic, y_synthetic = _cached(_synthetic_cache, (split_key, synthetic_fp),
+                                       lambda: _encode_synthetic(split, synthetic, target, task, max_train_rows, seed))
+    training_sets = {"Real": ((split_key,), split.X_train, split.y_train),
+                     "Synthetic": ((split_key, synthetic_fp), X_synthetic, y_synthetic)}
+
+    fits, missing = {}, []
+    for trained_on, (train_key, X, y) in training_sets.items():
+        for model_name in MODEL_FACTORIES[task]:
+            key = (train_key, model_name)
+            with _cache_lock:
+                cached = _model_cache.get(key)
+            if cached is not None:
+                fits[(model_name, trained_on)] = cached
+            else:
+                missing.append((key, model_name, trained_on, X, y))
+    fitted = Parallel(n_jobs=n_jobs, prefer="threads")(delayed(_fit)(task, model_name, X, y, seed) for _, model_name, _, X, y in missing)
+    for (key, model_name, trained_on, _, _), result in zip(missing, fitted):
+        fits[(model_name, trained_on)] = result
+        if result[0] is not None:
+            _cached(_model_cache, key, lambda: result, max_size=MODEL_CACHE_SIZE)
+
+    rows = []
+    for model_name in MODEL_FACTORIES[task]:
+        for trained_on in training_sets:
+            model, seconds, error = fits[(model_name, trained_on)]
+            metrics = _evaluate(task, model, split.X_test, split.y_test) if model is not None else {}
+            rows.append({"Model": model_name, "Trained On": trained_on, **metrics, "Fit Seconds": seconds, "Error": error})
+    metric_columns = ["F1 (macro)", "Accuracy"] if task == CLASSIFICATION else ["R2", "MAE"]
+    results = pd.DataFrame(rows, columns=["Model", "Trained On", *metric_columns, "Fit Seconds", "Error"])
+    return UtilityReport(target, task, results, list(feature_kinds), {"Real": len(split.y_train), "Synthetic": len(y_synthetic)},
+                         len(split.y_test), perf_counter() - started, fits_reused=len(fits) - len(missing))
@@ -0,0 +1,72 @@
+"""
+Virtual tables: any row range of a table, generated on demand.
+
+A VirtualTable never materializes its rows. rows(start, stop) generates only
+the stream chunks (nullbyte.streams) that cover [start, stop): each chunk is
+generated from its first row with fresh streams keyed by the table's seed,
+exactly as a full run reaches it, so the values equal those of a full run
+with the same seed and row count whatever the table size. At most
+STREAM_CHUNK_ROWS - 1 leading rows are generated and dropped per request, and
+recently used chunks are kept in an LRU cache so paging stays instant.
+
+Values that are not row-local are out of scope: PII scrambling permutes
+whole columns, and child tables take their rows from the parent fan-out.
+"""
+from collections import OrderedDict
+
+import pandas as pd
+
+from nullbyte.streams import STREAM_CHUNK_ROWS, RandomStreams, resolve_seed
+
+MAX_VIRTUAL_ROWS = 1_000_000_000
+DEFAULT_PAGE_SIZE = 100
+VIRTUAL_CACHE_CHUNKS = 16 # Generated chunks kept per table
+
+
+class VirtualTable:
+    """
+    `num_rows` rows of which only requested ranges are ever generated.
+    `row_generator(streams, row_index)` returns one row (a dict) and must
+    select its streams per row, like the full-run generators do.
+    """
+
+    def __init__(self, row_generator, num_rows, seed=None, columns=None):
+        if not 0 <= num_rows <= MAX_VIRTUAL_ROWS:
+            raise ValueError(f"A virtual table holds between 0 and {MAX_VIRTUAL_ROWS:,} rows, not {num_rows:,}.")
+        self.row_generator = row_generator
+        self.num_rows = int(num_rows)
+        self.seed = resolve_seed(seed) # Pinned, so repeated reads agree
+        self.columns = list(columns) if columns is not None else None
+        self._chunks = OrderedDict() # chunk index -> [row dict, ...]
+
+    def __len__(self):
+        return self.num_rows
+
+    def num_pages(self, page_size=DEFAULT_PAGE_SIZE):
+        return max(1, -(-self.num_rows // page_size))
+
+    def _chunk(self, chunk):
+        rows = self._chunks.get(chunk)
+        if rows is None:
+            start = chunk * STREAM_CHUNK_ROWS
+            with RandomStreams(self.seed) as streams: # Fresh streams start every stream at this chunk
+                rows = [self.row_generator(streams, i) for i in range(start, min(start + STREAM_CHUNK_ROWS, self.num_rows))]
+            self._chunks[chunk] = rows
+            if len(self._chunks) > VIRTUAL_CACHE_CHUNKS:
+                self._chunks.popitem(last=False)
+        else:
+            self._chunks.move_to_end(chunk)
+        return rows
+
+    def rows(self, start, stop):
+        """DataFrame of rows [start, stop) (clipped to the table), indexed by row number."""
+        start, stop = max(0, int(start)), min(self.num_rows, int(stop))
+        records = []
+        for chunk in range(start // STREAM_CHUNK_ROWS, (stop - 1) // STREAM_CHUNK_ROWS + 1 if stop > start else 0):
+            chunk_start = chunk * STREAM_CHUNK_ROWS
+            records.extend(self._chunk(chunk)[max(start - chunk_start, 0):stop - chunk_start])
+        return pd.DataFrame(records, index=pd.RangeIndex(start, start + len(records)), columns=self.columns)
+
+    def page(self, page_number, page_size=DEFAULT_PAGE_SIZE):
+        """Rows of 0-based page `page_number`."""
+        return self.rows(page_number * page_size, (page_number + 1) * page_size)
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nullbyte.dp import (
+    GAUSSIAN,
+    OTHER_CATEGORY,
+    RANDOMIZED_RESPONSE,
+    SELECTION_DELTA,
+    PrivacyLedger,
+    dataset_key,
+    exponential_mechanism_column,
+    fit_dp_histograms,
+    gaussian_sigma,
+    randomized_response,
+)
+
+SECRET = "SECRET_PERSON_X"
+
+
+@pytest.fixture
+def column_with_singleton():
+    return pd.Series(["A"] * 60_000 + ["B"] * 40_000 + [SECRET])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_randomized_response_never_emits_singleton(column_with_singleton, seed):
+    release = randomized_response(column_with_singleton, 0.5, seed=seed)
+    assert SECRET not in set(release.values.dropna())
+    assert release.delta == SELECTION_DELTA
+
+
+@pytest.mark.parametrize("top_k", [None, 1])
+@pytest.mark.parametrize("seed", range(5))
+def test_exponential_mechanism_never_emits_singleton(column_with_singleton, top_k, seed):
+    release = exponential_mechanism_column(column_with_singleton, 0.1, top_k=top_k, seed=seed)
+    assert SECRET not in set(release.values.dropna())
+    assert SECRET not in release.details["released"].index
+    assert release.epsilon == pytest.approx(0.1)
+
+
+def test_declared_domain_is_released_without_selection(column_with_singleton):
+    release = exponential_mechanism_column(column_with_singleton, 1.0, domain=["A", "B"], seed=0)
+    assert list(release.details["released"].index[:3]) == ["A", "B", OTHER_CATEGORY]
+    assert release.delta == 0.0
+
+
+@pytest.fixture
+def mixed_frame():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "age": rng.integers(18, 90, 5000).astype(float),
+        "city": rng.choice(["Pune", "Delhi", "Chennai"], 5000),
+        "plan": rng.choice(["basic", "pro"], 5000),
+    })
+
+
+def test_budget_is_split_over_histograms_and_category_selections(mixed_frame):
+    model = fit_dp_histograms(mixed_frame, 1.0, columns=["age", "city", "plan"], domains={"plan": ["basic", "pro"]}, seed=0)
+    assert model.measurements == 4 # Root marginal + 2 two-way tables + one selection ("city")
+    assert model.epsilon == 1.0
+    assert model.delta == pytest.approx(SELECTION_DELTA)
+
+
+def test_declared_domains_keep_laplace_pure(mixed_frame):
+    model = fit_dp_histograms(mixed_frame, 1.0, domains={"city": ["Pune", "Delhi", "Chennai"], "plan": ["basic", "pro"]}, seed=0)
+    assert model.measurements == 3
+    assert model.delta == 0.0
+
+
+def test_gaussian_epsilon_limit():
+    assert gaussian_sigma(1.0, 1e-6) > 0
+    with pytest.raises(ValueError):
+        gaussian_sigma(1.5, 1e-6)
+
+
+def test_gaussian_share_above_one_is_rejected(mixed_frame):
+    numeric = mixed_frame[["age"]].assign(score=mixed_frame["age"] * 2)
+    fit_dp_histograms(numeric, 2.0, delta=1e-6, mechanism=GAUSSIAN, seed=0) # 1.0 per histogram
+    with pytest.raises(ValueError):
+        fit_dp_histograms(numeric, 3.0, delta=1e-6, mechanism=GAUSSIAN, seed=0)
+
+
+def test_ledger_round_trip_and_composition(tmp_path):
+    path = tmp_path / "ledger.jsonl"
+    key = dataset_key("customers.csv", ["b", "a"])
+    assert key == dataset_key("customers.csv", ["a", "b"])
+    ledger = PrivacyLedger(path)
+    ledger.record(key, "dp_histograms", 0.5, 1e-6, dataset_name="customers.csv", columns=["a", "b"])
+    ledger.record(key, RANDOMIZED_RESPONSE, 0.25)
+    ledger.record(dataset_key("orders.csv", ["a"]), "dp_histograms", 3.0)
+    with path.open("a", encoding="utf-8") as ledger_file:
+        ledger_file.write('{"dataset": "torn') # Interrupted write
+
+    reopened = PrivacyLedger(path)
+    assert [e["epsilon"] for e in reopened.entries(key)] == [0.5, 0.25]
+    assert reopened.entries(key)[0]["columns"] == ["a", "b"]
+    epsilon, delta = reopened.spent(key)
+    assert epsilon == pytest.approx(0.75)
+    assert delta == pytest.approx(1e-6)
@@ -0,0 +1,23 @@
+import numpy as np
+import pandas as pd
+
+from nullbyte.pii_scan import scan_frame
+
+
+def _mobiles(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return [f"91{rng.integers(6, 10)}{rng.integers(0, 10**9):09d}" for _ in range(count)]
+
+
+def test_country_code_mobiles_without_separator_are_flagged():
+    df = pd.DataFrame({"contact": _mobiles(500)})
+    df["contact_int"] = df["contact"].astype("int64")
+    report = scan_frame(df)
+    assert report.detected_type("contact") == "mobile"
+    assert report.detected_type("contact_int") == "mobile"
+
+
+def test_random_twelve_digit_numbers_are_not_flagged():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({"reference": [str(n) for n in rng.integers(2 * 10**11, 10**12, 500)]})
+    assert scan_frame(df).detected_type("reference") is None
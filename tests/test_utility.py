@@ -0,0 +1,17 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from nullbyte.utility import tstr_benchmark
+
+
+def _frame(rng, rows=2000):
+    return pd.DataFrame({"a": rng.normal(size=rows), "b": rng.normal(size=rows), "target": rng.normal(size=rows)})
+
+
+def test_unpredictable_regression_target_is_not_scored():
+    rng = np.random.default_rng(0)
+    report = tstr_benchmark(_frame(rng), _frame(rng), "target")
+    assert all(math.isnan(ratio) for ratio in report.model_ratios().values())
+    assert math.isnan(report.score)
@@ -0,0 +1,42 @@
+import pandas as pd
+import pytest
+
+from nullbyte.generators import _generate_value_from_schema
+from nullbyte.streams import STREAM_CHUNK_ROWS, RandomStreams, chunk_bounds
+from nullbyte.virtual import VirtualTable
+
+TABLE = "customers"
+FIELDS = [
+    {"name": "name", "type": "name", "constraint": ""},
+    {"name": "age", "type": "int", "constraint": "18-90"},
+    {"name": "city", "type": "string", "constraint": "", "is_faker_city": True},
+]
+NUM_ROWS = 2 * STREAM_CHUNK_ROWS + 500
+
+
+@pytest.fixture(scope="module")
+def full_run():
+    """Column by column over stream chunks, as the Smart Schema Editor generates a table."""
+    columns = {}
+    with RandomStreams(11) as streams:
+        for field in FIELDS:
+            values = []
+            for chunk_start, chunk_rows in chunk_bounds(NUM_ROWS):
+                streams.select(TABLE, field["name"], chunk_start)
+                values.extend(_generate_value_from_schema(field) for _ in range(chunk_rows))
+            columns[field["name"]] = values
+    return pd.DataFrame(columns)
+
+
+def _row(streams, row_index):
+    row = {}
+    for field in FIELDS:
+        streams.select(TABLE, field["name"], row_index)
+        row[field["name"]] = _generate_value_from_schema(field)
+    return row
+
+
+@pytest.mark.parametrize("start, stop", [(0, 50), (STREAM_CHUNK_ROWS - 20, STREAM_CHUNK_ROWS + 20), (NUM_ROWS - 600, NUM_ROWS)])
+def test_virtual_rows_equal_full_run(full_run, start, stop):
+    virtual = VirtualTable(_row, NUM_ROWS, seed=11, columns=[f["name"] for f in FIELDS])
+    pd.testing.assert_frame_equal(virtual.rows(start, stop), full_run.iloc[start:stop])